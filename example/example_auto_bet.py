@@ -38,8 +38,8 @@ def main() -> None:
     try:
         better = AutoBetter(config=config)
         result = better.bet(orders)
-        if result:
-            print("馬券の自動購入が正常に完了しました")
+        if result.success:
+            print(f"馬券の自動購入が正常に完了しました（{result.total_seconds:.1f}秒）")
     except KeibaAutoBetError as exc:
         print(f"自動購入中にエラーが発生しました: {exc}")
 
@@ -1,7 +1,7 @@
 """keiba-auto-bet: JRA即パットを使用した馬券自動購入ライブラリ.
 
 このライブラリは、JRA即パットを使用した馬券の自動購入機能を提供します。
-現在は単勝・複勝に対応しています。
+単勝・複勝に加え、馬連・ワイド・馬単・3連複・3連単をフォーメーション・ボックス・ながしで購入できます。
 """
 
 try:
@@ -11,7 +11,10 @@ try:
 except (PackageNotFoundError, ImportError):
     __version__ = "unknown"
 
+from keiba_auto_bet.async_auto_bet import AsyncAutoBetter
 from keiba_auto_bet.auto_bet import AutoBetter
+from keiba_auto_bet.backend import BetBackend
+from keiba_auto_bet.browser_pool import BrowserPool, PooledBrowser
 from keiba_auto_bet.exceptions import (
     BetError,
     BrowserError,
@@ -20,13 +23,55 @@ from keiba_auto_bet.exceptions import (
     PurchaseError,
     ValidationError,
 )
-from keiba_auto_bet.models import AutoBetConfig, BetOrder, IpatCredentials, TicketType
+from keiba_auto_bet.models import (
+    AccountBetResult,
+    AutoBetConfig,
+    BetMethod,
+    BetOrder,
+    BetResult,
+    BettingAccount,
+    ClockOffset,
+    CommandProfile,
+    CommandRecord,
+    DeadlineReport,
+    EntryTiming,
+    HorseSelection,
+    IpatCredentials,
+    RaceSubmission,
+    ScheduleReport,
+    StreamFlush,
+    TicketType,
+)
+from keiba_auto_bet.multi_account import MultiAccountBetter
+from keiba_auto_bet.scheduler import BetScheduler, DeadlineScheduler
+from keiba_auto_bet.stream import OrderStream
 
 __all__ = [
+    "AccountBetResult",
+    "AsyncAutoBetter",
     "AutoBetter",
     "AutoBetConfig",
+    "BetBackend",
+    "BetMethod",
     "BetOrder",
+    "BetResult",
+    "BetScheduler",
+    "BrowserPool",
+    "BettingAccount",
+    "ClockOffset",
+    "CommandProfile",
+    "CommandRecord",
+    "DeadlineReport",
+    "DeadlineScheduler",
+    "EntryTiming",
+    "HorseSelection",
     "IpatCredentials",
+    "MultiAccountBetter",
+    "OrderStream",
+    "PooledBrowser",
+    "RaceSubmission",
+    "ScheduleReport",
+    "StreamFlush",
     "TicketType",
     "KeibaAutoBetError",
     "BetError",
@@ -0,0 +1,209 @@
+"""asyncio対応の自動購入モジュール.
+
+イベントループをブロックせずに馬券を自動購入するクライアントを提供する。
+"""
+
+import asyncio
+import functools
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import Any, TypeVar
+
+from keiba_auto_bet.auto_bet import AutoBetter
+from keiba_auto_bet.browser_pool import BrowserPool
+from keiba_auto_bet.models import AutoBetConfig, BetOrder, BetResult, IpatCredentials
+
+_T = TypeVar("_T")
+
+
+class AsyncAutoBetter:
+    """asyncio対応の馬券自動購入クライアント.
+
+    `AutoBetter`のブラウザ操作をインスタンス専用のワーカースレッドで実行し、
+    イベントループをブロックせずに待機できるようにする。
+    WebDriverの操作は常に同じスレッドで順番に実行されるため、
+    複数のインスタンスを1つのイベントループで同時に動かすことができる。
+    ワーカースレッドはセッションの終了時に停止し、次のブラウザ操作で起動し直す。
+
+    Attributes:
+        _better: ブラウザ操作を行う同期クライアント
+        _executor: ブラウザ操作を実行するワーカースレッド（停止中はNone）
+        _last_result: 直近に確定した購入結果（確定していない場合はNone）
+    """
+
+    def __init__(
+        self,
+        credentials: IpatCredentials | None = None,
+        config: AutoBetConfig | None = None,
+        logger: logging.Logger | None = None,
+        browser_pool: BrowserPool | None = None,
+    ) -> None:
+        """コンストラクタ.
+
+        Args:
+            credentials: 即パットの認証情報（Noneの場合は環境変数から読み込む）
+            config: 自動購入の設定（Noneの場合はデフォルト設定を使用）
+            logger: ロガーインスタンス。Noneの場合はモジュールロガーを使用
+            browser_pool: 起動済みのChromeを取り出すプール（Noneの場合は毎回Chromeを起動する）
+
+        Raises:
+            ValidationError: 環境変数から認証情報を読み込めない場合
+        """
+        self._better = AutoBetter(credentials, config, logger, browser_pool)
+        self._executor: ThreadPoolExecutor | None = None
+        self._last_result: BetResult | None = None
+
+    async def __aenter__(self) -> "AsyncAutoBetter":
+        """セッションを開始する.
+
+        Returns:
+            AsyncAutoBetter: 自身のインスタンス
+        """
+        await self.open()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """セッションを終了する."""
+        await self.close()
+
+    @property
+    def is_open(self) -> bool:
+        """セッションモードで動作中かどうか."""
+        return self._better.is_open
+
+    @property
+    def last_result(self) -> BetResult | None:
+        """直近に確定した購入結果.
+
+        購入確定の開始後にキャンセルされた場合も、確定の完了後にここで結果を参照できる。
+        確定していない場合はNone。
+        """
+        return self._last_result
+
+    async def open(self) -> None:
+        """ログイン済みのセッションを開始する.
+
+        Raises:
+            BrowserError: Chromeの起動に失敗した場合
+            LoginError: ログインに失敗した場合
+        """
+        await self._run(self._better.open)
+
+    async def close(self) -> None:
+        """セッションを終了してChromeを終了し、ワーカースレッドを停止する.
+
+        実行中・実行待ちのブラウザ操作（キャンセル後の購入確定や取り消しなど）は、
+        完了してからワーカースレッドを停止する。
+        """
+        try:
+            await asyncio.shield(self._run(self._better.close))
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    async def bet(self, orders: list[BetOrder]) -> BetResult:
+        """馬券を自動購入する.
+
+        馬券の入力（`prepare()`）と購入確定（`commit()`）を順に実行する。
+        入力中、または入力の完了後から購入確定の開始までにタスクがキャンセルされた場合は、
+        購入予定リストを取り消し、購入を確定せずに`asyncio.CancelledError`を送出する。
+        購入確定の開始後にキャンセルされても購入確定は中断されず、結果は`last_result`に記録する。
+        セッションが開始されていない場合は、購入後にセッションを終了する。
+
+        Args:
+            orders: 購入注文リスト
+
+        Returns:
+            BetResult: フェーズごとの所要時間を含む購入結果
+
+        Raises:
+            ValidationError: 入力内容のバリデーションエラー
+            KeibaAutoBetError: 購入処理中にエラーが発生した場合
+            asyncio.CancelledError: 購入確定の前にキャンセルされた場合
+        """
+        owns_session = not self._better.is_open
+        try:
+            await self.prepare(orders)
+            task = asyncio.current_task()
+            if task is not None and task.cancelling():
+                # 入力の完了後にキャンセルが要求されていた場合は購入を確定しない
+                await self.abort()
+                raise asyncio.CancelledError
+            return await self.commit()
+        finally:
+            if owns_session:
+                await self.close()
+
+    async def prepare(self, orders: list[BetOrder]) -> None:
+        """馬券を購入予定リストに入力する（購入は確定しない）.
+
+        入力中にタスクがキャンセルされた場合は、入力の完了を待って購入予定リストを取り消す。
+
+        Args:
+            orders: 購入注文リスト
+
+        Raises:
+            ValidationError: 入力内容のバリデーションエラー
+            BetError: 確定前の注文が購入予定リストに残っている場合
+            KeibaAutoBetError: 入力処理中にエラーが発生した場合
+            asyncio.CancelledError: 入力中にキャンセルされた場合
+        """
+        try:
+            await self._run(self._better.prepare, orders)
+        except asyncio.CancelledError:
+            # ワーカースレッドは入力を続けているため、完了後に実行される取り消しを予約する
+            await asyncio.shield(self._run(self._better.abort))
+            raise
+
+    async def commit(self) -> BetResult:
+        """`prepare()`で入力した購入予定リストの購入を確定する.
+
+        購入確定の開始後にキャンセルされても購入確定は中断されず、
+        完了後に結果を`last_result`に記録する。
+
+        Returns:
+            BetResult: `prepare()`と`commit()`のフェーズごとの所要時間を含む購入結果
+
+        Raises:
+            PurchaseError: 確定待ちの注文がない場合、または購入確定に失敗した場合
+            KeibaAutoBetError: 購入処理中にエラーが発生した場合
+        """
+        future = asyncio.ensure_future(self._run(self._better.commit))
+        future.add_done_callback(self._record_result)
+        return await asyncio.shield(future)
+
+    async def abort(self) -> None:
+        """`prepare()`で入力した購入予定リストを取り消す."""
+        await asyncio.shield(self._run(self._better.abort))
+
+    def _record_result(self, future: "asyncio.Future[BetResult]") -> None:
+        """完了した購入確定の結果を記録する.
+
+        Args:
+            future: 購入確定のFuture
+        """
+        if not future.cancelled() and future.exception() is None:
+            self._last_result = future.result()
+
+    async def _run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """ブラウザ操作をワーカースレッドで実行する.
+
+        Args:
+            func: 実行する関数
+            *args: 関数に渡す引数
+
+        Returns:
+            _T: 関数の戻り値
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="keiba-auto-bet")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
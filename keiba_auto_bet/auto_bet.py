@@ -6,16 +6,29 @@
 import logging
 import os
 import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
 
 from dotenv import load_dotenv
 from selenium import webdriver
-from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.ui import Select, WebDriverWait
 
+from keiba_auto_bet.backend import BetBackend
+from keiba_auto_bet.command_profiler import CommandProfiler
+from keiba_auto_bet.driver_cache import invalidate_driver_cache, resolve_chrome_driver
 from keiba_auto_bet.exceptions import (
     BetError,
     BrowserError,
@@ -24,24 +37,183 @@ from keiba_auto_bet.exceptions import (
     PurchaseError,
     ValidationError,
 )
-from keiba_auto_bet.models import AutoBetConfig, BetOrder, IpatCredentials, TicketType
+from keiba_auto_bet.models import (
+    AutoBetConfig,
+    BetOrder,
+    BetResult,
+    ChromeDriverPaths,
+    ClockOffset,
+    EntryTiming,
+    HorseSelection,
+    IpatCredentials,
+    TicketEntry,
+    TicketType,
+    validate_orders,
+)
+from keiba_auto_bet.planner import plan_orders
+from keiba_auto_bet.profile import ChromeProfile, acquire_profile
+from keiba_auto_bet.server_clock import ServerClockSampler
+from keiba_auto_bet.snapshot import (
+    RaceOptionIndex,
+    find_race_option,
+    read_purchase_limit,
+    take_snapshot,
+)
+
+if TYPE_CHECKING:
+    from keiba_auto_bet.browser_pool import BrowserPool
+
+_T = TypeVar("_T")
 
-_DEFAULT_TIMEOUT = 10  # タイムアウト秒数
 _MAX_STALE_RETRIES = 3  # StaleElementReferenceException発生時のリトライ回数
-_STALE_RETRY_INTERVAL = 1.0  # StaleElementReferenceException発生時のリトライ間隔（秒）
+_SCRIPT_TIMEOUT_MARGIN = 1.0  # 非同期スクリプトのタイムアウトに加える余裕（秒）
+_DOM_QUIET_PERIOD = 0.1  # DOMの変更がこの秒数途絶えたら安定したとみなす
+# ブラウザプールと一致している必要がある、Chromeの起動・トップページの表示に関する設定
+_POOL_LAUNCH_SETTINGS = (
+    "ipat_url",
+    "headless",
+    "lean_profile",
+    "blocked_url_patterns",
+    "profile_dir",
+    "profile_max_mb",
+)
+
+# 軽量プロファイルで追加する起動オプション（バックグラウンド通信・拡張機能などを無効化する）
+_LEAN_PROFILE_ARGUMENTS = (
+    "--disable-background-networking",
+    "--disable-extensions",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--blink-settings=imagesEnabled=false",
+)
+# 軽量プロファイルで画像・通知を読み込まないようにする設定（2=ブロック）
+_LEAN_PROFILE_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+}
+
+# AngularJSのダイジェスト完了（利用できる場合）を待ったうえで、MutationObserverで
+# DOMの変更が一定時間途絶えるまで待機する。安定までの経過ミリ秒、タイムアウト時はnullを返す
+_WAIT_FOR_DOM_QUIET_SCRIPT = """
+const quietMs = arguments[0];
+const timeoutMs = arguments[1];
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+let quietTimer = null;
+let finished = false;
+const finish = (settled) => {
+  if (finished) {
+    return;
+  }
+  finished = true;
+  observer.disconnect();
+  clearTimeout(quietTimer);
+  clearTimeout(deadlineTimer);
+  done(settled ? performance.now() - start : null);
+};
+const restartQuietTimer = () => {
+  clearTimeout(quietTimer);
+  quietTimer = setTimeout(() => finish(true), quietMs);
+};
+const observer = new MutationObserver(restartQuietTimer);
+const deadlineTimer = setTimeout(() => finish(false), timeoutMs);
+const observe = () => {
+  observer.observe(document.documentElement, {
+    childList: true, subtree: true, attributes: true, characterData: true,
+  });
+  restartQuietTimer();
+};
+const root = document.querySelector("[ng-app], [data-ng-app], .ng-scope");
+if (root && window.angular && window.angular.getTestability) {
+  try {
+    window.angular.getTestability(root).whenStable(observe);
+  } catch (e) {
+    observe();
+  }
+} else {
+  observe();
+}
+"""
+
+# 入力欄に値を設定してAngularJSが監視するinput・change・blurイベントを発火し、
+# 値が反映されたことを確認してから送信ボタンをクリックする。
+# [エラー内容, クリックした送信ボタン]を返す（成功時のエラー内容はnull、失敗時はクリックしない）
+_FILL_AND_SUBMIT_SCRIPT = """
+const fields = arguments[0];
+const submitXPath = arguments[1];
+const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set;
+for (const [name, value] of Object.entries(fields)) {
+  const input = document.getElementsByName(name)[0];
+  if (!input) {
+    return [`入力欄が見つかりません: ${name}`, null];
+  }
+  input.focus();
+  setValue.call(input, value);
+  for (const type of ["input", "change", "blur"]) {
+    input.dispatchEvent(new Event(type, {bubbles: true}));
+  }
+  if (input.value !== value) {
+    return [`入力欄に値を設定できません: ${name}`, null];
+  }
+}
+const submit = document.evaluate(
+  submitXPath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null,
+).singleNodeValue;
+if (!submit || submit.disabled || submit.classList.contains("disabled")) {
+  return ["送信ボタンをクリックできません", null];
+}
+submit.click();
+return [null, submit];
+"""
+_LOGIN_BUTTON_XPATH = "//a[@title='ログイン' and @tabindex='4']"
+_MENU_BUTTON_XPATH = "//a[@title='ネット投票メニューへ' and @tabindex='5']"
+
 
+@dataclass
+class _BetTrace:
+    """購入処理1回分の計測値.
 
-class AutoBetter:
+    Attributes:
+        phase_timings: フェーズ名ごとの所要時間（秒）
+        entry_timings: セット操作ごとの所要時間
+        race_count: 入力したレースの数
+    """
+
+    phase_timings: dict[str, float] = field(default_factory=dict)
+    entry_timings: list[EntryTiming] = field(default_factory=list)
+    race_count: int = 0
+
+
+class AutoBetter(BetBackend):
     """馬券自動購入クライアント.
 
     即パットを使用して馬券を自動購入するクライアント。
     Seleniumを使用してブラウザ操作を行う。
 
+    通常は`bet()`の呼び出しごとにChromeの起動・ログイン・終了を行う。
+    `open()`/`close()`またはwith文でセッションを開始すると、ログイン済みのChromeを
+    複数回の`bet()`で使い回し、セッション切れの場合は自動的に再ログインする。
+
     Attributes:
         _credentials: 即パットの認証情報
         _config: 自動購入の設定
         _logger: ロガーインスタンス
         _driver: WebDriverオブジェクト
+        _session_mode: セッションモードで動作中かどうか
+        _on_bet_page: 購入画面を表示中かどうか
+        _staged_orders: `prepare()`で購入予定リストに入力済みで確定前の注文
+        _selected_race: 購入画面で選択中のレース（競馬場名, レース番号）
+        _trace: 実行中の購入処理の計測値
+        _profile: 使用中のChromeプロファイル（profile_dir未指定の場合はNone）
+        _driver_paths: 解決済みのChromeDriverのパス（driver_cache_file未指定の場合はNone）
+        _browser_pool: 起動済みのChromeを取り出すプール
+        _command_profiler: WebDriverコマンドの記録（profile_commandsが無効の場合はNone）
+        _option_index: 起動中のChromeで記録した競馬場・レースの選択肢の索引
+        _clock_offset: 推定したサーバの時計のずれ（clock_samplesが0の場合はNone）
+        _purchase_limit: 起動中のChromeで取得した購入限度額から購入済みの金額を引いた額
+            （取得していない場合はNone）
     """
 
     def __init__(
@@ -49,6 +221,7 @@ class AutoBetter:
         credentials: IpatCredentials | None = None,
         config: AutoBetConfig | None = None,
         logger: logging.Logger | None = None,
+        browser_pool: "BrowserPool | None" = None,
     ) -> None:
         """コンストラクタ.
 
@@ -56,23 +229,133 @@ class AutoBetter:
             credentials: 即パットの認証情報（Noneの場合は環境変数から読み込む）
             config: 自動購入の設定（Noneの場合はデフォルト設定を使用）
             logger: ロガーインスタンス。Noneの場合はモジュールロガーを使用
+            browser_pool: 起動済みのChromeを取り出すプール（Noneの場合は毎回Chromeを起動する）
 
         Raises:
             ValidationError: 環境変数から認証情報を読み込めない場合
+            ValueError: ブラウザプールとChromeの起動に関する設定が異なる場合
         """
         if credentials is None:
-            credentials = _load_credentials_from_env()
+            credentials = load_credentials_from_env()
         if config is None:
             config = AutoBetConfig()
         if logger is None:
             logger = logging.getLogger(__name__)
+        if browser_pool is not None:
+            _check_pool_config(config, browser_pool.config)
 
         self._credentials = credentials
         self._config = config
         self._logger = logger
         self._driver: webdriver.Chrome | None = None
+        self._session_mode = False
+        self._on_bet_page = False
+        self._staged_orders: list[BetOrder] | None = None
+        self._selected_race: tuple[str, int] | None = None
+        self._trace = _BetTrace()
+        self._profile: ChromeProfile | None = None
+        self._driver_paths: ChromeDriverPaths | None = None
+        self._browser_pool = browser_pool
+        self._command_profiler = CommandProfiler() if config.profile_commands else None
+        self._option_index = RaceOptionIndex()
+        self._clock_offset: ClockOffset | None = None
+        self._purchase_limit: int | None = None
+
+    def __enter__(self) -> "AutoBetter":
+        """セッションを開始する.
+
+        Returns:
+            AutoBetter: 自身のインスタンス
+        """
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """セッションを終了する."""
+        self.close()
+
+    @property
+    def config(self) -> AutoBetConfig:
+        """自動購入の設定."""
+        return self._config
+
+    @property
+    def is_open(self) -> bool:
+        """セッションモードで動作中かどうか."""
+        return self._session_mode
+
+    @property
+    def purchase_limit(self) -> int | None:
+        """セッション中の購入限度額（円）.
+
+        セッションの開始時に画面から取得し、以降は購入のたびに購入金額を差し引く。
+        この額では足りない注文の場合は、入金を反映するため画面から取得し直す。
+        取得していない場合はNone。
+        """
+        return self._purchase_limit
+
+    @property
+    def clock_offset(self) -> ClockOffset | None:
+        """ホストの時計に対する即パットのサーバの時計のずれ.
+
+        `clock_samples`を指定した場合に、セッションの開始（Chromeの起動・ログイン）のたびに推定する。
+        推定していない場合はNone。
+        """
+        return self._clock_offset
+
+    def open(self) -> None:
+        """ログイン済みのセッションを開始する.
 
-    def bet(self, orders: list[BetOrder]) -> bool:
+        Chromeを起動して即パットにログインし、`close()`が呼ばれるまでブラウザを維持する。
+        セッション中の`bet()`は起動・ログインを省略して購入処理のみを行う。
+        既にセッションが開始されている場合は何もしない。
+
+        Raises:
+            BrowserError: Chromeの起動に失敗した場合
+            LoginError: ログインに失敗した場合
+        """
+        if self._session_mode:
+            return
+        self._start_session()
+        self._session_mode = True
+        self._logger.info("セッションを開始しました")
+
+    def close(self) -> None:
+        """セッションを終了してChromeを終了する.
+
+        セッションが開始されていない場合は何もしない。
+        """
+        if not self._session_mode:
+            return
+        self._session_mode = False
+        self._quit_driver()
+        self._logger.info("セッションを終了しました")
+
+    def warm_up(self) -> None:
+        """セッションを開始して購入画面まで移動しておく.
+
+        締切直前の購入に備え、Chromeの起動・ログイン・購入画面への移動を先に済ませる。
+        セッションが開始されていない場合は開始する。
+        以降の`bet()`は購入画面への移動を省略して馬券の入力から開始する。
+
+        Raises:
+            BrowserError: Chromeの起動に失敗した場合
+            LoginError: ログインに失敗した場合
+            BetError: 購入画面への移動に失敗した場合
+        """
+        if not self._session_mode:
+            self.open()
+        else:
+            self._ensure_session()
+        if not self._on_bet_page:
+            self._navigate_to_bet_page()
+
+    def bet(self, orders: list[BetOrder]) -> BetResult:
         """馬券を自動購入する.
 
         指定された購入注文リストに基づいて、即パットを使用して馬券を自動購入する。
@@ -82,67 +365,473 @@ class AutoBetter:
             orders: 購入注文リスト
 
         Returns:
-            bool: 購入が正常に完了した場合はTrue
+            BetResult: フェーズごとの所要時間を含む購入結果
 
         Raises:
-            ValidationError: 入力内容のバリデーションエラー
+            ValidationError: 入力内容のバリデーションエラー、または合計金額が購入限度額を超える場合
+            BetError: 確定前の注文が購入予定リストに残っている場合
             KeibaAutoBetError: 購入処理中にエラーが発生した場合
         """
-        _validate_orders(orders, self._config.max_bet)
+        validate_orders(orders, self._config.max_bet)
+        self._check_nothing_staged()
 
-        total_amount = sum(order.amount for order in orders)
+        total_amount = sum(order.total_amount for order in orders)
         self._logger.info("購入合計金額: %d円（%d件）", total_amount, len(orders))
 
-        self._open_chrome()
+        self._check_purchase_limit(total_amount)
+        self._reset_trace()
+        with self._guard_session():
+            if self._session_mode:
+                self._ensure_session()
+            else:
+                self._start_session()
+            refresh = not self._load_purchase_limit()
+            self._check_purchase_limit(total_amount, refresh)
+            self._place_orders(orders)
+            self._finish_purchase(total_amount)
+            return self._build_result(orders, total_amount)
+
+    def prepare(self, orders: list[BetOrder]) -> None:
+        """馬券を購入予定リストに入力する（購入は確定しない）.
 
-        try:
-            self._login()
-            self._dismiss_announce_page()
+        `bet()`のうち馬券の入力までを先に済ませておき、`commit()`で購入を確定する。
+        入力を取り消す場合は`abort()`を呼ぶ。
+        セッションが開始されていない場合は開始する。
+
+        Args:
+            orders: 購入注文リスト
+
+        Raises:
+            ValidationError: 入力内容のバリデーションエラー、または合計金額が購入限度額を超える場合
+            BetError: 確定前の注文が購入予定リストに残っている場合
+            KeibaAutoBetError: 入力処理中にエラーが発生した場合
+        """
+        validate_orders(orders, self._config.max_bet)
+        self._check_nothing_staged()
+
+        total_amount = sum(order.total_amount for order in orders)
+        self._logger.info("購入予定リストに入力します: %d円（%d件）", total_amount, len(orders))
+
+        self._check_purchase_limit(total_amount)
+        self._reset_trace()
+        if not self._session_mode:
+            self.open()
+        with self._guard_session():
+            self._ensure_session()
+            refresh = not self._load_purchase_limit()
+            self._check_purchase_limit(total_amount, refresh)
             self._place_orders(orders)
+        self._staged_orders = list(orders)
+        self._logger.info("購入予定リストへの入力が完了しました")
+
+    def commit(self) -> BetResult:
+        """`prepare()`で入力した購入予定リストの購入を確定する.
+
+        Returns:
+            BetResult: `prepare()`と`commit()`のフェーズごとの所要時間を含む購入結果
+
+        Raises:
+            PurchaseError: 確定待ちの注文がない場合、または購入確定に失敗した場合
+            KeibaAutoBetError: 購入処理中にエラーが発生した場合
+        """
+        if self._staged_orders is None or self._driver is None:
+            raise PurchaseError("確定待ちの注文がありません。先にprepare()を呼んでください")
+
+        orders = self._staged_orders
+        total_amount = sum(order.total_amount for order in orders)
+        self._staged_orders = None
+        with self._guard_session():
+            self._finish_purchase(total_amount)
+            return self._build_result(orders, total_amount)
+
+    def abort(self) -> None:
+        """`prepare()`で入力した購入予定リストを取り消す.
+
+        確定待ちの注文がない場合は何もしない。
+        購入予定リストを削除できなかった場合はブラウザごと破棄して取り消す。
+        """
+        if self._staged_orders is None:
+            return
+
+        self._staged_orders = None
+        try:
+            self._clear_vote_list()
+            self._navigate_to_top()
+            self._logger.info("購入予定リストを取り消しました")
+        except Exception as exc:
+            # 購入予定リストはブラウザ上にのみ保持されるため、ブラウザを破棄すれば購入されない
+            self._logger.warning(
+                "購入予定リストの削除に失敗したため、Chromeを終了して取り消します: %s", exc
+            )
+            self._quit_driver()
+
+    def _finish_purchase(self, total_amount: int) -> None:
+        """購入を確定してトップ画面に戻る.
+
+        Args:
+            total_amount: 合計購入金額（円）
+
+        Raises:
+            PurchaseError: 購入確定に失敗した場合
+            BrowserError: トップ画面への遷移に失敗した場合
+        """
+        with self._timed("confirm"):
             self._confirm_purchase(total_amount)
+        if self._purchase_limit is not None:
+            self._purchase_limit -= total_amount
+        with self._timed("return"):
             self._navigate_to_top()
-            self._logger.info("馬券の自動購入が完了しました")
-            return True
+        self._logger.info("馬券の自動購入が完了しました")
+
+    def _build_result(self, orders: list[BetOrder], total_amount: int) -> BetResult:
+        """計測したフェーズごとの所要時間から購入結果を作成する.
+
+        Args:
+            orders: 購入注文リスト
+            total_amount: 合計購入金額（円）
+
+        Returns:
+            BetResult: 購入結果
+        """
+        result = BetResult(
+            success=True,
+            phase_timings=dict(self._trace.phase_timings),
+            entry_timings=tuple(self._trace.entry_timings),
+            order_count=len(orders),
+            race_count=self._trace.race_count,
+            total_amount=total_amount,
+            command_profile=(
+                self._command_profiler.profile() if self._command_profiler is not None else None
+            ),
+        )
+        self._logger.debug(
+            "購入処理の所要時間: %.3f秒 %s",
+            result.total_seconds,
+            ", ".join(f"{phase}={seconds:.3f}" for phase, seconds in result.phase_timings.items()),
+        )
+        if result.command_profile is not None:
+            self._logger.debug(
+                "WebDriverコマンド: %d回 %s",
+                result.command_profile.total_count,
+                ", ".join(
+                    f"{phase}={count}"
+                    for phase, count in result.command_profile.count_by_phase().items()
+                ),
+            )
+        return result
+
+    def _reset_trace(self) -> None:
+        """購入処理1回分の計測値とWebDriverコマンドの記録を消去する."""
+        self._trace = _BetTrace()
+        if self._command_profiler is not None:
+            self._command_profiler.reset()
+
+    @contextmanager
+    def _timed(self, phase: str) -> Iterator[None]:
+        """ブロックの所要時間をフェーズの所要時間に加算する.
+
+        WebDriverコマンドを記録している場合は、ブロック内のコマンドをフェーズに計上する。
+
+        Args:
+            phase: フェーズ名
+
+        Yields:
+            None: 計測対象のブロック
+        """
+        profiling: AbstractContextManager[None] = (
+            self._command_profiler.phase(phase)
+            if self._command_profiler is not None
+            else nullcontext()
+        )
+        start = time.perf_counter()
+        try:
+            with profiling:
+                yield
+        finally:
+            timings = self._trace.phase_timings
+            timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
+
+    @contextmanager
+    def _guard_session(self) -> Iterator[None]:
+        """購入処理中の例外を変換し、ブラウザの後始末を行う.
+
+        セッションモードでない場合は処理後に必ずChromeを終了する。
+        セッションモードでも失敗時は画面状態が不明なためChromeを終了し、次回に再起動する。
+
+        Yields:
+            None: 購入処理を実行するブロック
+
+        Raises:
+            KeibaAutoBetError: 処理中に予期しない例外が発生した場合
+        """
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        except ValidationError:
+            # 画面を操作する前の確認で中止したため、画面はそのまま使用できる
+            succeeded = True
+            raise
         except KeibaAutoBetError:
             raise
         except Exception as exc:
             raise KeibaAutoBetError(f"予期しないエラーが発生しました: {exc}") from exc
         finally:
+            if not self._session_mode or not succeeded:
+                self._quit_driver()
+
+    def _load_purchase_limit(self) -> bool:
+        """購入限度額を取得していない場合は画面から取得する.
+
+        取得できなかった場合は購入限度額を確認せずに購入する（購入確定時に即パットが確認する）。
+
+        Returns:
+            bool: 画面から取得した場合はTrue（取得済みの場合やChromeがない場合はFalse）
+        """
+        if self._purchase_limit is not None or self._driver is None:
+            return False
+        try:
+            self._purchase_limit = read_purchase_limit(self._driver)
+        except BetError as exc:
+            self._logger.warning("%s", exc)
+            return False
+        if self._purchase_limit is None:
+            self._logger.debug("購入限度額が表示されていないため確認を省略します")
+        else:
+            self._logger.info("購入限度額: %d円", self._purchase_limit)
+        return True
+
+    def _reload_purchase_limit(self) -> None:
+        """取得済みの購入限度額を画面から取得し直す.
+
+        取得できなかった場合や表示されていない場合は、取得済みの購入限度額をそのまま使用する。
+        """
+        if self._driver is None:
+            return
+        try:
+            limit = read_purchase_limit(self._driver)
+        except BetError as exc:
+            self._logger.warning("%s", exc)
+            return
+        if limit is not None:
+            self._logger.info("購入限度額を取得し直しました: %d円", limit)
+            self._purchase_limit = limit
+
+    def _check_purchase_limit(self, total_amount: int, refresh: bool = True) -> None:
+        """合計金額が取得済みの購入限度額以下であることを確認する.
+
+        購入限度額は購入のたびに差し引くだけのため、セッション中に入金すると実際より小さくなる。
+        取得済みの額では足りない場合は、画面から1回だけ取得し直してから確認する。
+
+        Args:
+            total_amount: 合計購入金額（円）
+            refresh: 足りない場合に画面から取得し直すかどうか（取得した直後はFalse）
+
+        Raises:
+            ValidationError: 合計金額が購入限度額を超える場合
+        """
+        if self._purchase_limit is None or total_amount <= self._purchase_limit:
+            return
+        if refresh:
+            self._reload_purchase_limit()
+        if total_amount > self._purchase_limit:
+            raise ValidationError(
+                f"合計金額{total_amount}円が購入限度額{self._purchase_limit}円を超えています"
+            )
+
+    def _check_nothing_staged(self) -> None:
+        """確定前の注文が購入予定リストに残っていないことを確認する.
+
+        Raises:
+            BetError: 確定前の注文が残っている場合
+        """
+        if self._staged_orders is not None:
+            raise BetError(
+                "購入予定リストに確定前の注文が残っています。commit()またはabort()を呼んでください"
+            )
+
+    def _start_session(self) -> None:
+        """Chromeを起動してログインし、購入可能な状態にする.
+
+        Raises:
+            BrowserError: Chromeの起動またはお知らせページの処理に失敗した場合
+            LoginError: ログインに失敗した場合
+        """
+        sampler = None
+        if self._config.clock_samples > 0:
+            # サーバ時刻の計測はChromeの起動・ログインの待ち時間に並行して行う
+            sampler = ServerClockSampler(
+                self._config.ipat_url, self._config.clock_samples, self._config.login_timeout
+            )
+            sampler.start()
+        pooled = None
+        if self._browser_pool is not None:
+            with self._timed("launch"):
+                pooled = self._browser_pool.acquire(self._config.launch_timeout)
+            if pooled is None:
+                self._logger.warning("プールに使用できるChromeがないため、Chromeを起動します")
+        if pooled is not None:
+            self._driver, self._profile = pooled.driver, pooled.profile
+        else:
+            self._launch_new_chrome()
+        if self._command_profiler is not None and self._driver is not None:
+            self._command_profiler.attach(self._driver)
+        try:
+            if pooled is None:
+                with self._timed("page_load"):
+                    self._load_ipat_page()
+            else:
+                # プールのChromeはプールの設定で起動しているため、この設定のタイムアウトを適用し直す
+                assert self._driver is not None
+                self._driver.set_script_timeout(_script_timeout(self._config))
+            with self._timed("login"):
+                self._login()
+            with self._timed("announce"):
+                self._dismiss_announce_page()
+        except Exception:
+            self._quit_driver()
+            raise
+        finally:
+            if sampler is not None:
+                self._update_clock_offset(sampler.stop())
+
+    def _update_clock_offset(self, offset: ClockOffset | None) -> None:
+        """推定したサーバの時計のずれを記録する.
+
+        計測できなかった場合は前回の推定値を維持する。
+
+        Args:
+            offset: 推定したずれ（計測結果がない場合はNone）
+        """
+        if offset is None:
+            self._logger.warning("サーバ時刻を計測できませんでした")
+            return
+        self._clock_offset = offset
+        self._logger.info(
+            "サーバの時計のずれを推定しました: %+.3f秒（±%.3f秒、%d回の計測）",
+            offset.offset_seconds,
+            offset.error_seconds,
+            offset.sample_count,
+        )
+
+    def _launch_new_chrome(self) -> None:
+        """ChromeDriverのパスを解決し、新しいChromeを起動する.
+
+        Raises:
+            BrowserError: ChromeDriverのパスの解決またはChromeの起動に失敗した場合
+        """
+        if (
+            self._driver_paths is None
+            and self._config.driver_cache_file
+            and not self._config.chrome_driver_path
+        ):
+            with self._timed("driver_resolve"):
+                self._driver_paths = resolve_chrome_driver(self._config.driver_cache_file)
+            self._logger.debug(
+                "ChromeDriverのパスを解決しました（キャッシュ: %s）: %s",
+                self._driver_paths.from_cache,
+                self._driver_paths.driver_path,
+            )
+        with self._timed("launch"):
+            self._open_chrome()
+
+    def _ensure_session(self) -> None:
+        """セッションが有効であることを確認し、必要に応じて復旧する.
+
+        ブラウザが終了している場合はChromeを再起動し、
+        セッション切れでログイン画面に戻っている場合は再ログインする。
+
+        Raises:
+            BrowserError: Chromeの起動またはお知らせページの処理に失敗した場合
+            LoginError: ログインに失敗した場合
+        """
+        if self._driver is None:
+            self._logger.info("ブラウザが起動していません。Chromeを起動してログインします")
+            self._start_session()
+            return
+
+        try:
+            logged_out = bool(self._driver.find_elements(By.NAME, "inetid"))
+        except WebDriverException:
+            self._logger.warning("ブラウザとの接続が切れました。Chromeを再起動します")
+            self._quit_driver()
+            self._start_session()
+            return
+
+        if logged_out:
+            self._logger.info("セッションが切れています。再ログインします")
+            self._on_bet_page = False
+            with self._timed("login"):
+                self._login()
+            with self._timed("announce"):
+                self._dismiss_announce_page()
+
+    def _quit_driver(self) -> None:
+        """Chromeを終了する.
+
+        終了処理中の例外は無視する。
+        """
+        self._on_bet_page = False
+        self._staged_orders = None
+        if self._driver is not None:
             try:
-                if self._driver is not None:
-                    self._driver.quit()
+                self._driver.quit()
             except Exception:
                 pass
+            finally:
+                self._driver = None
+        self._option_index = RaceOptionIndex()
+        self._purchase_limit = None
+        self._release_profile()
+
+    def _release_profile(self) -> None:
+        """Chromeプロファイルのロックを解放する."""
+        if self._profile is not None:
+            self._profile.release()
+            self._profile = None
 
     def _open_chrome(self) -> None:
-        """Chromeブラウザを起動して即パットページを開く.
+        """Chromeブラウザを起動する.
 
         Raises:
             BrowserError: Chromeの起動に失敗した場合
         """
         try:
-            chrome_options = Options()
-            if self._config.headless:
-                chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-
-            if self._config.chrome_driver_path:
-                service = Service(self._config.chrome_driver_path)
-            else:
-                service = Service()
+            self._driver, self._profile = launch_chrome(self._config, self._driver_paths)
+        except BrowserError:
+            self._discard_cached_driver_paths()
+            raise
+
+    def _discard_cached_driver_paths(self) -> None:
+        """キャッシュから読み込んだChromeDriverのパスを破棄する.
+
+        ChromeとChromeDriverのバージョンが合わなくなった場合に備え、
+        次回の起動ではSelenium Managerで解決し直す。
+        """
+        if self._driver_paths is None or not self._driver_paths.from_cache:
+            return
+        assert self._config.driver_cache_file is not None
+        invalidate_driver_cache(self._config.driver_cache_file)
+        self._driver_paths = None
+
+    def _load_ipat_page(self) -> None:
+        """即パットページを開き、読み込みの完了を待機する.
 
-            self._driver = webdriver.Chrome(service=service, options=chrome_options)
+        軽量プロファイルではページ読み込み方式がeagerのため、DOMの構築完了までを待機する。
+
+        Raises:
+            BrowserError: ページの読み込みに失敗した場合
+        """
+        assert self._driver is not None
+        ready_states = page_ready_states(self._config)
+        try:
             self._driver.get(self._config.ipat_url)
-            WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
+            self._wait_until(
+                lambda d: d.execute_script("return document.readyState") in ready_states,
+                self._config.launch_timeout,
             )
         except Exception as exc:
-            if self._driver is not None:
-                self._driver.quit()
-                self._driver = None
-            raise BrowserError(f"Chromeの起動に失敗しました: {exc}") from exc
+            raise BrowserError(f"即パットページの読み込みに失敗しました: {exc}") from exc
 
     def _login(self) -> None:
         """即パットにログインする.
@@ -152,38 +841,82 @@ class AutoBetter:
         """
         assert self._driver is not None
         try:
-            # INET IDの入力
-            inetid_input = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.presence_of_element_located((By.NAME, "inetid"))
-            )
-            inetid_input.send_keys(self._credentials.inet_id)
-
-            # ログインボタンをクリック
-            login_link = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable((By.XPATH, "//a[@title='ログイン' and @tabindex='4']"))
+            # INET IDの入力とログインボタンのクリック
+            self._wait_until(
+                ec.presence_of_element_located((By.NAME, "inetid")), self._config.login_timeout
             )
-            login_link.click()
+            fields = {"inetid": self._credentials.inet_id}
+            if self._fill_and_submit(fields, _LOGIN_BUTTON_XPATH) is None:
+                self._type_and_submit(fields, _LOGIN_BUTTON_XPATH)
 
-            # 加入者番号・パスワード・P-ARSの入力
-            user_number_input = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.presence_of_element_located((By.NAME, "i"))
+            # 加入者番号・パスワード・P-ARSの入力とネット投票メニューへボタンのクリック
+            self._wait_until(
+                ec.presence_of_element_located((By.NAME, "i")), self._config.login_timeout
             )
-            user_number_input.send_keys(self._credentials.user_number)
-            password_input = self._driver.find_element(By.NAME, "p")
-            password_input.send_keys(self._credentials.password)
-            p_ars_input = self._driver.find_element(By.NAME, "r")
-            p_ars_input.send_keys(self._credentials.p_ars)
-
-            # ネット投票メニューへボタンをクリック
-            element = "//a[@title='ネット投票メニューへ' and @tabindex='5']"
-            menu_link = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable((By.XPATH, element))
-            )
-            menu_link.click()
-            WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(ec.staleness_of(menu_link))
+            fields = {
+                "i": self._credentials.user_number,
+                "p": self._credentials.password,
+                "r": self._credentials.p_ars,
+            }
+            menu_link = self._fill_and_submit(fields, _MENU_BUTTON_XPATH)
+            if menu_link is None:
+                menu_link = self._type_and_submit(fields, _MENU_BUTTON_XPATH)
+            self._wait_until(ec.staleness_of(menu_link), self._config.login_timeout)
         except Exception as exc:
             raise LoginError(f"ログインに失敗しました: {exc}") from exc
 
+    def _fill_and_submit(self, fields: dict[str, str], submit_xpath: str) -> WebElement | None:
+        """1回のスクリプト実行でフォームに入力して送信する.
+
+        入力欄・送信ボタンが見つからない場合や値が反映されない場合、
+        スクリプトの実行に失敗した場合は送信しない。
+
+        Args:
+            fields: 入力欄のname属性と入力値の対応
+            submit_xpath: 送信ボタンのXPath
+
+        Returns:
+            WebElement | None: クリックした送信ボタン。送信しなかった場合はNone
+        """
+        if not self._config.script_login:
+            return None
+        assert self._driver is not None
+        try:
+            result = self._driver.execute_script(_FILL_AND_SUBMIT_SCRIPT, fields, submit_xpath)
+        except WebDriverException as exc:
+            result = exc.msg or type(exc).__name__
+        if isinstance(result, list) and len(result) == 2 and result[0] is None:
+            submit = result[1]
+            if isinstance(submit, WebElement):
+                return submit
+        error = result[0] if isinstance(result, list) and result else result
+        self._logger.info(
+            "スクリプトでのログイン入力に失敗したため、キー入力で入力します: %s", error
+        )
+        return None
+
+    def _type_and_submit(self, fields: dict[str, str], submit_xpath: str) -> WebElement:
+        """キー入力でフォームに入力して送信する.
+
+        Args:
+            fields: 入力欄のname属性と入力値の対応
+            submit_xpath: 送信ボタンのXPath
+
+        Returns:
+            WebElement: クリックした送信ボタン
+        """
+        assert self._driver is not None
+        for name, value in fields.items():
+            field_input = self._driver.find_element(By.NAME, name)
+            # スクリプトでの入力が途中まで反映されている場合に備えて消去する
+            field_input.clear()
+            field_input.send_keys(value)
+        submit = self._wait_until(
+            ec.element_to_be_clickable((By.XPATH, submit_xpath)), self._config.login_timeout
+        )
+        submit.click()
+        return submit
+
     def _dismiss_announce_page(self) -> None:
         """お知らせページが表示されていた場合にOKボタンをクリックして閉じる.
 
@@ -203,14 +936,15 @@ class AutoBetter:
 
         self._logger.info("お知らせページが検出されました。OKボタンをクリックして閉じます")
         try:
-            ok_button = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable((By.CSS_SELECTOR, "button.btn-ok"))
+            ok_button = self._wait_until(
+                ec.element_to_be_clickable((By.CSS_SELECTOR, "button.btn-ok")),
+                self._config.login_timeout,
             )
             ok_button.click()
             self._logger.info("お知らせページのOKボタンをクリックしました")
 
             # お知らせページからの遷移を待機
-            WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(ec.staleness_of(ok_button))
+            self._wait_until(ec.staleness_of(ok_button), self._config.login_timeout)
             self._logger.info("お知らせページからの遷移が完了しました")
         except Exception as exc:
             raise BrowserError(f"お知らせページの処理に失敗しました: {exc}") from exc
@@ -222,29 +956,33 @@ class AutoBetter:
             BetError: 購入画面への移動に失敗した場合
         """
         assert self._driver is not None
+        self._selected_race = None
         try:
             # 通常投票ボタンをクリック
             element = "//button[@title='出馬表から馬を選択する方式です。']"
-            bet_button = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable((By.XPATH, element))
+            bet_button = self._wait_until(
+                ec.element_to_be_clickable((By.XPATH, element)), self._config.navigation_timeout
             )
             bet_button.click()
             self._logger.info("通常投票ボタンをクリックしました")
 
             # 通常投票ボタンクリック後のページ遷移を待機
-            WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(ec.staleness_of(bet_button))
+            self._wait_until(ec.staleness_of(bet_button), self._config.navigation_timeout)
             self._logger.info("通常投票画面に遷移しました")
 
             # レース選択ボタン（12Rを選択して購入画面に遷移）
-            race_select_button = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable((By.XPATH, "//button[contains(., '12R')]"))
+            race_select_button = self._wait_until(
+                ec.element_to_be_clickable((By.XPATH, "//button[contains(., '12R')]")),
+                self._config.navigation_timeout,
             )
             race_select_button.click()
 
             # 購入画面への遷移を待機（馬券タイプ選択が表示されるまで待つ）
-            WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable((By.ID, "bet-basic-type"))
+            self._wait_until(
+                ec.element_to_be_clickable((By.ID, "bet-basic-type")),
+                self._config.navigation_timeout,
             )
+            self._on_bet_page = True
             self._logger.info("購入画面に遷移しました")
         except BetError:
             raise
@@ -254,6 +992,9 @@ class AutoBetter:
     def _select_race(self, venue: str, race_number: int) -> None:
         """競馬場とレースを選択する.
 
+        選択肢と選択中の値は画面のスナップショットから判断し、既に選択されている
+        競馬場・レースは選択し直さない。選択肢はセッション中の索引から引く。
+
         Args:
             venue: 競馬場名
             race_number: レース番号
@@ -263,42 +1004,56 @@ class AutoBetter:
         """
         assert self._driver is not None
         try:
-            # 競馬場を選択
+            # 競馬場を選択（選択肢と選択中の値は1回のスナップショットで取得する）
             element_id = "select-course-race-course"
-            keibajo_select = Select(
-                WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                    ec.element_to_be_clickable((By.ID, element_id))
-                )
-            )
-            venue_found = False
-            for option in keibajo_select.options:
-                if venue in option.text:
-                    keibajo_select.select_by_visible_text(option.text)
-                    venue_found = True
-                    break
-            if not venue_found:
-                raise BetError(f"競馬場が見つかりませんでした: {venue}")
-
-            # レースを選択（競馬場選択後のプルダウン更新を待機）
-            element_id = "select-course-race-race"
-            race_option_xpath = (
-                f"//select[@id='{element_id}']//option[contains(., '{race_number}R')]"
-            )
-            WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.presence_of_element_located((By.XPATH, race_option_xpath))
+            course_element = self._wait_until(
+                ec.element_to_be_clickable((By.ID, element_id)),
+                self._config.race_select_timeout,
             )
-            race_select = Select(self._driver.find_element(By.ID, element_id))
-            race_found = False
-            for option in race_select.options:
-                if f"{race_number}R" in option.text:
-                    race_select.select_by_visible_text(option.text)
-                    race_found = True
-                    break
-            if not race_found:
+            snapshot = take_snapshot(self._driver)
+            self._option_index.refresh(snapshot)
+            venue_option = self._option_index.venue_option(venue)
+            venue_changed = venue_option != snapshot.selected_venue
+            if venue_changed:
+                Select(course_element).select_by_visible_text(venue_option)
+
+                # 競馬場選択後のプルダウン更新を待機し、更新後のレースの選択肢を取得する
+                known_option = self._option_index.race_option(venue, race_number)
+                option_condition = (
+                    f"normalize-space(.)='{known_option}'"
+                    if known_option is not None
+                    else f"contains(., '{race_number}R')"
+                )
+                self._wait_until(
+                    ec.presence_of_element_located(
+                        (
+                            By.XPATH,
+                            f"//select[@id='select-course-race-race']//option[{option_condition}]",
+                        )
+                    ),
+                    self._config.race_select_timeout,
+                )
+                snapshot = take_snapshot(self._driver)
+                self._option_index.refresh(snapshot)
+
+            # レースを選択（索引にない場合は競馬場のレースの選択肢を記録できていないため画面から探す）
+            race_option = self._option_index.race_option(venue, race_number)
+            if race_option is None:
+                race_option = find_race_option(snapshot, race_number)
+            if race_option is None:
                 raise BetError(f"レースが見つかりませんでした: {race_number}R")
+            race_changed = race_option != snapshot.selected_race
+            if race_changed:
+                race_select = Select(self._driver.find_element(By.ID, "select-course-race-race"))
+                race_select.select_by_visible_text(race_option)
 
             # レース選択後、AngularJSのDOM再レンダリング完了を待機
-            self._wait_for_element_stable(By.ID, "bet-basic-type")
+            if venue_changed or race_changed:
+                self._wait_for_element_stable(
+                    By.ID, "bet-basic-type", self._config.race_select_timeout
+                )
+            else:
+                self._logger.debug("%s%dRは選択済みのため選択を省略しました", venue, race_number)
         except BetError:
             raise
         except Exception as exc:
@@ -307,73 +1062,227 @@ class AutoBetter:
     def _bet_win_or_place(
         self,
         ticket_type: TicketType,
-        horse_number: int,
+        horse_numbers: tuple[int, ...],
         amount: int,
     ) -> None:
         """単勝または複勝の馬券を選択して金額を入力する.
 
+        複数の馬番にチェックを入れ、1回のセット操作でまとめて入力する。
+        選択中の馬券タイプとチェック済みの馬番は画面のスナップショットから判断する。
+
         Args:
             ticket_type: 馬券の種類（単勝または複勝）
-            horse_number: 馬番
-            amount: 購入金額（円）
+            horse_numbers: 馬番
+            amount: 1頭あたりの購入金額（円）
 
         Raises:
             BetError: 馬券選択または金額入力に失敗した場合
         """
         assert self._driver is not None
         try:
-            # 馬券タイプのプルダウンから選択（DOM再レンダリングによるstale対策でリトライ）
-            self._select_bet_type_with_retry(ticket_type)
+            # 馬券タイプと馬番のチェック状態は1回のスナップショットで取得する
+            snapshot = take_snapshot(self._driver)
+            if snapshot.selected_ticket_type != ticket_type.value:
+                # 馬券タイプのプルダウンから選択（DOM再レンダリングによるstale対策でリトライ）
+                self._select_bet_type_with_retry(ticket_type)
+                if snapshot.selected_method is not None:
+                    # 組み合わせの馬券からの切り替えでは馬番の入力欄が作り直されるため待機する
+                    self._wait_for_element_stable(
+                        By.ID, "bet-basic-type", self._config.ticket_entry_timeout
+                    )
+                    snapshot = take_snapshot(self._driver)
+                elif snapshot.checked_horses:
+                    # 馬券タイプの変更でチェックが外れる場合があるため取得し直す
+                    snapshot = take_snapshot(self._driver)
+
+            # 入力する馬番のうち未チェックの馬番と、入力しない馬番に残ったチェックを切り替える
+            checked = set(snapshot.checked_horses)
+            toggles = [number for number in horse_numbers if number not in checked]
+            toggles += sorted(checked.difference(horse_numbers))
+            for horse_number in toggles:
+                self._click_check(f"no{horse_number}")
+
+            self._enter_amount_and_set(amount)
+        except Exception as exc:
+            horses = ",".join(str(horse_number) for horse_number in horse_numbers)
+            raise BetError(
+                f"馬券選択に失敗しました（{ticket_type.value} {horses}番 {amount}円）: {exc}"
+            ) from exc
 
-            # 馬番のチェックボックスにチェックを入れる
-            label_element = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.presence_of_element_located((By.XPATH, f"//label[@for='no{horse_number}']"))
-            )
-            checkbox = label_element.find_element(By.CLASS_NAME, "check")
-            self._driver.execute_script("arguments[0].click();", checkbox)
+    def _bet_combination(
+        self,
+        ticket_type: TicketType,
+        selection: HorseSelection,
+        amount: int,
+    ) -> None:
+        """組み合わせの馬券を即パットの入力方式で選択して金額を入力する.
 
-            # 金額入力
-            amount_input = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable(
-                    (By.XPATH, "//input[@maxlength='4' and @ng-model='vm.nUnit']")
-                )
-            )
-            amount_input.clear()
-            amount_input.send_keys(str(amount // 100))
+        フォーメーション・ボックス・ながしの入力方式を選び、列ごとの馬番にチェックを入れて
+        1回のセット操作で全ての組み合わせを入力する。
+        列ごとの馬番のチェックボックスは`no{列番号}-{馬番}`、マルチは`multi`のラベルで指定し、
+        スナップショットのチェック状態と異なるものだけをクリックする。
 
-            # セットボタンをクリック
-            element = "button.btn.btn-lg.btn-set.btn-primary[ng-click='vm.onSet()']"
-            set_button = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable((By.CSS_SELECTOR, element))
-            )
-            set_button.click()
-            WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable((By.ID, "bet-basic-type"))
-            )
+        Args:
+            ticket_type: 馬券の種類（馬連・ワイド・馬単・3連複・3連単）
+            selection: 馬番の選び方
+            amount: 1点あたりの購入金額（円）
+
+        Raises:
+            BetError: 馬券選択または金額入力に失敗した場合
+        """
+        assert self._driver is not None
+        try:
+            snapshot = take_snapshot(self._driver)
+            if snapshot.selected_ticket_type != ticket_type.value:
+                # 馬券の種類によって入力方式・列の数が変わり、入力欄が作り直されるため待機する
+                self._select_bet_type_with_retry(ticket_type)
+                self._wait_for_element_stable(
+                    By.ID, "bet-basic-type", self._config.ticket_entry_timeout
+                )
+                snapshot = take_snapshot(self._driver)
+            if snapshot.selected_method != selection.method.value:
+                method_select = Select(
+                    self._wait_until(
+                        ec.element_to_be_clickable((By.ID, "bet-basic-method")),
+                        self._config.ticket_entry_timeout,
+                    )
+                )
+                method_select.select_by_visible_text(selection.method.value)
+                self._wait_for_element_stable(
+                    By.ID, "bet-basic-type", self._config.ticket_entry_timeout
+                )
+                snapshot = take_snapshot(self._driver)
+
+            # 前回の入力のチェックが残っている場合に反転させないよう、状態が異なるものだけクリックする
+            wanted = [
+                (column, horse_number)
+                for column, horse_numbers in enumerate(selection.legs, start=1)
+                for horse_number in horse_numbers
+            ]
+            checked = set(snapshot.checked_legs)
+            toggles = [leg for leg in wanted if leg not in checked]
+            toggles += sorted(checked.difference(wanted))
+            for column, horse_number in toggles:
+                self._click_check(f"no{column}-{horse_number}")
+            if bool(snapshot.multi) != selection.multi:
+                self._click_check("multi")
+
+            self._enter_amount_and_set(amount)
         except Exception as exc:
             raise BetError(
-                f"馬券選択に失敗しました"
-                f"（{ticket_type.value} {horse_number}番 {amount}円）: {exc}"
+                f"馬券選択に失敗しました（{ticket_type.value} {selection.describe()} "
+                f"{amount}円）: {exc}"
             ) from exc
 
+    def _click_check(self, label_for: str) -> None:
+        """チェックボックスのラベル内のチェックをクリックする.
+
+        Args:
+            label_for: ラベルのfor属性の値
+        """
+        assert self._driver is not None
+        label_element = self._wait_until(
+            ec.presence_of_element_located((By.XPATH, f"//label[@for='{label_for}']")),
+            self._config.ticket_entry_timeout,
+        )
+        checkbox = label_element.find_element(By.CLASS_NAME, "check")
+        self._driver.execute_script("arguments[0].click();", checkbox)
+
+    def _enter_amount_and_set(self, amount: int) -> None:
+        """金額を入力してセットボタンを押し、購入予定リストへの追加を待機する.
+
+        セット後の入力欄は非同期に再レンダリングされるため、DOMが安定するまで待機する。
+        同じレースの次の入力ではレース選択（とその後の待機）を省略するため、
+        ここで待機しないと再レンダリング中の入力欄を操作してしまう。
+
+        Args:
+            amount: 1頭（1点）あたりの購入金額（円）
+        """
+        # 金額入力
+        amount_input = self._wait_until(
+            ec.element_to_be_clickable(
+                (By.XPATH, "//input[@maxlength='4' and @ng-model='vm.nUnit']")
+            ),
+            self._config.ticket_entry_timeout,
+        )
+        amount_input.clear()
+        amount_input.send_keys(str(amount // 100))
+
+        # セットボタンをクリック
+        element = "button.btn.btn-lg.btn-set.btn-primary[ng-click='vm.onSet()']"
+        set_button = self._wait_until(
+            ec.element_to_be_clickable((By.CSS_SELECTOR, element)),
+            self._config.ticket_entry_timeout,
+        )
+        set_button.click()
+        self._wait_for_element_stable(By.ID, "bet-basic-type", self._config.ticket_entry_timeout)
+
     def _place_orders(self, orders: list[BetOrder]) -> None:
         """全ての購入注文を処理する.
 
+        同一馬券の注文を合算し、レースごとにまとめてから入力する。
+        同じ馬券の種類・金額の馬番は1回のセット操作でまとめて入力し、
+        直前に選択したレースと同じレースの注文ではレース選択を省略する。
+        入力を始める前に、全ての注文の競馬場・レースが選択できることを確認する。
+
         Args:
             orders: 購入注文リスト
 
         Raises:
-            BetError: 馬券の選択・入力に失敗した場合
+            BetError: 競馬場・レースが選択肢にない場合、または馬券の選択・入力に失敗した場合
         """
-        self._navigate_to_bet_page()
+        plan = plan_orders(orders)
+        self._logger.debug(
+            "入力計画: %d件→%d回のセット操作（%dレース、画面操作%d回省略）",
+            plan.original_count,
+            len(plan.entries),
+            plan.race_count,
+            plan.saved_operations,
+        )
+
+        self._trace.race_count = plan.race_count
+
+        if not self._on_bet_page:
+            with self._timed("navigation"):
+                self._navigate_to_bet_page()
+        with self._timed("race_select"):
+            self._check_races_available(plan.entries)
+
+        for entry in plan.entries:
+            entry_start = time.perf_counter()
+            race = (entry.venue, entry.race_number)
+            if race != self._selected_race:
+                with self._timed("race_select"):
+                    self._select_race(entry.venue, entry.race_number)
+                self._selected_race = race
+
+            with self._timed("ticket_entry"):
+                if entry.selection is None:
+                    self._bet_win_or_place(entry.ticket_type, entry.horse_numbers, entry.amount)
+                else:
+                    self._bet_combination(entry.ticket_type, entry.selection, entry.amount)
+            self._trace.entry_timings.append(
+                EntryTiming(entry=entry, seconds=time.perf_counter() - entry_start)
+            )
 
-        for order in orders:
-            self._select_race(order.venue, order.race_number)
+    def _check_races_available(self, entries: tuple[TicketEntry, ...]) -> None:
+        """注文の競馬場・レースが購入画面の選択肢にあることを確認する.
 
-            if order.ticket_type in (TicketType.WIN, TicketType.SHOW):
-                self._bet_win_or_place(order.ticket_type, order.horse_number, order.amount)
-            else:
-                raise BetError(f"未対応の馬券種類です: {order.ticket_type}")
+        競馬場は選択肢の一覧で確認する。レースは、セッション中に選択肢を記録済みの
+        競馬場のみ確認する（未記録の競馬場のレースは選択時に確認する）。
+
+        Args:
+            entries: 入力する馬券
+
+        Raises:
+            BetError: 競馬場が選択肢にない場合、または発売終了・未開催のレースの場合
+        """
+        assert self._driver is not None
+        self._option_index.refresh(take_snapshot(self._driver))
+        for venue, race_number in dict.fromkeys(
+            (entry.venue, entry.race_number) for entry in entries
+        ):
+            self._option_index.race_option(venue, race_number)
 
     def _confirm_purchase(self, total_amount: int) -> None:
         """購入を確定する.
@@ -388,39 +1297,76 @@ class AutoBetter:
         try:
             # 購入予定リストボタンを押す
             element = "//button[contains(@class, 'btn btn-vote-list')]"
-            purchase_list_button = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable((By.XPATH, element))
+            purchase_list_button = self._wait_until(
+                ec.element_to_be_clickable((By.XPATH, element)), self._config.confirm_timeout
             )
             purchase_list_button.click()
 
             # 合計金額を入力する
             element = "//input[@ng-model='vm.cAmountTotal']"
-            sum_buy = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable((By.XPATH, element))
+            sum_buy = self._wait_until(
+                ec.element_to_be_clickable((By.XPATH, element)), self._config.confirm_timeout
             )
             sum_buy.clear()
             sum_buy.send_keys(str(total_amount))
 
             # 購入ボタンを押す
-            purchase_button = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable((By.XPATH, "//button[contains(text(), '購入')]"))
+            purchase_button = self._wait_until(
+                ec.element_to_be_clickable((By.XPATH, "//button[contains(text(), '購入')]")),
+                self._config.confirm_timeout,
             )
             purchase_button.click()
 
             # 確認ダイアログのOKボタンを押す（ダイアログ本文が重なる場合があるためJS経由でクリック）
             element = "//button[contains(@class, 'btn-ok') and contains(text(), 'OK')]"
-            ok_button = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable((By.XPATH, element))
+            ok_button = self._wait_until(
+                ec.element_to_be_clickable((By.XPATH, element)), self._config.confirm_timeout
             )
             self._driver.execute_script("arguments[0].click();", ok_button)
 
             # ダイアログが閉じるのを待機（SPAのためstaleness_ofではなく非表示を待つ）
-            WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.invisibility_of_element_located((By.XPATH, element))
+            self._wait_until(
+                ec.invisibility_of_element_located((By.XPATH, element)),
+                self._config.confirm_timeout,
             )
         except Exception as exc:
             raise PurchaseError(f"購入確定に失敗しました: {exc}") from exc
 
+    def _clear_vote_list(self) -> None:
+        """購入予定リストの馬券を全て削除する.
+
+        Raises:
+            PurchaseError: 購入予定リストの削除に失敗した場合
+        """
+        assert self._driver is not None
+        try:
+            # 購入予定リストボタンを押す
+            element = "//button[contains(@class, 'btn btn-vote-list')]"
+            vote_list_button = self._wait_until(
+                ec.element_to_be_clickable((By.XPATH, element)), self._config.confirm_timeout
+            )
+            vote_list_button.click()
+
+            # 全て削除ボタンを押す
+            delete_all_button = self._wait_until(
+                ec.element_to_be_clickable((By.XPATH, "//button[contains(text(), '全て削除')]")),
+                self._config.confirm_timeout,
+            )
+            delete_all_button.click()
+
+            # 確認ダイアログのOKボタンを押す
+            element = "//button[contains(@class, 'btn-ok') and contains(text(), 'OK')]"
+            ok_button = self._wait_until(
+                ec.element_to_be_clickable((By.XPATH, element)), self._config.confirm_timeout
+            )
+            self._driver.execute_script("arguments[0].click();", ok_button)
+            self._wait_until(
+                ec.invisibility_of_element_located((By.XPATH, element)),
+                self._config.confirm_timeout,
+            )
+        except Exception as exc:
+            raise PurchaseError(f"購入予定リストの削除に失敗しました: {exc}") from exc
+
     def _navigate_to_top(self) -> None:
         """トップ画面に戻る.
 
@@ -428,53 +1374,117 @@ class AutoBetter:
             BrowserError: トップ画面への遷移に失敗した場合
         """
         assert self._driver is not None
+        self._on_bet_page = False
         try:
             element = "//a[@ui-sref='home' and @ng-click='vm.clickLogo()']"
-            top_return_link = WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable((By.XPATH, element))
+            top_return_link = self._wait_until(
+                ec.element_to_be_clickable((By.XPATH, element)), self._config.navigation_timeout
             )
             top_return_link.click()
 
             # ホーム画面の通常投票ボタンが表示されるまで待機（SPAのためstaleness_ofは使わない）
             home_element = "//button[@title='出馬表から馬を選択する方式です。']"
-            WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                ec.element_to_be_clickable((By.XPATH, home_element))
+            self._wait_until(
+                ec.element_to_be_clickable((By.XPATH, home_element)),
+                self._config.navigation_timeout,
             )
         except Exception as exc:
             raise BrowserError(f"トップ画面への遷移に失敗しました: {exc}") from exc
 
+    def _wait_until(self, condition: Callable[[Any], Literal[False] | _T], timeout: float) -> _T:
+        """条件を満たすまで待機する.
+
+        最初の`tight_poll_window`秒は`poll_frequency`間隔で細かく確認し、
+        それ以降は`relaxed_poll_frequency`間隔に緩めてタイムアウトまで確認する。
+        すぐに満たされる条件の検出を早めつつ、ページの応答が遅い場合の無駄な確認を減らす。
+
+        Args:
+            condition: WebDriverを受け取り、満たされた場合に真となる値を返す関数
+            timeout: タイムアウト秒数
+
+        Returns:
+            _T: 条件が返した値
+
+        Raises:
+            TimeoutException: タイムアウトしても条件を満たさなかった場合
+        """
+        assert self._driver is not None
+        tight_window = min(timeout, self._config.tight_poll_window)
+        try:
+            return WebDriverWait(
+                self._driver, tight_window, poll_frequency=self._config.poll_frequency
+            ).until(condition)
+        except TimeoutException:
+            if timeout <= tight_window:
+                raise
+        return WebDriverWait(
+            self._driver,
+            timeout - tight_window,
+            poll_frequency=self._config.relaxed_poll_frequency,
+        ).until(condition)
+
     def _wait_for_element_stable(
         self,
         by: str,
         value: str,
-        timeout: float = _DEFAULT_TIMEOUT,
-    ) -> None:
+        timeout: float,
+    ) -> float:
         """要素のDOMが安定するまで待機する.
 
         AngularJSのダイジェストサイクルによるDOM再レンダリング後、
         要素が安定的にアクセス可能になるまで待機する。
+        DOMの変更が途絶えた時点で戻るため、固定時間のsleepは行わない。
 
         Args:
             by: ロケータ戦略（By.ID等）
             value: ロケータの値
             timeout: タイムアウト秒数
 
+        Returns:
+            float: 実際に待機した秒数
+
         Raises:
             TimeoutException: タイムアウトしても要素が安定しなかった場合
         """
         assert self._driver is not None
-        end_time = time.time() + timeout
-        while time.time() < end_time:
+        start = time.perf_counter()
+        end_time = time.monotonic() + timeout
+        while True:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            self._wait_for_dom_quiet(remaining)
             try:
-                element = self._driver.find_element(by, value)
-                element.is_displayed()
-                time.sleep(0.5)
-                element.is_displayed()
-                return
+                self._driver.find_element(by, value).is_displayed()
             except StaleElementReferenceException:
-                time.sleep(0.5)
+                # 安定判定の直後に再レンダリングされた場合は再度待機する
+                continue
+            waited = time.perf_counter() - start
+            self._logger.debug("要素 %s の安定化待機: %.3f秒", value, waited)
+            return waited
         raise TimeoutException(f"要素 {value} の安定化待機がタイムアウトしました")
 
+    def _wait_for_dom_quiet(self, timeout: float) -> float:
+        """DOMの変更が`_DOM_QUIET_PERIOD`秒途絶えるまで待機する.
+
+        Args:
+            timeout: タイムアウト秒数
+
+        Returns:
+            float: 実際に待機した秒数
+
+        Raises:
+            TimeoutException: タイムアウトしてもDOMの変更が続いた場合
+        """
+        assert self._driver is not None
+        start = time.perf_counter()
+        settled = self._driver.execute_async_script(
+            _WAIT_FOR_DOM_QUIET_SCRIPT, _DOM_QUIET_PERIOD * 1000, timeout * 1000
+        )
+        if settled is None:
+            raise TimeoutException("DOMの安定化待機がタイムアウトしました")
+        return time.perf_counter() - start
+
     def _select_bet_type_with_retry(self, ticket_type: TicketType) -> None:
         """馬券タイプを選択する（StaleElementReferenceException対策でリトライ）.
 
@@ -488,8 +1498,9 @@ class AutoBetter:
         for attempt in range(_MAX_STALE_RETRIES):
             try:
                 bet_type_select = Select(
-                    WebDriverWait(self._driver, _DEFAULT_TIMEOUT).until(
-                        ec.element_to_be_clickable((By.ID, "bet-basic-type"))
+                    self._wait_until(
+                        ec.element_to_be_clickable((By.ID, "bet-basic-type")),
+                        self._config.ticket_entry_timeout,
                     )
                 )
                 bet_type_select.select_by_visible_text(ticket_type.value)
@@ -502,10 +1513,133 @@ class AutoBetter:
                     attempt + 1,
                     _MAX_STALE_RETRIES,
                 )
-                time.sleep(_STALE_RETRY_INTERVAL)
+                self._wait_for_dom_quiet(self._config.ticket_entry_timeout)
+
+
+def launch_chrome(
+    config: AutoBetConfig, driver_paths: ChromeDriverPaths | None = None
+) -> tuple[webdriver.Chrome, ChromeProfile | None]:
+    """設定に従ってChromeブラウザを起動する.
+
+    Args:
+        config: 自動購入の設定
+        driver_paths: 解決済みのChromeDriverのパス（Noneの場合はchrome_driver_pathまたは自動検出）
+
+    Returns:
+        tuple[webdriver.Chrome, ChromeProfile | None]:
+            (WebDriverオブジェクト, ロックしたプロファイル)のタプル。
+            profile_dir未指定の場合、プロファイルはNone
+
+    Raises:
+        BrowserError: Chromeの起動に失敗した場合
+    """
+    driver: webdriver.Chrome | None = None
+    profile: ChromeProfile | None = None
+    try:
+        chrome_options = Options()
+        if config.headless:
+            chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        if config.lean_profile:
+            _apply_lean_profile(chrome_options)
+        if config.profile_dir:
+            max_bytes = config.profile_max_mb * 1024 * 1024
+            profile = acquire_profile(config.profile_dir, max_bytes)
+            chrome_options.add_argument(f"--user-data-dir={profile.path}")
+            # プロファイル上限の半分をHTTPキャッシュに割り当て、残りをその他のデータ用に空ける
+            chrome_options.add_argument(f"--disk-cache-size={max_bytes // 2}")
+
+        if config.chrome_driver_path:
+            service = Service(config.chrome_driver_path)
+        elif driver_paths is not None:
+            service = Service(driver_paths.driver_path)
+            chrome_options.binary_location = driver_paths.browser_path
+        else:
+            service = Service()
+
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+        driver.set_script_timeout(_script_timeout(config))
+        if config.lean_profile and config.blocked_url_patterns:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": list(config.blocked_url_patterns)}
+            )
+    except Exception as exc:
+        if driver is not None:
+            driver.quit()
+        if profile is not None:
+            profile.release()
+        raise BrowserError(f"Chromeの起動に失敗しました: {exc}") from exc
+    return driver, profile
+
+
+def page_ready_states(config: AutoBetConfig) -> tuple[str, ...]:
+    """ページの読み込みが完了したとみなす`document.readyState`の値を返す.
+
+    軽量プロファイルではページ読み込み方式がeagerのため、DOMの構築完了で読み込み完了とみなす。
+
+    Args:
+        config: 自動購入の設定
+
+    Returns:
+        tuple[str, ...]: 読み込み完了とみなすreadyStateの値
+    """
+    return ("interactive", "complete") if config.lean_profile else ("complete",)
+
+
+def _script_timeout(config: AutoBetConfig) -> float:
+    """非同期スクリプトのタイムアウト秒数を返す.
+
+    DOM安定化待機の非同期スクリプトが各フェーズのタイムアウトより先に打ち切られないようにする。
+
+    Args:
+        config: 自動購入の設定
+
+    Returns:
+        float: タイムアウト秒数
+    """
+    return max(config.race_select_timeout, config.ticket_entry_timeout) + _SCRIPT_TIMEOUT_MARGIN
 
 
-def _load_credentials_from_env() -> IpatCredentials:
+def _check_pool_config(config: AutoBetConfig, pool_config: AutoBetConfig) -> None:
+    """ブラウザプールとChromeの起動・トップページの表示に関する設定が一致することを確認する.
+
+    プールのChromeはプールの設定で起動済みのため、起動オプションやプロファイル、
+    表示するページが異なるChromeを取り出さないようにする。
+
+    Args:
+        config: 購入に使用する設定
+        pool_config: ブラウザプールの設定
+
+    Raises:
+        ValueError: 設定が異なる場合
+    """
+    mismatched = [
+        name
+        for name in _POOL_LAUNCH_SETTINGS
+        if getattr(config, name) != getattr(pool_config, name)
+    ]
+    if mismatched:
+        raise ValueError(
+            f"ブラウザプールとChromeの起動に関する設定が異なります: {', '.join(mismatched)}"
+        )
+
+
+def _apply_lean_profile(chrome_options: Options) -> None:
+    """軽量プロファイルの起動オプションを設定する.
+
+    Args:
+        chrome_options: Chromeの起動オプション
+    """
+    chrome_options.page_load_strategy = "eager"
+    for argument in _LEAN_PROFILE_ARGUMENTS:
+        chrome_options.add_argument(argument)
+    chrome_options.add_experimental_option("prefs", dict(_LEAN_PROFILE_PREFS))
+
+
+def load_credentials_from_env() -> IpatCredentials:
     """環境変数から認証情報を読み込む.
 
     .envファイルが存在する場合は自動的に読み込む。
@@ -534,21 +1668,3 @@ def _load_credentials_from_env() -> IpatCredentials:
         raise ValidationError(
             f"環境変数から認証情報を読み込めませんでした。環境設定ファイル（.env）を確認してください: {e}"
         ) from e
-
-
-def _validate_orders(orders: list[BetOrder], max_bet: int) -> None:
-    """購入注文リストのバリデーションを行う.
-
-    Args:
-        orders: 購入注文リスト
-        max_bet: 最大合計購入金額（円）
-
-    Raises:
-        ValidationError: バリデーションエラー
-    """
-    if not orders:
-        raise ValidationError("購入注文リストが空です")
-
-    total_amount = sum(order.amount for order in orders)
-    if total_amount > max_bet:
-        raise ValidationError(f"合計金額{total_amount}円が最大購入金額{max_bet}円を超えています")
@@ -0,0 +1,89 @@
+"""購入処理の実装の基底モジュール.
+
+ブラウザ操作・HTTP通信など、購入処理の実装が共通で提供するインターフェースを定義する。
+"""
+
+from abc import ABC, abstractmethod
+from types import TracebackType
+
+from keiba_auto_bet.models import AutoBetConfig, BetOrder, BetResult, ClockOffset
+
+
+class BetBackend(ABC):
+    """馬券購入の実装の基底クラス.
+
+    実装は、購入前に`BetOrder`のバリデーションと最大合計購入金額の確認を行うこと。
+    `with`文で使用すると、ブロックの間はログイン済みのセッションを維持する。
+    """
+
+    def __enter__(self) -> "BetBackend":
+        """セッションを開始する.
+
+        Returns:
+            BetBackend: 自身のインスタンス
+        """
+        self.open()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """セッションを終了する."""
+        self.close()
+
+    @property
+    @abstractmethod
+    def config(self) -> AutoBetConfig:
+        """自動購入の設定."""
+
+    @property
+    @abstractmethod
+    def is_open(self) -> bool:
+        """セッションモードで動作中かどうか."""
+
+    @property
+    def clock_offset(self) -> ClockOffset | None:
+        """ホストの時計に対する即パットのサーバの時計のずれ（推定していない場合はNone）."""
+        return None
+
+    @abstractmethod
+    def open(self) -> None:
+        """ログイン済みのセッションを開始する.
+
+        Raises:
+            KeibaAutoBetError: セッションの開始に失敗した場合
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """セッションを終了する."""
+
+    def warm_up(self) -> None:
+        """セッションを開始して購入の準備を済ませておく.
+
+        既定ではセッションを開始する（開始済みの場合は何もしない）。
+
+        Raises:
+            KeibaAutoBetError: セッションの開始に失敗した場合
+        """
+        self.open()
+
+    @abstractmethod
+    def bet(self, orders: list[BetOrder]) -> BetResult:
+        """馬券を購入する.
+
+        セッションが開始されていない場合は、ログインから購入までを行ってセッションを終了する。
+
+        Args:
+            orders: 購入注文リスト
+
+        Returns:
+            BetResult: 購入結果
+
+        Raises:
+            ValidationError: 入力内容のバリデーションエラー
+            KeibaAutoBetError: 購入処理中にエラーが発生した場合
+        """
@@ -0,0 +1,305 @@
+"""ブラウザプールモジュール.
+
+起動済みのChromeを即パットのトップページで待機させておき、
+購入やセッションの復旧で即座に使えるようにする機能を提供する。
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from types import TracebackType
+
+from selenium import webdriver
+from selenium.webdriver.support.ui import WebDriverWait
+
+from keiba_auto_bet.auto_bet import launch_chrome, page_ready_states
+from keiba_auto_bet.driver_cache import resolve_chrome_driver
+from keiba_auto_bet.models import AutoBetConfig, ChromeDriverPaths
+from keiba_auto_bet.profile import ChromeProfile
+
+_DEFAULT_POOL_SIZE = 1
+_DEFAULT_MAX_IDLE_SECONDS = 600.0  # 待機中のChromeを作り直すまでの秒数
+_DEFAULT_HEALTH_CHECK_INTERVAL = 30.0  # 待機中のChromeの状態を確認する間隔（秒）
+
+
+@dataclass(eq=False)
+class PooledBrowser:
+    """プールで待機している起動済みのChrome.
+
+    Attributes:
+        driver: 即パットのトップページを開いたWebDriverオブジェクト
+        profile: ロックしたプロファイル（profile_dir未指定の場合はNone）
+        launched_at: 起動が完了した時刻（`time.monotonic()`）
+    """
+
+    driver: webdriver.Chrome
+    profile: ChromeProfile | None = None
+    launched_at: float = field(default_factory=time.monotonic)
+
+    def quit(self) -> None:
+        """Chromeを終了し、プロファイルのロックを解放する（終了処理中の例外は無視する）."""
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        if self.profile is not None:
+            self.profile.release()
+
+
+class BrowserPool:
+    """起動済みのChromeのプール.
+
+    `size`台のChromeをバックグラウンドで起動して即パットのトップページで待機させる。
+    取り出したChromeは返却せず、取り出すたびにバックグラウンドで補充する。
+    応答しないChromeや`max_idle_seconds`を超えて待機したChromeは定期的に作り直す。
+
+    Attributes:
+        _config: 自動購入の設定
+        _size: 待機させるChromeの台数
+        _max_idle_seconds: 待機中のChromeを作り直すまでの秒数
+        _health_check_interval: 待機中のChromeの状態を確認する間隔（秒）
+        _logger: ロガー
+        _idle: 待機中のChrome（起動順）
+        _launching: 起動中のChromeの台数
+        _closed: プールが停止しているかどうか
+        _condition: 状態の変更を通知する条件変数
+        _executor: Chromeを起動するワーカースレッド
+        _health_thread: 待機中のChromeの状態を確認するスレッド
+        _driver_paths: 解決済みのChromeDriverのパス
+    """
+
+    def __init__(
+        self,
+        config: AutoBetConfig | None = None,
+        size: int = _DEFAULT_POOL_SIZE,
+        max_idle_seconds: float = _DEFAULT_MAX_IDLE_SECONDS,
+        health_check_interval: float = _DEFAULT_HEALTH_CHECK_INTERVAL,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """コンストラクタ.
+
+        Args:
+            config: 自動購入の設定（Noneの場合はデフォルト設定を使用）
+            size: 待機させるChromeの台数
+            max_idle_seconds: 待機中のChromeを作り直すまでの秒数
+            health_check_interval: 待機中のChromeの状態を確認する間隔（秒）
+            logger: ロガーインスタンス。Noneの場合はモジュールロガーを使用
+
+        Raises:
+            ValueError: パラメータが不正な場合
+        """
+        if size < 1:
+            raise ValueError(f"プールの台数は1以上で指定してください: {size}")
+        if max_idle_seconds <= 0:
+            raise ValueError(f"待機秒数は0より大きい値で指定してください: {max_idle_seconds}")
+        if health_check_interval <= 0:
+            raise ValueError(
+                f"状態確認の間隔は0より大きい値で指定してください: {health_check_interval}"
+            )
+        self._config = config if config is not None else AutoBetConfig()
+        self._size = size
+        self._max_idle_seconds = max_idle_seconds
+        self._health_check_interval = health_check_interval
+        self._logger = logger if logger is not None else logging.getLogger(__name__)
+        self._idle: deque[PooledBrowser] = deque()
+        self._launching = 0
+        self._closed = True
+        self._condition = threading.Condition()
+        self._executor: ThreadPoolExecutor | None = None
+        self._health_thread: threading.Thread | None = None
+        self._driver_paths: ChromeDriverPaths | None = None
+
+    def __enter__(self) -> "BrowserPool":
+        """プールを開始する.
+
+        Returns:
+            BrowserPool: 自身のインスタンス
+        """
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """プールを停止する."""
+        self.close()
+
+    @property
+    def config(self) -> AutoBetConfig:
+        """プールのChromeの起動に使用する設定.
+
+        プールを使用する`AutoBetter`は、Chromeの起動・トップページの表示に関する設定
+        （ipat_url・headless・lean_profile・blocked_url_patterns・profile_dir・profile_max_mb）を
+        この設定と一致させる必要がある。
+        """
+        return self._config
+
+    @property
+    def idle_count(self) -> int:
+        """待機中のChromeの台数."""
+        with self._condition:
+            return len(self._idle)
+
+    def start(self) -> None:
+        """バックグラウンドでChromeの起動を開始する（開始済みの場合は何もしない）."""
+        with self._condition:
+            if not self._closed:
+                return
+            self._closed = False
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._size, thread_name_prefix="keiba-browser-pool"
+            )
+            self._health_thread = threading.Thread(
+                target=self._health_check_loop, name="keiba-browser-pool-health", daemon=True
+            )
+            self._health_thread.start()
+            self._refill()
+
+    def close(self) -> None:
+        """プールを停止し、待機中のChromeをすべて終了する."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            executor = self._executor
+            health_thread = self._health_thread
+            self._executor = None
+            self._health_thread = None
+            self._condition.notify_all()
+        for browser in idle:
+            browser.quit()
+        # 起動中のChromeは起動完了後に停止を検知して終了する
+        if executor is not None:
+            executor.shutdown(wait=True)
+        if health_thread is not None:
+            health_thread.join()
+
+    def acquire(self, timeout: float = 0.0) -> PooledBrowser | None:
+        """待機中のChromeを1台取り出す.
+
+        応答しないChromeは終了して次のChromeを確認する。
+        待機中のChromeがない場合は、起動中のChromeを最大`timeout`秒待つ。
+        取り出したChromeの終了は呼び出し側の責任とする。
+
+        Args:
+            timeout: 待機中のChromeがない場合に起動完了を待つ秒数
+
+        Returns:
+            PooledBrowser | None: 取り出したChrome。取り出せなかった場合はNone
+        """
+        end_time = time.monotonic() + timeout
+        while True:
+            with self._condition:
+                while not self._idle:
+                    remaining = end_time - time.monotonic()
+                    if self._closed or self._launching == 0 or remaining <= 0:
+                        return None
+                    self._condition.wait(remaining)
+                browser = self._idle.popleft()
+                self._refill()
+            if self._is_healthy(browser):
+                return browser
+            self._logger.warning("待機中のChromeが応答しないため作り直します")
+            browser.quit()
+
+    def _refill(self) -> None:
+        """不足している台数のChromeの起動を開始する（条件変数のロックを取得して呼び出す）."""
+        if self._closed or self._executor is None:
+            return
+        while len(self._idle) + self._launching < self._size:
+            self._launching += 1
+            self._executor.submit(self._launch_browser)
+
+    def _launch_browser(self) -> None:
+        """Chromeを起動して即パットのトップページを開き、プールに追加する."""
+        browser: PooledBrowser | None = None
+        try:
+            browser = self._open_browser()
+        except Exception as exc:
+            self._logger.warning("プールのChromeの起動に失敗しました: %s", exc)
+        with self._condition:
+            self._launching -= 1
+            if browser is not None and not self._closed:
+                self._idle.append(browser)
+                browser = None
+            self._condition.notify_all()
+        if browser is not None:
+            browser.quit()
+
+    def _open_browser(self) -> PooledBrowser:
+        """Chromeを起動して即パットのトップページを開く.
+
+        Returns:
+            PooledBrowser: 起動したChrome
+
+        Raises:
+            BrowserError: Chromeの起動に失敗した場合
+            TimeoutException: ページの読み込みがタイムアウトした場合
+        """
+        if (
+            self._driver_paths is None
+            and self._config.driver_cache_file
+            and not self._config.chrome_driver_path
+        ):
+            self._driver_paths = resolve_chrome_driver(self._config.driver_cache_file)
+        driver, profile = launch_chrome(self._config, self._driver_paths)
+        browser = PooledBrowser(driver=driver, profile=profile)
+        ready_states = page_ready_states(self._config)
+        try:
+            driver.get(self._config.ipat_url)
+            WebDriverWait(
+                driver, self._config.launch_timeout, poll_frequency=self._config.poll_frequency
+            ).until(lambda d: d.execute_script("return document.readyState") in ready_states)
+        except Exception:
+            browser.quit()
+            raise
+        browser.launched_at = time.monotonic()
+        return browser
+
+    def _is_healthy(self, browser: PooledBrowser) -> bool:
+        """Chromeが応答し、作り直す時期を過ぎていないかを確認する.
+
+        Args:
+            browser: 確認するChrome
+
+        Returns:
+            bool: そのまま使用できる場合はTrue
+        """
+        if time.monotonic() - browser.launched_at > self._max_idle_seconds:
+            return False
+        try:
+            state = browser.driver.execute_script("return document.readyState")
+            return state in page_ready_states(self._config)
+        except Exception:
+            return False
+
+    def _health_check_loop(self) -> None:
+        """待機中のChromeの状態を定期的に確認し、使用できないChromeを作り直す.
+
+        起動に失敗して不足したままの台数もここで補充する。
+        """
+        while True:
+            with self._condition:
+                self._condition.wait(self._health_check_interval)
+                if self._closed:
+                    return
+                idle = list(self._idle)
+            unhealthy = [browser for browser in idle if not self._is_healthy(browser)]
+            with self._condition:
+                # 確認中に取り出されたChromeは取り出した側が終了する
+                removed = [browser for browser in unhealthy if browser in self._idle]
+                for browser in removed:
+                    self._idle.remove(browser)
+                self._refill()
+            for browser in removed:
+                browser.quit()
+            if removed:
+                self._logger.info("待機中のChromeを%d台作り直しました", len(removed))
@@ -0,0 +1,112 @@
+"""WebDriverコマンドの計測モジュール.
+
+WebDriverのコマンドは要素の検索・クリック・スクリプト実行のたびにChromeDriverとの
+通信を伴う。WebDriverのコマンド送信をフックし、購入処理のフェーズごとに
+コマンドの種類・回数・所要時間を記録する。
+"""
+
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from selenium import webdriver
+
+from keiba_auto_bet.models import CommandProfile, CommandRecord
+
+_OUTSIDE_PHASE = "other"
+# WebDriverに設定する、記録先のCommandProfilerを保持する属性名
+_PROFILER_ATTRIBUTE = "_keiba_auto_bet_command_profiler"
+
+
+class CommandProfiler:
+    """WebDriverコマンドの実行回数と所要時間を記録する.
+
+    `attach()`したWebDriverのコマンド（要素の操作を含む）をすべて記録する。
+    記録中のフェーズは`phase()`で設定する。
+
+    Attributes:
+        _records: コマンドの実行記録（実行順）
+        _phase: 記録中のフェーズ名（フェーズ外の場合はNone）
+    """
+
+    def __init__(self) -> None:
+        """コンストラクタ."""
+        self._records: list[CommandRecord] = []
+        self._phase: str | None = None
+
+    def attach(self, driver: webdriver.Chrome) -> None:
+        """WebDriverのコマンドを記録対象にする.
+
+        既に別のCommandProfilerに記録しているWebDriverは、記録先をこのインスタンスに切り替える。
+
+        Args:
+            driver: 記録対象のWebDriver
+        """
+        attached = isinstance(getattr(driver, _PROFILER_ATTRIBUTE, None), CommandProfiler)
+        setattr(driver, _PROFILER_ATTRIBUTE, self)
+        if not attached:
+            setattr(driver, "execute", _profiled_execute(driver, driver.execute))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """ブロック内で実行したコマンドをフェーズに計上する.
+
+        Args:
+            name: フェーズ名
+
+        Yields:
+            None: 計測対象のブロック
+        """
+        previous = self._phase
+        self._phase = name
+        try:
+            yield
+        finally:
+            self._phase = previous
+
+    def record(self, command: str, seconds: float) -> None:
+        """コマンドの実行を記録する.
+
+        Args:
+            command: WebDriverのコマンド名
+            seconds: 所要時間（秒）
+        """
+        phase = self._phase if self._phase is not None else _OUTSIDE_PHASE
+        self._records.append(CommandRecord(phase=phase, command=command, seconds=seconds))
+
+    def reset(self) -> None:
+        """記録を消去する."""
+        self._records = []
+
+    def profile(self) -> CommandProfile:
+        """これまでの記録を返す.
+
+        Returns:
+            CommandProfile: コマンドの実行記録
+        """
+        return CommandProfile(records=tuple(self._records))
+
+
+def _profiled_execute(
+    driver: webdriver.Chrome, execute: Callable[..., dict[str, Any]]
+) -> Callable[..., dict[str, Any]]:
+    """コマンドの所要時間を記録するWebDriver.executeを作成する.
+
+    Args:
+        driver: 記録対象のWebDriver
+        execute: 元のWebDriver.execute
+
+    Returns:
+        Callable[..., dict[str, Any]]: 記録先のCommandProfilerに記録するWebDriver.execute
+    """
+
+    def profiled(driver_command: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            profiler: CommandProfiler = getattr(driver, _PROFILER_ATTRIBUTE)
+            profiler.record(driver_command, time.perf_counter() - start)
+
+    return profiled
@@ -0,0 +1,145 @@
+"""ChromeDriverのパス解決のキャッシュモジュール.
+
+Selenium Managerによる毎回のバージョン確認を省くため、解決したChromeDriverと
+Chromeのパスをファイルに保存し、Chromeが更新されるまで再利用する。
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from selenium.webdriver.common.selenium_manager import SeleniumManager
+
+from keiba_auto_bet.exceptions import BrowserError
+from keiba_auto_bet.models import ChromeDriverPaths
+
+_CACHE_FORMAT_VERSION = 1
+
+
+def resolve_chrome_driver(cache_file: str | Path) -> ChromeDriverPaths:
+    """ChromeDriverとChromeのパスを解決する.
+
+    キャッシュファイルの内容が有効な場合はSelenium Managerを実行せずにそのまま返す。
+    キャッシュは、ChromeDriverが存在し、Chromeの実行ファイルのサイズと更新日時が
+    保存時から変わっていない場合に有効とみなす（Chromeが更新されると再解決する）。
+
+    Args:
+        cache_file: キャッシュファイルのパス
+
+    Returns:
+        ChromeDriverPaths: 解決したパス
+
+    Raises:
+        BrowserError: Selenium ManagerでChromeDriverを解決できなかった場合
+    """
+    cache_path = Path(cache_file)
+    cached = _load_cache(cache_path)
+    if cached is not None:
+        return cached
+
+    paths = _resolve_with_selenium_manager()
+    _save_cache(cache_path, paths)
+    return paths
+
+
+def invalidate_driver_cache(cache_file: str | Path) -> None:
+    """キャッシュファイルを削除し、次回の解決でSelenium Managerを実行させる.
+
+    Args:
+        cache_file: キャッシュファイルのパス
+    """
+    Path(cache_file).unlink(missing_ok=True)
+
+
+def _resolve_with_selenium_manager() -> ChromeDriverPaths:
+    """Selenium ManagerでChromeDriverとChromeのパスを解決する.
+
+    Returns:
+        ChromeDriverPaths: 解決したパス
+
+    Raises:
+        BrowserError: 解決に失敗した場合
+    """
+    try:
+        output = SeleniumManager().binary_paths(["--browser", "chrome"])
+        driver_path = output["driver_path"]
+        browser_path = output["browser_path"]
+    except Exception as exc:
+        raise BrowserError(f"ChromeDriverのパスを解決できませんでした: {exc}") from exc
+    if not Path(driver_path).is_file() or not Path(browser_path).is_file():
+        raise BrowserError(
+            f"ChromeDriverのパスを解決できませんでした: driver={driver_path}, browser={browser_path}"
+        )
+    return ChromeDriverPaths(driver_path=driver_path, browser_path=browser_path)
+
+
+def _load_cache(cache_path: Path) -> ChromeDriverPaths | None:
+    """キャッシュファイルから有効なパスを読み込む.
+
+    Args:
+        cache_path: キャッシュファイルのパス
+
+    Returns:
+        ChromeDriverPaths | None: 有効なキャッシュがある場合はそのパス、ない場合はNone
+    """
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+        if data["version"] != _CACHE_FORMAT_VERSION:
+            return None
+        driver_path = data["driver_path"]
+        browser_path = data["browser_path"]
+        if not Path(driver_path).is_file():
+            return None
+        if _fingerprint(browser_path) != data["browser_fingerprint"]:
+            return None
+    except (OSError, ValueError, KeyError, TypeError):
+        # 壊れたキャッシュや削除されたChromeは再解決する
+        return None
+    return ChromeDriverPaths(driver_path=driver_path, browser_path=browser_path, from_cache=True)
+
+
+def _save_cache(cache_path: Path, paths: ChromeDriverPaths) -> None:
+    """解決したパスをキャッシュファイルに保存する.
+
+    並列に起動した他のプロセスが書きかけのファイルを読まないよう、一時ファイルに
+    書き込んでから置き換える。保存に失敗しても起動は継続する。
+
+    Args:
+        cache_path: キャッシュファイルのパス
+        paths: 解決したパス
+    """
+    data = {
+        "version": _CACHE_FORMAT_VERSION,
+        "driver_path": paths.driver_path,
+        "browser_path": paths.browser_path,
+        "browser_fingerprint": _fingerprint(paths.browser_path),
+    }
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=cache_path.parent, prefix=f".{cache_path.name}.")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+            json.dump(data, temp_file, ensure_ascii=False)
+        os.replace(temp_name, cache_path)
+    except OSError:
+        Path(temp_name).unlink(missing_ok=True)
+
+
+def _fingerprint(browser_path: str) -> dict[str, Any]:
+    """Chromeの実行ファイルのサイズと更新日時を返す.
+
+    Args:
+        browser_path: Chromeの実行ファイルのパス
+
+    Returns:
+        dict[str, Any]: サイズと更新日時（ナノ秒）
+
+    Raises:
+        OSError: 実行ファイルが存在しない場合
+    """
+    stat = os.stat(browser_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
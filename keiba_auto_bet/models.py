@@ -3,41 +3,228 @@
 馬券自動購入に必要なデータ構造を定義する。
 """
 
-from dataclasses import dataclass
+import itertools
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, tzinfo
 from enum import Enum
 
+from keiba_auto_bet.exceptions import ValidationError
+
 
 class TicketType(Enum):
     """馬券の種類.
 
-    現在は単勝・複勝のみ対応。
-
     Attributes:
         WIN: 単勝
         SHOW: 複勝
+        QUINELLA: 馬連
+        QUINELLA_PLACE: ワイド
+        EXACTA: 馬単
+        TRIO: 3連複
+        TRIFECTA: 3連単
     """
 
     WIN = "単勝"
     SHOW = "複勝"
+    QUINELLA = "馬連"
+    QUINELLA_PLACE = "ワイド"
+    EXACTA = "馬単"
+    TRIO = "3連複"
+    TRIFECTA = "3連単"
+
+    @property
+    def horse_count(self) -> int:
+        """1点の馬券に含まれる馬の数."""
+        if self in (TicketType.WIN, TicketType.SHOW):
+            return 1
+        if self in (TicketType.TRIO, TicketType.TRIFECTA):
+            return 3
+        return 2
+
+    @property
+    def ordered(self) -> bool:
+        """着順どおりに的中する馬券かどうか（馬単・3連単）."""
+        return self in (TicketType.EXACTA, TicketType.TRIFECTA)
+
+
+class BetMethod(Enum):
+    """組み合わせの馬券の入力方式.
+
+    Attributes:
+        FORMATION: フォーメーション
+        BOX: ボックス
+        NAGASHI: ながし
+    """
+
+    FORMATION = "フォーメーション"
+    BOX = "ボックス"
+    NAGASHI = "ながし"
+
+
+@dataclass(frozen=True)
+class HorseSelection:
+    """組み合わせの馬券（馬連・ワイド・馬単・3連複・3連単）の馬番の選び方.
+
+    即パットのフォーメーション・ボックス・ながしの入力方式に対応し、1回の入力で
+    全ての組み合わせを購入する。`legs`の内容は入力方式によって異なる。
+
+    - FORMATION: 1頭目（馬単・3連単では1着）から順に、各列の馬番
+    - BOX: 1つの列の馬番
+    - NAGASHI: 軸馬と相手の2つの列。馬単・3連単では軸馬を1着（2頭軸の場合は1着・2着）に
+      固定し、`multi`を指定すると軸馬の着順を問わないマルチになる
+
+    Attributes:
+        method: 入力方式
+        legs: 列ごとの馬番
+        multi: マルチ（ながしのみ）
+    """
+
+    method: BetMethod
+    legs: tuple[tuple[int, ...], ...]
+    multi: bool = False
+
+    def __post_init__(self) -> None:
+        """バリデーション.
+
+        Raises:
+            ValueError: パラメータが不正な場合
+        """
+        expected_legs = {BetMethod.BOX: 1, BetMethod.NAGASHI: 2}.get(self.method)
+        if not self.legs or (expected_legs is not None and len(self.legs) != expected_legs):
+            raise ValueError(f"{self.method.value}の馬番の列数が不正です: {len(self.legs)}")
+        for leg in self.legs:
+            if not leg:
+                raise ValueError(f"{self.method.value}の馬番が空の列があります")
+            if any(horse_number < 1 for horse_number in leg):
+                raise ValueError(f"馬番は1以上で指定してください: {leg}")
+            if len(set(leg)) != len(leg):
+                raise ValueError(f"同じ列に同じ馬番が重複しています: {leg}")
+        if self.method is BetMethod.NAGASHI and set(self.legs[0]) & set(self.legs[1]):
+            raise ValueError(f"軸馬と相手に同じ馬番が含まれています: {self.legs}")
+        if self.multi and self.method is not BetMethod.NAGASHI:
+            raise ValueError("マルチはながしでのみ指定できます")
+
+    @classmethod
+    def box(cls, horse_numbers: tuple[int, ...]) -> "HorseSelection":
+        """ボックスを作成する.
+
+        Args:
+            horse_numbers: 馬番
+
+        Returns:
+            HorseSelection: ボックス
+        """
+        return cls(BetMethod.BOX, (tuple(horse_numbers),))
+
+    @classmethod
+    def formation(cls, *legs: tuple[int, ...]) -> "HorseSelection":
+        """フォーメーションを作成する.
+
+        Args:
+            *legs: 1頭目（1着）から順に、各列の馬番
+
+        Returns:
+            HorseSelection: フォーメーション
+        """
+        return cls(BetMethod.FORMATION, tuple(tuple(leg) for leg in legs))
+
+    @classmethod
+    def nagashi(
+        cls, axis: tuple[int, ...], partners: tuple[int, ...], multi: bool = False
+    ) -> "HorseSelection":
+        """ながしを作成する.
+
+        Args:
+            axis: 軸馬の馬番（1頭または2頭）
+            partners: 相手の馬番
+            multi: マルチ（馬単・3連単で軸馬の着順を問わない）
+
+        Returns:
+            HorseSelection: ながし
+        """
+        return cls(BetMethod.NAGASHI, (tuple(axis), tuple(partners)), multi)
+
+    def describe(self) -> str:
+        """ログ・エラーメッセージ用の表記を返す.
+
+        Returns:
+            str: 入力方式と列ごとの馬番（例: "ながし 1-2,5,7（マルチ）"）
+        """
+        legs = "-".join(",".join(str(horse_number) for horse_number in leg) for leg in self.legs)
+        return f"{self.method.value} {legs}" + ("（マルチ）" if self.multi else "")
+
+    def count_combinations(self, ticket_type: TicketType) -> int:
+        """馬券の種類に対する組み合わせの点数を返す.
+
+        ボックスとながしは組み合わせを列挙せずに計算する。
+        フォーメーションは各列から1頭ずつ選ぶ組み合わせ（最大18×18×18通り）を数え、
+        同じ馬を含む組み合わせと、着順を問わない馬券で重複する組み合わせを除く。
+
+        Args:
+            ticket_type: 馬券の種類
+
+        Returns:
+            int: 組み合わせの点数
+
+        Raises:
+            ValueError: 馬券の種類と入力方式・列数が対応しない場合
+        """
+        size = ticket_type.horse_count
+        if size == 1:
+            raise ValueError(f"{ticket_type.value}は組み合わせの馬券ではありません")
+        if self.method is BetMethod.BOX:
+            horses = len(self.legs[0])
+            return math.perm(horses, size) if ticket_type.ordered else math.comb(horses, size)
+        if self.method is BetMethod.NAGASHI:
+            axis, partners = len(self.legs[0]), len(self.legs[1])
+            if axis >= size:
+                raise ValueError(
+                    f"{ticket_type.value}のながしの軸馬は{size - 1}頭以下で指定してください: {axis}"
+                )
+            if not ticket_type.ordered:
+                if self.multi:
+                    raise ValueError(f"{ticket_type.value}ではマルチを指定できません")
+                return math.comb(partners, size - axis)
+            # マルチは軸馬の着順を問わないため、軸馬の着順の並べ方の数だけ点数が増える
+            arrangements = math.perm(size, axis) if self.multi else 1
+            return math.perm(partners, size - axis) * arrangements
+        if len(self.legs) != size:
+            raise ValueError(
+                f"{ticket_type.value}のフォーメーションは{size}列で指定してください: {len(self.legs)}"
+            )
+        tickets = {
+            combination if ticket_type.ordered else tuple(sorted(combination))
+            for combination in itertools.product(*self.legs)
+            if len(set(combination)) == size
+        }
+        return len(tickets)
 
 
 @dataclass(frozen=True)
 class BetOrder:
     """1件の馬券購入注文.
 
+    単勝・複勝は`horse_number`で馬番を、組み合わせの馬券（馬連・ワイド・馬単・3連複・3連単）は
+    `selection`でフォーメーション・ボックス・ながしを指定する。
+
     Attributes:
         venue: 競馬場名（例: "東京", "阪神"）
         race_number: レース番号（1〜12）
         ticket_type: 馬券の種類
-        horse_number: 馬番
-        amount: 購入金額（円、100円単位）
+        horse_number: 馬番（組み合わせの馬券の場合はNone）
+        amount: 購入金額（円、100円単位。組み合わせの馬券の場合は1点あたりの金額）
+        selection: 組み合わせの馬券の馬番の選び方（単勝・複勝の場合はNone）
+        deadline: 発売締切時刻（`DeadlineScheduler`で締切の早い順に購入する場合に指定する）
     """
 
     venue: str
     race_number: int
     ticket_type: TicketType
-    horse_number: int
+    horse_number: int | None
     amount: int
+    selection: HorseSelection | None = None
+    deadline: datetime | None = None
 
     def __post_init__(self) -> None:
         """バリデーション.
@@ -47,13 +234,53 @@ class BetOrder:
         """
         if not 1 <= self.race_number <= 12:
             raise ValueError(f"レース番号は1〜12の範囲で指定してください: {self.race_number}")
-        if self.horse_number < 1:
-            raise ValueError(f"馬番は1以上で指定してください: {self.horse_number}")
+        if self.ticket_type.horse_count == 1:
+            if self.horse_number is None or self.selection is not None:
+                raise ValueError(f"{self.ticket_type.value}は馬番のみを指定してください")
+            if self.horse_number < 1:
+                raise ValueError(f"馬番は1以上で指定してください: {self.horse_number}")
+        else:
+            if self.selection is None or self.horse_number is not None:
+                raise ValueError(
+                    f"{self.ticket_type.value}は馬番の選び方（selection）のみを指定してください"
+                )
+            if self.selection.count_combinations(self.ticket_type) == 0:
+                raise ValueError(f"{self.ticket_type.value}の組み合わせが1点もありません")
         if self.amount < 100:
             raise ValueError(f"購入金額は100円以上で指定してください: {self.amount}")
         if self.amount % 100 != 0:
             raise ValueError(f"購入金額は100円単位で指定してください: {self.amount}")
 
+    @property
+    def ticket_count(self) -> int:
+        """購入する組み合わせの点数（単勝・複勝は1）."""
+        if self.selection is None:
+            return 1
+        return self.selection.count_combinations(self.ticket_type)
+
+    @property
+    def total_amount(self) -> int:
+        """全ての組み合わせの合計購入金額（円）."""
+        return self.amount * self.ticket_count
+
+
+def validate_orders(orders: list[BetOrder], max_bet: int) -> None:
+    """購入注文リストのバリデーションを行う.
+
+    Args:
+        orders: 購入注文リスト
+        max_bet: 最大合計購入金額（円）
+
+    Raises:
+        ValidationError: バリデーションエラー
+    """
+    if not orders:
+        raise ValidationError("購入注文リストが空です")
+
+    total_amount = sum(order.total_amount for order in orders)
+    if total_amount > max_bet:
+        raise ValidationError(f"合計金額{total_amount}円が最大購入金額{max_bet}円を超えています")
+
 
 @dataclass(frozen=True)
 class IpatCredentials:
@@ -96,12 +323,527 @@ class AutoBetConfig:
         chrome_driver_path: ChromeDriverのパス（Noneの場合は自動検出）
         headless: ヘッドレスモードで実行するかどうか
         max_bet: 最大合計購入金額（円）
+        launch_timeout: Chrome起動後のページ読み込みのタイムアウト秒数
+        login_timeout: ログイン・お知らせページ処理の各待機のタイムアウト秒数
+        navigation_timeout: 購入画面・トップ画面への遷移の各待機のタイムアウト秒数
+        race_select_timeout: 競馬場・レース選択の各待機のタイムアウト秒数
+        ticket_entry_timeout: 馬券の種類・馬番選択と金額入力の各待機のタイムアウト秒数
+        confirm_timeout: 購入確定の各待機のタイムアウト秒数
+        poll_frequency: 待機開始直後に条件を確認する間隔（秒）
+        relaxed_poll_frequency: tight_poll_windowを過ぎた後に条件を確認する間隔（秒）
+        tight_poll_window: poll_frequency間隔で細かく確認する時間（秒）
+        lean_profile: 軽量プロファイルで起動するかどうか。有効にすると、ページ読み込み方式を
+            eagerにし、画像の読み込みとバックグラウンド通信・拡張機能を無効化し、
+            blocked_url_patternsに一致するURLへの通信を遮断する
+        blocked_url_patterns: 軽量プロファイルで通信を遮断するURLのパターン
+            （*をワイルドカードとして使用可。初期値はWebフォントとアクセス解析）
+        profile_dir: 再利用するChromeプロファイルを配置するディレクトリ
+            （Noneの場合は起動ごとに新しい一時プロファイルを使用）
+        profile_max_mb: 1つのプロファイルの最大サイズ（MB）。超えた場合は起動前にキャッシュを削除する
+        driver_cache_file: Selenium Managerが解決したChromeDriverのパスを保存するファイル
+            （Noneの場合は起動ごとにSelenium Managerで解決する。chrome_driver_path指定時は無視）
+        script_login: ログインフォームの入力と送信を1回のスクリプト実行で行うかどうか
+            （失敗した場合はキー入力で入力し直す）
+        profile_commands: WebDriverコマンドの実行回数と所要時間を記録するかどうか
+            （記録した内容は`BetResult.command_profile`で取得できる）
+        clock_samples: Chromeの起動・ログインと並行してサーバ時刻を計測する回数
+            （0の場合は計測しない。推定したずれは`AutoBetter.clock_offset`で取得できる）
     """
 
     ipat_url: str = "https://www.ipat.jra.go.jp/"
     chrome_driver_path: str | None = None
     headless: bool = True
     max_bet: int = 10000
+    launch_timeout: float = 10.0
+    login_timeout: float = 10.0
+    navigation_timeout: float = 10.0
+    race_select_timeout: float = 10.0
+    ticket_entry_timeout: float = 10.0
+    confirm_timeout: float = 10.0
+    poll_frequency: float = 0.05
+    relaxed_poll_frequency: float = 0.5
+    tight_poll_window: float = 2.0
+    lean_profile: bool = False
+    blocked_url_patterns: tuple[str, ...] = (
+        "*.woff",
+        "*.woff2",
+        "*.ttf",
+        "*.otf",
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+    )
+    profile_dir: str | None = None
+    profile_max_mb: int = 500
+    driver_cache_file: str | None = None
+    script_login: bool = True
+    profile_commands: bool = False
+    clock_samples: int = 0
+
+    def __post_init__(self) -> None:
+        """バリデーション.
+
+        Raises:
+            ValueError: パラメータが不正な場合
+        """
+        if self.max_bet < 100:
+            raise ValueError(f"最大合計購入金額は100円以上で指定してください: {self.max_bet}")
+        for name in (
+            "launch_timeout",
+            "login_timeout",
+            "navigation_timeout",
+            "race_select_timeout",
+            "ticket_entry_timeout",
+            "confirm_timeout",
+        ):
+            timeout = getattr(self, name)
+            if timeout <= 0:
+                raise ValueError(
+                    f"タイムアウト秒数は0より大きい値で指定してください: {name}={timeout}"
+                )
+        if self.poll_frequency <= 0:
+            raise ValueError(
+                f"確認間隔は0より大きい値で指定してください: poll_frequency={self.poll_frequency}"
+            )
+        if self.relaxed_poll_frequency < self.poll_frequency:
+            raise ValueError(
+                "relaxed_poll_frequencyはpoll_frequency以上で指定してください: "
+                f"{self.relaxed_poll_frequency} < {self.poll_frequency}"
+            )
+        if self.tight_poll_window < 0:
+            raise ValueError(
+                f"tight_poll_windowは0以上で指定してください: {self.tight_poll_window}"
+            )
+        if self.profile_max_mb < 1:
+            raise ValueError(
+                f"プロファイルの最大サイズは1MB以上で指定してください: {self.profile_max_mb}"
+            )
+        if self.clock_samples < 0:
+            raise ValueError(f"サーバ時刻の計測回数は0以上で指定してください: {self.clock_samples}")
+
+
+@dataclass(frozen=True)
+class ChromeDriverPaths:
+    """解決済みのChromeDriver・Chromeのパス.
+
+    Attributes:
+        driver_path: ChromeDriverのパス
+        browser_path: Chromeの実行ファイルのパス
+        from_cache: キャッシュファイルから読み込んだかどうか
+    """
+
+    driver_path: str
+    browser_path: str
+    from_cache: bool = False
+
+
+@dataclass(frozen=True)
+class PageSnapshot:
+    """1回のスクリプト実行で取得した購入画面の状態.
+
+    Attributes:
+        venues: 競馬場の選択肢の表示テキスト
+        selected_venue: 選択中の競馬場の表示テキスト（選択肢がない場合はNone）
+        races: レースの選択肢の表示テキスト
+        selected_race: 選択中のレースの表示テキスト（選択肢がない場合はNone）
+        ticket_types: 馬券の種類の選択肢の表示テキスト
+        selected_ticket_type: 選択中の馬券の種類の表示テキスト（選択肢がない場合はNone）
+        methods: 組み合わせの馬券の入力方式の選択肢の表示テキスト（単勝・複勝の場合は空）
+        selected_method: 選択中の入力方式の表示テキスト（単勝・複勝の場合はNone）
+        horses: 選択できる馬番
+        checked_horses: チェックが入っている馬番
+        checked_legs: 組み合わせの馬券でチェックが入っている(列番号, 馬番)
+        multi: マルチのチェック状態（マルチを指定できない画面の場合はNone）
+        vote_count: 購入予定リストの件数（ボタンが表示されていない場合はNone）
+    """
+
+    venues: tuple[str, ...]
+    selected_venue: str | None
+    races: tuple[str, ...]
+    selected_race: str | None
+    ticket_types: tuple[str, ...]
+    selected_ticket_type: str | None
+    methods: tuple[str, ...]
+    selected_method: str | None
+    horses: tuple[int, ...]
+    checked_horses: tuple[int, ...]
+    checked_legs: tuple[tuple[int, int], ...]
+    multi: bool | None
+    vote_count: int | None
+
+
+@dataclass(frozen=True)
+class TicketEntry:
+    """1回のセット操作でまとめて入力する馬券.
+
+    同じレース・馬券の種類・金額の馬券は、複数の馬番にチェックを入れて1回で入力できる。
+    組み合わせの馬券は、1件の注文のフォーメーション・ボックス・ながしを1回で入力する。
+
+    Attributes:
+        venue: 競馬場名
+        race_number: レース番号
+        ticket_type: 馬券の種類
+        horse_numbers: 馬番（入力順。組み合わせの馬券の場合は空）
+        amount: 1頭（組み合わせの馬券の場合は1点）あたりの購入金額（円、100円単位）
+        selection: 組み合わせの馬券の馬番の選び方（単勝・複勝の場合はNone）
+    """
+
+    venue: str
+    race_number: int
+    ticket_type: TicketType
+    horse_numbers: tuple[int, ...]
+    amount: int
+    selection: HorseSelection | None = None
+
+
+@dataclass(frozen=True)
+class OrderPlan:
+    """馬券入力の実行計画.
+
+    同一馬券の注文をまとめ、レースごとにグループ化した入力順序を表す。
+
+    Attributes:
+        orders: 入力順に並べた購入注文（同一馬券は金額を合算済み）
+        entries: セット操作の単位にまとめた馬券（入力順）
+        original_count: 計画前の注文件数
+        race_count: 選択するレースの数
+    """
+
+    orders: tuple[BetOrder, ...]
+    entries: tuple[TicketEntry, ...]
+    original_count: int
+    race_count: int
+
+    @property
+    def merged_count(self) -> int:
+        """合算により省略される馬券入力の回数."""
+        return self.original_count - len(self.orders)
+
+    @property
+    def race_selections_saved(self) -> int:
+        """グループ化により省略されるレース選択の回数."""
+        return self.original_count - self.race_count
+
+    @property
+    def set_operations_saved(self) -> int:
+        """合算と複数頭のまとめ入力により省略されるセット操作の回数."""
+        return self.original_count - len(self.entries)
+
+    @property
+    def saved_operations(self) -> int:
+        """注文ごとにレース選択とセット操作を行う場合と比べて省略される画面操作の回数."""
+        return self.set_operations_saved + self.race_selections_saved
+
+
+@dataclass(frozen=True)
+class EntryTiming:
+    """1回のセット操作の所要時間.
+
+    Attributes:
+        entry: 入力した馬券
+        seconds: レース選択（必要な場合）から馬券の入力完了までの所要時間（秒）
+    """
+
+    entry: TicketEntry
+    seconds: float
+
+
+@dataclass(frozen=True)
+class CommandRecord:
+    """WebDriverコマンド1回の実行記録.
+
+    Attributes:
+        phase: 実行時のフェーズ名（フェーズ外で実行した場合は"other"）
+        command: WebDriverのコマンド名（findElement、executeScriptなど）
+        seconds: ChromeDriverとの通信を含む所要時間（秒）
+    """
+
+    phase: str
+    command: str
+    seconds: float
+
+
+@dataclass(frozen=True)
+class CommandProfile:
+    """購入処理中に実行したWebDriverコマンドの記録.
+
+    Attributes:
+        records: コマンドの実行記録（実行順）
+    """
+
+    records: tuple[CommandRecord, ...] = ()
+
+    @property
+    def total_count(self) -> int:
+        """実行したコマンドの回数."""
+        return len(self.records)
+
+    @property
+    def total_seconds(self) -> float:
+        """コマンドの所要時間の合計（秒）."""
+        return sum(record.seconds for record in self.records)
+
+    def count_by_phase(self) -> dict[str, int]:
+        """フェーズごとのコマンドの実行回数を返す.
+
+        Returns:
+            dict[str, int]: フェーズ名ごとの実行回数（最初に実行した順）
+        """
+        counts: dict[str, int] = {}
+        for record in self.records:
+            counts[record.phase] = counts.get(record.phase, 0) + 1
+        return counts
+
+    def count_by_command(self) -> dict[str, int]:
+        """コマンドの種類ごとの実行回数を返す.
+
+        Returns:
+            dict[str, int]: コマンド名ごとの実行回数（最初に実行した順）
+        """
+        counts: dict[str, int] = {}
+        for record in self.records:
+            counts[record.command] = counts.get(record.command, 0) + 1
+        return counts
+
+    def seconds_by_phase(self) -> dict[str, float]:
+        """フェーズごとのコマンドの所要時間の合計を返す.
+
+        Returns:
+            dict[str, float]: フェーズ名ごとの所要時間の合計（秒）
+        """
+        seconds: dict[str, float] = {}
+        for record in self.records:
+            seconds[record.phase] = seconds.get(record.phase, 0.0) + record.seconds
+        return seconds
+
+    def seconds_by_command(self) -> dict[str, float]:
+        """コマンドの種類ごとの所要時間の合計を返す.
+
+        Returns:
+            dict[str, float]: コマンド名ごとの所要時間の合計（秒）
+        """
+        seconds: dict[str, float] = {}
+        for record in self.records:
+            seconds[record.command] = seconds.get(record.command, 0.0) + record.seconds
+        return seconds
+
+
+@dataclass(frozen=True)
+class BetResult:
+    """馬券購入の結果.
+
+    所要時間は`time.perf_counter()`で計測した秒数。
+    `phase_timings`のキーは実行したフェーズのみを含む。
+
+    - driver_resolve: ChromeDriverのパスの解決（driver_cache_file指定時のみ）
+    - launch: Chromeの起動
+    - page_load: 即パットページの読み込み
+    - login: ログイン（セッション切れによる再ログインを含む）
+    - announce: お知らせページの確認と処理
+    - navigation: 購入画面への移動
+    - race_select: 競馬場・レース選択（全レースの合計）
+    - ticket_entry: 馬券の種類・馬番選択と金額入力（全セット操作の合計）
+    - confirm: 購入確定
+    - return: トップ画面への移動
+
+    真偽値としては`success`と同じ値に評価される。
+
+    Attributes:
+        success: 購入が正常に完了したかどうか
+        phase_timings: フェーズ名ごとの所要時間（秒）
+        entry_timings: セット操作ごとの所要時間（入力順）
+        order_count: 購入注文の件数
+        race_count: 入力したレースの数
+        total_amount: 合計購入金額（円）
+        command_profile: 実行したWebDriverコマンドの記録（profile_commandsが無効の場合はNone）
+    """
+
+    success: bool
+    phase_timings: dict[str, float] = field(default_factory=dict)
+    entry_timings: tuple[EntryTiming, ...] = ()
+    order_count: int = 0
+    race_count: int = 0
+    total_amount: int = 0
+    command_profile: CommandProfile | None = None
+
+    def __bool__(self) -> bool:
+        """購入が正常に完了したかどうか."""
+        return self.success
+
+    @property
+    def total_seconds(self) -> float:
+        """全フェーズの所要時間の合計（秒）."""
+        return sum(self.phase_timings.values())
+
+
+@dataclass(frozen=True)
+class ClockOffset:
+    """ホストの時計に対する即パットのサーバの時計のずれ.
+
+    Attributes:
+        offset_seconds: サーバ時刻からホスト時刻を引いた秒数（サーバの時計が進んでいる場合は正）
+        error_seconds: 推定の誤差の範囲（±秒）
+        sample_count: 推定に使用した計測の数
+        measured_at: 推定した時刻（UTC）
+    """
+
+    offset_seconds: float
+    error_seconds: float
+    sample_count: int
+    measured_at: datetime
+
+    def server_now(self, tz: tzinfo | None = None) -> datetime:
+        """現在のサーバ時刻を返す.
+
+        Args:
+            tz: タイムゾーン（Noneの場合はローカル時刻）
+
+        Returns:
+            datetime: 現在のサーバ時刻
+        """
+        return datetime.now(tz) + timedelta(seconds=self.offset_seconds)
+
+    def to_host_time(self, server_time: datetime) -> datetime:
+        """サーバ時刻を同じ瞬間のホスト時刻に変換する.
+
+        Args:
+            server_time: サーバ時刻（発売締切・購入の予定時刻など）
+
+        Returns:
+            datetime: ホスト時刻
+        """
+        return server_time - timedelta(seconds=self.offset_seconds)
+
+
+@dataclass(frozen=True)
+class ScheduleReport:
+    """予約購入の実行結果.
+
+    Attributes:
+        fire_at: 購入の予定時刻
+        warm_up_started_at: ウォームアップ（起動・ログイン・購入画面への移動）の開始時刻
+        warm_up_seconds: ウォームアップに要した時間（秒）
+        fired_at: 購入処理を実際に開始した時刻
+        fire_delay_seconds: 予定時刻（サーバの時計のずれを補正した時刻）に対する購入開始の遅れ
+            （秒、早い場合は負）
+        bet_seconds: 購入処理に要した時間（秒）
+        success: 購入が正常に完了したかどうか
+        bet_result: 購入処理の結果
+        clock_offset: 予定時刻の補正に使用したサーバの時計のずれ（推定していない場合はNone）
+    """
+
+    fire_at: datetime
+    warm_up_started_at: datetime
+    warm_up_seconds: float
+    fired_at: datetime
+    fire_delay_seconds: float
+    bet_seconds: float
+    success: bool
+    bet_result: BetResult
+    clock_offset: ClockOffset | None = None
+
+
+@dataclass(frozen=True)
+class StreamFlush:
+    """ストリーミング購入の1回の送信結果.
+
+    送信のきっかけ（`reason`）は次のいずれか。
+
+    - race: 別のレースの注文が届き、それまでのレースの注文が揃った
+    - deadline: 最初の注文が届いてから送信期限（flush_interval）が経過した
+    - end: 注文の受け付けが終了した
+
+    Attributes:
+        orders: 送信した購入注文（受け付け順）
+        reason: 送信のきっかけ
+        result: 購入結果（購入処理中にエラーが発生した場合はNone）
+        error: 購入処理中に発生したエラーのメッセージ（正常に完了した場合はNone）
+        wait_seconds: 最初の注文を受け付けてから送信を開始するまでの時間（秒）
+        bet_seconds: 購入処理の所要時間（秒）
+    """
+
+    orders: tuple[BetOrder, ...]
+    reason: str
+    result: BetResult | None
+    error: str | None
+    wait_seconds: float
+    bet_seconds: float
+
+    @property
+    def success(self) -> bool:
+        """購入が正常に完了したかどうか."""
+        return self.result is not None and self.result.success
+
+
+@dataclass(frozen=True)
+class RaceSubmission:
+    """締切順の購入での1レース分の送信結果.
+
+    Attributes:
+        venue: 競馬場名
+        race_number: レース番号
+        orders: このレースの購入注文
+        deadline: 発売締切時刻（締切時刻を指定した注文のうち最も早い時刻。指定がない場合はNone）
+        estimated_seconds: 送信開始から購入確定までの見込み時間（秒）
+        refused: 締切に間に合わないため送信しなかったかどうか
+        result: 購入結果（送信しなかった場合、購入処理中にエラーが発生した場合はNone）
+        error: 送信しなかった理由、または購入処理中に発生したエラーのメッセージ
+    """
+
+    venue: str
+    race_number: int
+    orders: tuple[BetOrder, ...]
+    deadline: datetime | None
+    estimated_seconds: float
+    refused: bool
+    result: BetResult | None
+    error: str | None
+
+    @property
+    def success(self) -> bool:
+        """購入が正常に完了したかどうか."""
+        return self.result is not None and self.result.success
+
+
+@dataclass(frozen=True)
+class DeadlineReport:
+    """締切順の購入の実行結果.
+
+    Attributes:
+        submissions: レースごとの送信結果（送信を判断した順）
+    """
+
+    submissions: tuple[RaceSubmission, ...]
+
+    @property
+    def success(self) -> bool:
+        """全てのレースの購入が正常に完了したかどうか."""
+        return all(submission.success for submission in self.submissions)
+
+    @property
+    def refused_orders(self) -> tuple[BetOrder, ...]:
+        """締切に間に合わないため送信しなかった購入注文."""
+        return tuple(
+            order
+            for submission in self.submissions
+            if submission.refused
+            for order in submission.orders
+        )
+
+
+@dataclass(frozen=True)
+class BettingAccount:
+    """複数口座での購入に使用する口座.
+
+    Attributes:
+        name: 口座名（購入結果の識別に使用）
+        credentials: 即パットの認証情報
+        max_bet: この口座で購入する最大合計金額（円）
+    """
+
+    name: str
+    credentials: IpatCredentials
+    max_bet: int = 10000
 
     def __post_init__(self) -> None:
         """バリデーション.
@@ -109,5 +851,31 @@ class AutoBetConfig:
         Raises:
             ValueError: パラメータが不正な場合
         """
+        if not self.name:
+            raise ValueError("口座名は必須です")
         if self.max_bet < 100:
             raise ValueError(f"最大合計購入金額は100円以上で指定してください: {self.max_bet}")
+
+
+@dataclass(frozen=True)
+class AccountBetResult:
+    """1口座分の購入結果.
+
+    Attributes:
+        account_name: 口座名
+        orders: この口座に割り当てた購入注文
+        result: 購入結果（購入処理中にエラーが発生した場合はNone）
+        error: 購入処理中に発生したエラーのメッセージ（正常に完了した場合はNone）
+        seconds: ワーカープロセスでの購入処理の所要時間（秒）
+    """
+
+    account_name: str
+    orders: tuple[BetOrder, ...]
+    result: BetResult | None
+    error: str | None
+    seconds: float
+
+    @property
+    def success(self) -> bool:
+        """購入が正常に完了したかどうか."""
+        return self.result is not None and self.result.success
@@ -0,0 +1,319 @@
+"""複数口座での並列購入モジュール.
+
+購入注文を複数の即パット口座に振り分け、口座ごとのブラウザを並列に操作して購入する機能を提供する。
+"""
+
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+
+from selenium.common.exceptions import WebDriverException
+
+from keiba_auto_bet.auto_bet import AutoBetter
+from keiba_auto_bet.exceptions import KeibaAutoBetError, ValidationError
+from keiba_auto_bet.models import (
+    AccountBetResult,
+    AutoBetConfig,
+    BetOrder,
+    BetResult,
+    BettingAccount,
+    IpatCredentials,
+    validate_orders,
+)
+
+_DEFAULT_MAX_WORKERS = 2  # 同時に起動するブラウザの数
+
+
+class MultiAccountBetter:
+    """複数口座での並列購入クライアント.
+
+    購入注文を口座ごとの最大合計購入金額に収まるように振り分け、
+    口座ごとに別プロセスでChromeを起動して並列に購入する。
+    ワーカープロセスはspawn方式で起動するため、呼び出し側のスクリプトでは
+    `if __name__ == "__main__":`の中から実行すること。
+
+    Attributes:
+        _accounts: 購入に使用する口座
+        _config: 自動購入の設定（max_betは口座ごとの値で上書きする）
+        _max_workers: 同時に起動するブラウザの数
+        _logger: ロガーインスタンス
+    """
+
+    def __init__(
+        self,
+        accounts: list[BettingAccount],
+        config: AutoBetConfig | None = None,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """コンストラクタ.
+
+        Args:
+            accounts: 購入に使用する口座
+            config: 自動購入の設定（Noneの場合はデフォルト設定を使用）
+            max_workers: 同時に起動するブラウザの数
+            logger: ロガーインスタンス。Noneの場合はモジュールロガーを使用
+
+        Raises:
+            ValueError: 口座が指定されていない場合、口座名が重複している場合、
+                またはmax_workersが1未満の場合
+        """
+        if not accounts:
+            raise ValueError("口座を1つ以上指定してください")
+        names = [account.name for account in accounts]
+        if len(set(names)) != len(names):
+            raise ValueError(f"口座名が重複しています: {names}")
+        if max_workers < 1:
+            raise ValueError(f"同時に起動するブラウザの数は1以上で指定してください: {max_workers}")
+        if config is None:
+            config = AutoBetConfig()
+        if logger is None:
+            logger = logging.getLogger(__name__)
+
+        self._accounts = list(accounts)
+        self._config = config
+        self._max_workers = max_workers
+        self._logger = logger
+
+    def bet(self, orders: list[BetOrder]) -> list[AccountBetResult]:
+        """購入注文を口座に振り分けて並列に購入する.
+
+        注文が割り当てられなかった口座ではブラウザを起動しない。
+        一部の口座で購入に失敗しても他の口座の購入は継続し、結果にエラーを記録する。
+        ワーカープロセスが異常終了した場合も、その口座の結果にエラーを記録する。
+
+        Args:
+            orders: 全口座分の購入注文リスト
+
+        Returns:
+            list[AccountBetResult]: 注文を割り当てた口座ごとの購入結果（口座の指定順）
+
+        Raises:
+            ValidationError: 入力内容のバリデーションエラー、
+                または口座の最大合計購入金額に収まらない注文がある場合
+        """
+        total_capacity = sum(account.max_bet for account in self._accounts)
+        validate_orders(orders, total_capacity)
+        shards = shard_orders(orders, self._accounts)
+        targets = [account for account in self._accounts if shards[account.name]]
+        self._logger.info(
+            "%d件の注文を%d口座に振り分けました（同時実行数%d）",
+            len(orders),
+            len(targets),
+            min(self._max_workers, len(targets)),
+        )
+
+        start = time.perf_counter()
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=min(self._max_workers, len(targets)), mp_context=context
+        ) as executor:
+            futures = [
+                (
+                    account,
+                    executor.submit(
+                        _bet_worker,
+                        account.credentials,
+                        replace(self._config, max_bet=account.max_bet),
+                        shards[account.name],
+                    ),
+                )
+                for account in targets
+            ]
+            results = []
+            for account, future in futures:
+                try:
+                    result, error, seconds = future.result()
+                except Exception as exc:
+                    # ワーカープロセスの異常終了や結果の受け渡しの失敗は、その口座のエラーとする
+                    result, error = None, f"ワーカープロセスでエラーが発生しました: {exc!r}"
+                    seconds = time.perf_counter() - start
+                if error is not None:
+                    self._logger.error("口座%sの購入に失敗しました: %s", account.name, error)
+                results.append(
+                    AccountBetResult(
+                        account_name=account.name,
+                        orders=tuple(shards[account.name]),
+                        result=result,
+                        error=error,
+                        seconds=seconds,
+                    )
+                )
+        return results
+
+
+def shard_orders(
+    orders: list[BetOrder], accounts: list[BettingAccount]
+) -> dict[str, list[BetOrder]]:
+    """購入注文を口座ごとの最大合計購入金額に収まるように振り分ける.
+
+    金額の大きい注文から順に、残りの購入可能額が最も大きい口座に割り当てる。
+    口座ごとの購入金額が均等に近づくため、並列購入の所要時間も揃いやすい。
+    この割り当てで収まらない場合は、全口座に収まる割り当てを探索する。
+    各口座の注文は元の注文リストの順序を保つ。注文の分割は行わない。
+
+    Args:
+        orders: 購入注文リスト
+        accounts: 購入に使用する口座
+
+    Returns:
+        dict[str, list[BetOrder]]: 口座名ごとの購入注文（注文のない口座は空リスト）
+
+    Raises:
+        ValidationError: 全ての注文を口座の最大合計購入金額に収める割り当てがない場合
+    """
+    by_amount = sorted(
+        range(len(orders)), key=lambda index: orders[index].total_amount, reverse=True
+    )
+    amounts = [orders[index].total_amount for index in by_amount]
+    capacities = [account.max_bet for account in accounts]
+
+    slots = _assign_balanced(amounts, capacities)
+    if slots is None:
+        slots = _assign_exhaustive(amounts, capacities)
+    if slots is None:
+        total_amount = sum(amounts)
+        shortfall = total_amount - _max_assignable(amounts, capacities)
+        raise ValidationError(
+            f"口座の最大合計購入金額に収まるように注文を振り分けられません: "
+            f"不足額{shortfall}円（合計金額{total_amount}円）"
+        )
+
+    assigned: dict[str, list[int]] = {account.name: [] for account in accounts}
+    for index, slot in zip(by_amount, slots):
+        assigned[accounts[slot].name].append(index)
+    return {
+        name: [orders[index] for index in sorted(indexes)] for name, indexes in assigned.items()
+    }
+
+
+def _assign_balanced(amounts: list[int], capacities: list[int]) -> list[int] | None:
+    """金額の大きい順の注文を、残りの購入可能額が最も大きい口座に割り当てる.
+
+    Args:
+        amounts: 金額の大きい順の注文の金額（円）
+        capacities: 口座ごとの最大合計購入金額（円）
+
+    Returns:
+        list[int] | None: 注文ごとの口座の番号（収まらない注文がある場合はNone）
+    """
+    remaining = list(capacities)
+    slots = []
+    for amount in amounts:
+        slot = max(range(len(remaining)), key=remaining.__getitem__)
+        if remaining[slot] < amount:
+            return None
+        remaining[slot] -= amount
+        slots.append(slot)
+    return slots
+
+
+def _assign_exhaustive(amounts: list[int], capacities: list[int]) -> list[int] | None:
+    """金額の大きい順の注文を全口座に収める割り当てをバックトラッキングで探索する.
+
+    残りの購入可能額が同じ口座は区別せず、収まらないと分かった
+    (注文の位置, 残りの購入可能額の組)は再度探索しない。
+
+    Args:
+        amounts: 金額の大きい順の注文の金額（円）
+        capacities: 口座ごとの最大合計購入金額（円）
+
+    Returns:
+        list[int] | None: 注文ごとの口座の番号（収まる割り当てがない場合はNone）
+    """
+    remaining = list(capacities)
+    slots: list[int] = []
+    failed: set[tuple[int, tuple[int, ...]]] = set()
+    rest = [sum(amounts[position:]) for position in range(len(amounts) + 1)]
+
+    def place(position: int) -> bool:
+        if position == len(amounts):
+            return True
+        state = (position, tuple(sorted(remaining)))
+        if state in failed or rest[position] > sum(remaining):
+            return False
+        tried = set()
+        for slot in sorted(range(len(remaining)), key=lambda index: -remaining[index]):
+            if remaining[slot] < amounts[position] or remaining[slot] in tried:
+                continue
+            tried.add(remaining[slot])
+            remaining[slot] -= amounts[position]
+            slots.append(slot)
+            if place(position + 1):
+                return True
+            remaining[slot] += amounts[position]
+            slots.pop()
+        failed.add(state)
+        return False
+
+    return slots if place(0) else None
+
+
+def _max_assignable(amounts: list[int], capacities: list[int]) -> int:
+    """口座の最大合計購入金額に収めて割り当てられる注文の金額の最大値を求める.
+
+    Args:
+        amounts: 金額の大きい順の注文の金額（円）
+        capacities: 口座ごとの最大合計購入金額（円）
+
+    Returns:
+        int: 割り当てられる注文の合計金額の最大値（円）
+    """
+    memo: dict[tuple[int, tuple[int, ...]], int] = {}
+    rest = [sum(amounts[position:]) for position in range(len(amounts) + 1)]
+
+    def best(position: int, remaining: tuple[int, ...]) -> int:
+        if position == len(amounts):
+            return 0
+        state = (position, remaining)
+        if state not in memo:
+            # 割り当てられる金額は、残りの注文の合計と残りの購入可能額の合計を超えない
+            bound = min(rest[position], sum(remaining))
+            result = 0
+            for slot, capacity in enumerate(remaining):
+                if capacity < amounts[position] or capacity in remaining[:slot]:
+                    continue
+                placed = remaining[:slot] + (capacity - amounts[position],) + remaining[slot + 1 :]
+                result = max(result, amounts[position] + best(position + 1, tuple(sorted(placed))))
+                if result == bound:
+                    break
+            if result < bound:
+                # この注文を割り当てない場合
+                result = max(result, best(position + 1, remaining))
+            memo[state] = result
+        return memo[state]
+
+    return best(0, tuple(sorted(capacities)))
+
+
+def _bet_worker(
+    credentials: IpatCredentials,
+    config: AutoBetConfig,
+    orders: list[BetOrder],
+) -> tuple[BetResult | None, str | None, float]:
+    """ワーカープロセスで1口座分の購入を行う.
+
+    例外はプロセス間で受け渡せるようにメッセージに変換して返す。
+    KeibaAutoBetErrorに変換されない例外（Chromeの起動前に発生したWebDriverExceptionなど）も
+    メッセージに変換し、ワーカープロセスの外に送出しない。
+
+    Args:
+        credentials: 即パットの認証情報
+        config: 自動購入の設定
+        orders: この口座の購入注文リスト
+
+    Returns:
+        tuple[BetResult | None, str | None, float]: (購入結果, エラーメッセージ, 所要時間（秒）)
+    """
+    start = time.perf_counter()
+    try:
+        result = AutoBetter(credentials, config).bet(orders)
+    except KeibaAutoBetError as exc:
+        return None, str(exc), time.perf_counter() - start
+    except WebDriverException as exc:
+        return None, f"WebDriverでエラーが発生しました: {exc}", time.perf_counter() - start
+    except Exception as exc:
+        return None, f"予期しないエラーが発生しました: {exc!r}", time.perf_counter() - start
+    return result, None, time.perf_counter() - start
@@ -0,0 +1,76 @@
+"""馬券入力の計画モジュール.
+
+購入注文リストを画面操作の少ない入力順序に並べ替える機能を提供する。
+"""
+
+from dataclasses import replace
+
+from keiba_auto_bet.models import BetOrder, HorseSelection, OrderPlan, TicketEntry, TicketType
+
+
+def plan_orders(orders: list[BetOrder]) -> OrderPlan:
+    """購入注文リストから馬券入力の実行計画を作成する.
+
+    競馬場・レース番号・馬券の種類・馬番（組み合わせの馬券では馬番の選び方）が同じ注文は
+    金額を合算して1件にまとめ、
+    同じレースの注文が連続するようにレースごとにグループ化する。
+    さらに、同じレース・馬券の種類・金額の馬券は1回のセット操作で入力できるよう
+    `TicketEntry`にまとめる。
+    レースの順序と、レース内の馬券の順序は、注文リストに最初に現れた順序を保つ。
+
+    Args:
+        orders: 購入注文リスト
+
+    Returns:
+        OrderPlan: 馬券入力の実行計画
+    """
+    races: dict[
+        tuple[str, int], dict[tuple[TicketType, int | None, HorseSelection | None], BetOrder]
+    ] = {}
+    for order in orders:
+        tickets = races.setdefault((order.venue, order.race_number), {})
+        key = (order.ticket_type, order.horse_number, order.selection)
+        merged = tickets.get(key)
+        if merged is None:
+            tickets[key] = order
+        else:
+            tickets[key] = replace(merged, amount=merged.amount + order.amount)
+
+    planned = tuple(order for tickets in races.values() for order in tickets.values())
+    return OrderPlan(
+        orders=planned,
+        entries=_group_entries(planned),
+        original_count=len(orders),
+        race_count=len(races),
+    )
+
+
+def _group_entries(orders: tuple[BetOrder, ...]) -> tuple[TicketEntry, ...]:
+    """同じレース・馬券の種類・金額の注文を1回のセット操作にまとめる.
+
+    組み合わせの馬券は、馬番の選び方ごとに1回のセット操作で入力する。
+
+    Args:
+        orders: レースごとにグループ化済みの購入注文
+
+    Returns:
+        tuple[TicketEntry, ...]: セット操作の単位にまとめた馬券
+    """
+    groups: dict[tuple[str, int, TicketType, int, HorseSelection | None], list[int]] = {}
+    for order in orders:
+        key = (order.venue, order.race_number, order.ticket_type, order.amount, order.selection)
+        horse_numbers = groups.setdefault(key, [])
+        if order.horse_number is not None:
+            horse_numbers.append(order.horse_number)
+
+    return tuple(
+        TicketEntry(
+            venue=venue,
+            race_number=race_number,
+            ticket_type=ticket_type,
+            horse_numbers=tuple(horse_numbers),
+            amount=amount,
+            selection=selection,
+        )
+        for (venue, race_number, ticket_type, amount, selection), horse_numbers in groups.items()
+    )
@@ -0,0 +1,196 @@
+"""Chromeプロファイル管理モジュール.
+
+実行をまたいで再利用するChromeのユーザーデータディレクトリ（プロファイル）を管理する。
+プロファイルにはディスクキャッシュが残るため、2回目以降の起動では即パットの
+JavaScript・CSSを再取得せずにページを読み込める。
+"""
+
+import os
+import shutil
+import sys
+from pathlib import Path
+from types import TracebackType
+
+from keiba_auto_bet.exceptions import BrowserError
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+_MAX_PROFILE_SLOTS = 32  # 同時に使用できるプロファイルの最大数
+_LOCK_FILE_NAME = ".keiba_auto_bet.lock"
+# サイズ上限を超えた場合に削除するキャッシュ（プロファイルからの相対パス）
+_CACHE_DIR_NAMES = (
+    "Default/Cache",
+    "Default/Code Cache",
+    "Default/GPUCache",
+    "Default/Service Worker/CacheStorage",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+    "ShaderCache",
+)
+
+
+class ChromeProfile:
+    """ロックを取得したChromeプロファイル.
+
+    ロックはファイルロックのため、プロセスが異常終了した場合もOSが自動的に解放する。
+
+    Attributes:
+        path: プロファイルのディレクトリ
+        _lock_fd: ロックファイルのファイルディスクリプタ（解放済みの場合はNone）
+    """
+
+    def __init__(self, path: Path, lock_fd: int) -> None:
+        """コンストラクタ.
+
+        Args:
+            path: プロファイルのディレクトリ
+            lock_fd: ロック済みのロックファイルのファイルディスクリプタ
+        """
+        self.path = path
+        self._lock_fd: int | None = lock_fd
+
+    def __enter__(self) -> "ChromeProfile":
+        """自身を返す.
+
+        Returns:
+            ChromeProfile: 自身のインスタンス
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """ロックを解放する."""
+        self.release()
+
+    @property
+    def is_locked(self) -> bool:
+        """ロックを保持しているかどうか."""
+        return self._lock_fd is not None
+
+    def release(self) -> None:
+        """ロックを解放する（解放済みの場合は何もしない）."""
+        if self._lock_fd is None:
+            return
+        _unlock(self._lock_fd)
+        os.close(self._lock_fd)
+        self._lock_fd = None
+
+
+def acquire_profile(root: str | Path, max_bytes: int) -> ChromeProfile:
+    """空いているプロファイルのロックを取得する.
+
+    `root`配下の`slot-0`、`slot-1`、...の順に、他のセッションが使用していない
+    プロファイルを探してロックする。使用するプロファイルのサイズが`max_bytes`を
+    超えている場合は、ロック後にキャッシュを削除してから返す。
+
+    Args:
+        root: プロファイルを配置するディレクトリ
+        max_bytes: 1つのプロファイルの最大サイズ（バイト）
+
+    Returns:
+        ChromeProfile: ロックを取得したプロファイル
+
+    Raises:
+        BrowserError: 空いているプロファイルがない場合
+    """
+    root_path = Path(root)
+    for index in range(_MAX_PROFILE_SLOTS):
+        path = root_path / f"slot-{index}"
+        path.mkdir(parents=True, exist_ok=True)
+        lock_fd = _try_lock(path / _LOCK_FILE_NAME)
+        if lock_fd is None:
+            continue
+        profile = ChromeProfile(path, lock_fd)
+        prune_profile(path, max_bytes)
+        return profile
+    raise BrowserError(f"空いているChromeプロファイルがありません: {root_path}")
+
+
+def prune_profile(path: str | Path, max_bytes: int) -> bool:
+    """プロファイルのサイズが上限を超えている場合にキャッシュを削除する.
+
+    キャッシュを削除しても上限を超えている場合は、ロックファイル以外をすべて削除する。
+    ロックを取得したプロファイルに対してのみ呼び出すこと。
+
+    Args:
+        path: プロファイルのディレクトリ
+        max_bytes: プロファイルの最大サイズ（バイト）
+
+    Returns:
+        bool: 削除を行った場合はTrue
+    """
+    profile_path = Path(path)
+    if _directory_size(profile_path) <= max_bytes:
+        return False
+    for name in _CACHE_DIR_NAMES:
+        shutil.rmtree(profile_path / name, ignore_errors=True)
+    if _directory_size(profile_path) > max_bytes:
+        for child in profile_path.iterdir():
+            if child.name == _LOCK_FILE_NAME:
+                continue
+            if child.is_dir() and not child.is_symlink():
+                shutil.rmtree(child, ignore_errors=True)
+            else:
+                child.unlink(missing_ok=True)
+    return True
+
+
+def _directory_size(path: Path) -> int:
+    """ディレクトリ配下のファイルサイズの合計を返す.
+
+    Args:
+        path: ディレクトリ
+
+    Returns:
+        int: ファイルサイズの合計（バイト）
+    """
+    total = 0
+    for directory, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(directory, name)).st_size
+            except OSError:
+                # Chromeが削除中のファイルは無視する
+                continue
+    return total
+
+
+def _try_lock(lock_path: Path) -> int | None:
+    """ロックファイルの排他ロックを取得する.
+
+    Args:
+        lock_path: ロックファイルのパス
+
+    Returns:
+        int | None: ロックを取得したファイルディスクリプタ。使用中の場合はNone
+    """
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if sys.platform == "win32":
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _unlock(fd: int) -> None:
+    """ロックファイルの排他ロックを解放する.
+
+    Args:
+        fd: ロックを取得したファイルディスクリプタ
+    """
+    if sys.platform == "win32":
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
@@ -0,0 +1,369 @@
+"""予約購入モジュール.
+
+締切直前の購入に備えて事前にログインしておき、指定時刻に購入を実行する機能と、
+発売締切の早いレースから順に購入する機能を提供する。
+"""
+
+import logging
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from keiba_auto_bet.backend import BetBackend
+from keiba_auto_bet.exceptions import KeibaAutoBetError
+from keiba_auto_bet.models import (
+    BetOrder,
+    BetResult,
+    ClockOffset,
+    DeadlineReport,
+    RaceSubmission,
+    ScheduleReport,
+    validate_orders,
+)
+from keiba_auto_bet.planner import plan_orders
+
+_DEFAULT_LEAD_TIME = 60.0  # ウォームアップを開始する予定時刻からの前倒し秒数
+_DEFAULT_SAFETY_MARGIN = 3.0  # 購入確定を終えておく発売締切からの前倒し秒数
+_DEFAULT_ENTRY_SECONDS = 1.5  # 計測前の1回のセット操作の見込み秒数
+_DEFAULT_OVERHEAD_SECONDS = 5.0  # 計測前の購入画面への移動・レース選択・購入確定の見込み秒数
+_COST_SMOOTHING = 0.5  # 見込み時間に計測値を反映する重み
+# 送信開始から購入確定までにかかる、セット操作以外のフェーズ
+_OVERHEAD_PHASES = ("navigation", "race_select", "confirm")
+
+
+class BetScheduler:
+    """予約購入スケジューラ.
+
+    予定時刻の`lead_time`秒前にウォームアップ（`AutoBetter`ではChromeの起動・ログイン・
+    購入画面への移動）を済ませ、予定時刻になったら馬券の入力と購入確定のみを実行する。
+
+    Attributes:
+        _better: 購入に使用するクライアント
+        _lead_time: ウォームアップを開始する予定時刻からの前倒し秒数
+        _logger: ロガーインスタンス
+    """
+
+    def __init__(
+        self,
+        better: BetBackend,
+        lead_time: float = _DEFAULT_LEAD_TIME,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """コンストラクタ.
+
+        Args:
+            better: 購入に使用するクライアント
+            lead_time: ウォームアップを開始する予定時刻からの前倒し秒数
+            logger: ロガーインスタンス。Noneの場合はモジュールロガーを使用
+
+        Raises:
+            ValueError: lead_timeが0以下の場合
+        """
+        if lead_time <= 0:
+            raise ValueError(f"前倒し秒数は0より大きい値で指定してください: {lead_time}")
+        if logger is None:
+            logger = logging.getLogger(__name__)
+
+        self._better = better
+        self._lead_time = lead_time
+        self._logger = logger
+
+    def run(self, orders: list[BetOrder], fire_at: datetime) -> ScheduleReport:
+        """予定時刻に馬券を購入する.
+
+        予定時刻の`lead_time`秒前まで待機してからウォームアップを行い、
+        予定時刻になったら購入を実行する。呼び出し時点でウォームアップ開始時刻を
+        過ぎている場合は直ちにウォームアップを開始する。
+        予定時刻はサーバ時刻として扱い、クライアントがサーバの時計のずれを推定している場合は
+        ホストの時計をずれの分だけ補正して待機する。
+        クライアントのセッションが開始されていない場合は、購入後にセッションを終了する。
+
+        Args:
+            orders: 購入注文リスト
+            fire_at: 購入の予定時刻（タイムゾーン付きの場合はそのタイムゾーンで比較する）
+
+        Returns:
+            ScheduleReport: 予約購入の実行結果
+
+        Raises:
+            ValidationError: 入力内容のバリデーションエラー
+            KeibaAutoBetError: 購入処理中にエラーが発生した場合
+        """
+        # ウォームアップ前に検証し、不正な注文でログインまで済ませてしまうことを防ぐ
+        validate_orders(orders, self._better.config.max_bet)
+
+        _sleep_until(
+            _to_host_time(fire_at - timedelta(seconds=self._lead_time), self._better.clock_offset)
+        )
+
+        owns_session = not self._better.is_open
+        try:
+            warm_up_started_at = datetime.now(fire_at.tzinfo)
+            warm_up_start = time.perf_counter()
+            self._better.warm_up()
+            warm_up_seconds = time.perf_counter() - warm_up_start
+            self._logger.info("ウォームアップが完了しました（%.2f秒）", warm_up_seconds)
+
+            # ウォームアップ中に推定したサーバの時計のずれで予定時刻を補正する
+            clock_offset = self._better.clock_offset
+            host_fire_at = _to_host_time(fire_at, clock_offset)
+            if datetime.now(fire_at.tzinfo) > host_fire_at:
+                self._logger.warning(
+                    "ウォームアップが予定時刻に間に合いませんでした。前倒し秒数を見直してください"
+                )
+
+            _sleep_until(host_fire_at)
+
+            fired_at = datetime.now(fire_at.tzinfo)
+            bet_start = time.perf_counter()
+            bet_result = self._better.bet(orders)
+            bet_seconds = time.perf_counter() - bet_start
+        finally:
+            if owns_session:
+                self._better.close()
+
+        return ScheduleReport(
+            fire_at=fire_at,
+            warm_up_started_at=warm_up_started_at,
+            warm_up_seconds=warm_up_seconds,
+            fired_at=fired_at,
+            fire_delay_seconds=(fired_at - host_fire_at).total_seconds(),
+            bet_seconds=bet_seconds,
+            success=bet_result.success,
+            bet_result=bet_result,
+            clock_offset=clock_offset,
+        )
+
+
+def _to_host_time(server_time: datetime, clock_offset: ClockOffset | None) -> datetime:
+    """サーバ時刻をホスト時刻に変換する.
+
+    Args:
+        server_time: サーバ時刻
+        clock_offset: サーバの時計のずれ（Noneの場合は補正しない）
+
+    Returns:
+        datetime: ホスト時刻
+    """
+    return server_time if clock_offset is None else clock_offset.to_host_time(server_time)
+
+
+def _sleep_until(target: datetime) -> None:
+    """指定時刻まで待機する.
+
+    指定時刻を既に過ぎている場合は直ちに戻る。
+
+    Args:
+        target: 待機を終える時刻
+    """
+    remaining = (target - datetime.now(target.tzinfo)).total_seconds()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+class DeadlineScheduler:
+    """締切順の購入スケジューラ.
+
+    購入注文をレースごとにまとめ、発売締切（`BetOrder.deadline`）の早いレースから順に
+    1レースずつ購入を確定する。締切時刻のない注文は締切のある注文の後に購入する。
+
+    送信開始から購入確定までの見込み時間は「セット操作以外の時間＋セット操作の回数×
+    1回のセット操作の時間」で見積もり、購入のたびに`BetResult`の計測値で更新する。
+    見込み時間で締切の`safety_margin`秒前までに購入確定を終えられないレースは送信せず、
+    `RaceSubmission.refused`として報告する。
+
+    Attributes:
+        _better: 購入に使用するクライアント
+        _safety_margin: 購入確定を終えておく発売締切からの前倒し秒数
+        _entry_seconds: 1回のセット操作の見込み秒数
+        _overhead_seconds: セット操作以外（購入画面への移動・レース選択・購入確定）の見込み秒数
+        _logger: ロガーインスタンス
+    """
+
+    def __init__(
+        self,
+        better: BetBackend,
+        safety_margin: float = _DEFAULT_SAFETY_MARGIN,
+        entry_seconds: float = _DEFAULT_ENTRY_SECONDS,
+        overhead_seconds: float = _DEFAULT_OVERHEAD_SECONDS,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """コンストラクタ.
+
+        Args:
+            better: 購入に使用するクライアント
+            safety_margin: 購入確定を終えておく発売締切からの前倒し秒数
+            entry_seconds: 計測前の1回のセット操作の見込み秒数
+            overhead_seconds: 計測前のセット操作以外の見込み秒数
+            logger: ロガーインスタンス。Noneの場合はモジュールロガーを使用
+
+        Raises:
+            ValueError: 秒数に負の値を指定した場合
+        """
+        for name, seconds in (
+            ("safety_margin", safety_margin),
+            ("entry_seconds", entry_seconds),
+            ("overhead_seconds", overhead_seconds),
+        ):
+            if seconds < 0:
+                raise ValueError(f"{name}は0以上の値で指定してください: {seconds}")
+        if logger is None:
+            logger = logging.getLogger(__name__)
+
+        self._better = better
+        self._safety_margin = safety_margin
+        self._entry_seconds = entry_seconds
+        self._overhead_seconds = overhead_seconds
+        self._logger = logger
+
+    @property
+    def entry_seconds(self) -> float:
+        """1回のセット操作の見込み秒数."""
+        return self._entry_seconds
+
+    @property
+    def overhead_seconds(self) -> float:
+        """セット操作以外の見込み秒数."""
+        return self._overhead_seconds
+
+    def estimate_seconds(self, orders: list[BetOrder]) -> float:
+        """購入注文の送信開始から購入確定までの見込み時間を返す.
+
+        Args:
+            orders: 購入注文リスト
+
+        Returns:
+            float: 見込み時間（秒）
+        """
+        entries = len(plan_orders(orders).entries)
+        return self._overhead_seconds + self._entry_seconds * entries
+
+    def run(self, orders: list[BetOrder]) -> DeadlineReport:
+        """発売締切の早いレースから順に購入する.
+
+        各レースの送信直前に残り時間（クライアントが推定したサーバの時計のずれで補正する）と
+        見込み時間を比較し、締切に間に合わないレースは
+        送信せずに次のレースへ進む。購入処理のエラーは`RaceSubmission.error`に記録し、
+        残りのレースの購入を続ける。
+        クライアントのセッションが開始されていない場合は、購入後にセッションを終了する。
+
+        Args:
+            orders: 購入注文リスト
+
+        Returns:
+            DeadlineReport: レースごとの送信結果
+
+        Raises:
+            ValidationError: 入力内容のバリデーションエラー
+            KeibaAutoBetError: セッションの開始に失敗した場合
+        """
+        # ウォームアップ前に検証し、不正な注文でログインまで済ませてしまうことを防ぐ
+        validate_orders(orders, self._better.config.max_bet)
+
+        submissions: list[RaceSubmission] = []
+        owns_session = not self._better.is_open
+        try:
+            self._better.warm_up()
+            for race_orders in _group_by_deadline(orders):
+                submissions.append(self._submit(race_orders))
+        finally:
+            if owns_session:
+                self._better.close()
+        return DeadlineReport(submissions=tuple(submissions))
+
+    def _submit(self, orders: list[BetOrder]) -> RaceSubmission:
+        """1レース分の購入注文を、締切に間に合う場合のみ購入する.
+
+        Args:
+            orders: 1レース分の購入注文
+
+        Returns:
+            RaceSubmission: 送信結果
+        """
+        venue, race_number = orders[0].venue, orders[0].race_number
+        deadline = _race_deadline(orders)
+        estimated = self.estimate_seconds(orders)
+        submission = RaceSubmission(
+            venue=venue,
+            race_number=race_number,
+            orders=tuple(orders),
+            deadline=deadline,
+            estimated_seconds=estimated,
+            refused=False,
+            result=None,
+            error=None,
+        )
+
+        if deadline is not None:
+            host_deadline = _to_host_time(deadline, self._better.clock_offset)
+            remaining = (host_deadline - datetime.now(deadline.tzinfo)).total_seconds()
+            available = remaining - self._safety_margin
+            if estimated > available:
+                error = (
+                    f"締切に間に合わないため送信しませんでした: {venue}{race_number}R"
+                    f"（締切まで{remaining:.1f}秒、見込み{estimated:.1f}秒）"
+                )
+                self._logger.warning(error)
+                return replace(submission, refused=True, error=error)
+
+        try:
+            result = self._better.bet(orders)
+        except KeibaAutoBetError as exc:
+            self._logger.error("%s%dRの購入に失敗しました: %s", venue, race_number, exc)
+            return replace(submission, error=str(exc))
+        self._update_estimates(result)
+        return replace(submission, result=result)
+
+    def _update_estimates(self, result: BetResult) -> None:
+        """購入結果の計測値で見込み時間を更新する.
+
+        Args:
+            result: 購入結果
+        """
+        entries = len(result.entry_timings)
+        if entries and "ticket_entry" in result.phase_timings:
+            measured = result.phase_timings["ticket_entry"] / entries
+            self._entry_seconds += (measured - self._entry_seconds) * _COST_SMOOTHING
+        overhead = [result.phase_timings[p] for p in _OVERHEAD_PHASES if p in result.phase_timings]
+        if overhead:
+            self._overhead_seconds += (sum(overhead) - self._overhead_seconds) * _COST_SMOOTHING
+        self._logger.debug(
+            "見込み時間を更新しました: セット操作%.2f秒、その他%.2f秒",
+            self._entry_seconds,
+            self._overhead_seconds,
+        )
+
+
+def _group_by_deadline(orders: list[BetOrder]) -> list[list[BetOrder]]:
+    """購入注文をレースごとにまとめ、発売締切の早い順に並べる.
+
+    締切時刻のないレースは締切のあるレースの後に、注文の順序のまま並べる。
+
+    Args:
+        orders: 購入注文リスト
+
+    Returns:
+        list[list[BetOrder]]: レースごとの購入注文
+    """
+    races: dict[tuple[str, int], list[BetOrder]] = {}
+    for order in orders:
+        races.setdefault((order.venue, order.race_number), []).append(order)
+
+    def sort_key(race_orders: list[BetOrder]) -> tuple[bool, float]:
+        deadline = _race_deadline(race_orders)
+        return (deadline is None, deadline.timestamp() if deadline is not None else 0.0)
+
+    return sorted(races.values(), key=sort_key)
+
+
+def _race_deadline(orders: list[BetOrder]) -> datetime | None:
+    """1レース分の購入注文の発売締切時刻を返す.
+
+    Args:
+        orders: 1レース分の購入注文
+
+    Returns:
+        datetime | None: 締切時刻を指定した注文のうち最も早い時刻（指定がない場合はNone）
+    """
+    deadlines = [order.deadline for order in orders if order.deadline is not None]
+    return min(deadlines, key=lambda deadline: deadline.timestamp(), default=None)
@@ -0,0 +1,182 @@
+"""即パットのサーバ時刻の推定モジュール.
+
+ホストの時計は即パットのサーバの時計からずれている場合があるため、サーバの応答の
+Dateヘッダと往復時間からホストの時計に対するサーバの時計のずれを推定する。
+Dateヘッダは1秒単位のため、送信時刻を1秒の中でずらした複数回の計測を組み合わせて
+ずれの範囲を狭める。
+"""
+
+import http.client
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from keiba_auto_bet.models import ClockOffset
+
+_DEFAULT_SAMPLE_COUNT = 5
+
+
+@dataclass(frozen=True)
+class _ClockSample:
+    """1回の計測結果.
+
+    Attributes:
+        sent: リクエストの送信直前のホスト時刻（UNIX時間）
+        received: レスポンスの受信直後のホスト時刻（UNIX時間）
+        server_time: Dateヘッダのサーバ時刻（UNIX時間、1秒単位）
+    """
+
+    sent: float
+    received: float
+    server_time: float
+
+    @property
+    def round_trip(self) -> float:
+        """往復時間（秒）."""
+        return self.received - self.sent
+
+
+class ServerClockSampler:
+    """サーバのDateヘッダを別スレッドで計測する.
+
+    Chromeの起動・ログインと並行して計測し、`stop()`の時点までの計測結果からずれを推定する。
+    1つのkeep-alive接続でHEADリクエストを送信し、送信時刻を1秒の中で均等にずらす。
+
+    Attributes:
+        _url: 計測に使用するURL
+        _sample_count: 計測回数の上限
+        _timeout: 接続・送受信のタイムアウト秒数
+        _samples: 計測結果（計測順）
+        _stopped: 計測の停止を指示するイベント
+        _thread: 計測スレッド
+    """
+
+    def __init__(
+        self, url: str, sample_count: int = _DEFAULT_SAMPLE_COUNT, timeout: float = 5.0
+    ) -> None:
+        """コンストラクタ.
+
+        Args:
+            url: 計測に使用するURL
+            sample_count: 計測回数の上限
+            timeout: 接続・送受信のタイムアウト秒数
+        """
+        self._url = url
+        self._sample_count = sample_count
+        self._timeout = timeout
+        self._samples: list[_ClockSample] = []
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """計測スレッドを開始する."""
+        self._thread = threading.Thread(target=self._run, name="server-clock", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 0.0) -> ClockOffset | None:
+        """計測を停止し、それまでの計測結果からずれを推定する.
+
+        Args:
+            timeout: 実行中の計測の完了を待つ最大秒数
+
+        Returns:
+            ClockOffset | None: 推定したずれ（計測結果がない場合はNone）
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return _estimate_clock_offset(list(self._samples))
+
+    def _run(self) -> None:
+        """計測回数の上限に達するか停止を指示されるまで計測する.
+
+        計測に失敗した場合はその時点で計測を終える。
+        """
+        parts = urlsplit(self._url)
+        connection_class = (
+            http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        )
+        connection = connection_class(parts.netloc, timeout=self._timeout)
+        path = parts.path or "/"
+        start_phase = time.time() % 1.0
+        try:
+            for index in range(self._sample_count):
+                # 送信時刻の1秒未満の部分を、最初の計測から1/計測回数秒ずつずらす
+                phase = (start_phase + index / self._sample_count) % 1.0
+                delay = (phase - time.time() % 1.0) % 1.0 if index else 0.0
+                if self._stopped.wait(delay):
+                    return
+                self._samples.append(_request_sample(connection, path))
+        except (OSError, http.client.HTTPException, ValueError):
+            return
+        finally:
+            connection.close()
+
+
+def _request_sample(connection: http.client.HTTPConnection, path: str) -> _ClockSample:
+    """HEADリクエストを送信してDateヘッダと往復時間を計測する.
+
+    Args:
+        connection: 接続
+        path: リクエストのパス
+
+    Returns:
+        _ClockSample: 計測結果
+
+    Raises:
+        OSError: 通信に失敗した場合
+        http.client.HTTPException: 応答が不正な場合
+        ValueError: Dateヘッダがない、または解析できない場合
+    """
+    sent = time.time()
+    connection.request("HEAD", path, headers={"Cache-Control": "no-store"})
+    response = connection.getresponse()
+    received = time.time()
+    response.read()
+    date = response.getheader("Date")
+    if date is None:
+        raise ValueError("Dateヘッダがありません")
+    return _ClockSample(
+        sent=sent, received=received, server_time=parsedate_to_datetime(date).timestamp()
+    )
+
+
+def _estimate_clock_offset(samples: list[_ClockSample]) -> ClockOffset | None:
+    """計測結果からホストの時計に対するサーバの時計のずれを推定する.
+
+    往復時間が中央値以下の計測のみを使用する。サーバはリクエストの送信から
+    レスポンスの受信までの間にDateヘッダの時刻（1秒単位で切り捨て）を付けるため、
+    各計測からずれの範囲が決まる。全ての範囲の共通部分の中央をずれとする。
+    共通部分がない場合（サーバの時計が計測中に補正された場合など）は、
+    各計測の往復の中間時刻とDateヘッダの1秒の中間の差の中央値をずれとする。
+
+    Args:
+        samples: 計測結果
+
+    Returns:
+        ClockOffset | None: 推定したずれ（計測結果がない場合はNone）
+    """
+    if not samples:
+        return None
+    median_round_trip = statistics.median(sample.round_trip for sample in samples)
+    used = [sample for sample in samples if sample.round_trip <= median_round_trip]
+
+    lower = max(sample.server_time - sample.received for sample in used)
+    upper = min(sample.server_time + 1.0 - sample.sent for sample in used)
+    if lower <= upper:
+        offset, error = (lower + upper) / 2, (upper - lower) / 2
+    else:
+        offset = statistics.median(
+            sample.server_time + 0.5 - (sample.sent + sample.received) / 2 for sample in used
+        )
+        error = 0.5 + max(sample.round_trip for sample in used) / 2
+    return ClockOffset(
+        offset_seconds=offset,
+        error_seconds=error,
+        sample_count=len(used),
+        measured_at=datetime.now(timezone.utc),
+    )
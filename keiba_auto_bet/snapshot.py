@@ -0,0 +1,368 @@
+"""購入画面の状態のスナップショットモジュール.
+
+プルダウンの選択肢や馬番のチェック状態を要素ごとに取得すると、取得のたびに
+ChromeDriverとの通信が発生する。1回のスクリプト実行で購入画面の状態をまとめて取得し、
+選択・入力の判断に使用する。
+購入限度額も同様に1回のスクリプト実行で取得する。
+競馬場・レースの選択肢はセッション中に索引へ記録し、注文ごとに選択肢を探し直さない。
+"""
+
+import re
+from typing import Any
+
+from selenium import webdriver
+
+from keiba_auto_bet.exceptions import BetError
+from keiba_auto_bet.models import PageSnapshot
+
+# JRAの場コードと競馬場名の対応
+_JRA_COURSE_CODES = {
+    "01": "札幌",
+    "02": "函館",
+    "03": "福島",
+    "04": "新潟",
+    "05": "東京",
+    "06": "中山",
+    "07": "中京",
+    "08": "京都",
+    "09": "阪神",
+    "10": "小倉",
+}
+_RACE_OPTION_PATTERN = re.compile(r"(?<!\d)(\d{1,2})R")
+
+_SNAPSHOT_SCRIPT = """
+const readSelect = (id) => {
+  const select = document.getElementById(id);
+  if (select === null) {
+    return {options: [], selected: null};
+  }
+  const options = Array.from(select.options, (option) => option.text.trim());
+  const selected = select.selectedIndex >= 0 ? options[select.selectedIndex] : null;
+  return {options: options, selected: selected};
+};
+const isChecked = (label) => {
+  const input = document.getElementById(label.getAttribute("for"));
+  const mark = label.querySelector(".check");
+  return (input !== null && input.checked) || (mark !== null && mark.classList.contains("checked"));
+};
+const horses = [];
+const checked = [];
+const checkedLegs = [];
+for (const label of document.querySelectorAll("label[for^='no']")) {
+  const key = label.getAttribute("for").slice(2);
+  const leg = key.match(/^(\\d+)-(\\d+)$/);
+  if (leg !== null) {
+    if (isChecked(label)) {
+      checkedLegs.push([Number(leg[1]), Number(leg[2])]);
+    }
+    continue;
+  }
+  const number = Number(key);
+  if (!Number.isInteger(number) || number <= 0) {
+    continue;
+  }
+  horses.push(number);
+  if (isChecked(label)) {
+    checked.push(number);
+  }
+}
+const multiLabel = document.querySelector("label[for='multi']");
+const voteList = document.querySelector(".btn-vote-list");
+const count = voteList === null ? null : voteList.textContent.match(/(\\d+)/);
+return {
+  venue: readSelect("select-course-race-course"),
+  race: readSelect("select-course-race-race"),
+  ticketType: readSelect("bet-basic-type"),
+  method: readSelect("bet-basic-method"),
+  horses: horses,
+  checked: checked,
+  checkedLegs: checkedLegs,
+  multi: multiLabel === null ? null : isChecked(multiLabel),
+  voteCount: count === null ? null : Number(count[1]),
+};
+"""
+
+# 画面上部の「購入限度額 10,000円」の表示から金額を読み取る
+_PURCHASE_LIMIT_SCRIPT = """
+const text = document.body === null ? "" : document.body.innerText;
+const match = text.match(/購入限度額[^0-9]*([0-9,]+)\\s*円/);
+return match === null ? null : Number(match[1].replace(/,/g, ""));
+"""
+
+
+def take_snapshot(driver: webdriver.Chrome) -> PageSnapshot:
+    """購入画面の状態を1回のスクリプト実行で取得する.
+
+    Args:
+        driver: 購入画面を表示しているWebDriver
+
+    Returns:
+        PageSnapshot: 購入画面の状態
+
+    Raises:
+        BetError: 状態の取得に失敗した場合、または取得結果の形式が不正な場合
+    """
+    try:
+        data = driver.execute_script(_SNAPSHOT_SCRIPT)
+        return _parse_snapshot(data)
+    except Exception as exc:
+        raise BetError(f"画面の状態を取得できませんでした: {exc}") from exc
+
+
+def read_purchase_limit(driver: webdriver.Chrome) -> int | None:
+    """画面に表示されている購入限度額を1回のスクリプト実行で取得する.
+
+    Args:
+        driver: 即パットの画面を表示しているWebDriver
+
+    Returns:
+        int | None: 購入限度額（円）。表示されていない場合はNone
+
+    Raises:
+        BetError: スクリプトの実行に失敗した場合
+    """
+    try:
+        limit = driver.execute_script(_PURCHASE_LIMIT_SCRIPT)
+    except Exception as exc:
+        raise BetError(f"購入限度額を取得できませんでした: {exc}") from exc
+    if isinstance(limit, bool) or not isinstance(limit, int):
+        return None
+    return limit
+
+
+def find_race_option(snapshot: PageSnapshot, race_number: int) -> str | None:
+    """レース番号に一致するレースの選択肢を探す.
+
+    「1R」が「11R」に一致しないよう、直前が数字でない「{レース番号}R」を探す。
+
+    Args:
+        snapshot: 購入画面の状態
+        race_number: レース番号
+
+    Returns:
+        str | None: 選択肢の表示テキスト（見つからない場合はNone）
+    """
+    pattern = re.compile(rf"(?<!\d){race_number}R")
+    return next((option for option in snapshot.races if pattern.search(option)), None)
+
+
+class RaceOptionIndex:
+    """競馬場・レースの選択肢の索引.
+
+    競馬場名・JRAの場コードから競馬場の選択肢を、（競馬場, レース番号）からレースの
+    選択肢を引く。レースの選択肢は競馬場を選択した画面のスナップショットから記録する。
+    競馬場の選択肢の一覧が変わった場合（開催日が変わった場合など）は索引を作り直す。
+
+    Attributes:
+        _venues: 索引の作成元の競馬場の選択肢（未作成の場合はNone）
+        _venue_options: 競馬場名・場コード・表示テキストから競馬場の選択肢への対応
+        _race_options: 競馬場の選択肢ごとの、レース番号からレースの選択肢への対応
+    """
+
+    def __init__(self) -> None:
+        """コンストラクタ."""
+        self._venues: tuple[str, ...] | None = None
+        self._venue_options: dict[str, str] = {}
+        self._race_options: dict[str, dict[int, str]] = {}
+
+    def refresh(self, snapshot: PageSnapshot) -> bool:
+        """スナップショットで索引を更新する.
+
+        競馬場の選択肢の一覧が索引の作成元と異なる場合は索引を作り直す。
+        選択中の競馬場のレースの選択肢は最新のスナップショットの内容で記録し直す
+        （発売が終了して選択肢から消えたレースを反映する）。
+
+        Args:
+            snapshot: 購入画面の状態
+
+        Returns:
+            bool: 索引を作り直した場合True
+        """
+        rebuilt = snapshot.venues != self._venues
+        if rebuilt:
+            self._build(snapshot.venues)
+        if snapshot.selected_venue in self._race_options:
+            self._race_options[snapshot.selected_venue] = _index_races(snapshot.races)
+        return rebuilt
+
+    def venue_option(self, venue: str) -> str:
+        """競馬場名またはJRAの場コードに対応する競馬場の選択肢を返す.
+
+        Args:
+            venue: 競馬場名またはJRAの場コード（例: "東京"、"05"）
+
+        Returns:
+            str: 競馬場の選択肢の表示テキスト
+
+        Raises:
+            BetError: 開催中の競馬場に一致しない場合
+        """
+        option = self._venue_options.get(_JRA_COURSE_CODES.get(venue, venue))
+        if option is None:
+            option = next((text for text in self._venues or () if venue in text), None)
+            if option is None:
+                venues = "、".join(self._venues or ()) or "なし"
+                raise BetError(f"競馬場が見つかりませんでした: {venue}（選択肢: {venues}）")
+            self._venue_options[venue] = option
+        return option
+
+    def race_option(self, venue: str, race_number: int) -> str | None:
+        """競馬場・レース番号に対応するレースの選択肢を返す.
+
+        Args:
+            venue: 競馬場名またはJRAの場コード
+            race_number: レース番号
+
+        Returns:
+            str | None: レースの選択肢の表示テキスト
+                （競馬場のレースの選択肢をまだ記録していない場合はNone）
+
+        Raises:
+            BetError: 開催中の競馬場に一致しない場合、
+                またはレースの選択肢にない（発売終了・未開催の）レースの場合
+        """
+        venue_option = self.venue_option(venue)
+        races = self._race_options[venue_option]
+        if not races:
+            return None
+        option = races.get(race_number)
+        if option is None:
+            raise BetError(
+                f"レースが見つかりませんでした（発売終了または未開催）: {venue}{race_number}R"
+            )
+        return option
+
+    def _build(self, venues: tuple[str, ...]) -> None:
+        """競馬場の選択肢から索引を作成する.
+
+        Args:
+            venues: 競馬場の選択肢の表示テキスト
+        """
+        self._venues = venues
+        self._venue_options = {}
+        self._race_options = {}
+        for text in venues:
+            self._venue_options.setdefault(text, text)
+            self._race_options[text] = {}
+            for name in _JRA_COURSE_CODES.values():
+                if name in text:
+                    self._venue_options.setdefault(name, text)
+
+
+def _index_races(races: tuple[str, ...]) -> dict[int, str]:
+    """レースの選択肢をレース番号で引けるようにする.
+
+    Args:
+        races: レースの選択肢の表示テキスト
+
+    Returns:
+        dict[int, str]: レース番号からレースの選択肢の表示テキストへの対応
+    """
+    index: dict[int, str] = {}
+    for text in races:
+        match = _RACE_OPTION_PATTERN.search(text)
+        if match is not None:
+            index.setdefault(int(match.group(1)), text)
+    return index
+
+
+def _parse_snapshot(data: Any) -> PageSnapshot:
+    """スクリプトの実行結果を購入画面の状態に変換する.
+
+    Args:
+        data: スナップショットのスクリプトの実行結果
+
+    Returns:
+        PageSnapshot: 購入画面の状態
+
+    Raises:
+        ValueError: 実行結果の形式が不正な場合
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"スナップショットの形式が不正です: {data!r}")
+    venue_options, selected_venue = _parse_select(data.get("venue"))
+    race_options, selected_race = _parse_select(data.get("race"))
+    ticket_type_options, selected_ticket_type = _parse_select(data.get("ticketType"))
+    method_options, selected_method = _parse_select(data.get("method"))
+    vote_count = data.get("voteCount")
+    if vote_count is not None and not isinstance(vote_count, int):
+        raise ValueError(f"購入予定リストの件数が不正です: {vote_count!r}")
+    multi = data.get("multi")
+    if multi is not None and not isinstance(multi, bool):
+        raise ValueError(f"マルチのチェック状態が不正です: {multi!r}")
+    return PageSnapshot(
+        venues=venue_options,
+        selected_venue=selected_venue,
+        races=race_options,
+        selected_race=selected_race,
+        ticket_types=ticket_type_options,
+        selected_ticket_type=selected_ticket_type,
+        methods=method_options,
+        selected_method=selected_method,
+        horses=_parse_numbers(data.get("horses")),
+        checked_horses=_parse_numbers(data.get("checked")),
+        checked_legs=_parse_legs(data.get("checkedLegs")),
+        multi=multi,
+        vote_count=vote_count,
+    )
+
+
+def _parse_select(data: Any) -> tuple[tuple[str, ...], str | None]:
+    """プルダウンの選択肢と選択中の値を変換する.
+
+    Args:
+        data: プルダウンの取得結果
+
+    Returns:
+        tuple[tuple[str, ...], str | None]: (選択肢の表示テキスト, 選択中の表示テキスト)のタプル
+
+    Raises:
+        ValueError: 取得結果の形式が不正な場合
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"プルダウンの形式が不正です: {data!r}")
+    options = data.get("options")
+    selected = data.get("selected")
+    if not isinstance(options, list) or not all(isinstance(option, str) for option in options):
+        raise ValueError(f"プルダウンの選択肢が不正です: {options!r}")
+    if selected is not None and not isinstance(selected, str):
+        raise ValueError(f"プルダウンの選択中の値が不正です: {selected!r}")
+    return tuple(options), selected
+
+
+def _parse_numbers(data: Any) -> tuple[int, ...]:
+    """馬番の一覧を変換する.
+
+    Args:
+        data: 馬番の取得結果
+
+    Returns:
+        tuple[int, ...]: 馬番
+
+    Raises:
+        ValueError: 取得結果の形式が不正な場合
+    """
+    if not isinstance(data, list) or not all(
+        isinstance(number, int) and not isinstance(number, bool) for number in data
+    ):
+        raise ValueError(f"馬番の一覧が不正です: {data!r}")
+    return tuple(data)
+
+
+def _parse_legs(data: Any) -> tuple[tuple[int, int], ...]:
+    """組み合わせの馬券の列ごとのチェック済みの馬番を変換する.
+
+    Args:
+        data: (列番号, 馬番)の一覧の取得結果
+
+    Returns:
+        tuple[tuple[int, int], ...]: (列番号, 馬番)
+
+    Raises:
+        ValueError: 取得結果の形式が不正な場合
+    """
+    if not isinstance(data, list) or not all(
+        isinstance(leg, list) and len(leg) == 2 and _parse_numbers(leg) for leg in data
+    ):
+        raise ValueError(f"列ごとの馬番の一覧が不正です: {data!r}")
+    return tuple((column, horse) for column, horse in data)
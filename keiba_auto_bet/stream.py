@@ -0,0 +1,223 @@
+"""ストリーミング購入モジュール.
+
+予想モデルがレースごとに出力する購入注文を、ログイン済みのセッションで受け付けながら
+購入する機能を提供する。注文はレースの区切りまたは送信期限ごとにまとめて送信する。
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Iterable, Iterator
+
+from keiba_auto_bet.backend import BetBackend
+from keiba_auto_bet.exceptions import KeibaAutoBetError
+from keiba_auto_bet.models import BetOrder, StreamFlush
+
+_DEFAULT_FLUSH_INTERVAL = 5.0  # 最初の注文を受け付けてから送信するまでの最大秒数
+
+
+class _SourceError:
+    """注文の読み出し中に発生した例外を受け付けキューで受け渡すための入れ物.
+
+    Attributes:
+        exc: 読み出し中に発生した例外
+    """
+
+    def __init__(self, exc: BaseException) -> None:
+        """コンストラクタ.
+
+        Args:
+            exc: 読み出し中に発生した例外
+        """
+        self.exc = exc
+
+
+_Item = BetOrder | _SourceError | None
+
+
+class OrderStream:
+    """ストリーミング購入の受け付け.
+
+    購入注文のイテラブルまたはキューから注文を受け付け、次のいずれかの時点で
+    それまでに受け付けた注文をまとめて購入する。
+
+    - 直前の注文と別のレースの注文が届いた時点（それまでのレースの注文が揃ったとみなす）
+    - 最初の注文を受け付けてから`flush_interval`秒が経過した時点
+    - 注文の受け付けが終了した時点
+
+    受け付けの間はセッションを維持し、送信のたびにブラウザを購入画面へ戻して待機させておく。
+
+    Attributes:
+        _better: 購入に使用するクライアント
+        _flush_interval: 最初の注文を受け付けてから送信するまでの最大秒数
+        _logger: ロガーインスタンス
+    """
+
+    def __init__(
+        self,
+        better: BetBackend,
+        flush_interval: float = _DEFAULT_FLUSH_INTERVAL,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        """コンストラクタ.
+
+        Args:
+            better: 購入に使用するクライアント
+            flush_interval: 最初の注文を受け付けてから送信するまでの最大秒数
+            logger: ロガーインスタンス。Noneの場合はモジュールロガーを使用
+
+        Raises:
+            ValueError: flush_intervalが0以下の場合
+        """
+        if flush_interval <= 0:
+            raise ValueError(f"送信期限は0より大きい値で指定してください: {flush_interval}")
+        if logger is None:
+            logger = logging.getLogger(__name__)
+
+        self._better = better
+        self._flush_interval = flush_interval
+        self._logger = logger
+
+    def run(
+        self, source: "Iterable[BetOrder] | queue.Queue[BetOrder | None]"
+    ) -> Iterator[StreamFlush]:
+        """注文を受け付けながら購入し、送信ごとの結果を返す.
+
+        キューの場合は`None`を受け取った時点で受け付けを終了する。
+        イテラブルは別スレッドで読み出すため、次の注文を待っている間も送信期限で送信する。
+        クライアントのセッションが開始されていない場合は、受け付けの終了後にセッションを終了する。
+
+        送信ごとの購入処理のエラーは`StreamFlush.error`に記録し、受け付けを続ける。
+
+        Args:
+            source: 購入注文のイテラブル、または購入注文を受け渡すキュー
+
+        Yields:
+            StreamFlush: 送信ごとの購入結果
+
+        Raises:
+            KeibaAutoBetError: セッションの開始に失敗した場合
+            Exception: イテラブルの読み出し中に例外が発生した場合（受け付け済みの注文は送信する）
+        """
+        inbox = source if isinstance(source, queue.Queue) else _start_reader(source)
+
+        owns_session = not self._better.is_open
+        try:
+            self._better.warm_up()
+            self._logger.info(
+                "注文の受け付けを開始しました（送信期限%.1f秒）", self._flush_interval
+            )
+            pending: list[BetOrder] = []
+            received_at = 0.0
+            while True:
+                timeout = None
+                if pending:
+                    timeout = max(received_at + self._flush_interval - time.monotonic(), 0.0)
+                try:
+                    item: _Item = inbox.get(timeout=timeout)
+                except queue.Empty:
+                    yield self._flush(pending, "deadline", received_at)
+                    pending = []
+                    self._keep_warm()
+                    continue
+
+                if isinstance(item, _SourceError):
+                    if pending:
+                        yield self._flush(pending, "end", received_at)
+                    raise item.exc
+                if item is None:
+                    break
+                if pending and _race_of(item) != _race_of(pending[-1]):
+                    yield self._flush(pending, "race", received_at)
+                    pending = []
+                    self._keep_warm()
+                if not pending:
+                    received_at = time.monotonic()
+                pending.append(item)
+
+            if pending:
+                yield self._flush(pending, "end", received_at)
+        finally:
+            self._logger.info("注文の受け付けを終了しました")
+            if owns_session:
+                self._better.close()
+
+    def _keep_warm(self) -> None:
+        """次の注文に備えて購入の準備を済ませておく.
+
+        購入後のクライアントはトップ画面に戻るため、次の注文を待つ間に購入画面へ移動しておく。
+        失敗した場合は次の購入時に改めて準備するため、警告のみ出力する。
+        """
+        try:
+            self._better.warm_up()
+        except KeibaAutoBetError as exc:
+            self._logger.warning("次の注文に備えた準備に失敗しました: %s", exc)
+
+    def _flush(self, orders: list[BetOrder], reason: str, received_at: float) -> StreamFlush:
+        """受け付けた注文をまとめて購入する.
+
+        Args:
+            orders: 受け付けた購入注文
+            reason: 送信のきっかけ
+            received_at: 最初の注文を受け付けた時刻（`time.monotonic()`の値）
+
+        Returns:
+            StreamFlush: 購入結果
+        """
+        wait_seconds = time.monotonic() - received_at
+        self._logger.info("受け付けた注文を送信します: %d件（%s）", len(orders), reason)
+        bet_start = time.perf_counter()
+        try:
+            result = self._better.bet(list(orders))
+            error = None
+        except KeibaAutoBetError as exc:
+            self._logger.error("受け付けた注文の購入に失敗しました: %s", exc)
+            result = None
+            error = str(exc)
+        return StreamFlush(
+            orders=tuple(orders),
+            reason=reason,
+            result=result,
+            error=error,
+            wait_seconds=wait_seconds,
+            bet_seconds=time.perf_counter() - bet_start,
+        )
+
+
+def _start_reader(source: Iterable[BetOrder]) -> "queue.Queue[_Item]":
+    """イテラブルから注文を読み出してキューに受け渡すスレッドを開始する.
+
+    読み出しが終了したらキューに`None`を、例外が発生した場合は`_SourceError`を入れる。
+
+    Args:
+        source: 購入注文のイテラブル
+
+    Returns:
+        queue.Queue[_Item]: 読み出した注文を受け渡すキュー
+    """
+    inbox: queue.Queue[_Item] = queue.Queue()
+
+    def read() -> None:
+        try:
+            for order in source:
+                inbox.put(order)
+        except BaseException as exc:
+            inbox.put(_SourceError(exc))
+        else:
+            inbox.put(None)
+
+    threading.Thread(target=read, name="order-stream-reader", daemon=True).start()
+    return inbox
+
+
+def _race_of(order: BetOrder) -> tuple[str, int]:
+    """注文のレースを返す.
+
+    Args:
+        order: 購入注文
+
+    Returns:
+        tuple[str, int]: (競馬場名, レース番号)
+    """
+    return (order.venue, order.race_number)
@@ -0,0 +1 @@
+"""結合テストパッケージ."""
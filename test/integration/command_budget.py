@@ -0,0 +1,61 @@
+"""WebDriverコマンド数の予算の確認.
+
+基準となる注文の購入で実行したWebDriverコマンドの回数を、記録済みの予算と比較する。
+画面操作を増やす変更でコマンド数が予算を超えた場合はテストを失敗させる。
+
+予算は`command_budget.json`に記録する。環境変数`KEIBA_AUTO_BET_RECORD_COMMAND_BUDGET=1`を
+指定してテストを実行すると、計測したコマンド数で予算を記録し直す。
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from keiba_auto_bet.models import CommandProfile
+
+BUDGET_FILE = Path(__file__).with_name("command_budget.json")
+RECORD_ENV = "KEIBA_AUTO_BET_RECORD_COMMAND_BUDGET"
+# 待機中の確認回数は画面の描画速度によって変わるため、予算を超える回数をこの割合まで許容する
+_TOLERANCE = 0.1
+_TOTAL_KEY = "total"
+
+
+def check_command_budget(
+    name: str, profile: CommandProfile, budget_file: Path = BUDGET_FILE
+) -> None:
+    """コマンド数が記録済みの予算以内であることを確認する.
+
+    予算は合計とフェーズごとのコマンド数で記録する。
+    記録モードの場合は、計測したコマンド数を予算として記録する。
+
+    Args:
+        name: 予算の名前（計測条件）
+        profile: 計測したWebDriverコマンドの記録
+        budget_file: 予算を記録したファイル
+    """
+    counts = {_TOTAL_KEY: profile.total_count, **profile.count_by_phase()}
+    budgets = json.loads(budget_file.read_text(encoding="utf-8")) if budget_file.exists() else {}
+    if os.environ.get(RECORD_ENV) == "1":
+        budgets[name] = counts
+        budget_file.write_text(
+            json.dumps(budgets, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+            encoding="utf-8",
+        )
+        return
+
+    budget = budgets.get(name)
+    if budget is None:
+        pytest.skip(f"コマンド数の予算が記録されていません（{RECORD_ENV}=1で記録）: {name}")
+    exceeded = [
+        f"{phase}: {counts.get(phase, 0)}回（予算{limit}回）"
+        for phase, limit in budget.items()
+        if counts.get(phase, 0) > limit * (1 + _TOLERANCE)
+    ]
+    if exceeded:
+        pytest.fail(
+            f"WebDriverコマンド数が予算を超えました（{name}）: "
+            + ", ".join(exceeded)
+            + f"。意図した変更の場合は{RECORD_ENV}=1で予算を記録し直してください"
+        )
@@ -0,0 +1,62 @@
+"""結合テスト用のfixture."""
+
+from collections.abc import Generator
+
+import pytest
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from keiba_auto_bet.models import IpatCredentials
+
+from .ipat_simulator import IpatSimulator
+
+
+@pytest.fixture(scope="session")
+def chrome_available() -> bool:
+    """ヘッドレスChromeを起動できるかどうか."""
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception:
+        return False
+    driver.quit()
+    return True
+
+
+@pytest.fixture()
+def require_chrome(chrome_available: bool) -> None:
+    """Chromeを起動できない環境ではテストをスキップする."""
+    if not chrome_available:
+        pytest.skip("Chromeを起動できないためスキップします")
+
+
+@pytest.fixture(scope="session")
+def ipat_simulator() -> Generator[IpatSimulator, None, None]:
+    """即パットのシミュレータ.
+
+    Yields:
+        IpatSimulator: 起動済みのシミュレータ
+    """
+    with IpatSimulator() as simulator:
+        yield simulator
+
+
+@pytest.fixture()
+def simulator(ipat_simulator: IpatSimulator) -> IpatSimulator:
+    """購入の記録をクリアしたシミュレータ."""
+    ipat_simulator.reset()
+    return ipat_simulator
+
+
+@pytest.fixture()
+def dummy_credentials() -> IpatCredentials:
+    """シミュレータ用の認証情報."""
+    return IpatCredentials(
+        inet_id="SIMULATE",
+        user_number="12345678",
+        password="1234",
+        p_ars="5678",
+    )
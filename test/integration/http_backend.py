@@ -0,0 +1,407 @@
+"""即パットシミュレータのHTTP/JSONのAPIに投票するクライアント.
+
+`BetBackend`の2つ目の実装として、ブラウザを使わずにシミュレータのログイン・投票のAPIへ
+直接リクエストを送信する。これらのAPIはシミュレータ（ipat_simulator.py）独自のもので、
+実際の即パットのAPIではないため、パッケージには含めずテストでのみ使用する。
+認証情報を誤って送信しないよう、APIのURLは明示的な指定を必須とし、JRAのホストは指定できない。
+"""
+
+import http.client
+import json
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+from urllib.parse import urljoin, urlsplit
+
+from keiba_auto_bet.auto_bet import load_credentials_from_env
+from keiba_auto_bet.backend import BetBackend
+from keiba_auto_bet.exceptions import LoginError, PurchaseError
+from keiba_auto_bet.models import (
+    AutoBetConfig,
+    BetOrder,
+    BetResult,
+    IpatCredentials,
+    validate_orders,
+)
+from keiba_auto_bet.planner import plan_orders
+
+_LOGIN_PATH = "api/login"
+_VOTE_PATH = "api/vote"
+_DEFAULT_POOL_SIZE = 2
+# 実際の即パットのホスト（APIが未確認のため接続を拒否する）
+_PRODUCTION_DOMAIN = "jra.go.jp"
+# これより長く使われていない接続はサーバ側で切断されている恐れがあるため、使わずに破棄する
+_MAX_IDLE_SECONDS = 5.0
+
+
+class _ConnectionPool:
+    """同じホストへのkeep-alive接続のプール.
+
+    Attributes:
+        _scheme: URLのスキーム（httpまたはhttps）
+        _host: 接続先のホスト（ポートを含む）
+        _size: 保持する接続の最大数
+        _timeout: 接続・送受信のタイムアウト秒数
+        _idle: 使用されていない接続と最後に使用した時刻
+        _lock: プールを保護するロック
+    """
+
+    def __init__(self, url: str, size: int, timeout: float) -> None:
+        """コンストラクタ.
+
+        Args:
+            url: 接続先のURL
+            size: 保持する接続の最大数
+            timeout: 接続・送受信のタイムアウト秒数
+        """
+        parts = urlsplit(url)
+        self._scheme = parts.scheme
+        self._host = parts.netloc
+        self._size = size
+        self._timeout = timeout
+        self._idle: list[tuple[http.client.HTTPConnection, float]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self) -> Iterator[http.client.HTTPConnection]:
+        """接続を取り出し、正常に使い終えた接続をプールに戻す.
+
+        例外が発生した接続は状態が不明なため、プールに戻さずに閉じる。
+
+        Yields:
+            http.client.HTTPConnection: 接続
+        """
+        connection = self._take()
+        try:
+            yield connection
+        except BaseException:
+            connection.close()
+            raise
+        with self._lock:
+            if len(self._idle) < self._size:
+                self._idle.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def close(self) -> None:
+        """プールの接続をすべて閉じる."""
+        with self._lock:
+            idle = self._idle
+            self._idle = []
+        for connection, _ in idle:
+            connection.close()
+
+    def _take(self) -> http.client.HTTPConnection:
+        """使用できる接続を取り出す（なければ新しく作成する）.
+
+        Returns:
+            http.client.HTTPConnection: 接続
+        """
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                connection, last_used = self._idle.pop()
+                if now - last_used <= _MAX_IDLE_SECONDS:
+                    return connection
+                connection.close()
+        if self._scheme == "https":
+            return http.client.HTTPSConnection(self._host, timeout=self._timeout)
+        return http.client.HTTPConnection(self._host, timeout=self._timeout)
+
+
+class HttpBetter(BetBackend):
+    """即パットシミュレータのAPIに投票するクライアント.
+
+    `api_url`のログイン・投票のAPIに直接リクエストを送信する。
+    APIはシミュレータ独自のものであり、実際の即パットでは使用できない。
+    ブラウザを起動しないため、起動・画面遷移・要素の待機が不要になる。
+    接続はkeep-aliveで使い回し、セッション中の`bet()`はログインを省略する。
+    セッション切れ（401）の場合は再ログインして1回だけ投票をやり直す。
+
+    Attributes:
+        _credentials: 即パットの認証情報
+        _config: 自動購入の設定
+        _logger: ロガー
+        _api_url: ログイン・投票のAPIのベースURL
+        _pool: keep-alive接続のプール
+        _token: ログインで取得したセッショントークン（未ログインの場合はNone）
+        _session_mode: open()でセッションを開始しているかどうか
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        credentials: IpatCredentials | None = None,
+        config: AutoBetConfig | None = None,
+        logger: logging.Logger | None = None,
+        pool_size: int = _DEFAULT_POOL_SIZE,
+    ) -> None:
+        """コンストラクタ.
+
+        Args:
+            api_url: ログイン・投票のAPIのベースURL（即パットシミュレータのURL）
+            credentials: 即パットの認証情報（Noneの場合は環境変数から読み込む）
+            config: 自動購入の設定（Noneの場合はデフォルト設定を使用）。ipat_urlは使用しない
+            logger: ロガーインスタンス。Noneの場合はモジュールロガーを使用
+            pool_size: 保持するkeep-alive接続の最大数
+
+        Raises:
+            ValidationError: 環境変数から認証情報を読み込めない場合
+            ValueError: api_urlがhttp(s)のURLでない場合、JRAのホストの場合、
+                またはpool_sizeが1未満の場合
+        """
+        _check_api_url(api_url)
+        if pool_size < 1:
+            raise ValueError(f"接続数は1以上で指定してください: {pool_size}")
+        if credentials is None:
+            credentials = load_credentials_from_env()
+        if config is None:
+            config = AutoBetConfig()
+        if logger is None:
+            logger = logging.getLogger(__name__)
+
+        self._credentials = credentials
+        self._config = config
+        self._logger = logger
+        self._api_url = api_url
+        self._pool = _ConnectionPool(
+            api_url, pool_size, max(config.login_timeout, config.confirm_timeout)
+        )
+        self._token: str | None = None
+        self._session_mode = False
+
+    def __enter__(self) -> "HttpBetter":
+        """セッションを開始する.
+
+        Returns:
+            HttpBetter: 自身のインスタンス
+        """
+        self.open()
+        return self
+
+    @property
+    def config(self) -> AutoBetConfig:
+        """自動購入の設定."""
+        return self._config
+
+    @property
+    def is_open(self) -> bool:
+        """セッションモードで動作中かどうか."""
+        return self._session_mode
+
+    def open(self) -> None:
+        """ログイン済みのセッションを開始する.
+
+        既にセッションが開始されている場合は何もしない。
+
+        Raises:
+            LoginError: ログインに失敗した場合
+        """
+        if self._session_mode:
+            return
+        self._login()
+        self._session_mode = True
+        self._logger.info("セッションを開始しました")
+
+    def close(self) -> None:
+        """セッションを終了して接続を閉じる.
+
+        セッションが開始されていない場合は何もしない。
+        """
+        if not self._session_mode:
+            return
+        self._session_mode = False
+        self._token = None
+        self._pool.close()
+        self._logger.info("セッションを終了しました")
+
+    def bet(self, orders: list[BetOrder]) -> BetResult:
+        """馬券を自動購入する.
+
+        同じ馬券の注文は金額を合算して1件にまとめて投票する。
+
+        Args:
+            orders: 購入注文リスト
+
+        Returns:
+            BetResult: フェーズごとの所要時間を含む購入結果
+
+        Raises:
+            ValidationError: 入力内容のバリデーションエラー
+            LoginError: ログインに失敗した場合
+            PurchaseError: 投票に失敗した場合、または投票結果を確認できなかった場合
+        """
+        validate_orders(orders, self._config.max_bet)
+        total_amount = sum(order.total_amount for order in orders)
+        self._logger.info("購入合計金額: %d円（%d件）", total_amount, len(orders))
+
+        plan = plan_orders(orders)
+        phase_timings: dict[str, float] = {}
+        try:
+            if self._token is None:
+                start = time.perf_counter()
+                self._login()
+                phase_timings["login"] = time.perf_counter() - start
+            login_seconds = phase_timings.get("login", 0.0)
+            start = time.perf_counter()
+            self._vote(plan.orders, total_amount, phase_timings)
+            # 投票中の再ログインの所要時間はloginに計上済みのため除く
+            relogin_seconds = phase_timings.get("login", 0.0) - login_seconds
+            phase_timings["confirm"] = time.perf_counter() - start - relogin_seconds
+        finally:
+            if not self._session_mode:
+                self._token = None
+                self._pool.close()
+
+        self._logger.info("馬券の自動購入が完了しました")
+        return BetResult(
+            success=True,
+            phase_timings=phase_timings,
+            order_count=len(orders),
+            race_count=plan.race_count,
+            total_amount=total_amount,
+        )
+
+    def _login(self) -> None:
+        """ログインしてセッショントークンを取得する.
+
+        Raises:
+            LoginError: ログインに失敗した場合
+        """
+        body = {
+            "inetid": self._credentials.inet_id,
+            "user_number": self._credentials.user_number,
+            "password": self._credentials.password,
+        }
+        try:
+            status, data = self._request(_LOGIN_PATH, body)
+        except (OSError, http.client.HTTPException, ValueError) as exc:
+            raise LoginError(f"ログインに失敗しました: {exc}") from exc
+        token = data.get("token")
+        if status != http.client.OK or not isinstance(token, str):
+            raise LoginError(f"ログインに失敗しました: {data.get('error', status)}")
+        self._token = token
+
+    def _vote(
+        self, orders: tuple[BetOrder, ...], total_amount: int, phase_timings: dict[str, float]
+    ) -> None:
+        """投票を送信する.
+
+        セッション切れの場合は再ログインして1回だけやり直す。
+        投票の送信後に通信が失敗した場合は、購入が確定した可能性があるためやり直さない。
+
+        Args:
+            orders: 投票する購入注文（同じ馬券はまとめ済み）
+            total_amount: 合計購入金額（円）
+            phase_timings: 再ログインの所要時間を記録するフェーズごとの所要時間
+
+        Raises:
+            LoginError: 再ログインに失敗した場合
+            PurchaseError: 投票に失敗した場合、または投票結果を確認できなかった場合
+        """
+        body = {
+            "tickets": [_ticket_body(order) for order in orders],
+            "total": total_amount,
+            "p_ars": self._credentials.p_ars,
+        }
+        for attempt in range(2):
+            assert self._token is not None
+            try:
+                status, data = self._request(_VOTE_PATH, body, self._token)
+            except (OSError, http.client.HTTPException, ValueError) as exc:
+                raise PurchaseError(
+                    f"投票結果を確認できませんでした。購入履歴を確認してください: {exc}"
+                ) from exc
+            if status == http.client.UNAUTHORIZED and attempt == 0:
+                self._logger.info("セッションが切れています。再ログインします")
+                start = time.perf_counter()
+                self._login()
+                phase_timings["login"] = phase_timings.get("login", 0.0) + (
+                    time.perf_counter() - start
+                )
+                continue
+            if status != http.client.OK or data.get("ok") is not True:
+                raise PurchaseError(f"購入確定に失敗しました: {data.get('error', status)}")
+            return
+
+    def _request(
+        self, path: str, body: dict[str, Any], token: str | None = None
+    ) -> tuple[int, dict[str, Any]]:
+        """JSONのPOSTリクエストを送信する.
+
+        Args:
+            path: APIのベースURLからの相対パス
+            body: リクエストボディ
+            token: セッショントークン（Noneの場合は送信しない）
+
+        Returns:
+            tuple[int, dict[str, Any]]: (ステータスコード, レスポンスボディ)のタプル
+
+        Raises:
+            OSError: 接続・送受信に失敗した場合
+            http.client.HTTPException: レスポンスが不正な場合
+            ValueError: レスポンスボディがJSONでない場合
+        """
+        headers = {"Content-Type": "application/json"}
+        if token is not None:
+            headers["Authorization"] = f"Bearer {token}"
+        url = urlsplit(urljoin(self._api_url, path))
+        encoded = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        with self._pool.connection() as connection:
+            connection.request("POST", url.path, body=encoded, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+        data = json.loads(payload) if payload else {}
+        if not isinstance(data, dict):
+            raise ValueError(f"レスポンスの形式が不正です: {payload!r}")
+        return response.status, data
+
+
+def _check_api_url(api_url: str) -> None:
+    """APIのベースURLを確認する.
+
+    Args:
+        api_url: ログイン・投票のAPIのベースURL
+
+    Raises:
+        ValueError: http(s)のURLでない場合、またはJRAのホストの場合
+    """
+    parts = urlsplit(api_url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"APIのURLはhttpまたはhttpsのURLで指定してください: {api_url!r}")
+    host = parts.hostname.lower()
+    if host == _PRODUCTION_DOMAIN or host.endswith(f".{_PRODUCTION_DOMAIN}"):
+        raise ValueError(
+            f"HttpBetterは即パットシミュレータ専用のため、JRAのホストは指定できません: {api_url}"
+        )
+
+
+def _ticket_body(order: BetOrder) -> dict[str, Any]:
+    """投票APIに送信する馬券を作成する.
+
+    組み合わせの馬券は入力方式と列ごとの馬番を送信し、金額には全ての組み合わせの
+    合計金額を指定する。
+
+    Args:
+        order: 購入注文
+
+    Returns:
+        dict[str, Any]: 投票APIの馬券
+    """
+    ticket: dict[str, Any] = {
+        "venue": order.venue,
+        "race": order.race_number,
+        "type": order.ticket_type.value,
+        "horse": order.horse_number,
+        "amount": order.total_amount,
+    }
+    if order.selection is not None:
+        ticket["method"] = order.selection.method.value
+        ticket["legs"] = [list(leg) for leg in order.selection.legs]
+        ticket["multi"] = order.selection.multi
+        ticket["unit"] = order.amount
+        ticket["count"] = order.ticket_count
+    return ticket
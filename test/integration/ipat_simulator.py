@@ -0,0 +1,772 @@
+"""即パットのローカルシミュレータ.
+
+`AutoBetter`が操作する要素ID・XPath・AngularJS風の再レンダリング遅延を再現した
+単一ページアプリケーションと、`HttpBetter`（http_backend.py）が呼び出す独自のログイン・投票のAPIを
+ローカルのHTTPサーバで提供する。
+実際の即パットにアクセスせずに、実ブラウザでの購入処理の動作確認と性能計測を行うために使用する。
+"""
+
+import json
+import secrets
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any
+
+_DEFAULT_VENUES = {"東京": 12, "京都": 12, "新潟": 12}
+
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="ja">
+<head>
+<meta charset="utf-8">
+<title>即パット シミュレータ</title>
+<style>
+.dialog { position: fixed; top: 30%; left: 30%; background: #fff; border: 1px solid #000; }
+.check { display: inline-block; width: 16px; height: 16px; border: 1px solid #000; }
+.check.checked { background: #000; }
+</style>
+__ASSETS_HEAD__
+</head>
+<body>
+__ASSETS_BODY__
+<div id="app"></div>
+<script>
+__SCRIPT__
+</script>
+</body>
+</html>
+"""
+
+# 実際の即パットと同様に、操作に不要な画像・Webフォント・アクセス解析を読み込ませる
+_ASSETS_HEAD = """<style>
+@font-face { font-family: "SimulatorFont"; src: url("/assets/font.woff2") format("woff2"); }
+body { font-family: "SimulatorFont", sans-serif; }
+</style>
+<script async src="/analytics/tag.js"></script>"""
+_ASSETS_BODY = """<img src="/assets/banner.png" alt="">"""
+_ASSET_CONTENT_TYPES = {
+    "/assets/font.woff2": "font/woff2",
+    "/assets/banner.png": "image/png",
+    "/analytics/tag.js": "text/javascript",
+}
+
+_SCRIPT = r"""
+"use strict";
+const CONFIG = __CONFIG__;
+const state = {
+  view: "login",
+  venue: 0,
+  race: 1,
+  betType: "単勝",
+  method: "フォーメーション",
+  multi: false,
+  checked: new Set(),
+  voteList: [],
+  limit: CONFIG.purchaseLimit,
+  dialog: null,
+  error: "",
+};
+const app = document.getElementById("app");
+
+const later = (fn) => setTimeout(fn, CONFIG.renderDelayMs);
+const value = (selector) => {
+  const element = document.querySelector(selector);
+  return element ? element.value : "";
+};
+const escape = (text) => String(text).replace(/[&<>"]/g, (c) => (
+  {"&": "&amp;", "<": "&lt;", ">": "&gt;", "\"": "&quot;"}[c]
+));
+const yen = (amount) => amount.toLocaleString("ja-JP");
+
+const header = () => `
+  <header>
+    <a href="#" ui-sref="home" ng-click="vm.clickLogo()" data-action="home">即パット</a>
+    <span class="purchase-limit">購入限度額 <strong>${yen(state.limit)}</strong>円</span>
+    <span class="error">${escape(state.error)}</span>
+  </header>`;
+
+const dialog = () => state.dialog === null ? "" : `
+  <div class="dialog">
+    <p>${escape(state.dialog.message)}</p>
+    <button class="btn btn-ok" data-action="dialog-ok">OK</button>
+  </div>`;
+
+const raceOptions = () => {
+  const races = CONFIG.venues[state.venue].races;
+  let html = "";
+  for (let race = 1; race <= races; race++) {
+    const selected = race === state.race ? " selected" : "";
+    html += `<option value="${race}"${selected}>${race}R</option>`;
+  }
+  return html;
+};
+
+// 馬券の種類ごとの組み合わせる頭数と、着順を区別するかどうか
+const BET_TYPES = {
+  "単勝": {size: 1, ordered: false},
+  "複勝": {size: 1, ordered: false},
+  "馬連": {size: 2, ordered: false},
+  "ワイド": {size: 2, ordered: false},
+  "馬単": {size: 2, ordered: true},
+  "3連複": {size: 3, ordered: false},
+  "3連単": {size: 3, ordered: true},
+};
+const METHODS = ["フォーメーション", "ボックス", "ながし"];
+
+// 馬番の入力欄の列の数（単勝・複勝は列番号のないチェックボックスを使う）
+const columnCount = () => {
+  const size = BET_TYPES[state.betType].size;
+  if (size === 1) {
+    return 0;
+  }
+  return {"フォーメーション": size, "ボックス": 1, "ながし": 2}[state.method];
+};
+
+const checkbox = (key, label) => {
+  const checked = state.checked.has(key) ? " checked" : "";
+  return `<label for="no${key}"><span class="check${checked}" data-action="toggle"
+    data-key="${key}"></span>${label}</label>`;
+};
+
+const betForm = () => {
+  let horses = "";
+  const columns = columnCount();
+  if (columns === 0) {
+    for (let horse = 1; horse <= CONFIG.horses; horse++) {
+      horses += checkbox(String(horse), horse);
+    }
+  } else {
+    for (let column = 1; column <= columns; column++) {
+      horses += `<div class="column">`;
+      for (let horse = 1; horse <= CONFIG.horses; horse++) {
+        horses += checkbox(`${column}-${horse}`, horse);
+      }
+      horses += "</div>";
+    }
+  }
+  const types = Object.keys(BET_TYPES).map((type) => {
+    const selected = type === state.betType ? " selected" : "";
+    return `<option${selected}>${type}</option>`;
+  }).join("");
+  let method = "";
+  if (columns > 0) {
+    const methods = METHODS.map((name) => {
+      const selected = name === state.method ? " selected" : "";
+      return `<option${selected}>${name}</option>`;
+    }).join("");
+    method = `<select id="bet-basic-method" data-change="method">${methods}</select>`;
+    if (state.method === "ながし" && BET_TYPES[state.betType].ordered) {
+      const checked = state.multi ? " checked" : "";
+      method += `<label for="multi"><span class="check${checked}"
+        data-action="multi"></span>マルチ</label>`;
+    }
+  }
+  return `
+    <select id="bet-basic-type" data-change="type">${types}</select>
+    ${method}
+    <div class="horses">${horses}</div>
+    <input type="text" maxlength="4" ng-model="vm.nUnit">
+    <button class="btn btn-lg btn-set btn-primary" ng-click="vm.onSet()"
+      data-action="set">セット</button>`;
+};
+
+const VIEWS = {
+  login: () => `
+    <form>
+      <input type="text" name="inetid">
+      <a href="#" title="ログイン" tabindex="4" data-action="login">ログイン</a>
+      <span class="error">${escape(state.error)}</span>
+    </form>`,
+  member: () => `
+    <form>
+      <input type="text" name="i">
+      <input type="password" name="p">
+      <input type="password" name="r">
+      <a href="#" title="ネット投票メニューへ" tabindex="5" data-action="member">ネット投票メニューへ</a>
+      <span class="error">${escape(state.error)}</span>
+    </form>`,
+  announce: () => `
+    <h1>お知らせ</h1>
+    <p>シミュレータからのお知らせです。</p>
+    <button class="btn btn-ok" data-action="dismiss">OK</button>`,
+  home: () => `
+    ${header()}
+    <button title="出馬表から馬を選択する方式です。" data-action="normal">通常投票</button>`,
+  races: () => {
+    let html = header();
+    CONFIG.venues.forEach((venue, index) => {
+      html += `<div class="venue"><h2>${escape(venue.name)}</h2>`;
+      for (let race = 1; race <= venue.races; race++) {
+        html += `<button data-action="pick" data-venue="${index}"
+          data-race="${race}">${race}R</button>`;
+      }
+      html += "</div>";
+    });
+    return html;
+  },
+  bet: () => {
+    const venues = CONFIG.venues.map((venue, index) => {
+      const selected = index === state.venue ? " selected" : "";
+      return `<option value="${index}"${selected}>${escape(venue.name)}（${venue.day}）</option>`;
+    }).join("");
+    return `
+      ${header()}
+      <select id="select-course-race-course" data-change="venue">${venues}</select>
+      <select id="select-course-race-race" data-change="race">${raceOptions()}</select>
+      <div id="bet-form">${betForm()}</div>
+      <button class="btn btn-vote-list" data-action="vote-list">
+        購入予定リスト（${state.voteList.length}）</button>`;
+  },
+  voteList: () => {
+    const rows = state.voteList.map((ticket) => `
+      <tr><td>${escape(ticket.venue)}</td><td>${ticket.race}R</td><td>${ticket.type}</td>
+      <td>${ticket.horse}</td><td>${yen(ticket.amount)}円</td></tr>`).join("");
+    return `
+      ${header()}
+      <table class="vote-list">${rows}</table>
+      <input type="text" ng-model="vm.cAmountTotal">
+      <button class="btn btn-primary" data-action="purchase">購入</button>
+      <button class="btn btn-default" data-action="delete-all">全て削除</button>
+      ${dialog()}`;
+  },
+};
+
+const render = () => {
+  app.innerHTML = VIEWS[state.view]();
+};
+
+const show = (view) => later(() => {
+  state.view = view;
+  state.error = "";
+  render();
+});
+
+// AngularJSのダイジェスト後の再レンダリングと同様に、購入フォームだけを遅延して作り直す
+const rerenderBetForm = () => later(() => {
+  const form = document.getElementById("bet-form");
+  if (form !== null) {
+    form.innerHTML = betForm();
+  }
+});
+
+// 列ごとのチェックから組み合わせの点数を数える
+const countCombinations = (legs) => {
+  const {size, ordered} = BET_TYPES[state.betType];
+  const horses = [...new Set(legs.flat())];
+  const axis = legs[0];
+  const matches = (tuple) => {
+    if (state.method === "フォーメーション") {
+      return tuple.every((horse, index) => legs[index].includes(horse));
+    }
+    if (state.method === "ボックス") {
+      return tuple.every((horse) => axis.includes(horse));
+    }
+    const rest = ordered && !state.multi ? tuple.slice(axis.length) : tuple;
+    if (ordered && !state.multi && axis.some((horse, index) => tuple[index] !== horse)) {
+      return false;
+    }
+    const partners = rest.filter((horse) => !axis.includes(horse));
+    return axis.every((horse) => tuple.includes(horse))
+      && partners.length === size - axis.length
+      && partners.every((horse) => legs[1].includes(horse));
+  };
+  const found = new Set();
+  const extend = (tuple) => {
+    if (tuple.length === size) {
+      if (matches(tuple)) {
+        found.add((ordered ? tuple : [...tuple].sort((a, b) => a - b)).join("-"));
+      }
+      return;
+    }
+    for (const horse of horses) {
+      if (!tuple.includes(horse)) {
+        extend([...tuple, horse]);
+      }
+    }
+  };
+  extend([]);
+  return found.size;
+};
+
+const fail = (message) => {
+  state.error = message;
+  render();
+};
+
+const ACTIONS = {
+  login: () => {
+    if (!value("[name=inetid]")) {
+      return fail("INET-IDを入力してください");
+    }
+    show("member");
+  },
+  member: () => {
+    const credentials = [value("[name=i]"), value("[name=p]"), value("[name=r]")];
+    if (credentials.some((item) => !item)) {
+      return fail("加入者番号・暗証番号・P-ARS番号を入力してください");
+    }
+    show(CONFIG.announce ? "announce" : "home");
+  },
+  dismiss: () => show("home"),
+  home: () => show("home"),
+  normal: () => show("races"),
+  pick: (target) => {
+    state.venue = Number(target.dataset.venue);
+    state.race = Number(target.dataset.race);
+    state.checked.clear();
+    state.multi = false;
+    show("bet");
+  },
+  toggle: (target) => {
+    const key = target.dataset.key;
+    if (state.checked.has(key)) {
+      state.checked.delete(key);
+    } else {
+      state.checked.add(key);
+    }
+    target.classList.toggle("checked", state.checked.has(key));
+  },
+  multi: (target) => {
+    state.multi = !state.multi;
+    target.classList.toggle("checked", state.multi);
+  },
+  set: () => {
+    const unit = Number(value("[ng-model='vm.nUnit']"));
+    if (state.checked.size === 0 || !Number.isInteger(unit) || unit <= 0) {
+      return fail("馬番と金額を入力してください");
+    }
+    const race = {venue: CONFIG.venues[state.venue].name, race: state.race, type: state.betType};
+    const columns = columnCount();
+    if (columns === 0) {
+      for (const horse of [...state.checked].map(Number).sort((a, b) => a - b)) {
+        state.voteList.push({...race, horse: horse, amount: unit * 100});
+      }
+    } else {
+      const legs = [];
+      for (let column = 1; column <= columns; column++) {
+        legs.push([...state.checked]
+          .filter((key) => key.startsWith(`${column}-`))
+          .map((key) => Number(key.split("-")[1]))
+          .sort((a, b) => a - b));
+      }
+      const count = countCombinations(legs);
+      if (count === 0) {
+        return fail("組み合わせがありません");
+      }
+      state.voteList.push({
+        ...race,
+        method: state.method,
+        horse: legs.map((leg) => leg.join(",")).join("-") + (state.multi ? "（マルチ）" : ""),
+        count: count,
+        amount: unit * 100 * count,
+      });
+    }
+    state.checked.clear();
+    state.multi = false;
+    state.error = "";
+    const button = document.querySelector(".btn-vote-list");
+    button.textContent = `購入予定リスト（${state.voteList.length}）`;
+    rerenderBetForm();
+  },
+  "vote-list": () => show("voteList"),
+  purchase: () => {
+    const total = state.voteList.reduce((sum, ticket) => sum + ticket.amount, 0);
+    if (state.voteList.length === 0 || Number(value("[ng-model='vm.cAmountTotal']")) !== total) {
+      return fail("合計金額が一致しません");
+    }
+    if (total > state.limit) {
+      return fail("購入限度額を超えています");
+    }
+    state.dialog = {kind: "purchase", message: `${yen(total)}円分を購入します。よろしいですか？`};
+    render();
+  },
+  "delete-all": () => {
+    state.dialog = {kind: "delete", message: "購入予定リストを全て削除します。よろしいですか？"};
+    render();
+  },
+  "dialog-ok": () => {
+    const kind = state.dialog.kind;
+    const tickets = state.voteList;
+    state.voteList = [];
+    state.dialog = null;
+    if (kind === "purchase") {
+      const total = tickets.reduce((sum, ticket) => sum + ticket.amount, 0);
+      state.limit -= total;
+      fetch("/api/purchase", {
+        method: "POST",
+        headers: {"Content-Type": "application/json"},
+        body: JSON.stringify({tickets: tickets, total: total}),
+      });
+    }
+    render();
+  },
+};
+
+const CHANGES = {
+  venue: (target) => {
+    state.venue = Number(target.value);
+    state.race = 1;
+    state.checked.clear();
+    state.multi = false;
+    // レースのプルダウンは競馬場の選択に合わせて即座に更新される
+    document.getElementById("select-course-race-race").innerHTML = raceOptions();
+    rerenderBetForm();
+  },
+  race: (target) => {
+    state.race = Number(target.value);
+    state.checked.clear();
+    state.multi = false;
+    rerenderBetForm();
+  },
+  type: (target) => {
+    const previous = BET_TYPES[state.betType];
+    state.betType = target.value;
+    // 組み合わせる頭数・着順の区別が変わる場合は馬番の入力欄が作り直される
+    const current = BET_TYPES[state.betType];
+    if (current.size !== previous.size || current.ordered !== previous.ordered) {
+      state.checked.clear();
+      state.multi = false;
+      rerenderBetForm();
+    }
+  },
+  method: (target) => {
+    state.method = target.value;
+    state.checked.clear();
+    state.multi = false;
+    rerenderBetForm();
+  },
+};
+
+document.addEventListener("click", (event) => {
+  const target = event.target.closest("[data-action]");
+  if (target === null) {
+    return;
+  }
+  event.preventDefault();
+  ACTIONS[target.dataset.action](target);
+});
+
+document.addEventListener("change", (event) => {
+  const target = event.target.closest("[data-change]");
+  if (target !== null) {
+    CHANGES[target.dataset.change](target);
+  }
+});
+
+render();
+"""
+
+
+class IpatSimulator:
+    """即パットのローカルシミュレータ.
+
+    ログイン・お知らせ・通常投票・購入予定リスト・購入確定の画面を再現し、
+    購入確定された馬券を`purchases`に記録する。
+    認証情報は空でないことのみ確認する。
+
+    Attributes:
+        venues: 競馬場名とレース数の対応
+        horses: 各レースの出走頭数
+        render_delay: 画面遷移・購入フォームの再レンダリングの遅延（秒）
+        announce: ログイン直後にお知らせページを表示するかどうか
+        asset_delay: 画像・Webフォント・アクセス解析の応答の遅延（秒、Noneの場合は読み込ませない）
+        purchase_limit: 画面に表示する購入限度額（円）。購入確定のたびに購入金額を差し引く
+        purchases: 購入確定された購入予定リスト（確定順）
+        asset_requests: 画像・Webフォント・アクセス解析へのリクエストのパス（受信順）
+        login_error: 設定するとAPIでのログインをこのエラーメッセージで拒否する
+        vote_error: 設定するとAPIでの投票をこのエラーメッセージで拒否する
+        login_count: APIでのログインの回数
+        connection_count: 受け付けたTCP接続の数
+    """
+
+    def __init__(
+        self,
+        venues: dict[str, int] | None = None,
+        horses: int = 16,
+        render_delay: float = 0.03,
+        announce: bool = False,
+        asset_delay: float | None = None,
+        purchase_limit: int = 100000,
+    ) -> None:
+        """コンストラクタ.
+
+        Args:
+            venues: 競馬場名とレース数の対応（Noneの場合は東京・京都・新潟の各12R）
+            horses: 各レースの出走頭数
+            render_delay: 画面遷移・購入フォームの再レンダリングの遅延（秒）
+            announce: ログイン直後にお知らせページを表示するかどうか
+            asset_delay: 画像・Webフォント・アクセス解析の応答の遅延（秒、Noneの場合は読み込ませない）
+            purchase_limit: 画面に表示する購入限度額（円）
+        """
+        self.venues = dict(_DEFAULT_VENUES if venues is None else venues)
+        self.horses = horses
+        self.render_delay = render_delay
+        self.announce = announce
+        self.asset_delay = asset_delay
+        self.purchase_limit = purchase_limit
+        self.purchases: list[dict[str, Any]] = []
+        self.asset_requests: list[str] = []
+        self.login_error: str | None = None
+        self.vote_error: str | None = None
+        self.login_count = 0
+        self.connection_count = 0
+        self._tokens: set[str] = set()
+        self._lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "IpatSimulator":
+        """サーバを起動する.
+
+        Returns:
+            IpatSimulator: 自身のインスタンス
+        """
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """サーバを停止する."""
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """シミュレータのトップページのURL."""
+        assert self._server is not None
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}/"
+
+    def start(self) -> None:
+        """空いているポートでサーバを起動する."""
+        simulator = self
+
+        class Handler(_SimulatorHandler):
+            """このシミュレータに紐付いたリクエストハンドラ."""
+
+            owner = simulator
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """サーバを停止する."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def reset(self) -> None:
+        """記録した購入・リクエストと、拒否の設定をクリアする."""
+        with self._lock:
+            self.purchases.clear()
+            self.asset_requests.clear()
+            self.login_error = None
+            self.vote_error = None
+            self.login_count = 0
+            self.connection_count = 0
+            self._tokens.clear()
+
+    def render_page(self) -> str:
+        """シミュレータのページのHTMLを生成する.
+
+        Returns:
+            str: HTML
+        """
+        config = {
+            "renderDelayMs": self.render_delay * 1000,
+            "venues": [
+                {"name": name, "races": races, "day": f"{index + 1}日"}
+                for index, (name, races) in enumerate(self.venues.items())
+            ],
+            "horses": self.horses,
+            "announce": self.announce,
+            "purchaseLimit": self.remaining_limit(),
+        }
+        script = _SCRIPT.replace("__CONFIG__", json.dumps(config, ensure_ascii=False))
+        with_assets = self.asset_delay is not None
+        return (
+            _PAGE_TEMPLATE.replace("__ASSETS_HEAD__", _ASSETS_HEAD if with_assets else "")
+            .replace("__ASSETS_BODY__", _ASSETS_BODY if with_assets else "")
+            .replace("__SCRIPT__", script)
+        )
+
+    def remaining_limit(self) -> int:
+        """購入確定された金額を差し引いた購入限度額を返す.
+
+        Returns:
+            int: 購入限度額（円）
+        """
+        with self._lock:
+            return self.purchase_limit - sum(purchase["total"] for purchase in self.purchases)
+
+    def record_purchase(self, purchase: dict[str, Any]) -> None:
+        """購入確定された購入予定リストを記録する.
+
+        Args:
+            purchase: 購入予定リストの馬券と合計金額
+        """
+        with self._lock:
+            self.purchases.append(purchase)
+
+    def login(self, body: dict[str, Any]) -> str | None:
+        """APIでのログインを処理する.
+
+        Args:
+            body: INET-ID・加入者番号・暗証番号
+
+        Returns:
+            str | None: 発行したセッショントークン。拒否する場合はNone
+        """
+        if self.login_error is not None:
+            return None
+        if not all(body.get(key) for key in ("inetid", "user_number", "password")):
+            return None
+        token = secrets.token_hex(16)
+        with self._lock:
+            self.login_count += 1
+            self._tokens.add(token)
+        return token
+
+    def is_valid_token(self, token: str) -> bool:
+        """セッショントークンが有効かどうかを返す.
+
+        Args:
+            token: セッショントークン
+
+        Returns:
+            bool: 有効な場合はTrue
+        """
+        with self._lock:
+            return token in self._tokens
+
+    def expire_sessions(self) -> None:
+        """発行済みのセッショントークンをすべて無効にする（セッション切れを再現する）."""
+        with self._lock:
+            self._tokens.clear()
+
+    def count_connection(self) -> None:
+        """TCP接続の受け付けを記録する."""
+        with self._lock:
+            self.connection_count += 1
+
+    def serve_asset(self, path: str) -> None:
+        """画像・Webフォント・アクセス解析へのリクエストを記録し、応答を遅延させる.
+
+        Args:
+            path: リクエストのパス
+        """
+        with self._lock:
+            self.asset_requests.append(path)
+        time.sleep(self.asset_delay or 0.0)
+
+
+class _SimulatorHandler(BaseHTTPRequestHandler):
+    """シミュレータのリクエストハンドラ.
+
+    APIの接続をkeep-aliveで使い回せるよう、HTTP/1.1で応答する。
+    """
+
+    protocol_version = "HTTP/1.1"
+    owner: IpatSimulator
+
+    def do_GET(self) -> None:  # noqa: N802
+        """ページを返す."""
+        path = self.path.split("?")[0]
+        if path in _ASSET_CONTENT_TYPES:
+            self.owner.serve_asset(path)
+            self._send(HTTPStatus.OK, _ASSET_CONTENT_TYPES[path], "")
+            return
+        if path != "/":
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        self._send(HTTPStatus.OK, "text/html; charset=utf-8", self.owner.render_page())
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        """ヘッダのみを返す."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+
+    def setup(self) -> None:
+        """TCP接続の受け付けを記録する."""
+        super().setup()
+        self.owner.count_connection()
+
+    def do_POST(self) -> None:  # noqa: N802
+        """購入確定の記録とAPIのリクエストを処理する."""
+        length = int(self.headers.get("Content-Length", "0"))
+        body = json.loads(self.rfile.read(length))
+        if self.path == "/api/purchase":
+            self.owner.record_purchase(body)
+            self._send_json(HTTPStatus.OK, {"ok": True})
+        elif self.path == "/api/login":
+            token = self.owner.login(body)
+            if token is None:
+                error = self.owner.login_error or "認証情報が正しくありません"
+                self._send_json(HTTPStatus.UNAUTHORIZED, {"error": error})
+            else:
+                self._send_json(HTTPStatus.OK, {"token": token})
+        elif self.path == "/api/vote":
+            self._vote(body)
+        else:
+            self.send_error(HTTPStatus.NOT_FOUND)
+
+    def _vote(self, body: dict[str, Any]) -> None:
+        """APIでの投票を処理する.
+
+        Args:
+            body: 馬券・合計金額・P-ARS番号
+        """
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not self.owner.is_valid_token(token):
+            self._send_json(HTTPStatus.UNAUTHORIZED, {"error": "セッションが切れています"})
+            return
+        if self.owner.vote_error is not None:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": self.owner.vote_error})
+            return
+        tickets = body.get("tickets", [])
+        total = sum(ticket["amount"] for ticket in tickets)
+        if not tickets or total != body.get("total") or not body.get("p_ars"):
+            self._send_json(HTTPStatus.BAD_REQUEST, {"error": "合計金額が一致しません"})
+            return
+        self.owner.record_purchase({"tickets": tickets, "total": total})
+        self._send_json(HTTPStatus.OK, {"ok": True})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """アクセスログを出力しない."""
+
+    def _send_json(self, status: HTTPStatus, body: dict[str, Any]) -> None:
+        """JSONのレスポンスを返す.
+
+        Args:
+            status: ステータスコード
+            body: レスポンスボディ
+        """
+        self._send(status, "application/json", json.dumps(body, ensure_ascii=False))
+
+    def _send(self, status: HTTPStatus, content_type: str, body: str) -> None:
+        """レスポンスを返す.
+
+        Args:
+            status: ステータスコード
+            content_type: Content-Type
+            body: レスポンスボディ
+        """
+        encoded = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(encoded)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(encoded)
@@ -0,0 +1,225 @@
+"""即パットシミュレータに対する購入処理の性能計測.
+
+実際のChromeでシミュレータを操作し、注文件数・レース数に対する`bet()`の所要時間を計測する。
+Chromeを起動できない環境ではスキップする。
+"""
+
+import time
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from keiba_auto_bet.auto_bet import AutoBetter
+from keiba_auto_bet.models import (
+    AutoBetConfig,
+    BetOrder,
+    BetResult,
+    HorseSelection,
+    IpatCredentials,
+    TicketType,
+)
+
+from .ipat_simulator import IpatSimulator
+
+pytestmark = [pytest.mark.integration, pytest.mark.slow]
+
+_PURCHASE_RECORD_TIMEOUT = 5.0  # 購入確定がシミュレータに記録されるまでの待機秒数
+_SLOW_ASSET_DELAY = 1.0  # 軽量プロファイルの計測で画像・Webフォント・アクセス解析を遅延させる秒数
+
+
+@pytest.fixture(scope="module")
+def latency_report() -> Generator[list[tuple[str, BetResult]], None, None]:
+    """計測結果を集め、モジュール終了時に一覧を出力する.
+
+    Yields:
+        list[tuple[str, BetResult]]: (計測条件, 購入結果)のリスト
+    """
+    report: list[tuple[str, BetResult]] = []
+    yield report
+    if not report:
+        return
+    phases = sorted({phase for _, result in report for phase in result.phase_timings})
+    print()
+    print("条件\t合計\t" + "\t".join(phases))
+    for label, result in report:
+        timings = "\t".join(f"{result.phase_timings.get(phase, 0.0):.3f}" for phase in phases)
+        print(f"{label}\t{result.total_seconds:.3f}\t{timings}")
+
+
+def _make_orders(order_count: int, race_count: int) -> list[BetOrder]:
+    """計測用の購入注文を生成する.
+
+    注文はレース・馬番が重ならないように、指定レース数に均等に振り分ける。
+
+    Args:
+        order_count: 注文件数
+        race_count: レース数
+
+    Returns:
+        list[BetOrder]: 購入注文リスト
+    """
+    return [
+        BetOrder(
+            venue="東京",
+            race_number=12 - index % race_count,
+            ticket_type=TicketType.WIN if index % 2 == 0 else TicketType.SHOW,
+            horse_number=index // race_count + 1,
+            amount=100 * (index % 3 + 1),
+        )
+        for index in range(order_count)
+    ]
+
+
+def _wait_for_purchases(simulator: IpatSimulator, count: int) -> None:
+    """購入確定がシミュレータに記録されるまで待機する.
+
+    Args:
+        simulator: シミュレータ
+        count: 期待する購入確定の回数
+    """
+    end_time = time.monotonic() + _PURCHASE_RECORD_TIMEOUT
+    while len(simulator.purchases) < count and time.monotonic() < end_time:
+        time.sleep(0.05)
+
+
+@pytest.mark.usefixtures("require_chrome")
+@pytest.mark.parametrize(
+    "order_count, race_count",
+    [(1, 1), (5, 1), (5, 5), (10, 2), (20, 4)],
+)
+def test_bet_latency(
+    simulator: IpatSimulator,
+    dummy_credentials: IpatCredentials,
+    latency_report: list[tuple[str, BetResult]],
+    order_count: int,
+    race_count: int,
+) -> None:
+    """コールドスタートからの購入処理が完了し、注文どおりに購入される."""
+    orders = _make_orders(order_count, race_count)
+    better = AutoBetter(dummy_credentials, AutoBetConfig(ipat_url=simulator.url, max_bet=100000))
+
+    result = better.bet(orders)
+
+    _wait_for_purchases(simulator, 1)
+    assert result.success is True
+    assert result.race_count == race_count
+    assert [purchase["total"] for purchase in simulator.purchases] == [
+        sum(order.amount for order in orders)
+    ]
+    latency_report.append((f"cold {order_count}件/{race_count}R", result))
+
+
+@pytest.mark.usefixtures("require_chrome")
+@pytest.mark.parametrize("order_count, race_count", [(1, 1), (10, 2)])
+def test_session_bet_latency(
+    simulator: IpatSimulator,
+    dummy_credentials: IpatCredentials,
+    latency_report: list[tuple[str, BetResult]],
+    order_count: int,
+    race_count: int,
+) -> None:
+    """セッション中の2回目以降の購入は起動・ログインを含まずに完了する."""
+    orders = _make_orders(order_count, race_count)
+    config = AutoBetConfig(ipat_url=simulator.url, max_bet=100000)
+
+    with AutoBetter(dummy_credentials, config) as better:
+        better.bet(orders)
+        result = better.bet(orders)
+
+    _wait_for_purchases(simulator, 2)
+    assert result.success is True
+    assert "login" not in result.phase_timings
+    assert len(simulator.purchases) == 2
+    latency_report.append((f"session {order_count}件/{race_count}R", result))
+
+
+@pytest.mark.usefixtures("require_chrome")
+def test_combination_bet_latency(
+    simulator: IpatSimulator,
+    dummy_credentials: IpatCredentials,
+    latency_report: list[tuple[str, BetResult]],
+) -> None:
+    """組み合わせの馬券は入力方式ごとに1回のセット操作で全ての組み合わせを購入する."""
+    orders = [
+        BetOrder("東京", 11, TicketType.TRIO, None, 100, HorseSelection.box((1, 2, 3, 4, 5, 6))),
+        BetOrder(
+            "東京", 11, TicketType.EXACTA, None, 200, HorseSelection.nagashi((3,), (1, 5), True)
+        ),
+        BetOrder(
+            "東京",
+            11,
+            TicketType.TRIFECTA,
+            None,
+            100,
+            HorseSelection.formation((1, 2), (1, 2, 3), (1, 2, 3, 4)),
+        ),
+        BetOrder("東京", 11, TicketType.WIN, 3, 100),
+    ]
+    better = AutoBetter(dummy_credentials, AutoBetConfig(ipat_url=simulator.url, max_bet=100000))
+
+    result = better.bet(orders)
+
+    _wait_for_purchases(simulator, 1)
+    assert result.success is True
+    assert len(result.entry_timings) == 4
+    tickets = simulator.purchases[0]["tickets"]
+    assert [(ticket["type"], ticket.get("count", 1)) for ticket in tickets] == [
+        ("3連複", 20),
+        ("馬単", 4),
+        ("3連単", 8),
+        ("単勝", 1),
+    ]
+    assert simulator.purchases[0]["total"] == 2000 + 800 + 800 + 100
+    latency_report.append(("combination 4件/1R", result))
+
+
+@pytest.mark.usefixtures("require_chrome")
+@pytest.mark.parametrize("lean_profile", [False, True])
+def test_lean_profile_page_load(
+    dummy_credentials: IpatCredentials,
+    latency_report: list[tuple[str, BetResult]],
+    lean_profile: bool,
+) -> None:
+    """軽量プロファイルでは画像・Webフォント・アクセス解析を待たずにページを読み込む."""
+    orders = _make_orders(1, 1)
+    with IpatSimulator(asset_delay=_SLOW_ASSET_DELAY) as simulator:
+        config = AutoBetConfig(
+            ipat_url=simulator.url,
+            max_bet=100000,
+            lean_profile=lean_profile,
+            blocked_url_patterns=AutoBetConfig().blocked_url_patterns + ("*/analytics/*",),
+        )
+        result = AutoBetter(dummy_credentials, config).bet(orders)
+        _wait_for_purchases(simulator, 1)
+        asset_requests = list(simulator.asset_requests)
+
+    assert result.success is True
+    if lean_profile:
+        assert asset_requests == []
+        assert result.phase_timings["page_load"] < _SLOW_ASSET_DELAY
+    else:
+        assert result.phase_timings["page_load"] >= _SLOW_ASSET_DELAY
+    latency_report.append((f"{'lean' if lean_profile else 'default'} profile", result))
+
+
+@pytest.mark.usefixtures("require_chrome")
+def test_reused_profile_page_load(
+    simulator: IpatSimulator,
+    dummy_credentials: IpatCredentials,
+    latency_report: list[tuple[str, BetResult]],
+    tmp_path: Path,
+) -> None:
+    """プロファイルを再利用した2回目の起動でも購入が完了する."""
+    orders = _make_orders(1, 1)
+    config = AutoBetConfig(ipat_url=simulator.url, max_bet=100000, profile_dir=str(tmp_path))
+
+    first = AutoBetter(dummy_credentials, config).bet(orders)
+    second = AutoBetter(dummy_credentials, config).bet(orders)
+
+    _wait_for_purchases(simulator, 2)
+    assert first.success is True
+    assert second.success is True
+    assert (tmp_path / "slot-0" / "Default").is_dir()
+    latency_report.append(("profile 1回目", first))
+    latency_report.append(("profile 2回目", second))
@@ -0,0 +1,116 @@
+"""購入処理のWebDriverコマンド数の予算のテスト.
+
+基準となる注文リストを即パットシミュレータで購入し、実行したWebDriverコマンドの回数が
+記録済みの予算を超えていないことを確認する。
+Chromeを起動できない環境では予算の確認をスキップする。
+"""
+
+from pathlib import Path
+
+import pytest
+
+from keiba_auto_bet.auto_bet import AutoBetter
+from keiba_auto_bet.models import (
+    AutoBetConfig,
+    BetOrder,
+    CommandProfile,
+    CommandRecord,
+    IpatCredentials,
+    TicketType,
+)
+
+from .command_budget import RECORD_ENV, check_command_budget
+from .ipat_simulator import IpatSimulator
+
+pytestmark = pytest.mark.integration
+
+
+def _reference_orders() -> list[BetOrder]:
+    """予算を計測する基準の購入注文（2レース・単勝と複勝・まとめ入力を含む）."""
+    return [
+        BetOrder("東京", 11, TicketType.WIN, 3, 500),
+        BetOrder("東京", 11, TicketType.SHOW, 1, 200),
+        BetOrder("東京", 11, TicketType.SHOW, 4, 200),
+        BetOrder("東京", 12, TicketType.WIN, 7, 300),
+        BetOrder("東京", 12, TicketType.WIN, 8, 100),
+    ]
+
+
+def _profile(phases: list[str]) -> CommandProfile:
+    """フェーズごとに1回ずつコマンドを実行した記録を作成する."""
+    return CommandProfile(
+        records=tuple(
+            CommandRecord(phase=phase, command="findElement", seconds=0.01) for phase in phases
+        )
+    )
+
+
+# 正常系
+@pytest.mark.slow
+@pytest.mark.usefixtures("require_chrome")
+@pytest.mark.parametrize("session", [False, True])
+def test_reference_orders_within_command_budget(
+    simulator: IpatSimulator,
+    dummy_credentials: IpatCredentials,
+    session: bool,
+) -> None:
+    """基準の注文リストの購入で実行するWebDriverコマンドの回数が予算以内に収まる."""
+    config = AutoBetConfig(ipat_url=simulator.url, max_bet=100000, profile_commands=True)
+
+    if session:
+        with AutoBetter(dummy_credentials, config) as better:
+            result = better.bet(_reference_orders())
+    else:
+        result = AutoBetter(dummy_credentials, config).bet(_reference_orders())
+
+    assert result.command_profile is not None
+    check_command_budget("session" if session else "cold", result.command_profile)
+
+
+def test_check_command_budget_within_budget(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """予算以内の場合は成功する."""
+    monkeypatch.delenv(RECORD_ENV, raising=False)
+    budget_file = tmp_path / "budget.json"
+    budget_file.write_text('{"cold": {"total": 2, "login": 1, "confirm": 1}}', encoding="utf-8")
+
+    check_command_budget("cold", _profile(["login", "confirm"]), budget_file)
+
+
+def test_check_command_budget_records_budget(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """記録モードの場合は計測したコマンド数を予算として記録する."""
+    monkeypatch.setenv(RECORD_ENV, "1")
+    budget_file = tmp_path / "budget.json"
+
+    check_command_budget("cold", _profile(["login", "login", "confirm"]), budget_file)
+
+    monkeypatch.delenv(RECORD_ENV)
+    check_command_budget("cold", _profile(["login", "login", "confirm"]), budget_file)
+    assert '"login": 2' in budget_file.read_text(encoding="utf-8")
+
+
+# 準正常系
+def test_check_command_budget_skips_without_budget(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """予算が記録されていない場合はスキップする."""
+    monkeypatch.delenv(RECORD_ENV, raising=False)
+
+    with pytest.raises(pytest.skip.Exception, match="予算が記録されていません"):
+        check_command_budget("cold", _profile(["login"]), tmp_path / "budget.json")
+
+
+# 異常系
+def test_check_command_budget_fails_over_budget(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """フェーズのコマンド数が予算を超えた場合は失敗する."""
+    monkeypatch.delenv(RECORD_ENV, raising=False)
+    budget_file = tmp_path / "budget.json"
+    budget_file.write_text('{"cold": {"total": 10, "race_select": 2}}', encoding="utf-8")
+
+    with pytest.raises(pytest.fail.Exception, match="race_select: 3回（予算2回）"):
+        check_command_budget("cold", _profile(["race_select"] * 3), budget_file)
@@ -0,0 +1,280 @@
+"""即パットシミュレータに対するHttpBetterのテスト.
+
+ブラウザを使わないため、Chromeを起動できない環境でも実行できる。
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from keiba_auto_bet.auto_bet import AutoBetter
+from keiba_auto_bet.backend import BetBackend
+from keiba_auto_bet.exceptions import LoginError, PurchaseError, ValidationError
+from keiba_auto_bet.models import (
+    AutoBetConfig,
+    BetOrder,
+    HorseSelection,
+    IpatCredentials,
+    TicketType,
+)
+
+from .http_backend import HttpBetter, _ConnectionPool
+from .ipat_simulator import IpatSimulator
+
+pytestmark = pytest.mark.integration
+
+
+def _orders() -> list[BetOrder]:
+    """テスト用の購入注文を生成する."""
+    return [
+        BetOrder(
+            venue="東京", race_number=11, ticket_type=TicketType.WIN, horse_number=3, amount=500
+        ),
+        BetOrder(
+            venue="東京", race_number=11, ticket_type=TicketType.WIN, horse_number=3, amount=200
+        ),
+        BetOrder(
+            venue="京都", race_number=12, ticket_type=TicketType.SHOW, horse_number=7, amount=300
+        ),
+    ]
+
+
+def _config(simulator: IpatSimulator) -> AutoBetConfig:
+    """シミュレータに接続する設定を生成する."""
+    return AutoBetConfig(login_timeout=2.0, confirm_timeout=2.0)
+
+
+# 正常系
+def test_bet_logs_in_and_votes(
+    simulator: IpatSimulator, dummy_credentials: IpatCredentials
+) -> None:
+    """ログインして同じ馬券をまとめた投票を送信する."""
+    better = HttpBetter(simulator.url, dummy_credentials, _config(simulator))
+
+    result = better.bet(_orders())
+
+    assert result.success is True
+    assert list(result.phase_timings) == ["login", "confirm"]
+    assert result.order_count == 3
+    assert result.race_count == 2
+    assert result.total_amount == 1000
+    assert simulator.purchases == [
+        {
+            "tickets": [
+                {"venue": "東京", "race": 11, "type": "単勝", "horse": 3, "amount": 700},
+                {"venue": "京都", "race": 12, "type": "複勝", "horse": 7, "amount": 300},
+            ],
+            "total": 1000,
+        }
+    ]
+
+
+def test_bet_votes_combination_with_total_amount(
+    simulator: IpatSimulator, dummy_credentials: IpatCredentials
+) -> None:
+    """組み合わせの馬券は馬番の選び方と全ての組み合わせの合計金額を送信する."""
+    better = HttpBetter(simulator.url, dummy_credentials, _config(simulator))
+    order = BetOrder(
+        venue="東京",
+        race_number=11,
+        ticket_type=TicketType.TRIO,
+        horse_number=None,
+        amount=200,
+        selection=HorseSelection.nagashi((3,), (1, 5, 8)),
+    )
+
+    result = better.bet([order])
+
+    assert result.success is True
+    assert result.total_amount == 600
+    assert simulator.purchases == [
+        {
+            "tickets": [
+                {
+                    "venue": "東京",
+                    "race": 11,
+                    "type": "3連複",
+                    "horse": None,
+                    "amount": 600,
+                    "method": "ながし",
+                    "legs": [[3], [1, 5, 8]],
+                    "multi": False,
+                    "unit": 200,
+                    "count": 3,
+                }
+            ],
+            "total": 600,
+        }
+    ]
+
+
+def test_session_reuses_login_and_connection(
+    simulator: IpatSimulator, dummy_credentials: IpatCredentials
+) -> None:
+    """セッション中はログインを省略し、keep-alive接続を使い回す."""
+    with HttpBetter(simulator.url, dummy_credentials, _config(simulator)) as better:
+        first = better.bet(_orders())
+        second = better.bet(_orders())
+
+    assert "login" not in first.phase_timings
+    assert "login" not in second.phase_timings
+    assert simulator.login_count == 1
+    assert simulator.connection_count == 1
+    assert len(simulator.purchases) == 2
+
+
+def test_relogin_on_expired_session(
+    simulator: IpatSimulator, dummy_credentials: IpatCredentials
+) -> None:
+    """セッション切れの場合は再ログインして投票をやり直す."""
+    with HttpBetter(simulator.url, dummy_credentials, _config(simulator)) as better:
+        simulator.expire_sessions()
+        result = better.bet(_orders())
+
+    assert "login" in result.phase_timings
+    assert simulator.login_count == 2
+    assert len(simulator.purchases) == 1
+
+
+def test_backends_share_interface(dummy_credentials: IpatCredentials) -> None:
+    """ブラウザ操作とHTTP通信の実装が同じインターフェースを持つ."""
+    assert isinstance(AutoBetter(dummy_credentials), BetBackend)
+    assert isinstance(HttpBetter("http://localhost:8080/", dummy_credentials), BetBackend)
+
+
+def test_connection_pool_reuses_connection() -> None:
+    """使い終えた接続を次のリクエストで使い回す."""
+    with patch("test.integration.http_backend.http.client.HTTPConnection") as mock_cls:
+        pool = _ConnectionPool("http://localhost:8080/", size=1, timeout=1.0)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+    assert first is second
+    mock_cls.assert_called_once_with("localhost:8080", timeout=1.0)
+
+
+def test_connection_pool_uses_https() -> None:
+    """httpsのURLにはTLS接続を使用する."""
+    with patch("test.integration.http_backend.http.client.HTTPSConnection") as mock_cls:
+        pool = _ConnectionPool("https://localhost:8443/", size=1, timeout=1.0)
+        with pool.connection():
+            pass
+
+    mock_cls.assert_called_once_with("localhost:8443", timeout=1.0)
+
+
+# 準正常系
+def test_bet_validates_max_bet(
+    simulator: IpatSimulator, dummy_credentials: IpatCredentials
+) -> None:
+    """最大合計購入金額を超える注文は送信しない."""
+    config = AutoBetConfig(max_bet=500)
+    better = HttpBetter(simulator.url, dummy_credentials, config)
+
+    with pytest.raises(ValidationError, match="最大購入金額500円を超えています"):
+        better.bet(_orders())
+
+    assert simulator.login_count == 0
+
+
+def test_connection_pool_discards_idle_connection() -> None:
+    """長く使われていない接続は使わずに閉じる."""
+    with (
+        patch("test.integration.http_backend.http.client.HTTPConnection") as mock_cls,
+        patch("test.integration.http_backend.time.monotonic") as mock_monotonic,
+    ):
+        mock_cls.side_effect = [MagicMock(), MagicMock()]
+        pool = _ConnectionPool("http://localhost/", size=1, timeout=1.0)
+        mock_monotonic.return_value = 0.0
+        with pool.connection() as first:
+            pass
+        mock_monotonic.return_value = 60.0
+        with pool.connection() as second:
+            pass
+
+    assert first is not second
+    first.close.assert_called_once()
+
+
+def test_connection_pool_closes_failed_connection() -> None:
+    """例外が発生した接続はプールに戻さずに閉じる."""
+    with patch("test.integration.http_backend.http.client.HTTPConnection") as mock_cls:
+        mock_cls.side_effect = [MagicMock(), MagicMock()]
+        pool = _ConnectionPool("http://localhost/", size=1, timeout=1.0)
+        with pytest.raises(ConnectionResetError):
+            with pool.connection() as failed:
+                raise ConnectionResetError
+        with pool.connection() as fresh:
+            pass
+
+    failed.close.assert_called_once()
+    assert fresh is not failed
+
+
+# 異常系
+def test_bet_raises_login_error_on_rejected_credentials(
+    simulator: IpatSimulator, dummy_credentials: IpatCredentials
+) -> None:
+    """ログインが拒否された場合LoginErrorが送出される."""
+    simulator.login_error = "認証情報が正しくありません"
+
+    with pytest.raises(LoginError, match="認証情報が正しくありません"):
+        HttpBetter(simulator.url, dummy_credentials, _config(simulator)).bet(_orders())
+
+    assert simulator.purchases == []
+
+
+def test_bet_raises_purchase_error_on_rejected_vote(
+    simulator: IpatSimulator, dummy_credentials: IpatCredentials
+) -> None:
+    """投票が拒否された場合PurchaseErrorが送出される."""
+    simulator.vote_error = "発売が締め切られました"
+
+    with pytest.raises(PurchaseError, match="購入確定に失敗しました: 発売が締め切られました"):
+        HttpBetter(simulator.url, dummy_credentials, _config(simulator)).bet(_orders())
+
+
+def test_bet_raises_login_error_when_server_unreachable(
+    dummy_credentials: IpatCredentials,
+) -> None:
+    """サーバに接続できない場合LoginErrorが送出される."""
+    with IpatSimulator() as stopped:
+        url = stopped.url
+    config = AutoBetConfig(login_timeout=1.0, confirm_timeout=1.0)
+
+    with pytest.raises(LoginError, match="ログインに失敗しました"):
+        HttpBetter(url, dummy_credentials, config).bet(_orders())
+
+
+def test_invalid_pool_size(dummy_credentials: IpatCredentials) -> None:
+    """1未満の接続数でValueErrorが発生する."""
+    with pytest.raises(ValueError, match="接続数は1以上で指定してください"):
+        HttpBetter("http://localhost:8080/", dummy_credentials, pool_size=0)
+
+
+@pytest.mark.parametrize(
+    "api_url",
+    [
+        "https://www.ipat.jra.go.jp/",
+        "https://jra.go.jp/api/",
+        "HTTPS://WWW.IPAT.JRA.GO.JP/",
+    ],
+)
+def test_rejects_production_host(dummy_credentials: IpatCredentials, api_url: str) -> None:
+    """JRAのホストを指定するとValueErrorが発生し、接続しない."""
+    with (
+        patch("test.integration.http_backend.http.client.HTTPSConnection") as mock_cls,
+        pytest.raises(ValueError, match="JRAのホストは指定できません"),
+    ):
+        HttpBetter(api_url, dummy_credentials)
+
+    mock_cls.assert_not_called()
+
+
+@pytest.mark.parametrize("api_url", ["", "localhost:8080", "ftp://localhost/"])
+def test_rejects_invalid_api_url(dummy_credentials: IpatCredentials, api_url: str) -> None:
+    """http(s)のURLでない場合ValueErrorが発生する."""
+    with pytest.raises(ValueError, match="APIのURLはhttpまたはhttpsのURLで指定してください"):
+        HttpBetter(api_url, dummy_credentials)
@@ -0,0 +1,78 @@
+"""IpatSimulatorのテスト."""
+
+import json
+import urllib.request
+
+from .ipat_simulator import IpatSimulator
+
+
+# 正常系
+def test_simulator_serves_page_with_config(simulator: IpatSimulator) -> None:
+    """トップページに競馬場・頭数の設定を埋め込んだSPAを返す."""
+    with urllib.request.urlopen(simulator.url) as response:
+        body = response.read().decode("utf-8")
+        assert response.headers["Date"]
+
+    assert '"name": "東京"' in body
+    assert '"horses": 16' in body
+    assert "__CONFIG__" not in body
+
+
+def test_simulator_records_purchase(simulator: IpatSimulator) -> None:
+    """購入確定のリクエストを記録する."""
+    purchase = {"tickets": [{"venue": "東京", "race": 11, "horse": 3, "amount": 500}], "total": 500}
+    request = urllib.request.Request(
+        f"{simulator.url}api/purchase",
+        data=json.dumps(purchase).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request) as response:
+        assert json.loads(response.read()) == {"ok": True}
+
+    assert simulator.purchases == [purchase]
+    simulator.reset()
+    assert simulator.purchases == []
+
+
+def test_simulator_deducts_purchases_from_limit() -> None:
+    """購入確定された金額を差し引いた購入限度額をページに埋め込む."""
+    with IpatSimulator(purchase_limit=3000) as simulator:
+        simulator.record_purchase({"tickets": [], "total": 1200})
+        with urllib.request.urlopen(simulator.url) as response:
+            body = response.read().decode("utf-8")
+
+    assert simulator.remaining_limit() == 1800
+    assert '"purchaseLimit": 1800' in body
+
+
+def test_simulator_custom_venues() -> None:
+    """競馬場とレース数を指定して起動できる."""
+    with IpatSimulator(venues={"中山": 11}, horses=8) as simulator:
+        with urllib.request.urlopen(simulator.url) as response:
+            body = response.read().decode("utf-8")
+
+    assert '"name": "中山", "races": 11' in body
+    assert '"horses": 8' in body
+
+
+def test_simulator_serves_delayed_assets() -> None:
+    """asset_delayを指定すると画像・Webフォント・アクセス解析を読み込ませ、リクエストを記録する."""
+    with IpatSimulator(asset_delay=0.0) as simulator:
+        with urllib.request.urlopen(simulator.url) as response:
+            body = response.read().decode("utf-8")
+        with urllib.request.urlopen(f"{simulator.url}assets/banner.png") as response:
+            assert response.headers["Content-Type"] == "image/png"
+
+        assert "/assets/banner.png" in body
+        assert "/analytics/tag.js" in body
+        assert simulator.asset_requests == ["/assets/banner.png"]
+
+
+def test_simulator_without_assets(simulator: IpatSimulator) -> None:
+    """asset_delayを指定しない場合は画像・Webフォント・アクセス解析を読み込ませない."""
+    with urllib.request.urlopen(simulator.url) as response:
+        body = response.read().decode("utf-8")
+
+    assert "/assets/" not in body
+    assert "__ASSETS_HEAD__" not in body
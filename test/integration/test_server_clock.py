@@ -0,0 +1,27 @@
+"""即パットシミュレータに対するServerClockSamplerのテスト.
+
+ブラウザを使わないため、Chromeを起動できない環境でも実行できる。
+"""
+
+import pytest
+
+from keiba_auto_bet.server_clock import ServerClockSampler
+
+from .ipat_simulator import IpatSimulator
+
+pytestmark = pytest.mark.integration
+
+
+# 正常系
+def test_sampler_estimates_offset_from_date_headers(simulator: IpatSimulator) -> None:
+    """同じホストで動くシミュレータの時計とのずれを誤差の範囲内で推定する."""
+    sampler = ServerClockSampler(simulator.url, sample_count=4)
+
+    sampler.start()
+    sampler._thread.join(10.0)  # type: ignore[union-attr]
+    offset = sampler.stop()
+
+    assert offset is not None
+    assert offset.sample_count >= 2
+    assert offset.error_seconds < 0.5
+    assert abs(offset.offset_seconds) <= offset.error_seconds + 0.01
@@ -0,0 +1 @@
+"""async_auto_betテストパッケージ."""
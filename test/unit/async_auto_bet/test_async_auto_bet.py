@@ -0,0 +1,216 @@
+"""AsyncAutoBetterのテスト."""
+
+import asyncio
+import threading
+from collections.abc import Generator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from keiba_auto_bet.async_auto_bet import AsyncAutoBetter
+from keiba_auto_bet.exceptions import BetError
+from keiba_auto_bet.models import BetOrder, BetResult, IpatCredentials, TicketType
+
+_ORDERS = [
+    BetOrder(venue="東京", race_number=11, ticket_type=TicketType.WIN, horse_number=1, amount=100)
+]
+
+
+@pytest.fixture()
+def mock_auto_better() -> Generator[MagicMock, None, None]:
+    """AutoBetterをモック化するfixture.
+
+    Yields:
+        MagicMock: AutoBetterインスタンスのモック
+    """
+    with patch("keiba_auto_bet.async_auto_bet.AutoBetter") as mock_cls:
+        better = mock_cls.return_value
+        better.is_open = False
+        better.commit.return_value = BetResult(success=True, order_count=1)
+        yield better
+
+
+def _create_async_better() -> AsyncAutoBetter:
+    """テスト用のAsyncAutoBetterを生成する."""
+    credentials = IpatCredentials(
+        inet_id="test_id", user_number="12345678", password="test_pass", p_ars="1234"
+    )
+    return AsyncAutoBetter(credentials=credentials)
+
+
+# 正常系
+
+
+def test_bet_prepares_commits_and_closes(mock_auto_better: MagicMock) -> None:
+    """セッション外のbetが入力・確定・終了を順に実行することを確認する."""
+    better = _create_async_better()
+
+    result = asyncio.run(better.bet(_ORDERS))
+
+    assert result.success is True
+    assert better.last_result is result
+    mock_auto_better.prepare.assert_called_once_with(_ORDERS)
+    mock_auto_better.commit.assert_called_once()
+    mock_auto_better.close.assert_called_once()
+
+
+def test_bet_in_session_keeps_session_open(mock_auto_better: MagicMock) -> None:
+    """セッション中のbetがセッションを終了しないことを確認する."""
+    mock_auto_better.is_open = True
+
+    async def run() -> None:
+        async with _create_async_better() as better:
+            await better.bet(_ORDERS)
+            mock_auto_better.close.assert_not_called()
+
+    asyncio.run(run())
+
+    mock_auto_better.open.assert_called_once()
+    mock_auto_better.close.assert_called_once()
+
+
+def test_close_shuts_down_worker_thread(mock_auto_better: MagicMock) -> None:
+    """セッションの終了時にワーカースレッドを停止し、次の購入では起動し直すことを確認する."""
+    executors = []
+    better = _create_async_better()
+    mock_auto_better.prepare.side_effect = lambda orders: executors.append(better._executor)
+
+    asyncio.run(better.bet(_ORDERS))
+    asyncio.run(better.bet(_ORDERS))
+
+    assert better._executor is None
+    assert executors[0] is not executors[1]
+    for executor in executors:
+        with pytest.raises(RuntimeError):
+            executor.submit(print)
+
+
+def test_bet_runs_off_event_loop_thread(mock_auto_better: MagicMock) -> None:
+    """ブラウザ操作がイベントループとは別のスレッドで実行されることを確認する."""
+    threads: list[threading.Thread] = []
+    mock_auto_better.prepare.side_effect = lambda orders: threads.append(threading.current_thread())
+    mock_auto_better.commit.side_effect = lambda: (
+        threads.append(threading.current_thread()) or BetResult(success=True)
+    )
+
+    asyncio.run(_create_async_better().bet(_ORDERS))
+
+    assert threads[0] is not threading.main_thread()
+    assert threads[0] is threads[1]
+
+
+def test_bet_multiple_sessions_concurrently() -> None:
+    """複数のインスタンスが1つのイベントループで同時に入力できることを確認する."""
+    barrier = threading.Barrier(2, timeout=5)
+    with patch("keiba_auto_bet.async_auto_bet.AutoBetter") as mock_cls:
+        first, second = MagicMock(is_open=False), MagicMock(is_open=False)
+        for better in (first, second):
+            # 両方の入力が同時に進行していなければバリアを通過できない
+            better.prepare.side_effect = lambda orders: barrier.wait()
+            better.commit.return_value = BetResult(success=True)
+        mock_cls.side_effect = [first, second]
+        betters = [_create_async_better(), _create_async_better()]
+
+        async def run() -> list[BetResult]:
+            return await asyncio.gather(*(b.bet(_ORDERS) for b in betters))
+
+        results = asyncio.run(run())
+
+    assert [r.success for r in results] == [True, True]
+
+
+# 準正常系
+
+
+def test_bet_cancelled_before_commit_aborts(mock_auto_better: MagicMock) -> None:
+    """入力中のキャンセルで購入を確定せずに取り消すことを確認する."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_prepare(orders: list[BetOrder]) -> None:
+        started.set()
+        release.wait(timeout=5)
+
+    mock_auto_better.prepare.side_effect = slow_prepare
+    better = _create_async_better()
+
+    async def run() -> None:
+        task = asyncio.create_task(better.bet(_ORDERS))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        task.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+    mock_auto_better.abort.assert_called_once()
+    mock_auto_better.commit.assert_not_called()
+    mock_auto_better.close.assert_called_once()
+
+
+def test_bet_cancelled_during_commit_completes_purchase(mock_auto_better: MagicMock) -> None:
+    """購入確定中にキャンセルされても購入確定が完了することを確認する."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_commit() -> BetResult:
+        started.set()
+        release.wait(timeout=5)
+        return BetResult(success=True)
+
+    mock_auto_better.commit.side_effect = slow_commit
+    better = _create_async_better()
+
+    async def run() -> None:
+        task = asyncio.create_task(better.bet(_ORDERS))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait)
+        task.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # 確定処理の完了を待つ
+        await better.close()
+
+    asyncio.run(run())
+
+    mock_auto_better.commit.assert_called_once()
+    mock_auto_better.abort.assert_not_called()
+    assert better.last_result == BetResult(success=True)
+
+
+def test_bet_cancel_requested_after_prepare_aborts(mock_auto_better: MagicMock) -> None:
+    """入力の完了後にキャンセルが要求されていた場合は購入を確定せずに取り消すことを確認する."""
+    better = _create_async_better()
+
+    async def prepare_then_cancelled(orders: list[BetOrder]) -> None:
+        task = asyncio.current_task()
+        assert task is not None
+        task.cancel()
+        try:
+            await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            pass  # キャンセルの要求は残ったまま入力が完了する
+
+    with patch.object(better, "prepare", side_effect=prepare_then_cancelled):
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(better.bet(_ORDERS))
+
+    mock_auto_better.abort.assert_called_once()
+    mock_auto_better.commit.assert_not_called()
+    mock_auto_better.close.assert_called_once()
+    assert better.last_result is None
+
+
+# 異常系
+
+
+def test_bet_error_propagates_and_closes(mock_auto_better: MagicMock) -> None:
+    """入力のエラーが送出され、セッションが終了することを確認する."""
+    mock_auto_better.prepare.side_effect = BetError("馬券選択に失敗しました")
+
+    with pytest.raises(BetError, match="馬券選択に失敗しました"):
+        asyncio.run(_create_async_better().bet(_ORDERS))
+
+    mock_auto_better.commit.assert_not_called()
+    mock_auto_better.close.assert_called_once()
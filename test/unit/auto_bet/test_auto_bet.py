@@ -2,15 +2,39 @@
 
 import logging
 from collections.abc import Generator
+from dataclasses import replace
+from pathlib import Path
 from typing import Any
-from unittest.mock import MagicMock, patch
+from unittest.mock import DEFAULT, MagicMock, call, patch
 
 import pytest
-from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import (
+    JavascriptException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
 
-from keiba_auto_bet.auto_bet import _MAX_STALE_RETRIES, AutoBetter
-from keiba_auto_bet.exceptions import BetError, BrowserError, KeibaAutoBetError, ValidationError
-from keiba_auto_bet.models import AutoBetConfig, BetOrder, IpatCredentials, TicketType
+from keiba_auto_bet.auto_bet import _FILL_AND_SUBMIT_SCRIPT, _MAX_STALE_RETRIES, AutoBetter
+from keiba_auto_bet.browser_pool import BrowserPool, PooledBrowser
+from keiba_auto_bet.exceptions import (
+    BetError,
+    BrowserError,
+    KeibaAutoBetError,
+    PurchaseError,
+    ValidationError,
+)
+from keiba_auto_bet.models import (
+    AutoBetConfig,
+    BetOrder,
+    ChromeDriverPaths,
+    HorseSelection,
+    IpatCredentials,
+    TicketType,
+)
+from keiba_auto_bet.snapshot import _PURCHASE_LIMIT_SCRIPT, _SNAPSHOT_SCRIPT
 
 
 @pytest.fixture()
@@ -85,6 +109,47 @@ def _select_factory(*args: Any, **kwargs: Any) -> MagicMock:
     return select
 
 
+def _snapshot_data(**overrides: Any) -> dict[str, Any]:
+    """購入画面のスナップショットの実行結果を作成する（競馬場・レース・馬券タイプは未選択）."""
+    data: dict[str, Any] = {
+        "venue": {"options": ["東京", "阪神", "中山"], "selected": None},
+        "race": {"options": [f"{race}R" for race in range(1, 13)], "selected": None},
+        "ticketType": {"options": ["単勝", "複勝"], "selected": None},
+        "method": {"options": [], "selected": None},
+        "horses": list(range(1, 19)),
+        "checked": [],
+        "checkedLegs": [],
+        "multi": None,
+        "voteCount": 0,
+    }
+    data.update(overrides)
+    return data
+
+
+def _mock_driver() -> MagicMock:
+    """スナップショットのスクリプトに応答するWebDriverのモックを作成する."""
+    driver = MagicMock()
+    driver.find_elements.return_value = []
+    driver.execute_script.side_effect = lambda script, *args: (
+        _snapshot_data() if script == _SNAPSHOT_SCRIPT else DEFAULT
+    )
+    return driver
+
+
+def _set_purchase_limit(driver: MagicMock, limit: int) -> None:
+    """購入限度額の取得スクリプトに応答するようWebDriverのモックを設定する."""
+    driver.execute_script.side_effect = lambda script, *args: (
+        _snapshot_data()
+        if script == _SNAPSHOT_SCRIPT
+        else limit if script == _PURCHASE_LIMIT_SCRIPT else DEFAULT
+    )
+
+
+def _mark_on_bet_page(better: AutoBetter) -> None:
+    """購入画面への移動をモックする."""
+    better._on_bet_page = True
+
+
 @pytest.fixture()
 def mock_selenium() -> Generator[tuple[MagicMock, MagicMock, MagicMock], None, None]:
     """Selenium関連の依存をモック化するfixture.
@@ -101,9 +166,8 @@ def mock_selenium() -> Generator[tuple[MagicMock, MagicMock, MagicMock], None, N
         patch("keiba_auto_bet.auto_bet.Service"),
         patch("keiba_auto_bet.auto_bet.time.sleep"),
     ):
-        mock_driver = MagicMock()
+        mock_driver = _mock_driver()
         mock_chrome_cls.return_value = mock_driver
-        mock_driver.find_elements.return_value = []
         mock_select_cls.side_effect = _select_factory
         yield mock_driver, mock_chrome_cls, mock_wait_cls
 
@@ -122,12 +186,56 @@ def test_auto_bet_success(
     better = AutoBetter(sample_credentials, sample_config, mock_logger)
     result = better.bet(sample_orders)
 
-    assert result is True
+    assert result.success is True
     mock_driver.quit.assert_called_once()
     mock_logger.info.assert_any_call("購入合計金額: %d円（%d件）", 800, 2)
     mock_logger.info.assert_any_call("馬券の自動購入が完了しました")
 
 
+def test_auto_bet_returns_phase_timings(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """購入結果にフェーズごと・セット操作ごとの所要時間と件数が含まれる."""
+    better = AutoBetter(sample_credentials, sample_config)
+
+    result = better.bet(sample_orders)
+
+    assert list(result.phase_timings) == [
+        "launch",
+        "page_load",
+        "login",
+        "announce",
+        "navigation",
+        "race_select",
+        "ticket_entry",
+        "confirm",
+        "return",
+    ]
+    assert all(seconds >= 0 for seconds in result.phase_timings.values())
+    assert [timing.entry.horse_numbers for timing in result.entry_timings] == [(3,), (7,)]
+    assert result.order_count == 2
+    assert result.race_count == 2
+    assert result.total_amount == 800
+
+
+def test_session_bet_result_excludes_login(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """セッション中の購入結果には起動・ログインのフェーズが含まれない."""
+    with AutoBetter(sample_credentials, sample_config) as better:
+        result = better.bet(sample_orders)
+
+    assert "launch" not in result.phase_timings
+    assert "login" not in result.phase_timings
+    assert "confirm" in result.phase_timings
+
+
 def test_auto_bet_with_default_config(
     mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
     sample_orders: list[BetOrder],
@@ -140,7 +248,7 @@ def test_auto_bet_with_default_config(
     assert better._config == AutoBetConfig()
     result = better.bet(sample_orders)
 
-    assert result is True
+    assert result.success is True
 
 
 def test_auto_bet_stale_retry_succeeds(
@@ -166,9 +274,8 @@ def test_auto_bet_stale_retry_succeeds(
         patch("keiba_auto_bet.auto_bet.Service"),
         patch("keiba_auto_bet.auto_bet.time.sleep"),
     ):
-        mock_driver = MagicMock()
+        mock_driver = _mock_driver()
         mock_chrome_cls.return_value = mock_driver
-        mock_driver.find_elements.return_value = []
         mock_select_cls.side_effect = [
             _select_factory(),  # _select_race: 競馬場選択
             _select_factory(),  # _select_race: レース選択
@@ -179,7 +286,7 @@ def test_auto_bet_stale_retry_succeeds(
         better = AutoBetter(sample_credentials, sample_config, mock_logger)
         result = better.bet(orders)
 
-    assert result is True
+    assert result.success is True
     mock_logger.debug.assert_any_call(
         "馬券タイプ選択でStaleElementReferenceExceptionが発生、リトライ(%d/%d)",
         1,
@@ -187,93 +294,1290 @@ def test_auto_bet_stale_retry_succeeds(
     )
 
 
-# 準正常系
-def test_auto_bet_empty_orders(
+def test_session_reuses_browser_across_bets(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
     sample_credentials: IpatCredentials,
     sample_config: AutoBetConfig,
+    mock_logger: MagicMock,
 ) -> None:
-    """空の注文リストでValidationErrorが発生する."""
-    better = AutoBetter(sample_credentials, sample_config)
+    """セッション中は1つのChromeを複数回のbetで使い回し、close時に終了する."""
+    mock_driver, mock_chrome_cls, _ = mock_selenium
 
-    with pytest.raises(ValidationError, match="購入注文リストが空です"):
-        better.bet([])
+    with AutoBetter(sample_credentials, sample_config, mock_logger) as better:
+        assert better.is_open is True
+        assert better.bet(sample_orders).success is True
+        assert better.bet(sample_orders).success is True
+        mock_driver.quit.assert_not_called()
+
+    assert better.is_open is False
+    mock_chrome_cls.assert_called_once()
+    mock_driver.quit.assert_called_once()
 
 
-def test_auto_bet_exceeds_max_bet(
+def test_session_reads_purchase_limit_once(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
     sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
 ) -> None:
-    """合計金額が最大購入金額を超える場合ValidationErrorが発生する."""
-    orders = [
-        BetOrder(
-            venue="東京",
-            race_number=1,
-            ticket_type=TicketType.WIN,
-            horse_number=1,
-            amount=600,
-        ),
+    """購入限度額はセッション中に1回だけ取得し、購入のたびに購入金額を差し引く."""
+    mock_driver, _, _ = mock_selenium
+    _set_purchase_limit(mock_driver, 2000)
+
+    with AutoBetter(sample_credentials, sample_config) as better:
+        better.bet(sample_orders)
+        assert better.purchase_limit == 1200
+        better.bet(sample_orders)
+        assert better.purchase_limit == 400
+
+    assert better.purchase_limit is None
+    limit_reads = [
+        args
+        for args, _ in mock_driver.execute_script.call_args_list
+        if args[0] == _PURCHASE_LIMIT_SCRIPT
     ]
-    config = AutoBetConfig(max_bet=500)
-    better = AutoBetter(sample_credentials, config)
+    assert len(limit_reads) == 1
 
-    with pytest.raises(
-        ValidationError,
-        match="合計金額600円が最大購入金額500円を超えています",
-    ):
-        better.bet(orders)
 
+def test_session_estimates_clock_offset_during_login(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_credentials: IpatCredentials,
+    mock_logger: MagicMock,
+) -> None:
+    """clock_samplesを指定するとChromeの起動・ログインと並行してサーバ時刻を計測する."""
+    config = AutoBetConfig(max_bet=10000, clock_samples=4)
+    better = AutoBetter(sample_credentials, config, mock_logger)
+    offset = MagicMock()
 
-# 異常系
-def test_auto_bet_raises_browser_error_on_chrome_failure(
+    with patch("keiba_auto_bet.auto_bet.ServerClockSampler") as mock_sampler_cls:
+        mock_sampler_cls.return_value.stop.return_value = offset
+        better.open()
+
+    mock_sampler_cls.assert_called_once_with(config.ipat_url, 4, config.login_timeout)
+    mock_sampler_cls.return_value.start.assert_called_once()
+    assert better.clock_offset is offset
+    better.close()
+
+
+def test_session_keeps_clock_offset_when_sampling_fails(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_credentials: IpatCredentials,
+    mock_logger: MagicMock,
+) -> None:
+    """サーバ時刻を計測できなかった場合は警告して前回の推定値を維持する."""
+    better = AutoBetter(sample_credentials, AutoBetConfig(clock_samples=2), mock_logger)
+    previous = MagicMock()
+    better._clock_offset = previous
+
+    with patch("keiba_auto_bet.auto_bet.ServerClockSampler") as mock_sampler_cls:
+        mock_sampler_cls.return_value.stop.return_value = None
+        better.open()
+
+    assert better.clock_offset is previous
+    mock_logger.warning.assert_any_call("サーバ時刻を計測できませんでした")
+    better.close()
+
+
+def test_session_open_is_idempotent(
     mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
-    sample_orders: list[BetOrder],
     sample_credentials: IpatCredentials,
     sample_config: AutoBetConfig,
 ) -> None:
-    """Chrome起動に失敗した場合BrowserErrorが送出される."""
+    """open()を複数回呼んでもChromeは1回だけ起動される."""
     _, mock_chrome_cls, _ = mock_selenium
-    mock_chrome_cls.side_effect = Exception("Chrome起動失敗")
 
     better = AutoBetter(sample_credentials, sample_config)
+    better.open()
+    better.open()
+    better.close()
+    better.close()
 
-    with pytest.raises(BrowserError, match="Chromeの起動に失敗しました"):
-        better.bet(sample_orders)
+    mock_chrome_cls.assert_called_once()
 
 
-def test_auto_bet_driver_quit_on_error(
+def test_session_relogin_when_logged_out(
     mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
     sample_orders: list[BetOrder],
     sample_credentials: IpatCredentials,
     sample_config: AutoBetConfig,
+    mock_logger: MagicMock,
 ) -> None:
-    """エラー発生時でもdriver.quit()が呼ばれる."""
-    mock_driver, _, mock_wait_cls = mock_selenium
-    mock_wait_cls.return_value.until.side_effect = [
-        MagicMock(),
-        Exception("処理エラー"),
-    ]
+    """セッション切れでログイン画面に戻っている場合は同じChromeで再ログインする."""
+    mock_driver, mock_chrome_cls, _ = mock_selenium
 
+    with AutoBetter(sample_credentials, sample_config, mock_logger) as better:
+        mock_driver.find_elements.side_effect = lambda by, value: (
+            [MagicMock()] if value == "inetid" else []
+        )
+        assert better.bet(sample_orders).success is True
+
+    mock_chrome_cls.assert_called_once()
+    mock_logger.info.assert_any_call("セッションが切れています。再ログインします")
+
+
+def test_session_restarts_browser_when_disconnected(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+    mock_logger: MagicMock,
+) -> None:
+    """ブラウザとの接続が切れている場合はChromeを再起動する."""
+    mock_driver, mock_chrome_cls, _ = mock_selenium
+    dead_driver = MagicMock()
+    dead_driver.find_elements.return_value = []
+    mock_chrome_cls.side_effect = [dead_driver, mock_driver]
+
+    with AutoBetter(sample_credentials, sample_config, mock_logger) as better:
+        dead_driver.find_elements.side_effect = WebDriverException("disconnected")
+        assert better.bet(sample_orders).success is True
+
+    assert mock_chrome_cls.call_count == 2
+    dead_driver.quit.assert_called_once()
+    mock_logger.warning.assert_any_call("ブラウザとの接続が切れました。Chromeを再起動します")
+
+
+def test_warm_up_skips_navigation_on_next_bet(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """warm_up後のbetでは購入画面への移動を省略し、購入後はトップに戻るため再度移動する."""
     better = AutoBetter(sample_credentials, sample_config)
 
-    with pytest.raises(KeibaAutoBetError, match="ログインに失敗しました"):
+    with patch.object(
+        AutoBetter, "_navigate_to_bet_page", autospec=True, side_effect=_mark_on_bet_page
+    ) as mock_navigate:
+        better.warm_up()
+        assert better.is_open is True
+        assert mock_navigate.call_count == 1
+
         better.bet(sample_orders)
+        assert mock_navigate.call_count == 1
 
-    mock_driver.quit.assert_called_once()
+        better.bet(sample_orders)
+        assert mock_navigate.call_count == 2
+    better.close()
 
 
-def test_auto_bet_wraps_unexpected_exception(
+def test_auto_bet_selects_each_race_once(
     mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
-    sample_orders: list[BetOrder],
     sample_credentials: IpatCredentials,
     sample_config: AutoBetConfig,
 ) -> None:
-    """予期しない例外がKeibaAutoBetErrorでラップされる."""
+    """同じレースの注文はまとめて入力し、レース選択は1レースにつき1回だけ行う."""
+    orders = [
+        BetOrder("東京", 11, TicketType.WIN, 3, 500),
+        BetOrder("阪神", 12, TicketType.SHOW, 7, 300),
+        BetOrder("東京", 11, TicketType.SHOW, 3, 200),
+        BetOrder("東京", 11, TicketType.WIN, 3, 100),
+    ]
+    better = AutoBetter(sample_credentials, sample_config)
+
+    with (
+        patch.object(AutoBetter, "_select_race", autospec=True) as mock_select_race,
+        patch.object(AutoBetter, "_bet_win_or_place", autospec=True) as mock_bet,
+    ):
+        better.bet(orders)
+
+    assert mock_select_race.call_args_list == [
+        call(better, "東京", 11),
+        call(better, "阪神", 12),
+    ]
+    assert mock_bet.call_args_list == [
+        call(better, TicketType.WIN, (3,), 600),
+        call(better, TicketType.SHOW, (3,), 200),
+        call(better, TicketType.SHOW, (7,), 300),
+    ]
+
+
+def test_auto_bet_sets_multiple_horses_at_once(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """同じレース・馬券の種類・金額の馬番はまとめてチェックし、セットボタンを1回だけ押す."""
+    mock_driver, _, mock_wait_cls = mock_selenium
+    orders = [
+        BetOrder("東京", 11, TicketType.SHOW, horse_number, 200) for horse_number in (1, 4, 6)
+    ]
+    better = AutoBetter(sample_credentials, sample_config)
+
+    with patch("keiba_auto_bet.auto_bet.ec") as mock_ec:
+        better.bet(orders)
+
+    label_xpaths = [
+        c.args[0][1]
+        for c in mock_ec.presence_of_element_located.call_args_list
+        if c.args[0][1].startswith("//label")
+    ]
+    assert label_xpaths == ["//label[@for='no1']", "//label[@for='no4']", "//label[@for='no6']"]
+    set_button_css = "button.btn.btn-lg.btn-set.btn-primary[ng-click='vm.onSet()']"
+    set_clicks = [
+        c for c in mock_ec.element_to_be_clickable.call_args_list if c.args[0][1] == set_button_css
+    ]
+    assert len(set_clicks) == 1
+
+
+def test_select_race_reads_options_from_snapshot(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """競馬場・レースの選択肢は要素ごとに読まず、スナップショットから選ぶ."""
     mock_driver, _, _ = mock_selenium
-    mock_driver.find_elements.side_effect = RuntimeError("unexpected")
+    better = AutoBetter(sample_credentials, sample_config)
+    better._driver = mock_driver
+
+    with patch("keiba_auto_bet.auto_bet.Select") as mock_select_cls:
+        better._select_race("東京", 1)
+
+    assert mock_select_cls.return_value.select_by_visible_text.call_args_list == [
+        call("東京"),
+        call("1R"),
+    ]
+    snapshot_calls = [
+        args for args, _ in mock_driver.execute_script.call_args_list if args[0] == _SNAPSHOT_SCRIPT
+    ]
+    assert len(snapshot_calls) == 2
+    mock_driver.execute_async_script.assert_called_once()
+
+
+def test_select_race_skips_selected_race(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+    mock_logger: MagicMock,
+) -> None:
+    """競馬場・レースが選択済みの場合は選択とDOMの安定待機を省略する."""
+    better = AutoBetter(sample_credentials, sample_config, mock_logger)
+    better._driver = MagicMock()
+    better._driver.execute_script.return_value = _snapshot_data(
+        venue={"options": ["東京", "阪神"], "selected": "東京"},
+        race={"options": ["11R", "12R"], "selected": "12R"},
+    )
+
+    with (
+        patch("keiba_auto_bet.auto_bet.WebDriverWait"),
+        patch("keiba_auto_bet.auto_bet.Select") as mock_select_cls,
+    ):
+        better._select_race("東京", 12)
+
+    mock_select_cls.assert_not_called()
+    better._driver.execute_async_script.assert_not_called()
+    better._driver.execute_script.assert_called_once_with(_SNAPSHOT_SCRIPT)
+    mock_logger.debug.assert_any_call("%s%dRは選択済みのため選択を省略しました", "東京", 12)
 
+
+def test_bet_win_or_place_toggles_only_changed_horses(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """選択済みの馬券タイプは選び直さず、チェック状態が異なる馬番だけを切り替える."""
     better = AutoBetter(sample_credentials, sample_config)
+    better._driver = MagicMock()
+    better._driver.execute_script.return_value = _snapshot_data(
+        ticketType={"options": ["単勝", "複勝"], "selected": "複勝"},
+        checked=[4, 9],
+    )
 
-    with pytest.raises(KeibaAutoBetError, match="予期しないエラーが発生しました"):
-        better.bet(sample_orders)
+    with (
+        patch("keiba_auto_bet.auto_bet.WebDriverWait"),
+        patch("keiba_auto_bet.auto_bet.Select") as mock_select_cls,
+        patch("keiba_auto_bet.auto_bet.ec") as mock_ec,
+    ):
+        better._bet_win_or_place(TicketType.SHOW, (1, 4), 200)
+
+    mock_select_cls.assert_not_called()
+    label_xpaths = [
+        c.args[0][1]
+        for c in mock_ec.presence_of_element_located.call_args_list
+        if c.args[0][1].startswith("//label")
+    ]
+    assert label_xpaths == ["//label[@for='no1']", "//label[@for='no9']"]
+
+
+def test_bet_win_or_place_resnapshots_after_ticket_type_change(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """チェック済みの馬番がある状態で馬券タイプを変更した場合はチェック状態を取得し直す."""
+    better = AutoBetter(sample_credentials, sample_config)
+    better._driver = MagicMock()
+    better._driver.execute_script.side_effect = [
+        _snapshot_data(ticketType={"options": ["単勝", "複勝"], "selected": "単勝"}, checked=[3]),
+        _snapshot_data(ticketType={"options": ["単勝", "複勝"], "selected": "複勝"}, checked=[]),
+        None,  # 馬番3のクリック
+    ]
+
+    with (
+        patch("keiba_auto_bet.auto_bet.WebDriverWait"),
+        patch("keiba_auto_bet.auto_bet.Select") as mock_select_cls,
+        patch("keiba_auto_bet.auto_bet.ec") as mock_ec,
+    ):
+        better._bet_win_or_place(TicketType.SHOW, (3,), 200)
+
+    mock_select_cls.return_value.select_by_visible_text.assert_called_once_with("複勝")
+    label_xpaths = [
+        c.args[0][1]
+        for c in mock_ec.presence_of_element_located.call_args_list
+        if c.args[0][1].startswith("//label")
+    ]
+    assert label_xpaths == ["//label[@for='no3']"]
+
+
+def test_bet_combination_checks_each_column_and_sets_once(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """組み合わせの馬券は入力方式を選び、列ごとの馬番をチェックして1回だけセットする."""
+    better = AutoBetter(sample_credentials, sample_config)
+    better._driver = MagicMock()
+    better._driver.execute_script.side_effect = [
+        _snapshot_data(ticketType={"options": ["単勝", "3連単"], "selected": "単勝"}),
+        _snapshot_data(
+            ticketType={"options": ["単勝", "3連単"], "selected": "3連単"},
+            method={"options": ["フォーメーション", "ながし"], "selected": "フォーメーション"},
+        ),
+        _snapshot_data(
+            ticketType={"options": ["単勝", "3連単"], "selected": "3連単"},
+            method={"options": ["フォーメーション", "ながし"], "selected": "ながし"},
+            multi=False,
+        ),
+        *[None] * 5,  # 軸馬・相手・マルチのクリック
+    ]
+
+    with (
+        patch("keiba_auto_bet.auto_bet.WebDriverWait"),
+        patch("keiba_auto_bet.auto_bet.Select") as mock_select_cls,
+        patch("keiba_auto_bet.auto_bet.ec") as mock_ec,
+    ):
+        better._bet_combination(
+            TicketType.TRIFECTA, HorseSelection.nagashi((1,), (2, 5, 7), multi=True), 100
+        )
+
+    assert [
+        c.args[0] for c in mock_select_cls.return_value.select_by_visible_text.call_args_list
+    ] == [
+        "3連単",
+        "ながし",
+    ]
+    label_xpaths = [
+        c.args[0][1]
+        for c in mock_ec.presence_of_element_located.call_args_list
+        if c.args[0][1].startswith("//label")
+    ]
+    assert label_xpaths == [
+        "//label[@for='no1-1']",
+        "//label[@for='no2-2']",
+        "//label[@for='no2-5']",
+        "//label[@for='no2-7']",
+        "//label[@for='multi']",
+    ]
+    set_buttons = [
+        c for c in mock_ec.element_to_be_clickable.call_args_list if "vm.onSet()" in c.args[0][1]
+    ]
+    assert len(set_buttons) == 1
+
+
+def test_bet_combination_clicks_only_checks_that_differ_from_snapshot(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """前回の入力のチェックやマルチが残っている場合は状態が異なるものだけクリックする."""
+    better = AutoBetter(sample_credentials, sample_config)
+    better._driver = MagicMock()
+    better._driver.execute_script.side_effect = [
+        _snapshot_data(
+            ticketType={"options": ["単勝", "3連単"], "selected": "3連単"},
+            method={"options": ["フォーメーション", "ながし"], "selected": "ながし"},
+            checkedLegs=[[1, 1], [2, 9]],
+            multi=True,
+        ),
+        *[None] * 4,  # 相手2頭のチェック・残った相手とマルチのチェック解除
+    ]
+
+    with (
+        patch("keiba_auto_bet.auto_bet.WebDriverWait"),
+        patch("keiba_auto_bet.auto_bet.Select") as mock_select_cls,
+        patch("keiba_auto_bet.auto_bet.ec") as mock_ec,
+    ):
+        better._bet_combination(TicketType.TRIFECTA, HorseSelection.nagashi((1,), (2, 5)), 100)
+
+    mock_select_cls.return_value.select_by_visible_text.assert_not_called()
+    label_xpaths = [
+        c.args[0][1]
+        for c in mock_ec.presence_of_element_located.call_args_list
+        if c.args[0][1].startswith("//label")
+    ]
+    assert label_xpaths == [
+        "//label[@for='no2-2']",
+        "//label[@for='no2-5']",
+        "//label[@for='no2-9']",
+        "//label[@for='multi']",
+    ]
+
+
+def test_enter_amount_and_set_waits_for_form_rerender(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """セットボタンを押した後は入力欄の再レンダリングが終わるまで待機する."""
+    better = AutoBetter(sample_credentials, sample_config)
+    better._driver = MagicMock()
+
+    with (
+        patch("keiba_auto_bet.auto_bet.WebDriverWait") as mock_wait_cls,
+        patch.object(better, "_wait_for_dom_quiet") as mock_dom_quiet,
+    ):
+        set_button = mock_wait_cls.return_value.until.return_value
+        mock_dom_quiet.side_effect = lambda timeout: set_button.click.assert_called_once()
+        better._enter_amount_and_set(300)
+
+    set_button.send_keys.assert_called_once_with("3")
+    mock_dom_quiet.assert_called_once()
+    better._driver.find_element.assert_called_once_with(By.ID, "bet-basic-type")
+
+
+def test_place_orders_enters_combination_entry(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """組み合わせの馬券の入力単位は組み合わせの入力で購入予定リストに追加する."""
+    better = AutoBetter(sample_credentials, sample_config)
+    selection = HorseSelection.box((1, 2, 3, 4))
+    orders = [
+        BetOrder(
+            venue="東京",
+            race_number=11,
+            ticket_type=TicketType.TRIO,
+            horse_number=None,
+            amount=100,
+            selection=selection,
+        )
+    ]
+
+    better._on_bet_page = True
+
+    with (
+        patch.object(better, "_check_races_available"),
+        patch.object(better, "_select_race"),
+        patch.object(better, "_bet_win_or_place") as mock_win_or_place,
+        patch.object(better, "_bet_combination") as mock_combination,
+    ):
+        better._place_orders(orders)
+
+    mock_win_or_place.assert_not_called()
+    mock_combination.assert_called_once_with(TicketType.TRIO, selection, 100)
+
+
+def test_bet_records_commands_by_phase(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+) -> None:
+    """profile_commandsを有効にするとWebDriverコマンドをフェーズごとに記録する."""
+    mock_driver, _, _ = mock_selenium
+    mock_driver.execute.return_value = {"value": None}
+
+    def execute_script(script: str, *args: Any) -> Any:
+        mock_driver.execute("executeScript", {"script": script, "args": list(args)})
+        return _snapshot_data() if script == _SNAPSHOT_SCRIPT else DEFAULT
+
+    mock_driver.execute_script.side_effect = execute_script
+    better = AutoBetter(sample_credentials, AutoBetConfig(profile_commands=True))
+
+    result = better.bet(sample_orders)
+
+    assert result.command_profile is not None
+    counts = result.command_profile.count_by_phase()
+    assert counts["race_select"] >= 2
+    assert counts["ticket_entry"] >= 2
+    assert result.command_profile.count_by_command()["executeScript"] == (
+        result.command_profile.total_count
+    )
+
+
+def test_bet_does_not_record_commands_by_default(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """profile_commandsが無効の場合はWebDriverコマンドを記録しない."""
+    better = AutoBetter(sample_credentials, sample_config)
+
+    result = better.bet(sample_orders)
+
+    assert result.command_profile is None
+
+
+def test_select_race_waits_for_recorded_race_option(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """記録済みの競馬場のレースは、索引の選択肢の表示テキストで待機して選択する."""
+    better = AutoBetter(sample_credentials, sample_config)
+    better._driver = MagicMock()
+    venues = ["東京（1日）", "阪神（1日）"]
+    tokyo = _snapshot_data(
+        venue={"options": venues, "selected": "東京（1日）"},
+        race={"options": ["11R 15:40", "12R 16:10"], "selected": "11R 15:40"},
+    )
+    hanshin = _snapshot_data(
+        venue={"options": venues, "selected": "阪神（1日）"},
+        race={"options": ["12R 16:25"], "selected": "12R 16:25"},
+    )
+    better._driver.execute_script.side_effect = [tokyo, hanshin, tokyo]
+
+    with (
+        patch("keiba_auto_bet.auto_bet.WebDriverWait"),
+        patch("keiba_auto_bet.auto_bet.Select") as mock_select_cls,
+        patch("keiba_auto_bet.auto_bet.ec") as mock_ec,
+    ):
+        better._select_race("東京", 11)  # 選択済みのため選択せず、東京のレースを記録する
+        better._select_race("東京", 12)
+
+    option_xpath = "//select[@id='select-course-race-race']//option[normalize-space(.)='12R 16:10']"
+    mock_ec.presence_of_element_located.assert_called_once_with((By.XPATH, option_xpath))
+    assert mock_select_cls.return_value.select_by_visible_text.call_args_list == [
+        call("東京（1日）"),
+        call("12R 16:10"),
+    ]
+
+
+def test_bet_rejects_unknown_venue_before_entry(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """開催していない競馬場の注文は、レース選択を始める前にBetErrorが発生する."""
+    orders = [BetOrder("札幌", 11, TicketType.WIN, 3, 500)]
+    better = AutoBetter(sample_credentials, sample_config)
+
+    with patch.object(AutoBetter, "_select_race") as mock_select_race:
+        with pytest.raises(BetError, match="競馬場が見つかりませんでした: 札幌"):
+            better.bet(orders)
+
+    mock_select_race.assert_not_called()
+
+
+def test_bet_rejects_closed_race_before_entry(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """選択肢から消えた（発売終了の）レースの注文は、入力を始める前にBetErrorが発生する."""
+    mock_driver, _, _ = mock_selenium
+    mock_driver.execute_script.side_effect = lambda script, *args: _snapshot_data(
+        venue={"options": ["東京", "阪神"], "selected": "東京"},
+        race={"options": [f"{race}R" for race in range(1, 11)], "selected": "10R"},
+    )
+    better = AutoBetter(sample_credentials, sample_config)
+
+    with patch.object(AutoBetter, "_select_race") as mock_select_race:
+        with pytest.raises(BetError, match="発売終了または未開催.*東京11R"):
+            better.bet(sample_orders)
+
+    mock_select_race.assert_not_called()
+
+
+def test_wait_for_element_stable_returns_waited_seconds(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """DOMの安定をページ側のスクリプトで待機し、待機した秒数を返す."""
+    better = AutoBetter(sample_credentials, sample_config)
+    better._driver = MagicMock()
+    better._driver.execute_async_script.return_value = 120.0
+
+    waited = better._wait_for_element_stable("id", "bet-basic-type", 10.0)
+
+    assert waited >= 0
+    better._driver.execute_async_script.assert_called_once()
+    quiet_ms, timeout_ms = better._driver.execute_async_script.call_args.args[1:]
+    assert quiet_ms == 100
+    assert 0 < timeout_ms <= 10000
+    better._driver.find_element.assert_called_once_with("id", "bet-basic-type")
+
+
+def test_wait_for_element_stable_rewaits_when_stale(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """安定判定の直後に要素がstaleになった場合は再度DOMの安定を待機する."""
+    better = AutoBetter(sample_credentials, sample_config)
+    better._driver = MagicMock()
+    better._driver.execute_async_script.return_value = 120.0
+    better._driver.find_element.side_effect = [StaleElementReferenceException(), MagicMock()]
+
+    better._wait_for_element_stable("id", "bet-basic-type", 10.0)
+
+    assert better._driver.execute_async_script.call_count == 2
+
+
+def test_wait_until_relaxes_poll_after_tight_window(
+    sample_credentials: IpatCredentials,
+) -> None:
+    """tight_poll_window内に条件を満たさない場合は確認間隔を緩めて残り時間を待機する."""
+    config = AutoBetConfig(poll_frequency=0.02, relaxed_poll_frequency=0.3, tight_poll_window=1.0)
+    better = AutoBetter(sample_credentials, config)
+    better._driver = MagicMock()
+    condition = MagicMock()
+
+    with patch("keiba_auto_bet.auto_bet.WebDriverWait") as mock_wait_cls:
+        mock_wait_cls.return_value.until.side_effect = [TimeoutException(), "element"]
+        result = better._wait_until(condition, 5.0)
+
+    assert result == "element"
+    assert mock_wait_cls.call_args_list == [
+        call(better._driver, 1.0, poll_frequency=0.02),
+        call(better._driver, 4.0, poll_frequency=0.3),
+    ]
+
+
+def test_wait_until_returns_within_tight_window(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """tight_poll_window内に条件を満たした場合は確認間隔を緩めずに戻る."""
+    better = AutoBetter(sample_credentials, sample_config)
+    better._driver = MagicMock()
+
+    with patch("keiba_auto_bet.auto_bet.WebDriverWait") as mock_wait_cls:
+        mock_wait_cls.return_value.until.return_value = "element"
+        result = better._wait_until(MagicMock(), 5.0)
+
+    assert result == "element"
+    mock_wait_cls.assert_called_once_with(better._driver, 2.0, poll_frequency=0.05)
+
+
+def test_prepare_then_commit(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """prepareで入力した注文をcommitで合計金額を指定して確定する."""
+    mock_driver, _, _ = mock_selenium
+    better = AutoBetter(sample_credentials, sample_config)
+
+    with (
+        patch.object(AutoBetter, "_place_orders", autospec=True) as mock_place,
+        patch.object(AutoBetter, "_confirm_purchase", autospec=True) as mock_confirm,
+    ):
+        better.prepare(sample_orders)
+        assert better.is_open is True
+        mock_place.assert_called_once_with(better, sample_orders)
+        mock_confirm.assert_not_called()
+
+        assert better.commit().success is True
+        mock_confirm.assert_called_once_with(better, 800)
+
+    mock_driver.quit.assert_not_called()
+    better.close()
+
+
+def test_abort_clears_staged_orders(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """abortで購入予定リストを削除し、確定せずに次の注文を受け付ける."""
+    mock_driver, _, _ = mock_selenium
+
+    with AutoBetter(sample_credentials, sample_config) as better:
+        with patch.object(AutoBetter, "_confirm_purchase", autospec=True) as mock_confirm:
+            better.prepare(sample_orders)
+            better.abort()
+            mock_confirm.assert_not_called()
+
+        better.abort()
+        assert better.bet(sample_orders).success is True
+
+    mock_driver.quit.assert_called_once()
+
+
+def test_lean_profile_configures_chrome(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+) -> None:
+    """軽量プロファイルでeager読み込み・画像無効化・URL遮断を設定する."""
+    mock_driver, _, _ = mock_selenium
+    config = AutoBetConfig(lean_profile=True, blocked_url_patterns=("*.woff2",))
+
+    with patch("keiba_auto_bet.auto_bet.Options") as mock_options_cls:
+        result = AutoBetter(sample_credentials, config).bet(sample_orders)
+
+    options = mock_options_cls.return_value
+    assert result.success is True
+    assert options.page_load_strategy == "eager"
+    options.add_argument.assert_any_call("--disable-background-networking")
+    options.add_argument.assert_any_call("--disable-extensions")
+    prefs = options.add_experimental_option.call_args.args[1]
+    assert prefs["profile.managed_default_content_settings.images"] == 2
+    mock_driver.execute_cdp_cmd.assert_any_call("Network.setBlockedURLs", {"urls": ["*.woff2"]})
+
+
+def test_default_profile_does_not_block_urls(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """軽量プロファイルでない場合は起動オプションの追加とURL遮断を行わない."""
+    mock_driver, _, _ = mock_selenium
+
+    with patch("keiba_auto_bet.auto_bet.Options") as mock_options_cls:
+        AutoBetter(sample_credentials, sample_config).bet(sample_orders)
+
+    mock_options_cls.return_value.add_experimental_option.assert_not_called()
+    mock_driver.execute_cdp_cmd.assert_not_called()
+
+
+def test_profile_dir_reuses_locked_profile(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    tmp_path: Path,
+) -> None:
+    """profile_dirを指定するとロックしたプロファイルで起動し、終了時にロックを解放する."""
+    config = AutoBetConfig(profile_dir=str(tmp_path), profile_max_mb=10)
+    better = AutoBetter(sample_credentials, config)
+
+    with patch("keiba_auto_bet.auto_bet.Options") as mock_options_cls:
+        better.bet(sample_orders)
+        better.bet(sample_orders)
+
+    options = mock_options_cls.return_value
+    options.add_argument.assert_any_call(f"--user-data-dir={tmp_path / 'slot-0'}")
+    options.add_argument.assert_any_call(f"--disk-cache-size={5 * 1024 * 1024}")
+    user_data_dirs = [
+        args[0]
+        for args, _ in options.add_argument.call_args_list
+        if args[0].startswith("--user-data-dir=")
+    ]
+    assert len(set(user_data_dirs)) == 1
+    assert better._profile is None
+
+
+def test_driver_cache_file_resolves_driver_once(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    tmp_path: Path,
+) -> None:
+    """driver_cache_fileを指定するとChromeDriverのパスを1回だけ解決して使い回す."""
+    paths = ChromeDriverPaths(driver_path="/opt/chromedriver", browser_path="/opt/chrome")
+    config = AutoBetConfig(driver_cache_file=str(tmp_path / "driver.json"))
+    better = AutoBetter(sample_credentials, config)
+
+    with (
+        patch("keiba_auto_bet.auto_bet.resolve_chrome_driver", return_value=paths) as mock_resolve,
+        patch("keiba_auto_bet.auto_bet.Service") as mock_service_cls,
+        patch("keiba_auto_bet.auto_bet.Options") as mock_options_cls,
+    ):
+        first = better.bet(sample_orders)
+        second = better.bet(sample_orders)
+
+    mock_resolve.assert_called_once_with(str(tmp_path / "driver.json"))
+    mock_service_cls.assert_called_with("/opt/chromedriver")
+    assert mock_options_cls.return_value.binary_location == "/opt/chrome"
+    assert list(first.phase_timings)[:2] == ["driver_resolve", "launch"]
+    assert "driver_resolve" not in second.phase_timings
+
+
+def test_browser_pool_provides_launched_chrome(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """プールがある場合は起動済みのChromeを使い、起動とページ読み込みを省く."""
+    mock_driver, mock_chrome_cls, _ = mock_selenium
+    pool = MagicMock(spec=BrowserPool)
+    pool.config = sample_config
+    pool.acquire.return_value = PooledBrowser(driver=mock_driver)
+
+    better = AutoBetter(sample_credentials, sample_config, browser_pool=pool)
+    result = better.bet(sample_orders)
+
+    assert result.success is True
+    pool.acquire.assert_called_once_with(sample_config.launch_timeout)
+    mock_chrome_cls.assert_not_called()
+    mock_driver.get.assert_not_called()
+    mock_driver.set_script_timeout.assert_called_once_with(
+        max(sample_config.race_select_timeout, sample_config.ticket_entry_timeout) + 1.0
+    )
+    assert "page_load" not in result.phase_timings
+    mock_driver.quit.assert_called_once()
+
+
+def test_browser_pool_falls_back_to_new_chrome(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+    mock_logger: MagicMock,
+) -> None:
+    """プールに使用できるChromeがない場合は新しくChromeを起動する."""
+    _, mock_chrome_cls, _ = mock_selenium
+    pool = MagicMock(spec=BrowserPool)
+    pool.config = sample_config
+    pool.acquire.return_value = None
+
+    better = AutoBetter(sample_credentials, sample_config, mock_logger, browser_pool=pool)
+    result = better.bet(sample_orders)
+
+    assert result.success is True
+    mock_chrome_cls.assert_called_once()
+    assert "page_load" in result.phase_timings
+    mock_logger.warning.assert_any_call("プールに使用できるChromeがないため、Chromeを起動します")
+
+
+def test_browser_pool_with_different_launch_settings_is_rejected(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """プールとChromeの起動に関する設定が異なる場合はValueErrorが発生する."""
+    pool = MagicMock(spec=BrowserPool)
+    pool.config = replace(sample_config, lean_profile=True, profile_dir="/tmp/profiles")
+
+    with pytest.raises(
+        ValueError,
+        match="ブラウザプールとChromeの起動に関する設定が異なります: lean_profile, profile_dir",
+    ):
+        AutoBetter(sample_credentials, sample_config, browser_pool=pool)
+
+
+def test_login_fills_each_form_with_single_script(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """ログインフォームごとに1回のスクリプト実行で入力と送信を行い、キー入力しない."""
+    mock_driver, _, _ = mock_selenium
+    submit = MagicMock(spec=WebElement)
+    mock_driver.execute_script.return_value = [None, submit]
+    better = AutoBetter(sample_credentials, sample_config)
+    better._driver = mock_driver
+
+    better._login()
+
+    fill_calls = [
+        args
+        for args, _ in mock_driver.execute_script.call_args_list
+        if args[0] == _FILL_AND_SUBMIT_SCRIPT
+    ]
+    assert [args[1] for args in fill_calls] == [
+        {"inetid": "test_id"},
+        {"i": "12345678", "p": "test_pass", "r": "1234"},
+    ]
+    mock_driver.find_element.assert_not_called()
+    submit.click.assert_not_called()
+
+
+# 準正常系
+def test_prepare_rejects_when_orders_staged(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """確定前の注文が残っている場合はprepare・betでBetErrorが発生する."""
+    with AutoBetter(sample_credentials, sample_config) as better:
+        better.prepare(sample_orders)
+
+        with pytest.raises(BetError, match="確定前の注文が残っています"):
+            better.prepare(sample_orders)
+        with pytest.raises(BetError, match="確定前の注文が残っています"):
+            better.bet(sample_orders)
+
+
+def test_commit_without_prepare(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """prepare前にcommitを呼ぶとPurchaseErrorが発生する."""
+    better = AutoBetter(sample_credentials, sample_config)
+
+    with pytest.raises(PurchaseError, match="確定待ちの注文がありません"):
+        better.commit()
+
+
+def test_auto_bet_empty_orders(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """空の注文リストでValidationErrorが発生する."""
+    better = AutoBetter(sample_credentials, sample_config)
+
+    with pytest.raises(ValidationError, match="購入注文リストが空です"):
+        better.bet([])
+
+
+def test_auto_bet_exceeds_max_bet(
+    sample_credentials: IpatCredentials,
+) -> None:
+    """合計金額が最大購入金額を超える場合ValidationErrorが発生する."""
+    orders = [
+        BetOrder(
+            venue="東京",
+            race_number=1,
+            ticket_type=TicketType.WIN,
+            horse_number=1,
+            amount=600,
+        ),
+    ]
+    config = AutoBetConfig(max_bet=500)
+    better = AutoBetter(sample_credentials, config)
+
+    with pytest.raises(
+        ValidationError,
+        match="合計金額600円が最大購入金額500円を超えています",
+    ):
+        better.bet(orders)
+
+
+def test_session_rejects_bet_over_purchase_limit_before_entry(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """購入限度額を取得し直しても足りない場合は画面を操作せずにValidationErrorが発生し、Chromeは維持する."""
+    mock_driver, _, _ = mock_selenium
+    _set_purchase_limit(mock_driver, 1000)
+
+    with AutoBetter(sample_credentials, sample_config) as better:
+        better.bet(sample_orders)
+        _set_purchase_limit(mock_driver, 200)
+        mock_driver.execute_script.reset_mock()
+
+        with pytest.raises(ValidationError, match="合計金額800円が購入限度額200円を超えています"):
+            better.bet(sample_orders)
+
+        assert mock_driver.execute_script.call_args_list == [call(_PURCHASE_LIMIT_SCRIPT)]
+        mock_driver.quit.assert_not_called()
+        assert better.purchase_limit == 200
+
+
+def test_session_reloads_purchase_limit_after_deposit(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """セッション中に入金した場合は、取得済みの購入限度額で足りなくても取得し直して購入する."""
+    mock_driver, _, _ = mock_selenium
+    _set_purchase_limit(mock_driver, 1000)
+
+    with AutoBetter(sample_credentials, sample_config) as better:
+        better.bet(sample_orders)
+        assert better.purchase_limit == 200
+        _set_purchase_limit(mock_driver, 5000)
+
+        assert better.bet(sample_orders).success is True
+        assert better.purchase_limit == 4200
+
+    limit_reads = [
+        args
+        for args, _ in mock_driver.execute_script.call_args_list
+        if args[0] == _PURCHASE_LIMIT_SCRIPT
+    ]
+    assert len(limit_reads) == 2
+
+
+def test_bet_rejects_over_purchase_limit_after_first_read(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """ログイン後に取得した購入限度額を超える場合は馬券を入力せずにValidationErrorが発生する."""
+    mock_driver, _, _ = mock_selenium
+    _set_purchase_limit(mock_driver, 500)
+
+    better = AutoBetter(sample_credentials, sample_config)
+    with pytest.raises(ValidationError, match="合計金額800円が購入限度額500円を超えています"):
+        better.bet(sample_orders)
+
+    assert not any(
+        args[0] == _SNAPSHOT_SCRIPT for args, _ in mock_driver.execute_script.call_args_list
+    )
+    mock_driver.quit.assert_called_once()
+
+
+def test_auto_bet_exceeds_max_bet_with_combinations(
+    sample_credentials: IpatCredentials,
+) -> None:
+    """組み合わせの馬券は全ての組み合わせの合計金額を最大購入金額と比較する."""
+    orders = [
+        BetOrder(
+            venue="東京",
+            race_number=11,
+            ticket_type=TicketType.TRIO,
+            horse_number=None,
+            amount=100,
+            selection=HorseSelection.box((1, 2, 3, 4, 5, 6)),
+        ),
+    ]
+    config = AutoBetConfig(max_bet=1000)
+    better = AutoBetter(sample_credentials, config)
+
+    with pytest.raises(
+        ValidationError,
+        match="合計金額2000円が最大購入金額1000円を超えています",
+    ):
+        better.bet(orders)
+
+
+def test_login_falls_back_to_send_keys_when_script_fails(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+    mock_logger: MagicMock,
+) -> None:
+    """スクリプトでの入力に失敗した場合はキー入力で入力し直す."""
+    mock_driver, _, _ = mock_selenium
+    mock_driver.execute_script.return_value = ["入力欄に値を設定できません: inetid", None]
+    inputs: dict[str, MagicMock] = {}
+    mock_driver.find_element.side_effect = lambda by, name: inputs.setdefault(name, MagicMock())
+    better = AutoBetter(sample_credentials, sample_config, mock_logger)
+    better._driver = mock_driver
+
+    better._login()
+
+    for name, value in [
+        ("inetid", "test_id"),
+        ("i", "12345678"),
+        ("p", "test_pass"),
+        ("r", "1234"),
+    ]:
+        inputs[name].clear.assert_called_once()
+        inputs[name].send_keys.assert_called_once_with(value)
+    mock_logger.info.assert_any_call(
+        "スクリプトでのログイン入力に失敗したため、キー入力で入力します: %s",
+        "入力欄に値を設定できません: inetid",
+    )
+
+
+def test_login_falls_back_to_send_keys_when_script_raises(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+    mock_logger: MagicMock,
+) -> None:
+    """スクリプトの実行で例外が発生した場合はキー入力で入力し直す."""
+    mock_driver, _, _ = mock_selenium
+
+    def execute_script(script: str, *args: Any) -> Any:
+        if script == _FILL_AND_SUBMIT_SCRIPT:
+            raise JavascriptException("javascript error: Cannot read properties of null")
+        return DEFAULT
+
+    mock_driver.execute_script.side_effect = execute_script
+    better = AutoBetter(sample_credentials, sample_config, mock_logger)
+    better._driver = mock_driver
+
+    better._login()
+
+    assert mock_driver.find_element.call_count == 4
+    mock_logger.info.assert_any_call(
+        "スクリプトでのログイン入力に失敗したため、キー入力で入力します: %s",
+        "javascript error: Cannot read properties of null",
+    )
+
+
+def test_login_without_script_uses_send_keys(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_credentials: IpatCredentials,
+) -> None:
+    """script_loginを無効にするとスクリプトを実行せずにキー入力で入力する."""
+    mock_driver, _, _ = mock_selenium
+    better = AutoBetter(sample_credentials, AutoBetConfig(script_login=False))
+    better._driver = mock_driver
+
+    better._login()
+
+    assert all(
+        args[0] != _FILL_AND_SUBMIT_SCRIPT for args, _ in mock_driver.execute_script.call_args_list
+    )
+    assert mock_driver.find_element.call_count == 4
+
+
+# 異常系
+def test_auto_bet_raises_browser_error_on_chrome_failure(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """Chrome起動に失敗した場合BrowserErrorが送出される."""
+    _, mock_chrome_cls, _ = mock_selenium
+    mock_chrome_cls.side_effect = Exception("Chrome起動失敗")
+
+    better = AutoBetter(sample_credentials, sample_config)
+
+    with pytest.raises(BrowserError, match="Chromeの起動に失敗しました"):
+        better.bet(sample_orders)
+
+
+def test_cached_driver_paths_discarded_on_launch_failure(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    tmp_path: Path,
+) -> None:
+    """キャッシュしたパスでChromeの起動に失敗した場合はキャッシュを破棄する."""
+    _, mock_chrome_cls, _ = mock_selenium
+    mock_chrome_cls.side_effect = Exception("session not created")
+    paths = ChromeDriverPaths(
+        driver_path="/opt/chromedriver", browser_path="/opt/chrome", from_cache=True
+    )
+    cache_file = str(tmp_path / "driver.json")
+    better = AutoBetter(sample_credentials, AutoBetConfig(driver_cache_file=cache_file))
+
+    with (
+        patch("keiba_auto_bet.auto_bet.resolve_chrome_driver", return_value=paths),
+        patch("keiba_auto_bet.auto_bet.invalidate_driver_cache") as mock_invalidate,
+        pytest.raises(BrowserError, match="Chromeの起動に失敗しました"),
+    ):
+        better.bet(sample_orders)
+
+    mock_invalidate.assert_called_once_with(cache_file)
+    assert better._driver_paths is None
+
+
+def test_auto_bet_raises_browser_error_on_page_load_failure(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """即パットページの読み込みに失敗した場合BrowserErrorが送出されChromeを終了する."""
+    mock_driver, _, _ = mock_selenium
+    mock_driver.get.side_effect = WebDriverException("net::ERR_CONNECTION_REFUSED")
+
+    better = AutoBetter(sample_credentials, sample_config)
+
+    with pytest.raises(BrowserError, match="即パットページの読み込みに失敗しました"):
+        better.bet(sample_orders)
+    mock_driver.quit.assert_called_once()
+
+
+def test_auto_bet_driver_quit_on_error(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """エラー発生時でもdriver.quit()が呼ばれる."""
+    mock_driver, _, mock_wait_cls = mock_selenium
+    mock_wait_cls.return_value.until.side_effect = [
+        MagicMock(),
+        Exception("処理エラー"),
+    ]
+
+    better = AutoBetter(sample_credentials, sample_config)
+
+    with pytest.raises(KeibaAutoBetError, match="ログインに失敗しました"):
+        better.bet(sample_orders)
+
+    mock_driver.quit.assert_called_once()
+
+
+def test_auto_bet_wraps_unexpected_exception(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """予期しない例外がKeibaAutoBetErrorでラップされる."""
+    mock_driver, _, _ = mock_selenium
+    mock_driver.find_elements.side_effect = RuntimeError("unexpected")
+
+    better = AutoBetter(sample_credentials, sample_config)
+
+    with pytest.raises(KeibaAutoBetError, match="予期しないエラーが発生しました"):
+        better.bet(sample_orders)
+
+
+def test_session_discards_browser_after_failed_bet(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """セッション中に購入が失敗した場合はChromeを破棄し、次回のbetで再起動する."""
+    mock_driver, mock_chrome_cls, _ = mock_selenium
+
+    with AutoBetter(sample_credentials, sample_config) as better:
+        mock_driver.find_elements.side_effect = RuntimeError("unexpected")
+        with pytest.raises(KeibaAutoBetError, match="予期しないエラーが発生しました"):
+            better.bet(sample_orders)
+        mock_driver.quit.assert_called_once()
+
+        mock_driver.find_elements.side_effect = None
+        assert better.bet(sample_orders).success is True
+
+    assert mock_chrome_cls.call_count == 2
+
+
+def test_abort_quits_browser_when_clear_fails(
+    mock_selenium: tuple[MagicMock, MagicMock, MagicMock],
+    sample_orders: list[BetOrder],
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+    mock_logger: MagicMock,
+) -> None:
+    """購入予定リストの削除に失敗した場合はChromeを終了して取り消す."""
+    mock_driver, _, _ = mock_selenium
+
+    with AutoBetter(sample_credentials, sample_config, mock_logger) as better:
+        better.prepare(sample_orders)
+        with patch.object(
+            AutoBetter, "_clear_vote_list", side_effect=PurchaseError("削除に失敗しました")
+        ):
+            better.abort()
+
+        mock_driver.quit.assert_called_once()
+        mock_logger.warning.assert_called_once()
+        with pytest.raises(PurchaseError, match="確定待ちの注文がありません"):
+            better.commit()
+
+
+def test_wait_for_element_stable_timeout(
+    sample_credentials: IpatCredentials,
+    sample_config: AutoBetConfig,
+) -> None:
+    """DOMの変更が続いてタイムアウトした場合TimeoutExceptionが発生する."""
+    better = AutoBetter(sample_credentials, sample_config)
+    better._driver = MagicMock()
+    better._driver.execute_async_script.return_value = None
+
+    with pytest.raises(TimeoutException, match="DOMの安定化待機がタイムアウトしました"):
+        better._wait_for_element_stable("id", "bet-basic-type", 10.0)
+
+
+def test_wait_until_timeout_shorter_than_tight_window(
+    sample_credentials: IpatCredentials,
+) -> None:
+    """タイムアウトがtight_poll_window以下の場合は細かい確認のみでTimeoutExceptionとなる."""
+    config = AutoBetConfig(login_timeout=1.0, tight_poll_window=2.0)
+    better = AutoBetter(sample_credentials, config)
+    better._driver = MagicMock()
+
+    with patch("keiba_auto_bet.auto_bet.WebDriverWait") as mock_wait_cls:
+        mock_wait_cls.return_value.until.side_effect = TimeoutException()
+        with pytest.raises(TimeoutException):
+            better._wait_until(MagicMock(), config.login_timeout)
+
+    mock_wait_cls.assert_called_once_with(better._driver, 1.0, poll_frequency=0.05)
 
 
 def test_auto_bet_stale_retry_max_exceeded(
@@ -299,9 +1603,8 @@ def test_auto_bet_stale_retry_max_exceeded(
         patch("keiba_auto_bet.auto_bet.Service"),
         patch("keiba_auto_bet.auto_bet.time.sleep"),
     ):
-        mock_driver = MagicMock()
+        mock_driver = _mock_driver()
         mock_chrome_cls.return_value = mock_driver
-        mock_driver.find_elements.return_value = []
         mock_select_cls.side_effect = [
             _select_factory(),  # _select_race: 競馬場選択
             _select_factory(),  # _select_race: レース選択
@@ -0,0 +1,386 @@
+"""購入処理のWebDriverコマンド数の予算のテスト.
+
+基準となる注文リストを、即パットの画面を再現したコマンドの応答元に対して購入し、
+実行したWebDriverコマンドの回数をフェーズごとの予算と比較する。
+要素は常にすぐに見つかるため、待機中の確認回数に左右されずコマンド数が毎回同じになる。
+画面操作を増やす変更でコマンド数が予算を超えた場合はテストを失敗させる。
+
+WebDriver・WebDriverWait・expected_conditionsはSeleniumの実装をそのまま使用する。
+Selectはseleniumのバージョンによって内部で実行するコマンドが異なるため、
+選択肢の検索とクリックだけを行う代替に置き換える。
+"""
+
+import json
+import re
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+from keiba_auto_bet.auto_bet import AutoBetter
+from keiba_auto_bet.models import AutoBetConfig, BetOrder, IpatCredentials, TicketType
+from keiba_auto_bet.snapshot import _SNAPSHOT_SCRIPT
+
+# セッション中の購入（ログイン済み・トップ画面から開始）で実行するWebDriverコマンドの予算。
+# 画面操作を減らした場合は予算も減らし、意図して増やす場合は理由を添えて更新する
+_SESSION_BUDGET = {
+    "total": 141,
+    "other": 2,
+    "navigation": 12,
+    "race_select": 25,
+    "ticket_entry": 77,
+    "confirm": 18,
+    "return": 7,
+}
+
+_ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+_VENUES = ("東京", "阪神")
+_TICKET_TYPES = ("単勝", "複勝", "馬連", "ワイド", "馬単", "3連複", "3連単")
+_HORSE_COUNT = 16
+
+# 要素の検索条件と（表示される画面, 要素名）の対応
+_LOCATORS = {
+    ("xpath", "//button[@title='出馬表から馬を選択する方式です。']"): ("home", "bet-menu"),
+    ("xpath", "//button[contains(., '12R')]"): ("races", "race-12"),
+    ("css selector", '[id="bet-basic-type"]'): ("bet", "type"),
+    ("css selector", '[id="bet-basic-method"]'): ("bet", "method"),
+    ("css selector", '[id="select-course-race-course"]'): ("bet", "course"),
+    ("css selector", '[id="select-course-race-race"]'): ("bet", "race"),
+    ("xpath", "//input[@maxlength='4' and @ng-model='vm.nUnit']"): ("bet", "amount"),
+    (
+        "css selector",
+        "button.btn.btn-lg.btn-set.btn-primary[ng-click='vm.onSet()']",
+    ): ("bet", "set"),
+    ("xpath", "//button[contains(@class, 'btn btn-vote-list')]"): ("bet", "vote-list"),
+    ("xpath", "//input[@ng-model='vm.cAmountTotal']"): ("bet", "total"),
+    ("xpath", "//button[contains(text(), '購入')]"): ("bet", "purchase"),
+    (
+        "xpath",
+        "//button[contains(@class, 'btn-ok') and contains(text(), 'OK')]",
+    ): ("dialog", "ok"),
+    ("xpath", "//a[@ui-sref='home' and @ng-click='vm.clickLogo()']"): ("bet", "logo"),
+}
+_LABEL_PATTERN = re.compile(r"//label\[@for='(no[\d-]+)'\]")
+_RACE_OPTION_PREFIX = "//select[@id='select-course-race-race']//option["
+_OPTION_PATTERN = re.compile(r"\.//option\[normalize-space\(\.\) = ['\"](.+)['\"]\]")
+
+
+def _reference_orders() -> list[BetOrder]:
+    """予算を計測する基準の購入注文（2レース・単勝と複勝・まとめ入力を含む）."""
+    return [
+        BetOrder("東京", 11, TicketType.WIN, 3, 500),
+        BetOrder("東京", 11, TicketType.SHOW, 1, 200),
+        BetOrder("東京", 11, TicketType.SHOW, 4, 200),
+        BetOrder("東京", 12, TicketType.WIN, 7, 300),
+        BetOrder("東京", 12, TicketType.WIN, 8, 100),
+    ]
+
+
+class _FakeIpat:
+    """即パットの画面の状態を再現し、WebDriverのコマンドに応答する.
+
+    要素は画面を表示するたびに作り直し、別の画面に移った後の要素の操作はstaleとして扱う。
+
+    Attributes:
+        page: 表示中の画面（home・races・bet）
+        dialog: 確認ダイアログを表示しているかどうか
+        venue: 選択中の競馬場
+        race: 選択中のレース
+        ticket_type: 選択中の馬券の種類
+        checked: チェック済みの馬番
+        vote_count: 購入予定リストの件数
+        purchased_count: 購入を確定した購入予定リストの件数
+        _generation: 画面を表示した回数（要素のstale判定に使用）
+    """
+
+    def __init__(self) -> None:
+        """コンストラクタ."""
+        self.page = "home"
+        self.dialog = False
+        self.venue: str | None = None
+        self.race: str | None = None
+        self.ticket_type = _TICKET_TYPES[0]
+        self.checked: set[str] = set()
+        self.vote_count = 0
+        self.purchased_count = 0
+        self._generation = 0
+
+    def execute(self, command: str, params: dict[str, Any]) -> dict[str, Any]:
+        """WebDriverのコマンドに応答する（RemoteConnection.executeの代替）.
+
+        Args:
+            command: WebDriverのコマンド名
+            params: コマンドの引数
+
+        Returns:
+            dict[str, Any]: レスポンス
+        """
+        if command == "newSession":
+            return {"value": {"sessionId": "fake", "capabilities": {"browserName": "chrome"}}}
+        if command in ("findElement", "findElements"):
+            name = self._locate(params["using"], params["value"])
+            if command == "findElements":
+                return {"value": [] if name is None else [self._element(name)]}
+            if name is None:
+                return _error("no such element", f"{params['using']}={params['value']}")
+            return {"value": self._element(name)}
+
+        name = self._element_name(params.get("id"))
+        if name is not None and not self._is_current(params["id"]):
+            return _error("stale element reference", name)
+        if command == "findChildElement":
+            return {"value": self._element(name.replace("label:", "check:"))}
+        if command == "findChildElements":
+            match = _OPTION_PATTERN.fullmatch(params["value"])
+            assert match is not None, params["value"]
+            return {"value": [self._element(f"option:{name}:{match.group(1)}")]}
+        if command == "clickElement":
+            self._click(name)
+        elif command == "w3cExecuteScript":
+            return {"value": self._execute_script(params["script"], params["args"])}
+        elif command == "w3cExecuteScriptAsync":
+            return {"value": True}  # DOMの安定化待機
+        elif command == "isElementEnabled":
+            return {"value": True}
+        return {"value": None}
+
+    def _execute_script(self, script: str, args: list[Any]) -> Any:
+        """スクリプトの実行に応答する.
+
+        Args:
+            script: スクリプト
+            args: スクリプトの引数
+
+        Returns:
+            Any: スクリプトの実行結果
+        """
+        if script == _SNAPSHOT_SCRIPT:
+            return self._snapshot()
+        if script.startswith("/* isDisplayed */"):
+            return True
+        if script == "arguments[0].click();":
+            self._click(self._element_name(args[0][_ELEMENT_KEY]))
+        return None
+
+    def _locate(self, using: str, value: str) -> str | None:
+        """表示中の画面から要素を探す.
+
+        Args:
+            using: 検索方法
+            value: 検索条件
+
+        Returns:
+            str | None: 要素名（表示されていない場合はNone）
+        """
+        located = _LOCATORS.get((using, value))
+        if located is None:
+            match = _LABEL_PATTERN.fullmatch(value)
+            if match is not None:
+                located = ("bet", f"label:{match.group(1)}")
+            elif value.startswith(_RACE_OPTION_PREFIX):
+                located = ("bet", "race-option")
+        if located is None:
+            return None
+        page, name = located
+        if page == "dialog":
+            return name if self.page == "bet" and self.dialog else None
+        return name if page == self.page else None
+
+    def _click(self, name: str | None) -> None:
+        """要素のクリックで画面の状態を更新する.
+
+        Args:
+            name: 要素名
+        """
+        assert name is not None
+        if name == "bet-menu":
+            self._show("races")
+        elif name == "race-12":
+            self._show("bet")
+        elif name == "logo":
+            self._show("home")
+        elif name.startswith("check:"):
+            self.checked ^= {name.removeprefix("check:")}
+        elif name == "set":
+            self.vote_count += 1 if self.checked else 0
+            self.checked = set()
+        elif name == "purchase":
+            self.dialog = True
+        elif name == "ok":
+            self.dialog = False
+            self.purchased_count += self.vote_count
+            self.vote_count = 0
+        elif name.startswith("option:"):
+            _, select, text = name.split(":", 2)
+            if select == "course":
+                self.venue, self.race = text, None
+            elif select == "race":
+                self.race = text
+            elif select == "type":
+                self.ticket_type = text
+            self.checked = set()
+
+    def _show(self, page: str) -> None:
+        """画面を表示する.
+
+        Args:
+            page: 表示する画面
+        """
+        self.page = page
+        self._generation += 1
+        if page == "bet":
+            self.venue, self.race, self.ticket_type = None, None, _TICKET_TYPES[0]
+
+    def _snapshot(self) -> dict[str, Any]:
+        """購入画面のスナップショットのスクリプトの実行結果を作成する.
+
+        Returns:
+            dict[str, Any]: スナップショット
+        """
+        races = [f"{race}R" for race in range(1, 13)] if self.venue is not None else []
+        horses = list(range(1, _HORSE_COUNT + 1))
+        return {
+            "venue": {"options": list(_VENUES), "selected": self.venue},
+            "race": {"options": races, "selected": self.race},
+            "ticketType": {"options": list(_TICKET_TYPES), "selected": self.ticket_type},
+            "method": {"options": [], "selected": None},
+            "horses": horses,
+            "checked": sorted(int(label.removeprefix("no")) for label in self.checked),
+            "checkedLegs": [],
+            "multi": None,
+            "voteCount": self.vote_count,
+        }
+
+    def _element(self, name: str) -> dict[str, str]:
+        """表示中の画面の要素の参照を作成する.
+
+        Args:
+            name: 要素名
+
+        Returns:
+            dict[str, str]: 要素の参照
+        """
+        return {_ELEMENT_KEY: f"{self._generation}|{name}"}
+
+    def _is_current(self, element_id: str) -> bool:
+        """要素が表示中の画面のものかどうか.
+
+        Args:
+            element_id: 要素のID
+
+        Returns:
+            bool: 表示中の画面の要素の場合True
+        """
+        return element_id.split("|", 1)[0] == str(self._generation)
+
+    @staticmethod
+    def _element_name(element_id: str | None) -> str | None:
+        """要素のIDから要素名を取り出す.
+
+        Args:
+            element_id: 要素のID
+
+        Returns:
+            str | None: 要素名
+        """
+        return None if element_id is None else element_id.split("|", 1)[1]
+
+
+class _OptionSelect:
+    """Selectの代替（選択肢を検索してクリックする）.
+
+    Attributes:
+        _element: select要素
+        _name: select要素の名前（option要素の名前に使用する）
+    """
+
+    _NAMES = {
+        "select-course-race-course": "course",
+        "select-course-race-race": "race",
+        "bet-basic-type": "type",
+        "bet-basic-method": "method",
+    }
+
+    def __init__(self, element: WebElement) -> None:
+        """コンストラクタ.
+
+        Args:
+            element: select要素
+        """
+        self._element = element
+
+    def select_by_visible_text(self, text: str) -> None:
+        """表示テキストが一致する選択肢を選択する.
+
+        Args:
+            text: 選択肢の表示テキスト
+        """
+        for option in self._element.find_elements(
+            By.XPATH, f".//option[normalize-space(.) = '{text}']"
+        ):
+            option.click()
+
+
+def _error(error: str, message: str) -> dict[str, Any]:
+    """WebDriverのエラーレスポンスを作成する.
+
+    Args:
+        error: エラーコード
+        message: メッセージ
+
+    Returns:
+        dict[str, Any]: エラーレスポンス
+    """
+    body = {"value": {"error": error, "message": message, "stacktrace": ""}}
+    return {"status": 404, "value": json.dumps(body)}
+
+
+@pytest.fixture()
+def fake_ipat() -> _FakeIpat:
+    """即パットの画面を再現したコマンドの応答元."""
+    return _FakeIpat()
+
+
+# 正常系
+def test_session_bet_within_command_budget(fake_ipat: _FakeIpat) -> None:
+    """セッション中の基準の注文リストの購入で実行するWebDriverコマンドの回数が予算以内に収まる."""
+    credentials = IpatCredentials(
+        inet_id="test_id", user_number="12345678", password="test_pass", p_ars="1234"
+    )
+    # 応答元が再現していない要素を探した場合にすぐ失敗するよう、タイムアウトを短くする
+    config = AutoBetConfig(
+        max_bet=100000,
+        profile_commands=True,
+        navigation_timeout=1.0,
+        race_select_timeout=1.0,
+        ticket_entry_timeout=1.0,
+        confirm_timeout=1.0,
+    )
+    driver = WebDriver(command_executor=fake_ipat, options=Options())  # type: ignore[arg-type]
+    better = AutoBetter(credentials, config)
+    better._driver = driver  # type: ignore[assignment]
+    better._session_mode = True
+    assert better._command_profiler is not None
+    better._command_profiler.attach(driver)  # type: ignore[arg-type]
+
+    with patch("keiba_auto_bet.auto_bet.Select", _OptionSelect):
+        result = better.bet(_reference_orders())
+
+    assert result.success is True
+    assert fake_ipat.purchased_count == 4  # 同じ馬券の種類・金額の馬番はまとめて入力する
+    assert fake_ipat.page == "home"
+    assert result.command_profile is not None
+    counts = {
+        "total": result.command_profile.total_count,
+        **result.command_profile.count_by_phase(),
+    }
+    exceeded = {
+        phase: f"{count}回（予算{_SESSION_BUDGET.get(phase, 0)}回）"
+        for phase, count in counts.items()
+        if count > _SESSION_BUDGET.get(phase, 0)
+    }
+    assert not exceeded, f"WebDriverコマンド数が予算を超えました: {exceeded}"
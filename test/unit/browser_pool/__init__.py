@@ -0,0 +1 @@
+"""browser_poolテストパッケージ."""
@@ -0,0 +1,182 @@
+"""BrowserPoolのテスト."""
+
+import time
+from collections.abc import Callable, Generator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from keiba_auto_bet.browser_pool import BrowserPool, PooledBrowser
+from keiba_auto_bet.exceptions import BrowserError
+from keiba_auto_bet.models import AutoBetConfig
+
+_WAIT_TIMEOUT = 5.0
+
+
+def _wait_for(condition: Callable[[], bool]) -> None:
+    """条件が満たされるまで待機する."""
+    end_time = time.monotonic() + _WAIT_TIMEOUT
+    while not condition():
+        assert time.monotonic() < end_time, "条件が満たされませんでした"
+        time.sleep(0.01)
+
+
+@pytest.fixture()
+def launched_drivers() -> Generator[list[MagicMock], None, None]:
+    """Chromeの起動をモック化し、起動したドライバを記録するfixture.
+
+    Yields:
+        list[MagicMock]: 起動したドライバのモック（起動順）
+    """
+    drivers: list[MagicMock] = []
+
+    def launch(config: AutoBetConfig, driver_paths: object) -> tuple[MagicMock, None]:
+        driver = MagicMock()
+        driver.execute_script.return_value = "complete"
+        drivers.append(driver)
+        return driver, None
+
+    with (
+        patch("keiba_auto_bet.browser_pool.launch_chrome", side_effect=launch),
+        patch("keiba_auto_bet.browser_pool.WebDriverWait"),
+    ):
+        yield drivers
+
+
+# 正常系
+def test_start_launches_browsers_on_top_page(launched_drivers: list[MagicMock]) -> None:
+    """開始すると指定台数のChromeを起動して即パットのトップページを開く."""
+    config = AutoBetConfig(ipat_url="http://localhost/")
+
+    with BrowserPool(config, size=2) as pool:
+        _wait_for(lambda: pool.idle_count == 2)
+
+    assert len(launched_drivers) == 2
+    for driver in launched_drivers:
+        driver.get.assert_called_once_with("http://localhost/")
+
+
+def test_acquire_returns_browser_and_refills(launched_drivers: list[MagicMock]) -> None:
+    """取り出したChromeの分をバックグラウンドで補充する."""
+    with BrowserPool(size=1) as pool:
+        _wait_for(lambda: pool.idle_count == 1)
+
+        browser = pool.acquire()
+
+        assert browser is not None
+        assert browser.driver is launched_drivers[0]
+        _wait_for(lambda: pool.idle_count == 1)
+    assert len(launched_drivers) == 2
+    launched_drivers[0].quit.assert_not_called()
+
+
+def test_acquire_waits_for_launching_browser(launched_drivers: list[MagicMock]) -> None:
+    """待機中のChromeがない場合は起動中のChromeを待つ."""
+    with BrowserPool(size=1) as pool:
+        browser = pool.acquire(timeout=_WAIT_TIMEOUT)
+
+    assert browser is not None
+
+
+def test_close_quits_idle_browsers(launched_drivers: list[MagicMock]) -> None:
+    """停止すると待機中のChromeをすべて終了する."""
+    pool = BrowserPool(size=2)
+    pool.start()
+    _wait_for(lambda: pool.idle_count == 2)
+
+    pool.close()
+
+    assert pool.idle_count == 0
+    for driver in launched_drivers:
+        driver.quit.assert_called_once()
+    assert pool.acquire() is None
+
+
+def test_lean_profile_accepts_interactive_page() -> None:
+    """軽量プロファイルではDOMの構築完了（interactive）で読み込み完了とみなす."""
+    driver = MagicMock()
+    driver.execute_script.return_value = "interactive"
+    config = AutoBetConfig(lean_profile=True, launch_timeout=0.5)
+    pool = BrowserPool(config)
+
+    with patch("keiba_auto_bet.browser_pool.launch_chrome", return_value=(driver, None)):
+        browser = pool._open_browser()
+
+    assert browser.driver is driver
+    assert pool._is_healthy(browser) is True
+    driver.quit.assert_not_called()
+
+
+# 準正常系
+def test_acquire_recycles_unresponsive_browser(launched_drivers: list[MagicMock]) -> None:
+    """応答しないChromeは終了し、次のChromeを返す."""
+    with BrowserPool(size=2) as pool:
+        _wait_for(lambda: pool.idle_count == 2)
+        unresponsive, responsive = (browser.driver for browser in pool._idle)
+        unresponsive.execute_script.side_effect = Exception("chrome not reachable")
+
+        browser = pool.acquire()
+
+        assert browser is not None
+        assert browser.driver is responsive
+        unresponsive.quit.assert_called_once()
+
+
+def test_acquire_recycles_expired_browser(launched_drivers: list[MagicMock]) -> None:
+    """max_idle_secondsを超えて待機したChromeは使わずに作り直す."""
+    with BrowserPool(size=1, max_idle_seconds=60.0) as pool:
+        _wait_for(lambda: pool.idle_count == 1)
+        later = time.monotonic() + 61
+        with patch("keiba_auto_bet.browser_pool.time.monotonic", return_value=later):
+            browser = pool.acquire(timeout=_WAIT_TIMEOUT)
+
+        assert browser is not None
+        assert browser.driver is launched_drivers[1]
+        launched_drivers[0].quit.assert_called_once()
+
+
+def test_health_check_recycles_unresponsive_browser(launched_drivers: list[MagicMock]) -> None:
+    """定期的な状態確認で応答しないChromeを作り直す."""
+    with BrowserPool(size=1, health_check_interval=0.01) as pool:
+        _wait_for(lambda: pool.idle_count == 1)
+        launched_drivers[0].execute_script.side_effect = Exception("chrome not reachable")
+
+        _wait_for(lambda: len(launched_drivers) == 2 and pool.idle_count == 1)
+
+    launched_drivers[0].quit.assert_called()
+
+
+def test_acquire_returns_none_when_launch_fails() -> None:
+    """Chromeを起動できない場合はNoneを返す."""
+    with patch(
+        "keiba_auto_bet.browser_pool.launch_chrome",
+        side_effect=BrowserError("Chromeの起動に失敗しました"),
+    ):
+        with BrowserPool(size=1) as pool:
+            assert pool.acquire(timeout=_WAIT_TIMEOUT) is None
+
+
+def test_pooled_browser_quit_ignores_errors() -> None:
+    """Chromeの終了に失敗してもプロファイルのロックを解放する."""
+    driver = MagicMock()
+    driver.quit.side_effect = Exception("already closed")
+    profile = MagicMock()
+
+    PooledBrowser(driver=driver, profile=profile).quit()
+
+    profile.release.assert_called_once()
+
+
+# 異常系
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"size": 0}, "プールの台数は1以上で指定してください"),
+        ({"max_idle_seconds": 0}, "待機秒数は0より大きい値で指定してください"),
+        ({"health_check_interval": 0}, "状態確認の間隔は0より大きい値で指定してください"),
+    ],
+)
+def test_invalid_parameters(kwargs: dict[str, float], message: str) -> None:
+    """不正なパラメータでValueErrorが発生する."""
+    with pytest.raises(ValueError, match=message):
+        BrowserPool(**kwargs)  # type: ignore[arg-type]
@@ -0,0 +1 @@
+"""command_profilerテストパッケージ."""
@@ -0,0 +1,103 @@
+"""WebDriverコマンドの計測のテスト."""
+
+from typing import Any
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from keiba_auto_bet.command_profiler import CommandProfiler
+
+
+class _FakeDriver:
+    """コマンドの送信を記録するWebDriverの代替."""
+
+    def __init__(self) -> None:
+        """コンストラクタ."""
+        self.sent: list[str] = []
+
+    def execute(self, driver_command: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        """コマンドを送信する."""
+        self.sent.append(driver_command)
+        if driver_command == "fail":
+            raise WebDriverException("disconnected")
+        return {"value": None}
+
+    def find_element(self) -> dict[str, Any]:
+        """要素を検索する（WebDriverと同様にexecuteを経由する）."""
+        return self.execute("findElement", {"using": "id", "value": "x"})
+
+
+# 正常系
+def test_attach_records_commands_by_phase() -> None:
+    """フェーズ内のコマンドはフェーズに、フェーズ外のコマンドはotherに計上する."""
+    driver = _FakeDriver()
+    profiler = CommandProfiler()
+    profiler.attach(driver)  # type: ignore[arg-type]
+
+    with profiler.phase("login"):
+        driver.find_element()
+        driver.execute("executeScript")
+    driver.execute("quit")
+
+    profile = profiler.profile()
+    assert [(record.phase, record.command) for record in profile.records] == [
+        ("login", "findElement"),
+        ("login", "executeScript"),
+        ("other", "quit"),
+    ]
+    assert all(record.seconds >= 0 for record in profile.records)
+    assert driver.sent == ["findElement", "executeScript", "quit"]
+
+
+def test_phase_restores_outer_phase() -> None:
+    """入れ子のフェーズを抜けると外側のフェーズに戻る."""
+    driver = _FakeDriver()
+    profiler = CommandProfiler()
+    profiler.attach(driver)  # type: ignore[arg-type]
+
+    with profiler.phase("launch"):
+        with profiler.phase("page_load"):
+            driver.execute("get")
+        driver.execute("setTimeouts")
+
+    assert profiler.profile().count_by_phase() == {"page_load": 1, "launch": 1}
+
+
+def test_attach_again_switches_profiler_without_double_wrapping() -> None:
+    """既に記録中のWebDriverをattachすると記録先が切り替わり、二重に記録しない."""
+    driver = _FakeDriver()
+    first = CommandProfiler()
+    second = CommandProfiler()
+    first.attach(driver)  # type: ignore[arg-type]
+    second.attach(driver)  # type: ignore[arg-type]
+    second.attach(driver)  # type: ignore[arg-type]
+
+    driver.execute("get")
+
+    assert first.profile().total_count == 0
+    assert second.profile().total_count == 1
+
+
+def test_reset_clears_records() -> None:
+    """resetで記録を消去する."""
+    driver = _FakeDriver()
+    profiler = CommandProfiler()
+    profiler.attach(driver)  # type: ignore[arg-type]
+    driver.execute("get")
+
+    profiler.reset()
+
+    assert profiler.profile().total_count == 0
+
+
+# 異常系
+def test_failed_command_is_recorded() -> None:
+    """失敗したコマンドも記録し、例外はそのまま送出する."""
+    driver = _FakeDriver()
+    profiler = CommandProfiler()
+    profiler.attach(driver)  # type: ignore[arg-type]
+
+    with pytest.raises(WebDriverException, match="disconnected"):
+        driver.execute("fail")
+
+    assert profiler.profile().count_by_command() == {"fail": 1}
@@ -0,0 +1,19 @@
+"""単体テスト用のfixture."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from keiba_auto_bet.backend import BetBackend
+from keiba_auto_bet.models import AutoBetConfig, BetResult
+
+
+@pytest.fixture()
+def mock_better() -> MagicMock:
+    """テスト用のクライアント（セッション未開始）."""
+    better = MagicMock(spec=BetBackend)
+    better.config = AutoBetConfig(max_bet=10000)
+    better.is_open = False
+    better.clock_offset = None
+    better.bet.return_value = BetResult(success=True)
+    return better
@@ -0,0 +1 @@
+"""driver_cacheテストパッケージ."""
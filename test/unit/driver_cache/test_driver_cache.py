@@ -0,0 +1,138 @@
+"""ChromeDriverのパス解決のキャッシュのテスト."""
+
+import json
+import os
+from collections.abc import Generator
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from keiba_auto_bet.driver_cache import invalidate_driver_cache, resolve_chrome_driver
+from keiba_auto_bet.exceptions import BrowserError
+
+
+@pytest.fixture()
+def binaries(tmp_path: Path) -> tuple[Path, Path]:
+    """ダミーのChromeDriverとChromeの実行ファイル.
+
+    Returns:
+        tuple[Path, Path]: (ChromeDriverのパス, Chromeのパス)のタプル
+    """
+    driver_path = tmp_path / "chromedriver"
+    browser_path = tmp_path / "chrome"
+    driver_path.write_bytes(b"driver")
+    browser_path.write_bytes(b"chrome-131")
+    return driver_path, browser_path
+
+
+@pytest.fixture()
+def mock_selenium_manager(
+    binaries: tuple[Path, Path],
+) -> Generator[MagicMock, None, None]:
+    """Selenium Managerをモック化するfixture.
+
+    Yields:
+        MagicMock: SeleniumManagerクラスのモック
+    """
+    driver_path, browser_path = binaries
+    with patch("keiba_auto_bet.driver_cache.SeleniumManager") as mock_cls:
+        mock_cls.return_value.binary_paths.return_value = {
+            "driver_path": str(driver_path),
+            "browser_path": str(browser_path),
+        }
+        yield mock_cls
+
+
+# 正常系
+def test_resolve_runs_selenium_manager_and_saves_cache(
+    mock_selenium_manager: MagicMock, binaries: tuple[Path, Path], tmp_path: Path
+) -> None:
+    """キャッシュがない場合はSelenium Managerで解決し、キャッシュファイルに保存する."""
+    driver_path, browser_path = binaries
+    cache_file = tmp_path / "cache" / "driver.json"
+
+    paths = resolve_chrome_driver(cache_file)
+
+    assert paths.driver_path == str(driver_path)
+    assert paths.browser_path == str(browser_path)
+    assert paths.from_cache is False
+    mock_selenium_manager.return_value.binary_paths.assert_called_once_with(["--browser", "chrome"])
+    assert json.loads(cache_file.read_text(encoding="utf-8"))["driver_path"] == str(driver_path)
+
+
+def test_resolve_reuses_cache(mock_selenium_manager: MagicMock, tmp_path: Path) -> None:
+    """2回目以降はSelenium Managerを実行せずにキャッシュを使用する."""
+    cache_file = tmp_path / "driver.json"
+    resolve_chrome_driver(cache_file)
+
+    paths = resolve_chrome_driver(cache_file)
+
+    assert paths.from_cache is True
+    mock_selenium_manager.return_value.binary_paths.assert_called_once()
+
+
+# 準正常系
+def test_resolve_again_after_chrome_update(
+    mock_selenium_manager: MagicMock, binaries: tuple[Path, Path], tmp_path: Path
+) -> None:
+    """Chromeが更新された場合はキャッシュを使わずに解決し直す."""
+    _, browser_path = binaries
+    cache_file = tmp_path / "driver.json"
+    resolve_chrome_driver(cache_file)
+    browser_path.write_bytes(b"chrome-132-updated")
+    os.utime(browser_path, ns=(0, 0))
+
+    paths = resolve_chrome_driver(cache_file)
+
+    assert paths.from_cache is False
+    assert mock_selenium_manager.return_value.binary_paths.call_count == 2
+
+
+def test_resolve_again_when_driver_removed(
+    mock_selenium_manager: MagicMock, binaries: tuple[Path, Path], tmp_path: Path
+) -> None:
+    """キャッシュしたChromeDriverが削除された場合は解決し直す（見つからなければエラー）."""
+    driver_path, _ = binaries
+    cache_file = tmp_path / "driver.json"
+    resolve_chrome_driver(cache_file)
+    driver_path.unlink()
+
+    with pytest.raises(BrowserError):
+        resolve_chrome_driver(cache_file)
+    assert mock_selenium_manager.return_value.binary_paths.call_count == 2
+
+
+def test_resolve_ignores_broken_cache(mock_selenium_manager: MagicMock, tmp_path: Path) -> None:
+    """壊れたキャッシュファイルは無視して解決し直す."""
+    cache_file = tmp_path / "driver.json"
+    cache_file.write_text("{broken", encoding="utf-8")
+
+    paths = resolve_chrome_driver(cache_file)
+
+    assert paths.from_cache is False
+    assert json.loads(cache_file.read_text(encoding="utf-8"))["version"] == 1
+
+
+def test_invalidate_driver_cache(mock_selenium_manager: MagicMock, tmp_path: Path) -> None:
+    """キャッシュを削除すると次回はSelenium Managerで解決する."""
+    cache_file = tmp_path / "driver.json"
+    resolve_chrome_driver(cache_file)
+
+    invalidate_driver_cache(cache_file)
+    invalidate_driver_cache(cache_file)
+
+    assert resolve_chrome_driver(cache_file).from_cache is False
+
+
+# 異常系
+def test_resolve_raises_browser_error_on_selenium_manager_failure(tmp_path: Path) -> None:
+    """Selenium Managerが失敗した場合BrowserErrorが送出され、キャッシュは作成されない."""
+    cache_file = tmp_path / "driver.json"
+    with patch("keiba_auto_bet.driver_cache.SeleniumManager") as mock_cls:
+        mock_cls.return_value.binary_paths.side_effect = RuntimeError("offline")
+
+        with pytest.raises(BrowserError, match="ChromeDriverのパスを解決できませんでした"):
+            resolve_chrome_driver(cache_file)
+
+    assert not cache_file.exists()
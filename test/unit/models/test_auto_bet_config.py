@@ -13,6 +13,10 @@ def test_auto_bet_config_default() -> None:
     assert config.chrome_driver_path is None
     assert config.headless is True
     assert config.max_bet == 10000
+    assert config.login_timeout == 10.0
+    assert config.poll_frequency == 0.05
+    assert config.relaxed_poll_frequency == 0.5
+    assert config.tight_poll_window == 2.0
 
 
 def test_auto_bet_config_custom() -> None:
@@ -41,3 +45,54 @@ def test_auto_bet_config_invalid_max_bet() -> None:
     """不正な最大合計購入金額でValueErrorが発生する."""
     with pytest.raises(ValueError, match="最大合計購入金額は100円以上で指定してください"):
         AutoBetConfig(max_bet=50)
+
+
+@pytest.mark.parametrize(
+    "field",
+    [
+        "launch_timeout",
+        "login_timeout",
+        "navigation_timeout",
+        "race_select_timeout",
+        "ticket_entry_timeout",
+        "confirm_timeout",
+    ],
+)
+def test_auto_bet_config_invalid_timeout(field: str) -> None:
+    """0以下のタイムアウト秒数でValueErrorが発生する."""
+    with pytest.raises(
+        ValueError, match=f"タイムアウト秒数は0より大きい値で指定してください: {field}"
+    ):
+        AutoBetConfig(**{field: 0})
+
+
+def test_auto_bet_config_invalid_poll_frequency() -> None:
+    """0以下の確認間隔でValueErrorが発生する."""
+    with pytest.raises(ValueError, match="確認間隔は0より大きい値で指定してください"):
+        AutoBetConfig(poll_frequency=0)
+
+
+def test_auto_bet_config_relaxed_poll_shorter_than_poll() -> None:
+    """relaxed_poll_frequencyがpoll_frequencyより短い場合ValueErrorが発生する."""
+    with pytest.raises(
+        ValueError, match="relaxed_poll_frequencyはpoll_frequency以上で指定してください"
+    ):
+        AutoBetConfig(poll_frequency=0.2, relaxed_poll_frequency=0.1)
+
+
+def test_auto_bet_config_negative_tight_poll_window() -> None:
+    """負のtight_poll_windowでValueErrorが発生する."""
+    with pytest.raises(ValueError, match="tight_poll_windowは0以上で指定してください"):
+        AutoBetConfig(tight_poll_window=-1)
+
+
+def test_auto_bet_config_invalid_profile_max_mb() -> None:
+    """1MB未満のprofile_max_mbでValueErrorが発生する."""
+    with pytest.raises(ValueError, match="プロファイルの最大サイズは1MB以上で指定してください"):
+        AutoBetConfig(profile_max_mb=0)
+
+
+def test_auto_bet_config_negative_clock_samples() -> None:
+    """負のclock_samplesでValueErrorが発生する."""
+    with pytest.raises(ValueError, match="サーバ時刻の計測回数は0以上で指定してください"):
+        AutoBetConfig(clock_samples=-1)
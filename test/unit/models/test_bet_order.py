@@ -2,7 +2,7 @@
 
 import pytest
 
-from keiba_auto_bet.models import BetOrder, TicketType
+from keiba_auto_bet.models import BetOrder, HorseSelection, TicketType
 
 
 # 正常系
@@ -49,6 +49,29 @@ def test_bet_order_is_frozen() -> None:
         order.amount = 200  # type: ignore[misc]
 
 
+def test_bet_order_combination_total_amount() -> None:
+    """組み合わせの馬券は1点あたりの金額と点数から合計金額を計算する."""
+    order = BetOrder(
+        venue="東京",
+        race_number=11,
+        ticket_type=TicketType.TRIO,
+        horse_number=None,
+        amount=200,
+        selection=HorseSelection.box((1, 2, 3, 4, 5, 6)),
+    )
+    assert order.ticket_count == 20
+    assert order.total_amount == 4000
+
+
+def test_bet_order_single_total_amount() -> None:
+    """単勝・複勝は1点として合計金額を計算する."""
+    order = BetOrder(
+        venue="東京", race_number=1, ticket_type=TicketType.SHOW, horse_number=3, amount=300
+    )
+    assert order.ticket_count == 1
+    assert order.total_amount == 300
+
+
 # 準正常系
 @pytest.mark.parametrize(
     "race_number, expected_msg",
@@ -109,3 +132,42 @@ def test_bet_order_invalid_amount(amount: int, expected_msg: str) -> None:
             horse_number=1,
             amount=amount,
         )
+
+
+@pytest.mark.parametrize(
+    "ticket_type, horse_number, selection, expected_msg",
+    [
+        (TicketType.WIN, None, None, "単勝は馬番のみを指定してください"),
+        (TicketType.WIN, 1, HorseSelection.box((1, 2)), "単勝は馬番のみを指定してください"),
+        (TicketType.QUINELLA, 1, None, r"馬連は馬番の選び方（selection）のみを指定してください"),
+        (
+            TicketType.QUINELLA,
+            1,
+            HorseSelection.box((1, 2)),
+            r"馬連は馬番の選び方（selection）のみを指定してください",
+        ),
+        (TicketType.TRIO, None, HorseSelection.box((1, 2)), "3連複の組み合わせが1点もありません"),
+        (
+            TicketType.EXACTA,
+            None,
+            HorseSelection.formation((1,), (1,)),
+            "馬単の組み合わせが1点もありません",
+        ),
+    ],
+)
+def test_bet_order_invalid_selection(
+    ticket_type: TicketType,
+    horse_number: int | None,
+    selection: HorseSelection | None,
+    expected_msg: str,
+) -> None:
+    """馬券の種類と馬番・馬番の選び方が対応しない場合はValueErrorが発生する."""
+    with pytest.raises(ValueError, match=expected_msg):
+        BetOrder(
+            venue="東京",
+            race_number=1,
+            ticket_type=ticket_type,
+            horse_number=horse_number,
+            amount=100,
+            selection=selection,
+        )
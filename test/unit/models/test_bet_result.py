@@ -0,0 +1,26 @@
+"""BetResultのテスト."""
+
+import pytest
+
+from keiba_auto_bet.models import BetResult
+
+
+# 正常系
+def test_bet_result_total_seconds() -> None:
+    """total_secondsは全フェーズの所要時間の合計になる."""
+    result = BetResult(success=True, phase_timings={"login": 1.5, "confirm": 0.25})
+
+    assert result.total_seconds == pytest.approx(1.75)
+
+
+@pytest.mark.parametrize("success", [True, False])
+def test_bet_result_bool(success: bool) -> None:
+    """真偽値としてはsuccessと同じ値に評価される."""
+    assert bool(BetResult(success=success)) is success
+
+
+def test_bet_result_is_frozen() -> None:
+    """BetResultが不変（frozen）であることを確認する."""
+    result = BetResult(success=True)
+    with pytest.raises(AttributeError):
+        result.success = False  # type: ignore[misc]
@@ -0,0 +1,48 @@
+"""CommandProfileのテスト."""
+
+import pytest
+
+from keiba_auto_bet.models import CommandProfile, CommandRecord
+
+
+@pytest.fixture()
+def profile() -> CommandProfile:
+    """テスト用のコマンドの記録."""
+    return CommandProfile(
+        records=(
+            CommandRecord(phase="login", command="findElement", seconds=0.5),
+            CommandRecord(phase="race_select", command="executeScript", seconds=0.25),
+            CommandRecord(phase="login", command="executeScript", seconds=0.125),
+            CommandRecord(phase="race_select", command="findElement", seconds=0.125),
+        )
+    )
+
+
+# 正常系
+def test_command_profile_totals(profile: CommandProfile) -> None:
+    """実行回数と所要時間の合計を返す."""
+    assert profile.total_count == 4
+    assert profile.total_seconds == pytest.approx(1.0)
+
+
+def test_command_profile_by_phase(profile: CommandProfile) -> None:
+    """フェーズごとに実行回数と所要時間を集計する."""
+    assert profile.count_by_phase() == {"login": 2, "race_select": 2}
+    assert profile.seconds_by_phase() == pytest.approx({"login": 0.625, "race_select": 0.375})
+
+
+def test_command_profile_by_command(profile: CommandProfile) -> None:
+    """コマンドの種類ごとに実行回数と所要時間を集計する."""
+    assert profile.count_by_command() == {"findElement": 2, "executeScript": 2}
+    assert profile.seconds_by_command() == pytest.approx(
+        {"findElement": 0.625, "executeScript": 0.375}
+    )
+
+
+def test_command_profile_empty() -> None:
+    """記録がない場合は0と空の集計を返す."""
+    profile = CommandProfile()
+
+    assert profile.total_count == 0
+    assert profile.total_seconds == 0
+    assert profile.count_by_phase() == {}
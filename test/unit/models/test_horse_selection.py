@@ -0,0 +1,122 @@
+"""HorseSelectionのテスト."""
+
+import itertools
+
+import pytest
+
+from keiba_auto_bet.models import BetMethod, HorseSelection, TicketType
+
+
+def _brute_force_count(selection: HorseSelection, ticket_type: TicketType) -> int:
+    """全ての着順を列挙して組み合わせの点数を数える.
+
+    Args:
+        selection: 馬番の選び方
+        ticket_type: 馬券の種類
+
+    Returns:
+        int: 組み合わせの点数
+    """
+    size = ticket_type.horse_count
+    horses = sorted({horse for leg in selection.legs for horse in leg})
+    tickets = set()
+    for ranking in itertools.permutations(horses, size):
+        if selection.method is BetMethod.FORMATION:
+            matched = all(horse in leg for horse, leg in zip(ranking, selection.legs))
+        elif selection.method is BetMethod.BOX:
+            matched = True
+        else:
+            axis, partners = selection.legs
+            fixed = ticket_type.ordered and not selection.multi
+            matched = set(axis) <= set(ranking) and set(ranking) - set(axis) <= set(partners)
+            matched = matched and (not fixed or ranking[: len(axis)] == axis)
+        if matched:
+            tickets.add(ranking if ticket_type.ordered else tuple(sorted(ranking)))
+    return len(tickets)
+
+
+# 正常系
+@pytest.mark.parametrize(
+    "selection, ticket_type, expected",
+    [
+        (HorseSelection.box((1, 2, 3, 4, 5, 6)), TicketType.TRIO, 20),
+        (HorseSelection.box((1, 2, 3, 4)), TicketType.TRIFECTA, 24),
+        (HorseSelection.box((1, 2, 3)), TicketType.QUINELLA, 3),
+        (HorseSelection.box((1, 2, 3)), TicketType.EXACTA, 6),
+        (HorseSelection.nagashi((1,), (2, 3, 4)), TicketType.QUINELLA_PLACE, 3),
+        (HorseSelection.nagashi((1,), (2, 3, 4)), TicketType.EXACTA, 3),
+        (HorseSelection.nagashi((1,), (2, 3, 4), multi=True), TicketType.EXACTA, 6),
+        (HorseSelection.nagashi((1,), (2, 3, 4, 5)), TicketType.TRIO, 6),
+        (HorseSelection.nagashi((1, 2), (3, 4, 5)), TicketType.TRIO, 3),
+        (HorseSelection.nagashi((1,), (2, 3, 4, 5), multi=True), TicketType.TRIFECTA, 36),
+        (HorseSelection.nagashi((1, 2), (3, 4, 5), multi=True), TicketType.TRIFECTA, 18),
+        (HorseSelection.formation((1, 2), (1, 2, 3), (1, 2, 3, 4)), TicketType.TRIFECTA, 8),
+        (HorseSelection.formation((1, 2), (1, 2, 3), (1, 2, 3, 4)), TicketType.TRIO, 4),
+        (HorseSelection.formation((1,), (2, 3)), TicketType.EXACTA, 2),
+    ],
+)
+def test_count_combinations(
+    selection: HorseSelection, ticket_type: TicketType, expected: int
+) -> None:
+    """入力方式ごとの点数が全ての着順を列挙した点数と一致する."""
+    assert selection.count_combinations(ticket_type) == expected
+    assert _brute_force_count(selection, ticket_type) == expected
+
+
+def test_describe() -> None:
+    """入力方式と列ごとの馬番を表記する."""
+    assert HorseSelection.box((1, 2, 3)).describe() == "ボックス 1,2,3"
+    assert HorseSelection.nagashi((1,), (2, 5, 7), multi=True).describe() == (
+        "ながし 1-2,5,7（マルチ）"
+    )
+
+
+# 準正常系
+@pytest.mark.parametrize(
+    "method, legs, multi, expected_msg",
+    [
+        (BetMethod.BOX, ((1, 2), (3, 4)), False, "ボックスの馬番の列数が不正です"),
+        (BetMethod.NAGASHI, ((1,),), False, "ながしの馬番の列数が不正です"),
+        (BetMethod.FORMATION, (), False, "フォーメーションの馬番の列数が不正です"),
+        (BetMethod.FORMATION, ((1,), ()), False, "馬番が空の列があります"),
+        (BetMethod.BOX, ((0, 1),), False, "馬番は1以上で指定してください"),
+        (BetMethod.BOX, ((1, 1),), False, "同じ列に同じ馬番が重複しています"),
+        (BetMethod.NAGASHI, ((1,), (1, 2)), False, "軸馬と相手に同じ馬番が含まれています"),
+        (BetMethod.BOX, ((1, 2),), True, "マルチはながしでのみ指定できます"),
+    ],
+)
+def test_horse_selection_invalid(
+    method: BetMethod, legs: tuple[tuple[int, ...], ...], multi: bool, expected_msg: str
+) -> None:
+    """不正な馬番の選び方でValueErrorが発生する."""
+    with pytest.raises(ValueError, match=expected_msg):
+        HorseSelection(method, legs, multi)
+
+
+@pytest.mark.parametrize(
+    "selection, ticket_type, expected_msg",
+    [
+        (HorseSelection.box((1, 2)), TicketType.WIN, "単勝は組み合わせの馬券ではありません"),
+        (
+            HorseSelection.nagashi((1, 2), (3, 4)),
+            TicketType.QUINELLA,
+            "馬連のながしの軸馬は1頭以下で指定してください",
+        ),
+        (
+            HorseSelection.nagashi((1,), (2, 3), multi=True),
+            TicketType.QUINELLA,
+            "馬連ではマルチを指定できません",
+        ),
+        (
+            HorseSelection.formation((1,), (2,)),
+            TicketType.TRIO,
+            "3連複のフォーメーションは3列で指定してください",
+        ),
+    ],
+)
+def test_count_combinations_invalid(
+    selection: HorseSelection, ticket_type: TicketType, expected_msg: str
+) -> None:
+    """馬券の種類と入力方式・列数が対応しない場合はValueErrorが発生する."""
+    with pytest.raises(ValueError, match=expected_msg):
+        selection.count_combinations(ticket_type)
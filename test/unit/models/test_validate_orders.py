@@ -0,0 +1,32 @@
+"""validate_ordersのテスト."""
+
+import pytest
+
+from keiba_auto_bet.exceptions import ValidationError
+from keiba_auto_bet.models import BetOrder, TicketType, validate_orders
+
+
+def _order(amount: int) -> BetOrder:
+    """テスト用の購入注文を生成する."""
+    return BetOrder(
+        venue="東京", race_number=11, ticket_type=TicketType.WIN, horse_number=1, amount=amount
+    )
+
+
+# 正常系
+def test_validate_orders_accepts_total_up_to_max_bet() -> None:
+    """合計金額が最大合計購入金額以下の場合は何もしない."""
+    validate_orders([_order(300), _order(700)], 1000)
+
+
+# 準正常系
+def test_validate_orders_rejects_empty_orders() -> None:
+    """購入注文リストが空の場合ValidationErrorが発生する."""
+    with pytest.raises(ValidationError, match="購入注文リストが空です"):
+        validate_orders([], 1000)
+
+
+def test_validate_orders_rejects_total_over_max_bet() -> None:
+    """合計金額が最大合計購入金額を超える場合ValidationErrorが発生する."""
+    with pytest.raises(ValidationError, match="合計金額1100円が最大購入金額1000円を超えています"):
+        validate_orders([_order(600), _order(500)], 1000)
@@ -0,0 +1 @@
+"""multi_accountテストパッケージ."""
@@ -0,0 +1,217 @@
+"""MultiAccountBetterのテスト."""
+
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from keiba_auto_bet.exceptions import LoginError, ValidationError
+from keiba_auto_bet.models import (
+    AutoBetConfig,
+    BetOrder,
+    BetResult,
+    BettingAccount,
+    IpatCredentials,
+    TicketType,
+)
+from keiba_auto_bet.multi_account import MultiAccountBetter, _bet_worker, shard_orders
+
+
+def _account(name: str, max_bet: int) -> BettingAccount:
+    """テスト用の口座を生成する."""
+    credentials = IpatCredentials(
+        inet_id=f"id_{name}",
+        user_number="12345678",
+        password="test_pass",
+        p_ars="1234",
+    )
+    return BettingAccount(name=name, credentials=credentials, max_bet=max_bet)
+
+
+def _order(horse_number: int, amount: int) -> BetOrder:
+    """テスト用の購入注文を生成する."""
+    return BetOrder(
+        venue="東京",
+        race_number=11,
+        ticket_type=TicketType.WIN,
+        horse_number=horse_number,
+        amount=amount,
+    )
+
+
+@pytest.fixture()
+def mock_auto_better() -> Generator[MagicMock, None, None]:
+    """ワーカーをスレッドで実行し、AutoBetterをモック化するfixture.
+
+    Yields:
+        MagicMock: AutoBetterクラスのモック
+    """
+
+    def thread_executor(max_workers: int, **kwargs: Any) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=max_workers)
+
+    with (
+        patch("keiba_auto_bet.multi_account.ProcessPoolExecutor", side_effect=thread_executor),
+        patch("keiba_auto_bet.multi_account.AutoBetter") as mock_cls,
+    ):
+        mock_cls.return_value.bet.side_effect = lambda orders: BetResult(
+            success=True, order_count=len(orders)
+        )
+        yield mock_cls
+
+
+# 正常系
+def test_shard_orders_balances_accounts() -> None:
+    """金額の大きい注文から残りの購入可能額が最も大きい口座に割り当てる."""
+    orders = [_order(1, 300), _order(2, 1000), _order(3, 500), _order(4, 400)]
+    accounts = [_account("a", 2000), _account("b", 1500)]
+
+    shards = shard_orders(orders, accounts)
+
+    assert shards == {
+        "a": [_order(2, 1000), _order(4, 400)],
+        "b": [_order(1, 300), _order(3, 500)],
+    }
+
+
+def test_shard_orders_leaves_unused_account_empty() -> None:
+    """注文が割り当てられない口座は空リストになる."""
+    shards = shard_orders([_order(1, 100)], [_account("a", 1000), _account("b", 500)])
+
+    assert shards == {"a": [_order(1, 100)], "b": []}
+
+
+def test_shard_orders_searches_when_balanced_assignment_fails() -> None:
+    """残りの購入可能額が最も大きい口座への割り当てで収まらない場合も、収まる割り当てを探す."""
+    orders = [_order(1, 600), _order(2, 500), _order(3, 400), _order(4, 300), _order(5, 200)]
+    accounts = [_account("a", 1000), _account("b", 1000)]
+
+    shards = shard_orders(orders, accounts)
+
+    assert shards == {
+        "a": [_order(1, 600), _order(3, 400)],
+        "b": [_order(2, 500), _order(4, 300), _order(5, 200)],
+    }
+
+
+def test_bet_runs_each_account(mock_auto_better: MagicMock) -> None:
+    """口座ごとにmax_betを上書きした設定で購入し、口座の指定順に結果を返す."""
+    accounts = [_account("a", 1000), _account("b", 1000), _account("c", 1000)]
+    better = MultiAccountBetter(accounts, AutoBetConfig(headless=False), max_workers=2)
+
+    results = better.bet([_order(1, 800), _order(2, 700)])
+
+    assert [result.account_name for result in results] == ["a", "b"]
+    assert all(result.success for result in results)
+    assert [result.orders for result in results] == [(_order(1, 800),), (_order(2, 700),)]
+    configs = {call.args[1] for call in mock_auto_better.call_args_list}
+    assert configs == {AutoBetConfig(headless=False, max_bet=1000)}
+
+
+def test_bet_records_account_error(mock_auto_better: MagicMock) -> None:
+    """一部の口座で購入に失敗しても他の口座の結果を返し、エラーを記録する."""
+
+    def bet(orders: list[BetOrder]) -> BetResult:
+        if orders[0].horse_number == 1:
+            raise LoginError("ログインに失敗しました")
+        return BetResult(success=True)
+
+    mock_auto_better.return_value.bet.side_effect = bet
+    better = MultiAccountBetter([_account("a", 1000), _account("b", 1000)])
+
+    results = better.bet([_order(1, 800), _order(2, 700)])
+
+    assert results[0].success is False
+    assert results[0].result is None
+    assert results[0].error == "ログインに失敗しました"
+    assert results[1].success is True
+
+
+def test_bet_records_unexpected_worker_error(mock_auto_better: MagicMock) -> None:
+    """KeibaAutoBetError以外の例外が発生した口座もエラーを記録し、他の口座の結果を返す."""
+
+    def bet(orders: list[BetOrder]) -> BetResult:
+        if orders[0].horse_number == 1:
+            raise WebDriverException("chrome not reachable")
+        return BetResult(success=True)
+
+    mock_auto_better.return_value.bet.side_effect = bet
+    better = MultiAccountBetter([_account("a", 1000), _account("b", 1000)])
+
+    results = better.bet([_order(1, 800), _order(2, 700)])
+
+    assert results[0].success is False
+    assert results[0].error is not None
+    assert "chrome not reachable" in results[0].error
+    assert results[1].success is True
+
+
+def test_bet_records_broken_worker_process(mock_auto_better: MagicMock) -> None:
+    """ワーカープロセスが異常終了した口座もエラーを記録し、購入済みの口座の結果を返す."""
+    succeeded = (BetResult(success=True), None, 1.0)
+
+    with patch(
+        "keiba_auto_bet.multi_account._bet_worker",
+        side_effect=[BrokenProcessPool("terminated abruptly"), succeeded],
+    ):
+        better = MultiAccountBetter([_account("a", 1000), _account("b", 1000)], max_workers=1)
+        results = better.bet([_order(1, 800), _order(2, 700)])
+
+    assert results[0].result is None
+    assert results[0].error is not None
+    assert "ワーカープロセスでエラーが発生しました" in results[0].error
+    assert results[1].success is True
+
+
+def test_bet_worker_converts_unexpected_error(mock_auto_better: MagicMock) -> None:
+    """ワーカーはKeibaAutoBetError以外の例外もメッセージに変換して返す."""
+    mock_auto_better.side_effect = RuntimeError("pickle failed")
+
+    result, error, _ = _bet_worker(_account("a", 1000).credentials, AutoBetConfig(), [])
+
+    assert result is None
+    assert error == "予期しないエラーが発生しました: RuntimeError('pickle failed')"
+
+
+# 準正常系
+def test_shard_orders_rejects_order_exceeding_capacity() -> None:
+    """収まる割り当てがない場合は不足額を示してValidationErrorが発生する."""
+    with pytest.raises(
+        ValidationError,
+        match=r"振り分けられません: 不足額600円（合計金額1200円）",
+    ):
+        shard_orders([_order(1, 600), _order(2, 600)], [_account("a", 1000), _account("b", 500)])
+
+
+def test_bet_rejects_total_exceeding_capacity(mock_auto_better: MagicMock) -> None:
+    """合計金額が全口座の最大合計購入金額の合計を超える場合ValidationErrorが発生する."""
+    better = MultiAccountBetter([_account("a", 500), _account("b", 500)])
+
+    with pytest.raises(ValidationError, match="合計金額1100円が最大購入金額1000円を超えています"):
+        better.bet([_order(1, 600), _order(2, 500)])
+
+    mock_auto_better.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "accounts, max_workers, message",
+    [
+        ([], 1, "口座を1つ以上指定してください"),
+        ([_account("a", 100), _account("a", 100)], 1, "口座名が重複しています"),
+        ([_account("a", 100)], 0, "同時に起動するブラウザの数は1以上で指定してください"),
+    ],
+)
+def test_init_invalid(accounts: list[BettingAccount], max_workers: int, message: str) -> None:
+    """不正な口座・同時実行数でValueErrorが発生する."""
+    with pytest.raises(ValueError, match=message):
+        MultiAccountBetter(accounts, max_workers=max_workers)
+
+
+def test_betting_account_invalid_max_bet() -> None:
+    """口座の最大合計購入金額が100円未満の場合ValueErrorが発生する."""
+    with pytest.raises(ValueError, match="最大合計購入金額は100円以上で指定してください"):
+        _account("a", 50)
@@ -0,0 +1 @@
+"""plannerテストパッケージ."""
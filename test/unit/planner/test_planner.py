@@ -0,0 +1,137 @@
+"""plan_ordersのテスト."""
+
+from keiba_auto_bet.models import BetOrder, HorseSelection, TicketEntry, TicketType
+from keiba_auto_bet.planner import plan_orders
+
+
+def _order(
+    venue: str,
+    race_number: int,
+    horse_number: int,
+    amount: int = 100,
+    ticket_type: TicketType = TicketType.WIN,
+) -> BetOrder:
+    """テスト用の購入注文を生成する."""
+    return BetOrder(
+        venue=venue,
+        race_number=race_number,
+        ticket_type=ticket_type,
+        horse_number=horse_number,
+        amount=amount,
+    )
+
+
+# 正常系
+def test_plan_orders_merges_duplicate_tickets() -> None:
+    """同一馬券の注文は金額を合算して1件にまとめる."""
+    plan = plan_orders(
+        [
+            _order("東京", 11, 3, 500),
+            _order("東京", 11, 3, 300),
+            _order("東京", 11, 3, 200, TicketType.SHOW),
+        ]
+    )
+
+    assert plan.orders == (
+        _order("東京", 11, 3, 800),
+        _order("東京", 11, 3, 200, TicketType.SHOW),
+    )
+    assert plan.merged_count == 1
+
+
+def test_plan_orders_groups_by_race_in_first_seen_order() -> None:
+    """同じレースの注文が連続するよう、最初に現れたレースの順にまとめる."""
+    plan = plan_orders(
+        [
+            _order("阪神", 12, 1),
+            _order("東京", 11, 2),
+            _order("阪神", 12, 3),
+            _order("東京", 11, 4),
+            _order("阪神", 11, 5),
+        ]
+    )
+
+    assert [(o.venue, o.race_number, o.horse_number) for o in plan.orders] == [
+        ("阪神", 12, 1),
+        ("阪神", 12, 3),
+        ("東京", 11, 2),
+        ("東京", 11, 4),
+        ("阪神", 11, 5),
+    ]
+    assert plan.race_count == 3
+    assert plan.race_selections_saved == 2
+
+
+def test_plan_orders_saved_operations() -> None:
+    """省略される画面操作の回数は合算した馬券入力とレース選択の合計になる."""
+    plan = plan_orders(
+        [
+            _order("東京", 11, 3),
+            _order("東京", 11, 3),
+            _order("東京", 11, 5),
+            _order("中山", 1, 1),
+        ]
+    )
+
+    assert plan.original_count == 4
+    assert len(plan.orders) == 3
+    assert len(plan.entries) == 3
+    assert plan.race_count == 2
+    assert plan.saved_operations == 1 + 2
+
+
+def test_plan_orders_groups_horses_sharing_type_and_amount() -> None:
+    """同じレース・馬券の種類・金額の馬番は1回のセット操作にまとめる."""
+    plan = plan_orders(
+        [
+            _order("東京", 11, 1, 200, TicketType.SHOW),
+            _order("東京", 11, 4, 200, TicketType.SHOW),
+            _order("東京", 11, 6, 300, TicketType.SHOW),
+            _order("東京", 11, 8, 100, TicketType.SHOW),
+            _order("東京", 11, 8, 100, TicketType.SHOW),
+            _order("東京", 11, 4, 200),
+            _order("阪神", 11, 2, 200, TicketType.SHOW),
+        ]
+    )
+
+    assert plan.entries == (
+        TicketEntry("東京", 11, TicketType.SHOW, (1, 4, 8), 200),
+        TicketEntry("東京", 11, TicketType.SHOW, (6,), 300),
+        TicketEntry("東京", 11, TicketType.WIN, (4,), 200),
+        TicketEntry("阪神", 11, TicketType.SHOW, (2,), 200),
+    )
+    assert plan.set_operations_saved == 3
+    assert plan.saved_operations == 3 + 5
+
+
+def test_plan_orders_keeps_combination_as_single_entry() -> None:
+    """組み合わせの馬券は同じ選び方の注文だけを合算し、注文ごとに1回のセット操作にする."""
+    box = HorseSelection.box((1, 2, 3))
+    nagashi = HorseSelection.nagashi((1,), (2, 3))
+    orders = [
+        BetOrder("東京", 11, TicketType.QUINELLA, None, 100, box),
+        BetOrder("東京", 11, TicketType.QUINELLA, None, 200, box),
+        BetOrder("東京", 11, TicketType.QUINELLA, None, 300, nagashi),
+    ]
+
+    plan = plan_orders(orders)
+
+    assert plan.orders == (
+        BetOrder("東京", 11, TicketType.QUINELLA, None, 300, box),
+        BetOrder("東京", 11, TicketType.QUINELLA, None, 300, nagashi),
+    )
+    assert plan.entries == (
+        TicketEntry("東京", 11, TicketType.QUINELLA, (), 300, box),
+        TicketEntry("東京", 11, TicketType.QUINELLA, (), 300, nagashi),
+    )
+    assert plan.merged_count == 1
+
+
+def test_plan_orders_without_duplicates_keeps_orders() -> None:
+    """合算・並べ替えが不要な注文はそのままの順序で計画される."""
+    orders = [_order("東京", 11, 3), _order("阪神", 12, 7)]
+
+    plan = plan_orders(orders)
+
+    assert plan.orders == tuple(orders)
+    assert plan.saved_operations == 0
@@ -0,0 +1 @@
+"""profileテストパッケージ."""
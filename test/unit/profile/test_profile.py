@@ -0,0 +1,109 @@
+"""Chromeプロファイル管理のテスト."""
+
+from pathlib import Path
+
+import pytest
+
+from keiba_auto_bet.exceptions import BrowserError
+from keiba_auto_bet.profile import acquire_profile, prune_profile
+
+_MAX_BYTES = 1024 * 1024
+
+
+def _write_file(path: Path, size: int) -> None:
+    """指定サイズのファイルを作成する."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" * size)
+
+
+# 正常系
+def test_acquire_profile_creates_first_slot(tmp_path: Path) -> None:
+    """最初のプロファイルを作成してロックする."""
+    with acquire_profile(tmp_path, _MAX_BYTES) as profile:
+        assert profile.path == tmp_path / "slot-0"
+        assert profile.path.is_dir()
+        assert profile.is_locked is True
+
+    assert profile.is_locked is False
+
+
+def test_acquire_profile_skips_locked_slot(tmp_path: Path) -> None:
+    """使用中のプロファイルは共有せず、次のプロファイルを使用する."""
+    with acquire_profile(tmp_path, _MAX_BYTES) as first:
+        with acquire_profile(tmp_path, _MAX_BYTES) as second:
+            assert first.path != second.path
+            assert second.path == tmp_path / "slot-1"
+
+
+def test_acquire_profile_reuses_released_slot(tmp_path: Path) -> None:
+    """解放したプロファイルはキャッシュを残したまま再利用する."""
+    with acquire_profile(tmp_path, _MAX_BYTES) as profile:
+        _write_file(profile.path / "Default" / "Cache" / "data_0", 100)
+
+    with acquire_profile(tmp_path, _MAX_BYTES) as reused:
+        assert reused.path == profile.path
+        assert (reused.path / "Default" / "Cache" / "data_0").exists()
+
+
+def test_release_is_idempotent(tmp_path: Path) -> None:
+    """解放を複数回呼び出してもエラーにならない."""
+    profile = acquire_profile(tmp_path, _MAX_BYTES)
+
+    profile.release()
+    profile.release()
+
+    assert profile.is_locked is False
+
+
+def test_prune_profile_removes_cache_over_limit(tmp_path: Path) -> None:
+    """上限を超えた場合はキャッシュのみを削除する."""
+    _write_file(tmp_path / "Default" / "Cache" / "data_0", 2000)
+    _write_file(tmp_path / "Default" / "Code Cache" / "js" / "index", 2000)
+    _write_file(tmp_path / "Default" / "Preferences", 100)
+
+    assert prune_profile(tmp_path, 1000) is True
+
+    assert not (tmp_path / "Default" / "Cache").exists()
+    assert not (tmp_path / "Default" / "Code Cache").exists()
+    assert (tmp_path / "Default" / "Preferences").exists()
+
+
+def test_prune_profile_keeps_profile_under_limit(tmp_path: Path) -> None:
+    """上限以下の場合は何も削除しない."""
+    _write_file(tmp_path / "Default" / "Cache" / "data_0", 500)
+
+    assert prune_profile(tmp_path, 1000) is False
+
+    assert (tmp_path / "Default" / "Cache" / "data_0").exists()
+
+
+# 準正常系
+def test_prune_profile_resets_profile_still_over_limit(tmp_path: Path) -> None:
+    """キャッシュを削除しても上限を超える場合はロックファイル以外を削除する."""
+    with acquire_profile(tmp_path, _MAX_BYTES) as profile:
+        _write_file(profile.path / "Default" / "History", 2000)
+        _write_file(profile.path / "Local State", 100)
+
+        assert prune_profile(profile.path, 1000) is True
+
+        assert [child.name for child in profile.path.iterdir()] == [".keiba_auto_bet.lock"]
+
+
+def test_acquire_profile_prunes_oversized_slot(tmp_path: Path) -> None:
+    """上限を超えたプロファイルはロック後にキャッシュを削除してから返す."""
+    _write_file(tmp_path / "slot-0" / "Default" / "Cache" / "data_0", 2000)
+
+    with acquire_profile(tmp_path, 1000) as profile:
+        assert not (profile.path / "Default" / "Cache").exists()
+
+
+# 異常系
+def test_acquire_profile_raises_when_all_slots_locked(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """空いているプロファイルがない場合BrowserErrorが送出される."""
+    monkeypatch.setattr("keiba_auto_bet.profile._MAX_PROFILE_SLOTS", 1)
+
+    with acquire_profile(tmp_path, _MAX_BYTES):
+        with pytest.raises(BrowserError, match="空いているChromeプロファイルがありません"):
+            acquire_profile(tmp_path, _MAX_BYTES)
@@ -0,0 +1 @@
+"""schedulerテストパッケージ."""
@@ -0,0 +1,164 @@
+"""DeadlineSchedulerのテスト."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from keiba_auto_bet.exceptions import BetError, ValidationError
+from keiba_auto_bet.models import (
+    BetOrder,
+    BetResult,
+    ClockOffset,
+    EntryTiming,
+    TicketType,
+)
+from keiba_auto_bet.planner import plan_orders
+from keiba_auto_bet.scheduler import DeadlineScheduler
+
+
+def _order(
+    race_number: int, horse_number: int, deadline: datetime | None, amount: int = 100
+) -> BetOrder:
+    """テスト用の購入注文を生成する."""
+    return BetOrder(
+        venue="東京",
+        race_number=race_number,
+        ticket_type=TicketType.WIN,
+        horse_number=horse_number,
+        amount=amount,
+        deadline=deadline,
+    )
+
+
+def _in(seconds: float) -> datetime:
+    """現在時刻から指定秒数後の時刻を返す."""
+    return datetime.now(timezone.utc) + timedelta(seconds=seconds)
+
+
+# 正常系
+def test_run_commits_races_earliest_deadline_first(mock_better: MagicMock) -> None:
+    """締切の早いレースから1レースずつ購入し、締切のないレースは最後に購入する."""
+    late = _order(12, 1, _in(1200))
+    undated = _order(9, 5, None)
+    soon = _order(11, 2, _in(40))
+    soon_second = _order(11, 3, _in(60))
+    scheduler = DeadlineScheduler(mock_better)
+
+    report = scheduler.run([late, undated, soon, soon_second])
+
+    assert mock_better.method_calls == [
+        call.warm_up(),
+        call.bet([soon, soon_second]),
+        call.bet([late]),
+        call.bet([undated]),
+        call.close(),
+    ]
+    assert report.success is True
+    assert [submission.race_number for submission in report.submissions] == [11, 12, 9]
+    assert report.submissions[0].deadline == soon.deadline
+    assert report.refused_orders == ()
+
+
+def test_estimate_seconds_counts_set_operations(mock_better: MagicMock) -> None:
+    """見込み時間はセット操作以外の時間と、まとめた後のセット操作の回数から計算する."""
+    scheduler = DeadlineScheduler(mock_better, entry_seconds=2.0, overhead_seconds=4.0)
+    orders = [_order(11, 1, None), _order(11, 2, None), _order(11, 3, None, 200)]
+
+    assert len(plan_orders(orders).entries) == 2
+    assert scheduler.estimate_seconds(orders) == 4.0 + 2.0 * 2
+
+
+def test_run_updates_estimates_from_measured_result(mock_better: MagicMock) -> None:
+    """購入結果の計測値で見込み時間を更新する."""
+    order = _order(11, 1, None)
+    entry = plan_orders([order]).entries[0]
+    mock_better.bet.return_value = BetResult(
+        success=True,
+        phase_timings={"race_select": 1.0, "ticket_entry": 3.0, "confirm": 1.0, "return": 9.0},
+        entry_timings=(EntryTiming(entry=entry, seconds=3.5),),
+    )
+    scheduler = DeadlineScheduler(mock_better, entry_seconds=1.0, overhead_seconds=4.0)
+
+    scheduler.run([order])
+
+    assert scheduler.entry_seconds == pytest.approx(2.0)
+    assert scheduler.overhead_seconds == pytest.approx(3.0)
+
+
+def test_run_keeps_existing_session_open(mock_better: MagicMock) -> None:
+    """開始済みのセッションは購入後も維持する."""
+    mock_better.is_open = True
+
+    DeadlineScheduler(mock_better).run([_order(11, 1, _in(600))])
+
+    mock_better.close.assert_not_called()
+
+
+# 準正常系
+def test_run_refuses_race_that_cannot_make_deadline(mock_better: MagicMock) -> None:
+    """見込み時間で締切に間に合わないレースは送信せずに報告し、残りのレースを購入する."""
+    too_late = _order(10, 1, _in(6))
+    in_time = _order(12, 1, _in(600))
+    scheduler = DeadlineScheduler(
+        mock_better, safety_margin=3.0, entry_seconds=1.0, overhead_seconds=4.0
+    )
+
+    report = scheduler.run([in_time, too_late])
+
+    assert mock_better.bet.call_args_list == [call([in_time])]
+    refused = report.submissions[0]
+    assert refused.refused is True
+    assert refused.result is None
+    assert refused.estimated_seconds == 5.0
+    assert refused.error is not None
+    assert "締切に間に合わないため送信しませんでした: 東京10R" in refused.error
+    assert report.refused_orders == (too_late,)
+    assert report.success is False
+
+
+def test_run_refuses_by_server_clock(mock_better: MagicMock) -> None:
+    """締切までの残り時間はサーバの時計のずれで補正して判断する."""
+    mock_better.clock_offset = ClockOffset(
+        offset_seconds=30.0,
+        error_seconds=0.05,
+        sample_count=3,
+        measured_at=datetime.now(timezone.utc),
+    )
+    order = _order(11, 1, _in(35))
+    scheduler = DeadlineScheduler(
+        mock_better, safety_margin=3.0, entry_seconds=1.0, overhead_seconds=4.0
+    )
+
+    report = scheduler.run([order])
+
+    # ホストの時計では35秒後でも、サーバの時計では締切まで5秒しか残っていない
+    mock_better.bet.assert_not_called()
+    assert report.refused_orders == (order,)
+
+
+def test_run_records_bet_error_and_continues(mock_better: MagicMock) -> None:
+    """購入処理のエラーは送信結果に記録し、残りのレースを購入する."""
+    mock_better.bet.side_effect = [BetError("購入確定に失敗しました"), BetResult(success=True)]
+
+    report = DeadlineScheduler(mock_better).run([_order(11, 1, _in(60)), _order(12, 1, _in(600))])
+
+    assert report.submissions[0].error == "購入確定に失敗しました"
+    assert report.submissions[0].refused is False
+    assert report.submissions[1].success is True
+
+
+# 異常系
+def test_run_validates_before_warm_up(mock_better: MagicMock) -> None:
+    """バリデーションエラーの場合はウォームアップせずに例外を送出する."""
+    with pytest.raises(ValidationError):
+        DeadlineScheduler(mock_better).run([_order(11, 1, _in(600), amount=20000)])
+
+    mock_better.warm_up.assert_not_called()
+
+
+@pytest.mark.parametrize("name", ["safety_margin", "entry_seconds", "overhead_seconds"])
+def test_init_invalid_seconds(mock_better: MagicMock, name: str) -> None:
+    """見込み秒数・前倒し秒数が負の場合ValueErrorが発生する."""
+    with pytest.raises(ValueError, match=f"{name}は0以上の値で指定してください"):
+        DeadlineScheduler(mock_better, **{name: -1.0})
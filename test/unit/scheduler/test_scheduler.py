@@ -0,0 +1,155 @@
+"""BetSchedulerのテスト."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+
+from keiba_auto_bet.exceptions import LoginError, ValidationError
+from keiba_auto_bet.models import BetOrder, ClockOffset, TicketType
+from keiba_auto_bet.scheduler import BetScheduler
+
+
+@pytest.fixture()
+def sample_orders() -> list[BetOrder]:
+    """テスト用の購入注文リスト."""
+    return [
+        BetOrder(
+            venue="東京",
+            race_number=11,
+            ticket_type=TicketType.WIN,
+            horse_number=3,
+            amount=500,
+        ),
+    ]
+
+
+# 正常系
+def test_run_warms_up_before_fire_time(
+    mock_better: MagicMock,
+    sample_orders: list[BetOrder],
+) -> None:
+    """ウォームアップ後に予定時刻まで待機してから購入し、セッションを終了する."""
+    fire_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    scheduler = BetScheduler(mock_better, lead_time=60.0)
+
+    with patch("keiba_auto_bet.scheduler.time.sleep") as mock_sleep:
+        report = scheduler.run(sample_orders, fire_at)
+
+    assert mock_better.method_calls[:3] == [
+        call.warm_up(),
+        call.bet(sample_orders),
+        call.close(),
+    ]
+    # ウォームアップ開始時刻は過ぎているため、待機は予定時刻までの1回のみ
+    mock_sleep.assert_called_once()
+    assert 0 < mock_sleep.call_args.args[0] <= 30
+    assert report.success is True
+    assert report.bet_result is mock_better.bet.return_value
+    assert report.fire_at == fire_at
+    assert report.warm_up_seconds >= 0
+    assert report.bet_seconds >= 0
+
+
+def test_run_waits_for_warm_up_start(
+    mock_better: MagicMock,
+    sample_orders: list[BetOrder],
+) -> None:
+    """ウォームアップ開始時刻前に呼ばれた場合はウォームアップ開始まで待機する."""
+    fire_at = datetime.now() + timedelta(seconds=120)
+    scheduler = BetScheduler(mock_better, lead_time=60.0)
+
+    with patch("keiba_auto_bet.scheduler.time.sleep") as mock_sleep:
+        scheduler.run(sample_orders, fire_at)
+
+    assert mock_sleep.call_count == 2
+    assert 50 < mock_sleep.call_args_list[0].args[0] <= 60
+
+
+def test_run_keeps_existing_session_open(
+    mock_better: MagicMock,
+    sample_orders: list[BetOrder],
+) -> None:
+    """既にセッションが開始されている場合はセッションを終了しない."""
+    mock_better.is_open = True
+    scheduler = BetScheduler(mock_better)
+
+    with patch("keiba_auto_bet.scheduler.time.sleep"):
+        scheduler.run(sample_orders, datetime.now())
+
+    mock_better.close.assert_not_called()
+
+
+def test_run_reports_late_fire(
+    mock_better: MagicMock,
+    sample_orders: list[BetOrder],
+) -> None:
+    """予定時刻を過ぎてから呼ばれた場合は直ちに購入し、遅れを報告する."""
+    fire_at = datetime.now() - timedelta(seconds=5)
+    mock_logger = MagicMock()
+    scheduler = BetScheduler(mock_better, logger=mock_logger)
+
+    with patch("keiba_auto_bet.scheduler.time.sleep") as mock_sleep:
+        report = scheduler.run(sample_orders, fire_at)
+
+    mock_sleep.assert_not_called()
+    assert report.fire_delay_seconds >= 5
+    mock_logger.warning.assert_called_once()
+
+
+def test_run_corrects_fire_time_by_clock_offset(
+    mock_better: MagicMock,
+    sample_orders: list[BetOrder],
+) -> None:
+    """ウォームアップ中に推定したサーバの時計のずれの分だけ予定時刻を補正して待機する."""
+    mock_better.clock_offset = ClockOffset(
+        offset_seconds=2.0,
+        error_seconds=0.05,
+        sample_count=3,
+        measured_at=datetime.now(timezone.utc),
+    )
+    fire_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    scheduler = BetScheduler(mock_better, lead_time=60.0)
+
+    with patch("keiba_auto_bet.scheduler.time.sleep") as mock_sleep:
+        report = scheduler.run(sample_orders, fire_at)
+
+    # サーバの時計が2秒進んでいるため、ホストの時計では2秒早く購入する
+    assert 26 < mock_sleep.call_args.args[0] <= 28
+    assert report.clock_offset is mock_better.clock_offset
+
+
+# 準正常系
+def test_init_invalid_lead_time(mock_better: MagicMock) -> None:
+    """前倒し秒数が0以下の場合ValueErrorが発生する."""
+    with pytest.raises(ValueError, match="前倒し秒数は0より大きい値で指定してください"):
+        BetScheduler(mock_better, lead_time=0)
+
+
+def test_run_validates_before_warm_up(mock_better: MagicMock) -> None:
+    """不正な注文の場合はウォームアップ前にValidationErrorが発生する."""
+    scheduler = BetScheduler(mock_better)
+
+    with pytest.raises(ValidationError, match="購入注文リストが空です"):
+        scheduler.run([], datetime.now())
+
+    mock_better.warm_up.assert_not_called()
+
+
+# 異常系
+def test_run_closes_session_on_error(
+    mock_better: MagicMock,
+    sample_orders: list[BetOrder],
+) -> None:
+    """ウォームアップに失敗した場合も開始したセッションを終了する."""
+    mock_better.warm_up.side_effect = LoginError("ログインに失敗しました")
+    scheduler = BetScheduler(mock_better)
+
+    with (
+        patch("keiba_auto_bet.scheduler.time.sleep"),
+        pytest.raises(LoginError),
+    ):
+        scheduler.run(sample_orders, datetime.now())
+
+    mock_better.close.assert_called_once()
+    mock_better.bet.assert_not_called()
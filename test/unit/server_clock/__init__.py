@@ -0,0 +1 @@
+"""server_clockテストパッケージ."""
@@ -0,0 +1,114 @@
+"""サーバ時刻の推定のテスト."""
+
+import math
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from keiba_auto_bet.models import ClockOffset
+from keiba_auto_bet.server_clock import ServerClockSampler, _ClockSample, _estimate_clock_offset
+
+_HOST_TIME = 1_760_000_000.0
+
+
+def _sample(sent: float, round_trip: float, offset: float) -> _ClockSample:
+    """サーバの時計が指定秒数進んでいる場合の計測結果を生成する.
+
+    サーバは往復の中間時刻にDateヘッダを付けるものとする。
+    """
+    server_time = math.floor(sent + round_trip / 2 + offset)
+    return _ClockSample(sent=sent, received=sent + round_trip, server_time=server_time)
+
+
+# 正常系
+def test_estimate_clock_offset_narrows_with_staggered_samples() -> None:
+    """送信時刻を1秒の中でずらした計測を組み合わせ、1秒より狭い範囲でずれを推定する."""
+    samples = [_sample(_HOST_TIME + index * 1.2, 0.04, 0.35) for index in range(5)]
+
+    offset = _estimate_clock_offset(samples)
+
+    assert offset is not None
+    assert offset.error_seconds < 0.25
+    assert abs(offset.offset_seconds - 0.35) <= offset.error_seconds
+    assert offset.sample_count == 5
+
+
+def test_estimate_clock_offset_ignores_slow_round_trips() -> None:
+    """往復時間が中央値を超える計測は推定に使用しない."""
+    samples = [
+        _sample(_HOST_TIME, 0.05, -1.2),
+        _sample(_HOST_TIME + 1.4, 0.05, -1.2),
+        _sample(_HOST_TIME + 2.8, 0.05, -1.2),
+        _ClockSample(sent=_HOST_TIME + 4.0, received=_HOST_TIME + 6.0, server_time=0.0),
+    ]
+
+    offset = _estimate_clock_offset(samples)
+
+    assert offset is not None
+    assert offset.sample_count == 3
+    assert abs(offset.offset_seconds + 1.2) <= offset.error_seconds
+
+
+def test_clock_offset_converts_server_time() -> None:
+    """サーバ時刻をずれの分だけ補正したホスト時刻に変換する."""
+    offset = ClockOffset(
+        offset_seconds=1.5,
+        error_seconds=0.1,
+        sample_count=3,
+        measured_at=datetime.now(timezone.utc),
+    )
+    deadline = datetime(2026, 10, 18, 15, 40, tzinfo=timezone.utc)
+
+    assert offset.to_host_time(deadline) == deadline - timedelta(seconds=1.5)
+    assert offset.server_now(timezone.utc) - datetime.now(timezone.utc) == pytest.approx(
+        timedelta(seconds=1.5), abs=timedelta(seconds=0.1)
+    )
+
+
+# 準正常系
+def test_estimate_clock_offset_without_samples() -> None:
+    """計測結果がない場合はNoneを返す."""
+    assert _estimate_clock_offset([]) is None
+
+
+def test_estimate_clock_offset_falls_back_to_median_on_inconsistent_samples() -> None:
+    """範囲の共通部分がない場合は往復の中間時刻とDateヘッダの差の中央値を使用する."""
+    samples = [
+        _sample(_HOST_TIME, 0.02, 0.0),
+        _sample(_HOST_TIME + 1.5, 0.02, 3.0),
+        _sample(_HOST_TIME + 3.0, 0.02, 3.0),
+    ]
+
+    offset = _estimate_clock_offset(samples)
+
+    assert offset is not None
+    assert offset.offset_seconds == pytest.approx(3.0, abs=0.6)
+    assert offset.error_seconds >= 0.5
+
+
+def test_sampler_stops_on_request_error() -> None:
+    """計測に失敗した場合はそれまでの計測結果で推定する."""
+    sampler = ServerClockSampler("http://127.0.0.1:9/", sample_count=3, timeout=0.5)
+
+    with patch("keiba_auto_bet.server_clock.http.client.HTTPConnection") as mock_connection:
+        mock_connection.return_value.request.side_effect = OSError("接続できません")
+        sampler.start()
+        offset = sampler.stop(timeout=5.0)
+
+    assert offset is None
+    mock_connection.return_value.close.assert_called_once()
+
+
+def test_sampler_requires_date_header() -> None:
+    """Dateヘッダのない応答は計測結果に含めない."""
+    sampler = ServerClockSampler("http://127.0.0.1:9/", sample_count=1)
+    response = MagicMock()
+    response.getheader.return_value = None
+
+    with patch("keiba_auto_bet.server_clock.http.client.HTTPConnection") as mock_connection:
+        mock_connection.return_value.getresponse.return_value = response
+        sampler.start()
+        offset = sampler.stop(timeout=5.0)
+
+    assert offset is None
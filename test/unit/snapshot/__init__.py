@@ -0,0 +1 @@
+"""snapshotテストパッケージ."""
@@ -0,0 +1,235 @@
+"""購入画面のスナップショットのテスト."""
+
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from keiba_auto_bet.exceptions import BetError
+from keiba_auto_bet.models import PageSnapshot
+from keiba_auto_bet.snapshot import (
+    _PURCHASE_LIMIT_SCRIPT,
+    _SNAPSHOT_SCRIPT,
+    RaceOptionIndex,
+    find_race_option,
+    read_purchase_limit,
+    take_snapshot,
+)
+
+
+def _snapshot_data(**overrides: Any) -> dict[str, Any]:
+    """スナップショットのスクリプトの実行結果を作成する."""
+    data: dict[str, Any] = {
+        "venue": {"options": ["東京（1日）", "阪神（2日）"], "selected": "東京（1日）"},
+        "race": {"options": [f"{race}R" for race in range(1, 13)], "selected": "12R"},
+        "ticketType": {"options": ["単勝", "複勝"], "selected": "単勝"},
+        "method": {"options": [], "selected": None},
+        "horses": [1, 2, 3, 4],
+        "checked": [2],
+        "checkedLegs": [],
+        "multi": None,
+        "voteCount": 3,
+    }
+    data.update(overrides)
+    return data
+
+
+def _snapshot(**overrides: Any) -> PageSnapshot:
+    """スナップショットを作成する."""
+    driver = MagicMock()
+    driver.execute_script.return_value = _snapshot_data(**overrides)
+    return take_snapshot(driver)
+
+
+# 正常系
+def test_take_snapshot_runs_single_script() -> None:
+    """1回のスクリプト実行で購入画面の状態を取得する."""
+    driver = MagicMock()
+    driver.execute_script.return_value = _snapshot_data()
+
+    snapshot = take_snapshot(driver)
+
+    driver.execute_script.assert_called_once_with(_SNAPSHOT_SCRIPT)
+    assert snapshot == PageSnapshot(
+        venues=("東京（1日）", "阪神（2日）"),
+        selected_venue="東京（1日）",
+        races=tuple(f"{race}R" for race in range(1, 13)),
+        selected_race="12R",
+        ticket_types=("単勝", "複勝"),
+        selected_ticket_type="単勝",
+        methods=(),
+        selected_method=None,
+        horses=(1, 2, 3, 4),
+        checked_horses=(2,),
+        checked_legs=(),
+        multi=None,
+        vote_count=3,
+    )
+
+
+def test_take_snapshot_without_bet_page() -> None:
+    """購入画面の要素がない場合は選択肢が空で選択中の値がNoneになる."""
+    empty_select = {"options": [], "selected": None}
+    snapshot = _snapshot(
+        venue=empty_select,
+        race=empty_select,
+        ticketType=empty_select,
+        horses=[],
+        checked=[],
+        voteCount=None,
+    )
+
+    assert snapshot.venues == ()
+    assert snapshot.selected_venue is None
+    assert snapshot.vote_count is None
+
+
+def test_take_snapshot_reads_combination_checks() -> None:
+    """組み合わせの馬券の列ごとのチェックとマルチの状態を読み取る."""
+    snapshot = _snapshot(checkedLegs=[[1, 3], [2, 5]], multi=True)
+
+    assert snapshot.checked_legs == ((1, 3), (2, 5))
+    assert snapshot.multi is True
+
+
+def test_read_purchase_limit_runs_single_script() -> None:
+    """購入限度額を1回のスクリプト実行で取得する."""
+    driver = MagicMock()
+    driver.execute_script.return_value = 30000
+
+    assert read_purchase_limit(driver) == 30000
+    driver.execute_script.assert_called_once_with(_PURCHASE_LIMIT_SCRIPT)
+
+
+def test_find_race_option_does_not_match_longer_number() -> None:
+    """「1R」は「11R」に一致しない."""
+    snapshot = _snapshot(race={"options": ["10R", "11R", "1R"], "selected": None})
+
+    assert find_race_option(snapshot, 1) == "1R"
+    assert find_race_option(snapshot, 11) == "11R"
+
+
+def test_race_option_index_looks_up_venue_by_name_and_code() -> None:
+    """競馬場名・JRAの場コード・表示テキストで競馬場の選択肢を引ける."""
+    index = RaceOptionIndex()
+    index.refresh(_snapshot())
+
+    assert index.venue_option("東京") == "東京（1日）"
+    assert index.venue_option("09") == "阪神（2日）"
+    assert index.venue_option("阪神（2日）") == "阪神（2日）"
+
+
+def test_race_option_index_records_races_of_selected_venue() -> None:
+    """選択中の競馬場のレースの選択肢を記録し、未記録の競馬場はNoneを返す."""
+    index = RaceOptionIndex()
+    index.refresh(_snapshot(race={"options": ["1R", "11R", "12R"], "selected": "12R"}))
+
+    assert index.race_option("東京", 11) == "11R"
+    assert index.race_option("05", 1) == "1R"
+    assert index.race_option("阪神", 11) is None
+
+
+def test_race_option_index_rebuilds_only_when_venues_change() -> None:
+    """競馬場の選択肢の一覧が変わった場合のみ索引を作り直す."""
+    index = RaceOptionIndex()
+
+    assert index.refresh(_snapshot()) is True
+    assert (
+        index.refresh(
+            _snapshot(
+                venue={"options": ["東京（1日）", "阪神（2日）"], "selected": "阪神（2日）"},
+                race={"options": ["9R"], "selected": "9R"},
+            )
+        )
+        is False
+    )
+    assert index.race_option("東京", 12) == "12R"
+    assert index.race_option("阪神", 9) == "9R"
+
+    assert index.refresh(_snapshot(venue={"options": ["東京（2日）"], "selected": None})) is True
+    assert index.race_option("東京", 12) is None
+
+
+# 準正常系
+def test_find_race_option_returns_none_when_missing() -> None:
+    """一致する選択肢がない場合はNoneを返す."""
+    snapshot = _snapshot()
+
+    assert find_race_option(snapshot, 13) is None
+
+
+@pytest.mark.parametrize("limit", [None, "30,000", 1.5, True])
+def test_read_purchase_limit_returns_none_when_not_shown(limit: Any) -> None:
+    """購入限度額が表示されていない場合Noneを返す."""
+    driver = MagicMock()
+    driver.execute_script.return_value = limit
+
+    assert read_purchase_limit(driver) is None
+
+
+# 異常系
+def test_take_snapshot_rejects_invalid_combination_checks() -> None:
+    """列ごとのチェックの形式が不正な場合はBetErrorを送出する."""
+    with pytest.raises(BetError, match="列ごとの馬番"):
+        _snapshot(checkedLegs=[[1, 3, 5]])
+
+
+def test_race_option_index_rejects_unknown_venue() -> None:
+    """選択肢にない競馬場はBetErrorが発生する."""
+    index = RaceOptionIndex()
+    index.refresh(_snapshot())
+
+    with pytest.raises(
+        BetError, match="競馬場が見つかりませんでした: 中山（選択肢: 東京（1日）、阪神（2日））"
+    ):
+        index.race_option("中山", 11)
+
+
+def test_race_option_index_rejects_closed_race() -> None:
+    """記録済みの選択肢から消えたレースは発売終了としてBetErrorが発生する."""
+    index = RaceOptionIndex()
+    index.refresh(_snapshot())
+    index.refresh(_snapshot(race={"options": ["11R", "12R"], "selected": "11R"}))
+
+    with pytest.raises(BetError, match="発売終了または未開催"):
+        index.race_option("東京", 10)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        None,
+        _snapshot_data(venue=None),
+        _snapshot_data(race={"options": [1, 2], "selected": None}),
+        _snapshot_data(ticketType={"options": ["単勝"], "selected": 0}),
+        _snapshot_data(checked=["2"]),
+        _snapshot_data(horses=[True]),
+        _snapshot_data(voteCount="3"),
+    ],
+)
+def test_take_snapshot_rejects_invalid_data(data: Any) -> None:
+    """スクリプトの実行結果の形式が不正な場合BetErrorが発生する."""
+    driver = MagicMock()
+    driver.execute_script.return_value = data
+
+    with pytest.raises(BetError, match="画面の状態を取得できませんでした"):
+        take_snapshot(driver)
+
+
+def test_take_snapshot_wraps_webdriver_error() -> None:
+    """スクリプトの実行に失敗した場合BetErrorが発生する."""
+    driver = MagicMock()
+    driver.execute_script.side_effect = WebDriverException("disconnected")
+
+    with pytest.raises(BetError, match="画面の状態を取得できませんでした"):
+        take_snapshot(driver)
+
+
+def test_read_purchase_limit_wraps_webdriver_error() -> None:
+    """購入限度額の取得スクリプトの実行に失敗した場合BetErrorが発生する."""
+    driver = MagicMock()
+    driver.execute_script.side_effect = WebDriverException("disconnected")
+
+    with pytest.raises(BetError, match="購入限度額を取得できませんでした"):
+        read_purchase_limit(driver)
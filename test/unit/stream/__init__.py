@@ -0,0 +1 @@
+"""streamテストパッケージ."""
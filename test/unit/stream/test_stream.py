@@ -0,0 +1,139 @@
+"""OrderStreamのテスト."""
+
+import queue
+import time
+from collections.abc import Iterator
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from keiba_auto_bet.exceptions import BetError
+from keiba_auto_bet.models import BetOrder, BetResult, TicketType
+from keiba_auto_bet.stream import OrderStream
+
+
+def _order(race_number: int, horse_number: int) -> BetOrder:
+    """テスト用の購入注文を生成する."""
+    return BetOrder(
+        venue="東京",
+        race_number=race_number,
+        ticket_type=TicketType.WIN,
+        horse_number=horse_number,
+        amount=100,
+    )
+
+
+# 正常系
+def test_run_flushes_each_race_group(mock_better: MagicMock) -> None:
+    """別のレースの注文が届くたびにそれまでの注文を送信し、終了時に残りを送信する."""
+    orders = [_order(10, 1), _order(10, 2), _order(11, 3), _order(12, 4)]
+    stream = OrderStream(mock_better, flush_interval=60.0)
+
+    flushes = list(stream.run(orders))
+
+    assert [flush.orders for flush in flushes] == [
+        (orders[0], orders[1]),
+        (orders[2],),
+        (orders[3],),
+    ]
+    assert [flush.reason for flush in flushes] == ["race", "race", "end"]
+    assert all(flush.success for flush in flushes)
+    assert mock_better.method_calls == [
+        call.warm_up(),
+        call.bet([orders[0], orders[1]]),
+        call.warm_up(),
+        call.bet([orders[2]]),
+        call.warm_up(),
+        call.bet([orders[3]]),
+        call.close(),
+    ]
+
+
+def test_run_flushes_on_deadline_while_waiting(mock_better: MagicMock) -> None:
+    """次の注文を待っている間に送信期限が来た場合は受け付けた注文を送信する."""
+    first, second = _order(11, 1), _order(11, 2)
+
+    def slow_source() -> Iterator[BetOrder]:
+        yield first
+        time.sleep(0.3)
+        yield second
+
+    stream = OrderStream(mock_better, flush_interval=0.05)
+
+    flushes = list(stream.run(slow_source()))
+
+    assert [(flush.orders, flush.reason) for flush in flushes] == [
+        ((first,), "deadline"),
+        ((second,), "end"),
+    ]
+    assert flushes[0].wait_seconds >= 0.05
+
+
+def test_run_reads_orders_from_queue(mock_better: MagicMock) -> None:
+    """キューから注文を受け付け、Noneを受け取った時点で終了する."""
+    inbox: queue.Queue[BetOrder | None] = queue.Queue()
+    order = _order(11, 1)
+    inbox.put(order)
+    inbox.put(None)
+    inbox.put(_order(12, 1))
+
+    flushes = list(OrderStream(mock_better).run(inbox))
+
+    assert [flush.orders for flush in flushes] == [(order,)]
+    assert inbox.qsize() == 1
+
+
+def test_run_keeps_existing_session_open(mock_better: MagicMock) -> None:
+    """開始済みのセッションは受け付けの終了後も維持する."""
+    mock_better.is_open = True
+
+    list(OrderStream(mock_better).run([_order(11, 1)]))
+
+    mock_better.close.assert_not_called()
+
+
+# 準正常系
+def test_run_records_bet_error_and_continues(mock_better: MagicMock) -> None:
+    """送信ごとの購入処理のエラーは結果に記録し、受け付けを続ける."""
+    mock_better.bet.side_effect = [BetError("馬券選択に失敗しました"), BetResult(success=True)]
+
+    flushes = list(OrderStream(mock_better).run([_order(11, 1), _order(12, 1)]))
+
+    assert flushes[0].success is False
+    assert flushes[0].result is None
+    assert flushes[0].error == "馬券選択に失敗しました"
+    assert flushes[1].success is True
+
+
+def test_run_ignores_warm_up_error_between_flushes(mock_better: MagicMock) -> None:
+    """送信後の準備に失敗しても次の注文の受け付けを続ける."""
+    mock_better.warm_up.side_effect = [None, BetError("購入画面への移動に失敗しました")]
+
+    flushes = list(OrderStream(mock_better).run([_order(11, 1), _order(12, 1)]))
+
+    assert len(flushes) == 2
+    assert mock_better.bet.call_count == 2
+
+
+# 異常系
+def test_run_flushes_pending_orders_before_source_error(mock_better: MagicMock) -> None:
+    """注文の読み出し中の例外は、受け付け済みの注文を送信してから送出する."""
+    order = _order(11, 1)
+
+    def broken_source() -> Iterator[BetOrder]:
+        yield order
+        raise RuntimeError("予想モデルが停止しました")
+
+    flushes = []
+    with pytest.raises(RuntimeError, match="予想モデルが停止しました"):
+        for flush in OrderStream(mock_better, flush_interval=60.0).run(broken_source()):
+            flushes.append(flush)
+
+    assert [flush.orders for flush in flushes] == [(order,)]
+    mock_better.close.assert_called_once()
+
+
+def test_init_invalid_flush_interval(mock_better: MagicMock) -> None:
+    """送信期限が0以下の場合ValueErrorが発生する."""
+    with pytest.raises(ValueError, match="送信期限は0より大きい値で指定してください"):
+        OrderStream(mock_better, flush_interval=0)